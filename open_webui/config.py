@@ -34,6 +34,7 @@ from open_webui.env import (
 )
 from open_webui.internal.db import Base, get_db
 from open_webui.utils.redis import get_redis_connection
+from open_webui.utils.serialization import json_dumps, json_loads
 
 
 class EndpointFilter(logging.Filter):
@@ -225,6 +226,8 @@ class AppConfig:
     _state: dict[str, PersistentConfig]
     _redis: Union[redis.Redis, redis.cluster.RedisCluster] = None
     _redis_key_prefix: str
+    # Last value seen in Redis for each key, only a changed value is decoded
+    _redis_values: dict[str, str]
 
     def __init__(
         self,
@@ -235,6 +238,7 @@ class AppConfig:
     ):
         super().__setattr__("_state", {})
         super().__setattr__("_redis_key_prefix", redis_key_prefix)
+        super().__setattr__("_redis_values", {})
         if redis_url:
             super().__setattr__(
                 "_redis",
@@ -255,7 +259,9 @@ class AppConfig:
 
             if self._redis:
                 redis_key = f"{self._redis_key_prefix}:config:{key}"
-                self._redis.set(redis_key, json.dumps(self._state[key].value))
+                redis_value = json_dumps(self._state[key].value)
+                self._redis.set(redis_key, redis_value)
+                self._redis_values[key] = redis_value
 
     def __getattr__(self, key):
         if key not in self._state:
@@ -266,9 +272,10 @@ class AppConfig:
             redis_key = f"{self._redis_key_prefix}:config:{key}"
             redis_value = self._redis.get(redis_key)
 
-            if redis_value is not None:
+            if redis_value is not None and redis_value != self._redis_values.get(key):
                 try:
-                    decoded_value = json.loads(redis_value)
+                    decoded_value = json_loads(redis_value)
+                    self._redis_values[key] = redis_value
 
                     # Update the in-memory value if different
                     if self._state[key].value != decoded_value:
@@ -1598,6 +1605,34 @@ ENABLE_TITLE_GENERATION = PersistentConfig(
     os.environ.get("ENABLE_TITLE_GENERATION", "True").lower() == "true",
 )
 
+ENABLE_COMBINED_TASK_GENERATION = PersistentConfig(
+    "ENABLE_COMBINED_TASK_GENERATION",
+    "task.combined.enable",
+    os.environ.get("ENABLE_COMBINED_TASK_GENERATION", "False").lower() == "true",
+)
+
+COMBINED_TASK_GENERATION_PROMPT_TEMPLATE = PersistentConfig(
+    "COMBINED_TASK_GENERATION_PROMPT_TEMPLATE",
+    "task.combined.prompt_template",
+    os.environ.get("COMBINED_TASK_GENERATION_PROMPT_TEMPLATE", ""),
+)
+
+DEFAULT_COMBINED_TASK_GENERATION_PROMPT_TEMPLATE = """### Task:
+Generate the requested metadata for the chat history below in a single JSON object.
+### Guidelines:
+- "title": a concise, 3-5 word title with an emoji summarizing the chat history, without quotation marks or special formatting.
+- "tags": 1-3 broad tags categorizing the main themes of the chat (e.g. Science, Technology, Philosophy, Arts, Politics, Business, Health, Sports, Entertainment, Education), along with 1-3 more specific subtopic tags; if the content is too short or too diverse, use only ["General"].
+- "follow_ups": 3-5 concise follow-up questions the user might naturally ask next, written from the user's point of view and directed to the assistant, that don't repeat what was already covered.
+- Only include the keys shown in the output format.
+- Use the chat's primary language; default to English if multilingual.
+- Your entire response must be the raw JSON object, without markdown code fences or any text before or after it.
+### Output:
+JSON format: {{OUTPUT}}
+### Chat History:
+<chat_history>
+{{MESSAGES:END:6}}
+</chat_history>"""
+
 
 ENABLE_SEARCH_QUERY_GENERATION = PersistentConfig(
     "ENABLE_SEARCH_QUERY_GENERATION",
@@ -1881,6 +1916,34 @@ Ensure that the tools are effectively utilized to achieve the highest-quality an
 
 VECTOR_DB = os.environ.get("VECTOR_DB", "chroma")
 
+# Reduced-precision vector storage: "none" (float32), "half" (float16), "int8"
+# (scalar quantization) or "binary". Backends that support the mode index the
+# compact vectors and rescore the top candidates at full precision; others
+# keep float32.
+VECTOR_QUANTIZATION_MODES = ("none", "half", "int8", "binary")
+VECTOR_QUANTIZATION = os.environ.get("VECTOR_QUANTIZATION", "none").lower()
+# Per collection overrides by collection name prefix, the longest prefix wins,
+# e.g. {"user-memory-": "none"}
+try:
+    VECTOR_QUANTIZATION_COLLECTIONS = {
+        prefix: mode.lower()
+        for prefix, mode in json.loads(
+            os.environ.get("VECTOR_QUANTIZATION_COLLECTIONS", "{}")
+        ).items()
+    }
+except Exception as e:
+    log.warning(f"Invalid VECTOR_QUANTIZATION_COLLECTIONS: {e}")
+    VECTOR_QUANTIZATION_COLLECTIONS = {}
+for mode in [VECTOR_QUANTIZATION, *VECTOR_QUANTIZATION_COLLECTIONS.values()]:
+    if mode not in VECTOR_QUANTIZATION_MODES:
+        raise ValueError(
+            f"Unsupported vector quantization {mode}, expected one of {', '.join(VECTOR_QUANTIZATION_MODES)}."
+        )
+# Candidates fetched per requested result and rescored at full precision
+VECTOR_QUANTIZATION_OVERSAMPLING = float(
+    os.environ.get("VECTOR_QUANTIZATION_OVERSAMPLING", "3.0")
+)
+
 # Chroma
 CHROMA_DATA_PATH = f"{DATA_DIR}/vector_db"
 
@@ -1926,6 +1989,9 @@ QDRANT_PREFER_GRPC = os.environ.get("QDRANT_PREFER_GRPC", "false").lower() == "t
 QDRANT_GRPC_PORT = int(os.environ.get("QDRANT_GRPC_PORT", "6334"))
 QDRANT_TIMEOUT = int(os.environ.get("QDRANT_TIMEOUT", "5"))
 QDRANT_HNSW_M = int(os.environ.get("QDRANT_HNSW_M", "16"))
+# Points per upsert request and requests in flight while uploading a batch
+QDRANT_UPSERT_BATCH_SIZE = int(os.environ.get("QDRANT_UPSERT_BATCH_SIZE", "256"))
+QDRANT_UPSERT_PARALLELISM = int(os.environ.get("QDRANT_UPSERT_PARALLELISM", "4"))
 ENABLE_QDRANT_MULTITENANCY_MODE = (
     os.environ.get("ENABLE_QDRANT_MULTITENANCY_MODE", "true").lower() == "true"
 )
@@ -2007,6 +2073,39 @@ else:
     except Exception:
         PGVECTOR_POOL_RECYCLE = 3600
 
+# Rows written per multi-row INSERT statement
+PGVECTOR_INSERT_BATCH_SIZE = int(os.environ.get("PGVECTOR_INSERT_BATCH_SIZE", "500"))
+
+# ANN index: "hnsw", "ivfflat" or "none"
+PGVECTOR_INDEX_METHOD = os.environ.get("PGVECTOR_INDEX_METHOD", "hnsw").lower()
+# vector_cosine_ops, vector_l2_ops or vector_ip_ops; searches use the matching distance
+PGVECTOR_INDEX_OPCLASS = os.environ.get("PGVECTOR_INDEX_OPCLASS", "vector_cosine_ops")
+PGVECTOR_HNSW_M = int(os.environ.get("PGVECTOR_HNSW_M", "16"))
+PGVECTOR_HNSW_EF_CONSTRUCTION = int(
+    os.environ.get("PGVECTOR_HNSW_EF_CONSTRUCTION", "64")
+)
+PGVECTOR_IVFFLAT_LISTS = int(os.environ.get("PGVECTOR_IVFFLAT_LISTS", "100"))
+
+# Query-time recall/latency knobs, applied per search transaction
+PGVECTOR_HNSW_EF_SEARCH = int(os.environ.get("PGVECTOR_HNSW_EF_SEARCH", "40"))
+# "relaxed_order" or "strict_order" (pgvector >= 0.8) keeps filtered HNSW searches
+# scanning until enough rows of the collection are found
+PGVECTOR_HNSW_ITERATIVE_SCAN = os.environ.get("PGVECTOR_HNSW_ITERATIVE_SCAN", "")
+# 0 keeps the server default
+PGVECTOR_IVFFLAT_PROBES = int(os.environ.get("PGVECTOR_IVFFLAT_PROBES", "0"))
+
+# Collections with at least this many chunks get their own partial ANN index when
+# the index is rebuilt, 0 disables per-collection indexes
+PGVECTOR_PARTIAL_INDEX_MIN_ROWS = int(
+    os.environ.get("PGVECTOR_PARTIAL_INDEX_MIN_ROWS", "0")
+)
+# Collections with a storage mode of their own (VECTOR_QUANTIZATION_COLLECTIONS)
+# get a partial index from rebuild_index once they hold this many chunks,
+# smaller ones are searched by scanning their rows
+PGVECTOR_QUANTIZED_INDEX_MIN_ROWS = int(
+    os.environ.get("PGVECTOR_QUANTIZED_INDEX_MIN_ROWS", "10000")
+)
+
 # Pinecone
 PINECONE_API_KEY = os.environ.get("PINECONE_API_KEY", None)
 PINECONE_ENVIRONMENT = os.environ.get("PINECONE_ENVIRONMENT", None)
@@ -2049,6 +2148,36 @@ S3_VECTOR_REGION = os.environ.get("S3_VECTOR_REGION", None)
 # Weaviate (optional)
 WEAVIATE_URL = os.environ.get("WEAVIATE_URL", "http://localhost:8080")
 WEAVIATE_COLLECTION_PREFIX = os.environ.get("WEAVIATE_COLLECTION_PREFIX", "open_webui")
+# Metadata keys copied into top-level filterable properties so that metadata
+# filters (file_id, hash, ...) run inside Weaviate instead of in Python
+WEAVIATE_FILTERABLE_METADATA_KEYS = [
+    key.strip()
+    for key in os.environ.get(
+        "WEAVIATE_FILTERABLE_METADATA_KEYS", "file_id,hash,source"
+    ).split(",")
+    if key.strip()
+]
+WEAVIATE_PAGE_SIZE = int(os.environ.get("WEAVIATE_PAGE_SIZE", "500"))
+# Must match the server's QUERY_MAXIMUM_RESULTS, filtered queries page with
+# offsets up to it and scan the rest of the collection with a cursor
+WEAVIATE_QUERY_MAXIMUM_RESULTS = int(
+    os.environ.get("WEAVIATE_QUERY_MAXIMUM_RESULTS", "10000")
+)
+
+# HNSW (embedded, in-process hnswlib index)
+HNSW_DATA_PATH = os.environ.get("HNSW_DATA_PATH", f"{DATA_DIR}/vector_db/hnsw")
+# float16 halves the size of the memory-mapped vector files
+HNSW_VECTOR_DTYPE = os.environ.get("HNSW_VECTOR_DTYPE", "float16").lower()
+if HNSW_VECTOR_DTYPE not in ("float16", "float32"):
+    raise ValueError(
+        f"Unsupported HNSW_VECTOR_DTYPE {HNSW_VECTOR_DTYPE}, expected float16 or float32."
+    )
+HNSW_M = int(os.environ.get("HNSW_M", "16"))
+HNSW_EF_CONSTRUCTION = int(os.environ.get("HNSW_EF_CONSTRUCTION", "200"))
+HNSW_EF_SEARCH = int(os.environ.get("HNSW_EF_SEARCH", "64"))
+# Vectors appended since the last saved index are replayed from the vector
+# file on load; the index is saved again once this many have accumulated
+HNSW_SNAPSHOT_INTERVAL = int(os.environ.get("HNSW_SNAPSHOT_INTERVAL", "10000"))
 
 ####################################
 # Information Retrieval (RAG)
@@ -2414,6 +2543,15 @@ RAG_EMBEDDING_BATCH_SIZE = PersistentConfig(
     ),
 )
 
+# Number of chunks handed to one embedding call by the ingestion pipeline; the
+# effective batch is never smaller than RAG_EMBEDDING_BATCH_SIZE.
+RAG_INGESTION_BATCH_SIZE = int(os.environ.get("RAG_INGESTION_BATCH_SIZE", "64"))
+
+# Embedding batches that may be in flight at once while ingesting documents.
+RAG_EMBEDDING_CONCURRENT_REQUESTS = int(
+    os.environ.get("RAG_EMBEDDING_CONCURRENT_REQUESTS", "4")
+)
+
 RAG_EMBEDDING_QUERY_PREFIX = os.environ.get("RAG_EMBEDDING_QUERY_PREFIX", None)
 
 RAG_EMBEDDING_CONTENT_PREFIX = os.environ.get("RAG_EMBEDDING_CONTENT_PREFIX", None)
@@ -2446,6 +2584,24 @@ RAG_RERANKING_MODEL_TRUST_REMOTE_CODE = (
     os.environ.get("RAG_RERANKING_MODEL_TRUST_REMOTE_CODE", "True").lower() == "true"
 )
 
+# Pairs scored per reranking model call and number of cached pair scores
+RAG_RERANKING_BATCH_SIZE = int(os.environ.get("RAG_RERANKING_BATCH_SIZE", "32"))
+RAG_RERANKING_CACHE_SIZE = int(os.environ.get("RAG_RERANKING_CACHE_SIZE", "10000"))
+
+# Store ColBERT document token embeddings at ingestion time so reranking only
+# has to encode the query
+RAG_COLBERT_PRECOMPUTE_EMBEDDINGS = (
+    os.environ.get("RAG_COLBERT_PRECOMPUTE_EMBEDDINGS", "False").lower() == "true"
+)
+RAG_COLBERT_INDEX_DIR = os.environ.get(
+    "RAG_COLBERT_INDEX_DIR", str(CACHE_DIR / "colbert")
+)
+# Size cap of each model's stored token embeddings, the oldest passages are
+# evicted beyond it (0 = unlimited)
+RAG_COLBERT_INDEX_MAX_SIZE_MB = int(
+    os.environ.get("RAG_COLBERT_INDEX_MAX_SIZE_MB", "10240")
+)
+
 RAG_EXTERNAL_RERANKER_URL = PersistentConfig(
     "RAG_EXTERNAL_RERANKER_URL",
     "rag.external_reranker_url",
@@ -584,6 +584,136 @@ AIOHTTP_CLIENT_SESSION_TOOL_SERVER_SSL = (
     os.environ.get("AIOHTTP_CLIENT_SESSION_TOOL_SERVER_SSL", "True").lower() == "true"
 )
 
+# Keep-alive connection pool of each upstream origin (see utils/http_client.py),
+# 0 means no limit on concurrent connections
+try:
+    AIOHTTP_CLIENT_POOL_LIMIT_PER_HOST = int(
+        os.environ.get("AIOHTTP_CLIENT_POOL_LIMIT_PER_HOST", "100")
+    )
+except ValueError:
+    AIOHTTP_CLIENT_POOL_LIMIT_PER_HOST = 100
+
+try:
+    AIOHTTP_CLIENT_POOL_KEEPALIVE_TIMEOUT = float(
+        os.environ.get("AIOHTTP_CLIENT_POOL_KEEPALIVE_TIMEOUT", "60")
+    )
+except ValueError:
+    AIOHTTP_CLIENT_POOL_KEEPALIVE_TIMEOUT = 60.0
+
+
+####################################
+# UPSTREAM SCHEDULER
+####################################
+
+# Concurrent requests per upstream connection (e.g. "openai:0"), 0 means no limit
+try:
+    UPSTREAM_MAX_CONCURRENCY = int(os.environ.get("UPSTREAM_MAX_CONCURRENCY", "0"))
+except ValueError:
+    UPSTREAM_MAX_CONCURRENCY = 0
+
+# Limits of individual models or connections, e.g. {"llama3:70b": 4, "openai:1": 16}
+try:
+    UPSTREAM_CONCURRENCY_LIMITS = json.loads(
+        os.environ.get("UPSTREAM_CONCURRENCY_LIMITS", "{}")
+    )
+except Exception:
+    UPSTREAM_CONCURRENCY_LIMITS = {}
+
+# Seconds a request may wait for a slot per priority class before failing with 503
+try:
+    UPSTREAM_QUEUE_TIMEOUTS = {
+        "interactive": 60,
+        "regeneration": 300,
+        "background": 600,
+        **json.loads(os.environ.get("UPSTREAM_QUEUE_TIMEOUTS", "{}")),
+    }
+except Exception:
+    UPSTREAM_QUEUE_TIMEOUTS = {
+        "interactive": 60,
+        "regeneration": 300,
+        "background": 600,
+    }
+
+
+####################################
+# TASK COMPLETION CACHE
+####################################
+
+ENABLE_TASK_COMPLETION_CACHE = (
+    os.environ.get("ENABLE_TASK_COMPLETION_CACHE", "False").lower() == "true"
+)
+
+try:
+    TASK_COMPLETION_CACHE_TTL = int(os.environ.get("TASK_COMPLETION_CACHE_TTL", "3600"))
+except ValueError:
+    TASK_COMPLETION_CACHE_TTL = 3600
+
+try:
+    TASK_COMPLETION_CACHE_SIZE = int(
+        os.environ.get("TASK_COMPLETION_CACHE_SIZE", "1024")
+    )
+except ValueError:
+    TASK_COMPLETION_CACHE_SIZE = 1024
+
+# Tasks whose non-streaming completions are cached
+TASK_COMPLETION_CACHE_TASKS = {
+    task.strip()
+    for task in os.environ.get(
+        "TASK_COMPLETION_CACHE_TASKS",
+        "title_generation,query_generation,autocomplete_generation,emoji_generation",
+    ).split(",")
+    if task.strip()
+}
+
+# Cosine similarity above which a cached completion of a similar prompt is
+# reused, 0 disables similarity lookups
+try:
+    TASK_COMPLETION_CACHE_SIMILARITY_THRESHOLD = float(
+        os.environ.get("TASK_COMPLETION_CACHE_SIMILARITY_THRESHOLD", "0")
+    )
+except ValueError:
+    TASK_COMPLETION_CACHE_SIMILARITY_THRESHOLD = 0.0
+
+
+# Workers and queue size for best-effort work after a chat response (title, tags
+# and follow-up generation); 0 workers runs it inline in the response task, the
+# queue holds at least one task
+try:
+    BACKGROUND_TASK_WORKERS = int(os.environ.get("BACKGROUND_TASK_WORKERS", "2"))
+except ValueError:
+    BACKGROUND_TASK_WORKERS = 2
+
+try:
+    BACKGROUND_TASK_QUEUE_SIZE = int(
+        os.environ.get("BACKGROUND_TASK_QUEUE_SIZE", "256")
+    )
+except ValueError:
+    BACKGROUND_TASK_QUEUE_SIZE = 256
+
+
+####################################
+# LAZY LOADING
+####################################
+
+# Load local embedding/reranking models and the vector DB client in a background
+# warm-up after startup (or on first use) instead of while importing the app
+ENABLE_LAZY_LOADING = os.environ.get("ENABLE_LAZY_LOADING", "False").lower() == "true"
+
+# Profile the import time of the app once in a subprocess after startup, served
+# by /api/startup/importtime
+ENABLE_IMPORT_TIME_PROFILE = (
+    os.environ.get("ENABLE_IMPORT_TIME_PROFILE", "False").lower() == "true"
+)
+
+
+####################################
+# JSON SERIALIZATION
+####################################
+
+# JSON library of the hot encoding/decoding paths (streamed chunks, Redis state,
+# chat rows): "orjson", "msgspec" or "json"; "auto" picks the first installed
+JSON_SERIALIZER = os.environ.get("JSON_SERIALIZER", "auto").lower()
+
 
 ####################################
 # SENTENCE TRANSFORMERS
@@ -746,6 +876,28 @@ OTEL_LOGS_OTLP_SPAN_EXPORTER = os.environ.get(
 PIP_OPTIONS = os.getenv("PIP_OPTIONS", "").split()
 PIP_PACKAGE_INDEX_OPTIONS = os.getenv("PIP_PACKAGE_INDEX_OPTIONS", "").split()
 
+# Wheels are built here in parallel, then installed from it; the directory
+# also holds the list of requirement sets already installed
+REQUIREMENTS_CACHE_DIR = Path(
+    os.getenv("REQUIREMENTS_CACHE_DIR", DATA_DIR / "cache" / "requirements")
+)
+
+try:
+    REQUIREMENTS_INSTALL_PARALLELISM = int(
+        os.environ.get("REQUIREMENTS_INSTALL_PARALLELISM", "4")
+    )
+except ValueError:
+    REQUIREMENTS_INSTALL_PARALLELISM = 4
+
+# Seconds a chat request waits for the startup install of its filters'
+# requirements before it is rejected with 503
+try:
+    REQUIREMENTS_READY_TIMEOUT = float(
+        os.environ.get("REQUIREMENTS_READY_TIMEOUT", "30")
+    )
+except ValueError:
+    REQUIREMENTS_READY_TIMEOUT = 30.0
+
 
 ####################################
 # PROGRESSIVE WEB APP OPTIONS
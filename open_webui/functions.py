@@ -32,6 +32,7 @@ from open_webui.models.models import Models
 from open_webui.utils.plugin import (
     load_function_module_by_id,
     get_function_module_from_cache,
+    is_requirements_ready,
 )
 from open_webui.utils.tools import get_tools
 from open_webui.utils.access_control import has_access
@@ -70,6 +71,10 @@ async def get_function_models(request):
     pipe_models = []
 
     for pipe in pipes:
+        if not is_requirements_ready("function", pipe.id):
+            # listed once its requirements are installed
+            continue
+
         function_module = get_function_module_by_id(request, pipe.id)
 
         # Check if function is a manifold
@@ -54,6 +54,15 @@ from starlette.datastructures import Headers
 from open_webui.utils import logger
 from open_webui.utils.audit import AuditLevel, AuditLoggingMiddleware
 from open_webui.utils.logger import start_logger
+from open_webui.utils.startup import (
+    LazyFunction,
+    get_import_time,
+    get_startup_status,
+    mark_ready,
+    register_warm_up,
+    run_import_time_profile,
+    run_warm_ups,
+)
 from open_webui.socket.main import (
     app as socket_app,
     periodic_usage_pool_cleanup,
@@ -385,11 +394,13 @@ from open_webui.config import (
     ENABLE_TAGS_GENERATION,
     ENABLE_TITLE_GENERATION,
     ENABLE_FOLLOW_UP_GENERATION,
+    ENABLE_COMBINED_TASK_GENERATION,
     ENABLE_SEARCH_QUERY_GENERATION,
     ENABLE_RETRIEVAL_QUERY_GENERATION,
     ENABLE_AUTOCOMPLETE_GENERATION,
     TITLE_GENERATION_PROMPT_TEMPLATE,
     FOLLOW_UP_GENERATION_PROMPT_TEMPLATE,
+    COMBINED_TASK_GENERATION_PROMPT_TEMPLATE,
     TAGS_GENERATION_PROMPT_TEMPLATE,
     IMAGE_PROMPT_GENERATION_PROMPT_TEMPLATE,
     TOOLS_FUNCTION_CALLING_PROMPT_TEMPLATE,
@@ -434,6 +445,8 @@ from open_webui.env import (
     ENABLE_OTEL,
     EXTERNAL_PWA_MANIFEST_URL,
     AIOHTTP_CLIENT_SESSION_SSL,
+    ENABLE_LAZY_LOADING,
+    ENABLE_IMPORT_TIME_PROFILE,
 )
 
 
@@ -442,6 +455,7 @@ from open_webui.utils.models import (
     get_all_base_models,
     check_model_access,
 )
+from open_webui.utils.model_catalog import ModelCatalog
 from open_webui.utils.chat import (
     generate_chat_completion as chat_completion_handler,
     chat_completed as chat_completed_handler,
@@ -458,10 +472,17 @@ from open_webui.utils.auth import (
     get_admin_user,
     get_verified_user,
 )
-from open_webui.utils.plugin import install_tool_and_function_dependencies
+from open_webui.utils.plugin import (
+    RequirementsNotReadyError,
+    get_tool_and_function_requirements,
+    install_requirements,
+    redis_function_command_listener,
+)
 from open_webui.utils.oauth import OAuthManager
 from open_webui.utils.security_headers import SecurityHeadersMiddleware
 from open_webui.utils.redis import get_redis_connection
+from open_webui.utils.http_client import init_http_client_pool, close_http_client_pool
+from open_webui.utils.task_queue import BACKGROUND_TASK_QUEUE
 
 from open_webui.tasks import (
     redis_task_command_listener,
@@ -528,10 +549,13 @@ async def lifespan(app: FastAPI):
     if LICENSE_KEY:
         get_license_data(app, LICENSE_KEY)
 
-    # This should be blocking (sync) so functions are not deactivated on first /get_models calls
-    # when the first user lands on the / route.
+    # Functions and tools with missing requirements are marked pending here, before
+    # the first request, so they aren't loaded (and deactivated on the ImportError)
+    # until the background install below is done with them.
     log.info("Installing external dependencies of functions and tools...")
-    install_tool_and_function_dependencies()
+    app.state.requirements_install_task = asyncio.create_task(
+        asyncio.to_thread(install_requirements, get_tool_and_function_requirements())
+    )
 
     app.state.redis = get_redis_connection(
         redis_url=REDIS_URL,
@@ -546,6 +570,9 @@ async def lifespan(app: FastAPI):
         app.state.redis_task_command_listener = asyncio.create_task(
             redis_task_command_listener(app)
         )
+        app.state.redis_function_command_listener = asyncio.create_task(
+            redis_function_command_listener(app)
+        )
 
     if THREAD_POOL_SIZE and THREAD_POOL_SIZE > 0:
         limiter = anyio.to_thread.current_default_thread_limiter()
@@ -553,6 +580,15 @@ async def lifespan(app: FastAPI):
 
     asyncio.create_task(periodic_usage_pool_cleanup())
 
+    # Keep-alive sessions for upstream model backends, closed on shutdown
+    app.state.http_client_pool = init_http_client_pool()
+
+    if ENABLE_LAZY_LOADING:
+        app.state.warm_up_task = asyncio.create_task(run_warm_ups())
+
+    if ENABLE_IMPORT_TIME_PROFILE:
+        app.state.import_time_task = asyncio.create_task(run_import_time_profile())
+
     if app.state.config.ENABLE_BASE_MODELS_CACHE:
         await get_all_models(
             Request(
@@ -574,11 +610,18 @@ async def lifespan(app: FastAPI):
             None,
         )
 
+    mark_ready()
     yield
 
     if hasattr(app.state, "redis_task_command_listener"):
         app.state.redis_task_command_listener.cancel()
 
+    if hasattr(app.state, "redis_function_command_listener"):
+        app.state.redis_function_command_listener.cancel()
+
+    await BACKGROUND_TASK_QUEUE.close()
+    await close_http_client_pool()
+
 
 app = FastAPI(
     title="Open WebUI",
@@ -674,7 +717,7 @@ app.state.SCIM_TOKEN = SCIM_TOKEN
 ########################################
 
 app.state.config.ENABLE_BASE_MODELS_CACHE = ENABLE_BASE_MODELS_CACHE
-app.state.BASE_MODELS = []
+app.state.MODEL_CATALOG = ModelCatalog()
 
 ########################################
 #
@@ -763,7 +806,7 @@ app.state.TOOLS = {}
 app.state.TOOL_CONTENTS = {}
 
 app.state.FUNCTIONS = {}
-app.state.FUNCTION_CONTENTS = {}
+app.state.FUNCTION_VERSIONS = {}
 
 ########################################
 #
@@ -913,60 +956,76 @@ app.state.rf = None
 app.state.YOUTUBE_LOADER_TRANSLATION = None
 
 
-try:
-    app.state.ef = get_ef(
+def load_retrieval_models():
+    """Load the local embedding/reranking models and build the retrieval functions."""
+    try:
+        app.state.ef = get_ef(
+            app.state.config.RAG_EMBEDDING_ENGINE,
+            app.state.config.RAG_EMBEDDING_MODEL,
+            RAG_EMBEDDING_MODEL_AUTO_UPDATE,
+        )
+
+        app.state.rf = get_rf(
+            app.state.config.RAG_RERANKING_ENGINE,
+            app.state.config.RAG_RERANKING_MODEL,
+            app.state.config.RAG_EXTERNAL_RERANKER_URL,
+            app.state.config.RAG_EXTERNAL_RERANKER_API_KEY,
+            RAG_RERANKING_MODEL_AUTO_UPDATE,
+        )
+    except Exception as e:
+        log.error(f"Error updating models: {e}")
+
+    app.state.EMBEDDING_FUNCTION = get_embedding_function(
         app.state.config.RAG_EMBEDDING_ENGINE,
         app.state.config.RAG_EMBEDDING_MODEL,
-        RAG_EMBEDDING_MODEL_AUTO_UPDATE,
+        embedding_function=app.state.ef,
+        url=(
+            app.state.config.RAG_OPENAI_API_BASE_URL
+            if app.state.config.RAG_EMBEDDING_ENGINE == "openai"
+            else (
+                app.state.config.RAG_OLLAMA_BASE_URL
+                if app.state.config.RAG_EMBEDDING_ENGINE == "ollama"
+                else app.state.config.RAG_AZURE_OPENAI_BASE_URL
+            )
+        ),
+        key=(
+            app.state.config.RAG_OPENAI_API_KEY
+            if app.state.config.RAG_EMBEDDING_ENGINE == "openai"
+            else (
+                app.state.config.RAG_OLLAMA_API_KEY
+                if app.state.config.RAG_EMBEDDING_ENGINE == "ollama"
+                else app.state.config.RAG_AZURE_OPENAI_API_KEY
+            )
+        ),
+        embedding_batch_size=app.state.config.RAG_EMBEDDING_BATCH_SIZE,
+        azure_api_version=(
+            app.state.config.RAG_AZURE_OPENAI_API_VERSION
+            if app.state.config.RAG_EMBEDDING_ENGINE == "azure_openai"
+            else None
+        ),
     )
 
-    app.state.rf = get_rf(
+    app.state.RERANKING_FUNCTION = get_reranking_function(
         app.state.config.RAG_RERANKING_ENGINE,
         app.state.config.RAG_RERANKING_MODEL,
-        app.state.config.RAG_EXTERNAL_RERANKER_URL,
-        app.state.config.RAG_EXTERNAL_RERANKER_API_KEY,
-        RAG_RERANKING_MODEL_AUTO_UPDATE,
+        reranking_function=app.state.rf,
     )
-except Exception as e:
-    log.error(f"Error updating models: {e}")
-    pass
-
-
-app.state.EMBEDDING_FUNCTION = get_embedding_function(
-    app.state.config.RAG_EMBEDDING_ENGINE,
-    app.state.config.RAG_EMBEDDING_MODEL,
-    embedding_function=app.state.ef,
-    url=(
-        app.state.config.RAG_OPENAI_API_BASE_URL
-        if app.state.config.RAG_EMBEDDING_ENGINE == "openai"
-        else (
-            app.state.config.RAG_OLLAMA_BASE_URL
-            if app.state.config.RAG_EMBEDDING_ENGINE == "ollama"
-            else app.state.config.RAG_AZURE_OPENAI_BASE_URL
-        )
-    ),
-    key=(
-        app.state.config.RAG_OPENAI_API_KEY
-        if app.state.config.RAG_EMBEDDING_ENGINE == "openai"
-        else (
-            app.state.config.RAG_OLLAMA_API_KEY
-            if app.state.config.RAG_EMBEDDING_ENGINE == "ollama"
-            else app.state.config.RAG_AZURE_OPENAI_API_KEY
+
+
+retrieval_models = register_warm_up("retrieval_models", load_retrieval_models)
+
+if ENABLE_LAZY_LOADING:
+    # built by the warm-up started in lifespan, or by whichever request needs them first
+    app.state.EMBEDDING_FUNCTION = LazyFunction(
+        retrieval_models, lambda: app.state.EMBEDDING_FUNCTION
+    )
+    if app.state.config.RAG_RERANKING_MODEL:
+        app.state.RERANKING_FUNCTION = LazyFunction(
+            retrieval_models, lambda: app.state.RERANKING_FUNCTION
         )
-    ),
-    embedding_batch_size=app.state.config.RAG_EMBEDDING_BATCH_SIZE,
-    azure_api_version=(
-        app.state.config.RAG_AZURE_OPENAI_API_VERSION
-        if app.state.config.RAG_EMBEDDING_ENGINE == "azure_openai"
-        else None
-    ),
-)
+else:
+    retrieval_models.run()
 
-app.state.RERANKING_FUNCTION = get_reranking_function(
-    app.state.config.RAG_RERANKING_ENGINE,
-    app.state.config.RAG_RERANKING_MODEL,
-    reranking_function=app.state.rf,
-)
 
 ########################################
 #
@@ -1089,6 +1148,7 @@ app.state.config.ENABLE_AUTOCOMPLETE_GENERATION = ENABLE_AUTOCOMPLETE_GENERATION
 app.state.config.ENABLE_TAGS_GENERATION = ENABLE_TAGS_GENERATION
 app.state.config.ENABLE_TITLE_GENERATION = ENABLE_TITLE_GENERATION
 app.state.config.ENABLE_FOLLOW_UP_GENERATION = ENABLE_FOLLOW_UP_GENERATION
+app.state.config.ENABLE_COMBINED_TASK_GENERATION = ENABLE_COMBINED_TASK_GENERATION
 
 
 app.state.config.TITLE_GENERATION_PROMPT_TEMPLATE = TITLE_GENERATION_PROMPT_TEMPLATE
@@ -1099,6 +1159,9 @@ app.state.config.IMAGE_PROMPT_GENERATION_PROMPT_TEMPLATE = (
 app.state.config.FOLLOW_UP_GENERATION_PROMPT_TEMPLATE = (
     FOLLOW_UP_GENERATION_PROMPT_TEMPLATE
 )
+app.state.config.COMBINED_TASK_GENERATION_PROMPT_TEMPLATE = (
+    COMBINED_TASK_GENERATION_PROMPT_TEMPLATE
+)
 
 app.state.config.TOOLS_FUNCTION_CALLING_PROMPT_TEMPLATE = (
     TOOLS_FUNCTION_CALLING_PROMPT_TEMPLATE
@@ -1465,6 +1528,12 @@ async def chat_completion(
         form_data, metadata, events = await process_chat_payload(
             request, form_data, user, metadata, model
         )
+    except RequirementsNotReadyError as e:
+        # filters are not skipped while their requirements are installing
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e),
+        )
     except Exception as e:
         log.debug(f"Error processing chat payload: {e}")
         if metadata.get("chat_id") and metadata.get("message_id"):
@@ -1496,6 +1565,11 @@ async def chat_completion(
         return await process_chat_response(
             request, response, form_data, user, metadata, model, events, tasks
         )
+    except RequirementsNotReadyError as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e),
+        )
     except Exception as e:
         log.debug(f"Error in chat completion: {e}")
         if metadata.get("chat_id") and metadata.get("message_id"):
@@ -1531,6 +1605,11 @@ async def chat_completed(
             request.state.model = model_item
 
         return await chat_completed_handler(request, form_data, user)
+    except RequirementsNotReadyError as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e),
+        )
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -1780,6 +1859,31 @@ async def get_app_latest_release_version(user=Depends(get_verified_user)):
         return {"current": VERSION, "latest": VERSION}
 
 
+@app.get("/api/startup")
+async def get_startup(user=Depends(get_admin_user)):
+    return {"lazy_loading": ENABLE_LAZY_LOADING, **get_startup_status()}
+
+
+@app.get("/api/startup/importtime")
+async def get_startup_import_time(limit: int = 25, user=Depends(get_admin_user)):
+    if not ENABLE_IMPORT_TIME_PROFILE:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=ERROR_MESSAGES.DEFAULT(
+                "Import time profiling is disabled, set ENABLE_IMPORT_TIME_PROFILE"
+            ),
+        )
+
+    try:
+        return await get_import_time(limit=limit)
+    except Exception as e:
+        log.exception(f"Error profiling import time: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=ERROR_MESSAGES.DEFAULT(e),
+        )
+
+
 @app.get("/api/changelog")
 async def get_app_changelog():
     return {key: CHANGELOG[key] for idx, key in enumerate(CHANGELOG) if idx < 5}
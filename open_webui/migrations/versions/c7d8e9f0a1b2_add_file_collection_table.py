@@ -0,0 +1,108 @@
+"""add file_collection table
+
+Revision ID: c7d8e9f0a1b2
+Revises: b1c2d3e4f5a6
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+
+import time
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+from open_webui.migrations.util import get_existing_tables
+
+# revision identifiers, used by Alembic.
+revision: str = "c7d8e9f0a1b2"
+down_revision: Union[str, None] = "b1c2d3e4f5a6"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    if "file_collection" in set(get_existing_tables()):
+        return
+
+    op.create_table(
+        "file_collection",
+        sa.Column("collection_name", sa.Text(), nullable=False),
+        sa.Column("file_id", sa.Text(), nullable=False),
+        sa.Column("hash", sa.Text(), nullable=True),
+        sa.Column("created_at", sa.BigInteger(), nullable=True),
+        sa.PrimaryKeyConstraint(
+            "collection_name", "file_id", name="pk_collection_name_file_id"
+        ),
+    )
+    op.create_index(
+        "file_collection_collection_name_hash_idx",
+        "file_collection",
+        ["collection_name", "hash"],
+    )
+    op.create_index("file_collection_file_id_idx", "file_collection", ["file_id"])
+
+    # Backfill from the relational data so existing collections keep deduplicating
+    conn = op.get_bind()
+    file_table = sa.table(
+        "file",
+        sa.column("id", sa.Text()),
+        sa.column("hash", sa.Text()),
+        sa.column("meta", sa.JSON()),
+    )
+    knowledge_table = sa.table(
+        "knowledge",
+        sa.column("id", sa.Text()),
+        sa.column("data", sa.JSON()),
+    )
+    file_collection_table = sa.table(
+        "file_collection",
+        sa.column("collection_name", sa.Text()),
+        sa.column("file_id", sa.Text()),
+        sa.column("hash", sa.Text()),
+        sa.column("created_at", sa.BigInteger()),
+    )
+
+    now = int(time.time())
+    hashes = {}
+    rows = {}
+
+    for file in conn.execute(
+        sa.select(file_table.c.id, file_table.c.hash, file_table.c.meta)
+    ):
+        if not file.hash:
+            continue
+        hashes[file.id] = file.hash
+
+        collection_name = (file.meta or {}).get("collection_name")
+        if collection_name == f"file-{file.id}":
+            rows[(collection_name, file.id)] = file.hash
+
+    for knowledge in conn.execute(
+        sa.select(knowledge_table.c.id, knowledge_table.c.data)
+    ):
+        for file_id in (knowledge.data or {}).get("file_ids", []):
+            if file_id in hashes:
+                rows[(knowledge.id, file_id)] = hashes[file_id]
+
+    if rows:
+        op.bulk_insert(
+            file_collection_table,
+            [
+                {
+                    "collection_name": collection_name,
+                    "file_id": file_id,
+                    "hash": hash,
+                    "created_at": now,
+                }
+                for (collection_name, file_id), hash in rows.items()
+            ],
+        )
+
+
+def downgrade() -> None:
+    op.drop_index("file_collection_file_id_idx", table_name="file_collection")
+    op.drop_index(
+        "file_collection_collection_name_hash_idx", table_name="file_collection"
+    )
+    op.drop_table("file_collection")
@@ -5,7 +5,15 @@ from typing import Optional
 from open_webui.internal.db import Base, JSONField, get_db
 from open_webui.env import SRC_LOG_LEVELS
 from pydantic import BaseModel, ConfigDict
-from sqlalchemy import BigInteger, Column, String, Text, JSON
+from sqlalchemy import (
+    BigInteger,
+    Column,
+    Index,
+    PrimaryKeyConstraint,
+    String,
+    Text,
+    JSON,
+)
 
 log = logging.getLogger(__name__)
 log.setLevel(SRC_LOG_LEVELS["MODELS"])
@@ -52,6 +60,26 @@ class FileModel(BaseModel):
     updated_at: Optional[int]  # timestamp in epoch
 
 
+class FileCollection(Base):
+    """Which files have been embedded into which vector collections, by hash."""
+
+    __tablename__ = "file_collection"
+
+    collection_name = Column(Text, nullable=False)
+    file_id = Column(Text, nullable=False)
+    hash = Column(Text, nullable=True)
+
+    created_at = Column(BigInteger)
+
+    __table_args__ = (
+        PrimaryKeyConstraint(
+            "collection_name", "file_id", name="pk_collection_name_file_id"
+        ),
+        Index("file_collection_collection_name_hash_idx", "collection_name", "hash"),
+        Index("file_collection_file_id_idx", "file_id"),
+    )
+
+
 ####################
 # Forms
 ####################
@@ -183,6 +211,9 @@ class FilesTable:
         with get_db() as db:
             try:
                 file = db.query(File).filter_by(id=id).first()
+                if file.hash != hash:
+                    # Collections holding the previous content no longer match
+                    db.query(FileCollection).filter_by(file_id=id).delete()
                 file.hash = hash
                 db.commit()
 
@@ -215,6 +246,7 @@ class FilesTable:
         with get_db() as db:
             try:
                 db.query(File).filter_by(id=id).delete()
+                db.query(FileCollection).filter_by(file_id=id).delete()
                 db.commit()
 
                 return True
@@ -225,6 +257,7 @@ class FilesTable:
         with get_db() as db:
             try:
                 db.query(File).delete()
+                db.query(FileCollection).delete()
                 db.commit()
 
                 return True
@@ -233,3 +266,85 @@ class FilesTable:
 
 
 Files = FilesTable()
+
+
+class FileCollectionsTable:
+    """
+    Relational index of file hashes per vector collection, so duplicate
+    detection is an indexed lookup instead of a metadata scan of the vector DB.
+    """
+
+    def has_hash(self, collection_name: str, hash: str) -> bool:
+        with get_db() as db:
+            return (
+                db.query(FileCollection.file_id)
+                .filter_by(collection_name=collection_name, hash=hash)
+                .first()
+                is not None
+            )
+
+    def add_file_to_collection(
+        self, collection_name: str, file_id: str, hash: Optional[str]
+    ) -> bool:
+        with get_db() as db:
+            try:
+                db.merge(
+                    FileCollection(
+                        collection_name=collection_name,
+                        file_id=file_id,
+                        hash=hash,
+                        created_at=int(time.time()),
+                    )
+                )
+                db.commit()
+                return True
+            except Exception as e:
+                log.exception(
+                    f"Error indexing file {file_id} in {collection_name}: {e}"
+                )
+                return False
+
+    def remove_file_from_collection(self, collection_name: str, file_id: str) -> bool:
+        with get_db() as db:
+            try:
+                db.query(FileCollection).filter_by(
+                    collection_name=collection_name, file_id=file_id
+                ).delete()
+                db.commit()
+                return True
+            except Exception:
+                return False
+
+    def remove_hash_from_collection(self, collection_name: str, hash: str) -> bool:
+        with get_db() as db:
+            try:
+                db.query(FileCollection).filter_by(
+                    collection_name=collection_name, hash=hash
+                ).delete()
+                db.commit()
+                return True
+            except Exception:
+                return False
+
+    def delete_collection(self, collection_name: str) -> bool:
+        with get_db() as db:
+            try:
+                db.query(FileCollection).filter_by(
+                    collection_name=collection_name
+                ).delete()
+                db.commit()
+                return True
+            except Exception:
+                return False
+
+    def delete_all(self) -> bool:
+        with get_db() as db:
+            try:
+                db.query(FileCollection).delete()
+                db.commit()
+                return True
+            except Exception:
+                return False
+
+
+FileCollections = FileCollectionsTable()
@@ -5,6 +5,7 @@ from typing import Optional
 from open_webui.internal.db import Base, JSONField, get_db
 from open_webui.models.users import Users
 from open_webui.env import SRC_LOG_LEVELS
+from open_webui.utils.model_catalog import bump_catalog_revision
 from pydantic import BaseModel, ConfigDict
 from sqlalchemy import BigInteger, Boolean, Column, String, Text
 
@@ -99,6 +100,7 @@ class FunctionsTable:
                 result = Function(**function.model_dump())
                 db.add(result)
                 db.commit()
+                bump_catalog_revision("functions")
                 db.refresh(result)
                 if result:
                     return FunctionModel.model_validate(result)
@@ -147,6 +149,7 @@ class FunctionsTable:
                         db.delete(func)
 
                 db.commit()
+                bump_catalog_revision("functions")
 
                 return [
                     FunctionModel.model_validate(func)
@@ -230,6 +233,7 @@ class FunctionsTable:
                 function.valves = valves
                 function.updated_at = int(time.time())
                 db.commit()
+                bump_catalog_revision("functions")
                 db.refresh(function)
                 return self.get_function_by_id(id)
             except Exception:
@@ -290,6 +294,7 @@ class FunctionsTable:
                     }
                 )
                 db.commit()
+                bump_catalog_revision("functions")
                 return self.get_function_by_id(id)
             except Exception:
                 return None
@@ -304,6 +309,7 @@ class FunctionsTable:
                     }
                 )
                 db.commit()
+                bump_catalog_revision("functions")
                 return True
             except Exception:
                 return None
@@ -313,6 +319,7 @@ class FunctionsTable:
             try:
                 db.query(Function).filter_by(id=id).delete()
                 db.commit()
+                bump_catalog_revision("functions")
 
                 return True
             except Exception:
@@ -7,12 +7,12 @@ import uuid
 from open_webui.internal.db import Base, get_db
 from open_webui.env import SRC_LOG_LEVELS
 
-from open_webui.models.files import FileMetadataResponse
+from open_webui.models.files import FileCollection, FileMetadataResponse
 from open_webui.models.users import Users, UserResponse
 
 
 from pydantic import BaseModel, ConfigDict
-from sqlalchemy import BigInteger, Column, String, Text, JSON
+from sqlalchemy import BigInteger, Column, String, Text, JSON, select
 
 from open_webui.utils.access_control import has_access
 
@@ -192,6 +192,11 @@ class KnowledgeTable:
                         "updated_at": int(time.time()),
                     }
                 )
+                # Keep the file hash index in line with the knowledge membership
+                db.query(FileCollection).filter(
+                    FileCollection.collection_name == id,
+                    FileCollection.file_id.notin_((data or {}).get("file_ids", [])),
+                ).delete(synchronize_session=False)
                 db.commit()
                 return self.get_knowledge_by_id(id=id)
         except Exception as e:
@@ -202,6 +207,7 @@ class KnowledgeTable:
         try:
             with get_db() as db:
                 db.query(Knowledge).filter_by(id=id).delete()
+                db.query(FileCollection).filter_by(collection_name=id).delete()
                 db.commit()
                 return True
         except Exception:
@@ -210,6 +216,9 @@ class KnowledgeTable:
     def delete_all_knowledge(self) -> bool:
         with get_db() as db:
             try:
+                db.query(FileCollection).filter(
+                    FileCollection.collection_name.in_(select(Knowledge.id))
+                ).delete(synchronize_session=False)
                 db.query(Knowledge).delete()
                 db.commit()
 
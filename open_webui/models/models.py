@@ -16,6 +16,7 @@ from sqlalchemy import BigInteger, Column, Text, JSON, Boolean
 
 
 from open_webui.utils.access_control import has_access
+from open_webui.utils.model_catalog import bump_catalog_revision
 
 
 log = logging.getLogger(__name__)
@@ -159,6 +160,7 @@ class ModelsTable:
                 result = Model(**model.model_dump())
                 db.add(result)
                 db.commit()
+                bump_catalog_revision("models")
                 db.refresh(result)
 
                 if result:
@@ -226,6 +228,7 @@ class ModelsTable:
                     }
                 )
                 db.commit()
+                bump_catalog_revision("models")
 
                 return self.get_model_by_id(id)
             except Exception:
@@ -241,6 +244,7 @@ class ModelsTable:
                     .update(model.model_dump(exclude={"id"}))
                 )
                 db.commit()
+                bump_catalog_revision("models")
 
                 model = db.get(Model, id)
                 db.refresh(model)
@@ -254,6 +258,7 @@ class ModelsTable:
             with get_db() as db:
                 db.query(Model).filter_by(id=id).delete()
                 db.commit()
+                bump_catalog_revision("models")
 
                 return True
         except Exception:
@@ -264,6 +269,7 @@ class ModelsTable:
             with get_db() as db:
                 db.query(Model).delete()
                 db.commit()
+                bump_catalog_revision("models")
 
                 return True
         except Exception:
@@ -305,6 +311,7 @@ class ModelsTable:
                         db.delete(model)
 
                 db.commit()
+                bump_catalog_revision("models")
 
                 return [
                     ModelModel.model_validate(model) for model in db.query(Model).all()
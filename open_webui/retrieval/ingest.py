@@ -0,0 +1,106 @@
+import logging
+import uuid
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from itertools import islice
+from typing import Any, Callable, Iterable, Iterator, Optional
+
+from open_webui.env import SRC_LOG_LEVELS
+
+log = logging.getLogger(__name__)
+log.setLevel(SRC_LOG_LEVELS["RAG"])
+
+
+def batched(iterable: Iterable[Any], size: int) -> Iterator[list[Any]]:
+    """Yield successive lists of at most ``size`` elements from ``iterable``."""
+    iterator = iter(iterable)
+    while batch := list(islice(iterator, max(1, size))):
+        yield batch
+
+
+def embed_chunks(
+    chunks: list[dict],
+    embed: Callable[[list[str]], Optional[list]],
+) -> list[dict]:
+    """
+    Embed one batch of ``{"text", "metadata"}`` chunks and return them as
+    vector items ready for ``VECTOR_DB_CLIENT.insert``.
+    """
+    vectors = embed([chunk["text"] for chunk in chunks])
+    if vectors is None or len(vectors) != len(chunks):
+        raise ValueError(
+            f"Embedding batch returned {0 if vectors is None else len(vectors)} vectors for {len(chunks)} chunks"
+        )
+
+    return [
+        {
+            "id": chunk.get("id") or str(uuid.uuid4()),
+            "text": chunk["text"],
+            "vector": vector,
+            "metadata": chunk["metadata"],
+        }
+        for chunk, vector in zip(chunks, vectors)
+    ]
+
+
+def run_ingestion_pipeline(
+    chunks: Iterable[dict],
+    embed: Callable[[list[str]], Optional[list]],
+    write: Callable[[list[dict]], None],
+    batch_size: int,
+    concurrency: int = 1,
+    on_error: Optional[Callable[[list[dict], Exception], None]] = None,
+) -> int:
+    """
+    Embed ``chunks`` batch by batch and pass every embedded batch to ``write``
+    as soon as it is ready.
+
+    ``chunks`` is consumed lazily, up to ``concurrency`` embedding batches run in
+    parallel and finished batches are written in submission order while the
+    following batches are still being embedded. At most ``concurrency + 1``
+    batches are held in memory at any time, independent of the document size.
+
+    Without ``on_error`` the first failing batch aborts the pipeline. With it,
+    the chunks of a batch that could not be embedded are reported to
+    ``on_error`` together with the exception and the remaining batches are
+    still processed.
+
+    Returns the number of chunks written.
+    """
+    concurrency = max(1, concurrency)
+    pending: deque[tuple[list[dict], Future]] = deque()
+    written = 0
+
+    def write_next():
+        nonlocal written
+        batch, future = pending.popleft()
+        try:
+            items = future.result()
+        except Exception as e:
+            if on_error is None:
+                raise
+            log.warning(f"run_ingestion_pipeline: failed to embed batch: {e}")
+            on_error(batch, e)
+            return
+
+        write(items)
+        written += len(items)
+
+    executor = ThreadPoolExecutor(max_workers=concurrency)
+    try:
+        for batch in batched(chunks, batch_size):
+            # Flush batches that are already embedded before blocking on new work
+            while pending and pending[0][1].done():
+                write_next()
+            if len(pending) >= concurrency:
+                write_next()
+
+            pending.append((batch, executor.submit(embed_chunks, batch, embed)))
+
+        while pending:
+            write_next()
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+
+    log.debug(f"run_ingestion_pipeline: wrote {written} chunks")
+    return written
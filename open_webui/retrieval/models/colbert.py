@@ -1,5 +1,8 @@
 import os
+import hashlib
 import logging
+from typing import Optional
+
 import torch
 import numpy as np
 from colbert.infra import ColBERTConfig
@@ -8,12 +11,20 @@ from colbert.modeling.checkpoint import Checkpoint
 from open_webui.env import SRC_LOG_LEVELS
 
 from open_webui.retrieval.models.base_reranker import BaseReranker
+from open_webui.retrieval.models.colbert_index import (
+    ColBERTTokenIndex,
+    hash_passage,
+    maxsim_scores,
+)
 
 log = logging.getLogger(__name__)
 log.setLevel(SRC_LOG_LEVELS["RAG"])
 
 
 class ColBERT(BaseReranker):
+    # Scores are softmax-normalized over the candidates of each call
+    scores_depend_on_batch = True
+
     def __init__(self, name, **kwargs) -> None:
         log.info("ColBERT: Loading model", name)
         self.device = "cuda" if torch.cuda.is_available() else "cpu"
@@ -35,7 +46,15 @@ class ColBERT(BaseReranker):
             name,
             colbert_config=ColBERTConfig(model_name=name),
         ).to(self.device)
-        pass
+
+        # Optional store of precomputed document token embeddings
+        self.index = None
+        index_path = kwargs.get("index_path")
+        if index_path:
+            self.index = ColBERTTokenIndex(
+                os.path.join(index_path, hashlib.sha256(name.encode()).hexdigest()),
+                max_size=kwargs.get("index_max_size", 0),
+            )
 
     def calculate_similarity_scores(self, query_embeddings, document_embeddings):
 
@@ -70,11 +89,54 @@ class ColBERT(BaseReranker):
 
         return normalized_scores.detach().cpu().numpy().astype(np.float32)
 
+    def encode_documents(self, docs: list[str]) -> list[np.ndarray]:
+        """Token embeddings of each document, as float16 arrays without padding."""
+        embeddings, doclens = self.ckpt.docFromText(docs, bsize=32, keep_dims="flatten")
+        embeddings = embeddings.detach().cpu().numpy().astype(np.float16)
+        return np.split(embeddings, np.cumsum(doclens)[:-1])
+
+    def index_documents(self, docs: list[str], collection_name: str) -> None:
+        """Precompute and store the token embeddings of documents ingested into a collection."""
+        if self.index is not None and docs:
+            hashes = [hash_passage(doc) for doc in docs]
+            self.index.add(
+                dict(zip(hashes, self.get_document_embeddings(docs, hashes))),
+                collection_name,
+            )
+
+    def get_document_embeddings(
+        self, docs: list[str], hashes: Optional[list[str]] = None
+    ) -> list[np.ndarray]:
+        """
+        Token embeddings from the index. Documents missing from it, such as
+        web search results, are encoded here and not stored.
+        """
+        hashes = hashes or [hash_passage(doc) for doc in docs]
+        stored = self.index.get(hashes)
+
+        missing = {key: doc for key, doc in zip(hashes, docs) if key not in stored}
+        if missing:
+            log.debug(f"ColBERT: encoding {len(missing)} documents missing from index")
+            encoded = dict(zip(missing, self.encode_documents(list(missing.values()))))
+            stored = {**stored, **encoded}
+
+        return [stored[key] for key in hashes]
+
     def predict(self, sentences):
 
         query = sentences[0][0]
         docs = [i[1] for i in sentences]
 
+        if self.index is not None:
+            # Only the query goes through the model, MaxSim runs on CPU
+            embedded_query = self.ckpt.queryFromText([query], bsize=32)[0]
+            scores = maxsim_scores(
+                embedded_query.detach().cpu().numpy(),
+                self.get_document_embeddings(docs),
+            )
+            scores = np.exp(scores - scores.max())
+            return (scores / scores.sum()).astype(np.float32)
+
         # Embedding the documents
         embedded_docs = self.ckpt.docFromText(docs, bsize=32)[0]
         # Embedding the queries
@@ -0,0 +1,376 @@
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+from contextlib import closing
+from pathlib import Path
+from typing import Optional, Union
+
+import numpy as np
+
+from open_webui.env import SRC_LOG_LEVELS
+
+log = logging.getLogger(__name__)
+log.setLevel(SRC_LOG_LEVELS["RAG"])
+
+
+def hash_passage(text: str) -> str:
+    return hashlib.sha256(text.encode()).hexdigest()
+
+
+def maxsim_scores(
+    query_embeddings: np.ndarray, document_embeddings: list[np.ndarray]
+) -> np.ndarray:
+    """
+    Late interaction (MaxSim) scores of one query against many documents.
+
+    All document tokens are stacked into a single matrix, multiplied with the
+    query tokens once, and reduced to the best match per query token and
+    document with `np.maximum.reduceat`.
+    """
+    if not document_embeddings:
+        return np.zeros(0, dtype=np.float32)
+
+    query = np.asarray(query_embeddings, dtype=np.float32)
+    lengths = np.array([len(doc) for doc in document_embeddings])
+    tokens = np.concatenate(document_embeddings).astype(np.float32, copy=False)
+
+    similarities = tokens @ query.T
+    offsets = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+    scores = np.maximum.reduceat(similarities, offsets, axis=0).sum(axis=1)
+    # reduceat returns the row at the offset for empty segments
+    scores[lengths == 0] = 0.0
+    return scores.astype(np.float32)
+
+
+class ColBERTTokenIndex:
+    """
+    On-disk store of per-passage ColBERT token embeddings.
+
+    Token embeddings are appended as float16 rows to a tokens file and read
+    back through a memory map, `index.db` (SQLite) maps a passage hash to its
+    row offset and token count and records the collections that contain the
+    passage. Writes run inside an immediate SQLite transaction, which
+    serializes writers across worker processes.
+
+    Removing collections leaves dead rows behind, the tokens file is rewritten
+    without them once they take up half of it or the file outgrows `max_size`
+    bytes, in which case the oldest passages are evicted as well. Every
+    rewrite goes to a new file (`tokens-<generation>.f16`) so that readers
+    never see offsets of one file applied to another.
+    """
+
+    def __init__(self, path: Path, max_size: int = 0):
+        self.path = Path(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.db_path = self.path / "index.db"
+        self.max_size = max_size
+
+        self._lock = threading.Lock()
+        self._memmap: Optional[np.memmap] = None
+        self._memmap_generation: Optional[int] = None
+
+        with closing(self._connect()) as conn:
+            # passages stored before collections were recorded cannot be
+            # removed with their collection, start over without them
+            legacy = (
+                conn.execute(
+                    "SELECT 1 FROM sqlite_master WHERE name = 'passage'"
+                ).fetchone()
+                and not conn.execute(
+                    "SELECT 1 FROM sqlite_master WHERE name = 'collection_passage'"
+                ).fetchone()
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS passage "
+                "(hash TEXT PRIMARY KEY, offset INTEGER NOT NULL, length INTEGER NOT NULL)"
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS collection_passage "
+                "(collection TEXT NOT NULL, hash TEXT NOT NULL, "
+                "PRIMARY KEY (collection, hash))"
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS collection_passage_hash "
+                "ON collection_passage (hash)"
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)"
+            )
+        if legacy:
+            self.clear()
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+
+    def _tokens_path(self, generation: int) -> Path:
+        return self.path / (
+            "tokens.f16" if generation == 0 else f"tokens-{generation}.f16"
+        )
+
+    def _meta(self, conn: sqlite3.Connection) -> tuple[Optional[int], int]:
+        """The token dimension (None while empty) and the tokens file generation."""
+        meta = dict(conn.execute("SELECT key, value FROM meta"))
+        dim = int(meta["dim"]) if "dim" in meta else None
+        return dim, int(meta.get("generation", 0))
+
+    def _rows(self, dim: int, generation: int) -> np.memmap:
+        """Memory map covering every row written so far, remapped when the file changed."""
+        tokens_path = self._tokens_path(generation)
+        rows = os.path.getsize(tokens_path) // (dim * 2)
+        if (
+            self._memmap is None
+            or self._memmap_generation != generation
+            or self._memmap.shape[0] < rows
+        ):
+            self._memmap = np.memmap(
+                tokens_path, dtype=np.float16, mode="r", shape=(rows, dim)
+            )
+            self._memmap_generation = generation
+        return self._memmap
+
+    def _select(self, conn: sqlite3.Connection, query: str, keys: list) -> list:
+        rows = []
+        for start in range(0, len(keys), 500):
+            batch = keys[start : start + 500]
+            rows.extend(conn.execute(query.format(",".join("?" * len(batch))), batch))
+        return rows
+
+    def get(self, hashes: list[str]) -> dict[str, np.ndarray]:
+        """Return the stored token embeddings of the passages that are indexed."""
+        if not hashes:
+            return {}
+
+        with closing(self._connect()) as conn:
+            # one read transaction, so the offsets match the generation
+            conn.execute("BEGIN")
+            dim, generation = self._meta(conn)
+            entries = {
+                row[0]: (row[1], row[2])
+                for row in self._select(
+                    conn,
+                    "SELECT hash, offset, length FROM passage WHERE hash IN ({})",
+                    hashes,
+                )
+            }
+            conn.execute("COMMIT")
+        if not entries or dim is None:
+            return {}
+
+        try:
+            with self._lock:
+                rows = self._rows(dim, generation)
+        except FileNotFoundError:
+            # the file was compacted away since the offsets were read
+            return {}
+        return {
+            key: rows[offset : offset + length]
+            for key, (offset, length) in entries.items()
+            if offset + length <= rows.shape[0]
+        }
+
+    def add(self, embeddings: dict[str, np.ndarray], collection_name: str) -> None:
+        """
+        Record the passages as part of `collection_name`, appending the token
+        embeddings of those that are not indexed yet.
+        """
+        if not embeddings:
+            return
+
+        obsolete = []
+        with self._lock, closing(self._connect()) as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                dim, generation = self._meta(conn)
+                if dim is None:
+                    dim = int(next(iter(embeddings.values())).shape[1])
+                    conn.execute(
+                        "INSERT OR REPLACE INTO meta (key, value) VALUES ('dim', ?)",
+                        (str(dim),),
+                    )
+
+                keys = list(embeddings)
+                existing = {
+                    row[0]
+                    for row in self._select(
+                        conn, "SELECT hash FROM passage WHERE hash IN ({})", keys
+                    )
+                }
+
+                tokens_path = self._tokens_path(generation)
+                offset = (
+                    os.path.getsize(tokens_path) // (dim * 2)
+                    if tokens_path.exists()
+                    else 0
+                )
+                rows = []
+                with open(tokens_path, "ab") as f:
+                    for key in keys:
+                        if key in existing:
+                            continue
+                        tokens = np.asarray(embeddings[key], dtype=np.float16)
+                        f.write(tokens.tobytes())
+                        rows.append((key, offset, len(tokens)))
+                        offset += len(tokens)
+
+                conn.executemany(
+                    "INSERT INTO passage (hash, offset, length) VALUES (?, ?, ?)",
+                    rows,
+                )
+                conn.executemany(
+                    "INSERT OR IGNORE INTO collection_passage (collection, hash) "
+                    "VALUES (?, ?)",
+                    [(collection_name, key) for key in keys],
+                )
+
+                if self.max_size and offset * dim * 2 > self.max_size:
+                    obsolete = self._compact(conn, dim, generation)
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+
+        self._unlink(obsolete)
+        log.debug(f"ColBERTTokenIndex: indexed {len(rows)} passages")
+
+    def remove_collections(self, collection_names: list[str]) -> None:
+        """Forget the collections, dropping passages no other collection contains."""
+        if not collection_names:
+            return
+
+        obsolete = []
+        with self._lock, closing(self._connect()) as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                hashes = [
+                    row[0]
+                    for row in self._select(
+                        conn,
+                        "SELECT DISTINCT hash FROM collection_passage "
+                        "WHERE collection IN ({})",
+                        collection_names,
+                    )
+                ]
+                conn.executemany(
+                    "DELETE FROM collection_passage WHERE collection = ?",
+                    [(name,) for name in collection_names],
+                )
+                conn.executemany(
+                    "DELETE FROM passage WHERE hash = ? AND NOT EXISTS "
+                    "(SELECT 1 FROM collection_passage WHERE hash = passage.hash)",
+                    [(key,) for key in hashes],
+                )
+
+                dim, generation = self._meta(conn)
+                tokens_path = self._tokens_path(generation)
+                if dim is not None and tokens_path.exists():
+                    live = conn.execute("SELECT SUM(length) FROM passage").fetchone()
+                    size = os.path.getsize(tokens_path)
+                    if size and 2 * (live[0] or 0) * dim * 2 <= size:
+                        obsolete = self._compact(conn, dim, generation)
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+
+        self._unlink(obsolete)
+
+    def _compact(
+        self, conn: sqlite3.Connection, dim: int, generation: int
+    ) -> list[Path]:
+        """
+        Rewrite the live rows into the next generation's tokens file, evicting
+        the oldest passages while they exceed 80% of `max_size`. Runs inside
+        the caller's write transaction and returns the files to delete once
+        it is committed.
+        """
+        passages = conn.execute(
+            "SELECT hash, offset, length FROM passage ORDER BY rowid"
+        ).fetchall()
+
+        if self.max_size:
+            budget = int(self.max_size * 0.8) // (dim * 2)
+            total = sum(length for _, _, length in passages)
+            evicted = 0
+            while evicted < len(passages) and total > budget:
+                total -= passages[evicted][2]
+                evicted += 1
+            if evicted:
+                log.info(f"ColBERTTokenIndex: evicting {evicted} oldest passages")
+                stale = [(key,) for key, _, _ in passages[:evicted]]
+                conn.executemany("DELETE FROM passage WHERE hash = ?", stale)
+                conn.executemany("DELETE FROM collection_passage WHERE hash = ?", stale)
+                passages = passages[evicted:]
+
+        old_path = self._tokens_path(generation)
+        new_path = self._tokens_path(generation + 1)
+        rows = (
+            np.memmap(old_path, dtype=np.float16, mode="r").reshape(-1, dim)
+            if old_path.exists() and os.path.getsize(old_path)
+            else np.zeros((0, dim), dtype=np.float16)
+        )
+
+        offset = 0
+        updates = []
+        with open(new_path, "wb") as f:
+            for key, start, length in passages:
+                f.write(rows[start : start + length].tobytes())
+                updates.append((offset, key))
+                offset += length
+        del rows
+
+        conn.executemany("UPDATE passage SET offset = ? WHERE hash = ?", updates)
+        conn.execute(
+            "INSERT OR REPLACE INTO meta (key, value) VALUES ('generation', ?)",
+            (str(generation + 1),),
+        )
+        log.info(f"ColBERTTokenIndex: compacted to {offset * dim * 2} bytes")
+        return [old_path]
+
+    def _unlink(self, paths: list[Path]) -> None:
+        for path in paths:
+            try:
+                path.unlink(missing_ok=True)
+            except OSError as e:
+                log.warning(f"ColBERTTokenIndex: could not remove {path}: {e}")
+
+    def clear(self) -> None:
+        with self._lock, closing(self._connect()) as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            _, generation = self._meta(conn)
+            # a compaction that never committed may have left the next file
+            self._tokens_path(generation + 1).unlink(missing_ok=True)
+            obsolete = list(self.path.glob("tokens*.f16"))
+            conn.execute("DELETE FROM passage")
+            conn.execute("DELETE FROM collection_passage")
+            conn.execute("DELETE FROM meta WHERE key = 'dim'")
+            # generations are never reused, see _rows
+            conn.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES ('generation', ?)",
+                (str(generation + 1),),
+            )
+            conn.execute("COMMIT")
+            self._memmap = None
+        self._unlink(obsolete)
+
+
+def remove_collections(
+    root: Union[str, Path], collection_names: Optional[list[str]] = None
+) -> None:
+    """
+    Drop the token embeddings of deleted collections, or of every collection
+    when `collection_names` is None, from the index of each model under `root`.
+    """
+    root = Path(root)
+    if not root.is_dir():
+        return
+
+    for path in root.iterdir():
+        if not (path / "index.db").exists():
+            continue
+        index = ColBERTTokenIndex(path)
+        if collection_names is None:
+            index.clear()
+        else:
+            index.remove_collections(collection_names)
@@ -0,0 +1,214 @@
+import hashlib
+import logging
+import threading
+import time
+from collections import OrderedDict, defaultdict
+from typing import Any, Optional
+
+from opentelemetry import metrics
+
+from open_webui.env import SRC_LOG_LEVELS
+from open_webui.retrieval.models.base_reranker import BaseReranker
+
+log = logging.getLogger(__name__)
+log.setLevel(SRC_LOG_LEVELS["RAG"])
+
+meter = metrics.get_meter(__name__)
+batch_size_histogram = meter.create_histogram(
+    name="webui.rerank.batch_size",
+    description="Number of (query, passage) pairs per reranking model call",
+    unit="1",
+)
+duration_histogram = meter.create_histogram(
+    name="webui.rerank.duration",
+    description="Reranking model call duration",
+    unit="ms",
+)
+cache_counter = meter.create_counter(
+    name="webui.rerank.cache",
+    description="Reranking score cache lookups",
+    unit="1",
+)
+
+
+def hash_text(text: str) -> str:
+    return hashlib.sha256(text.encode()).hexdigest()
+
+
+class RerankingService:
+    """
+    Score (query, passage) pairs with a reranking model.
+
+    Every call is one batched inference call for all the pairs it is given, no
+    matter how many queries and collections they come from. Scores are cached
+    by (model, query hash, passage hash) with LRU eviction, so candidates that
+    show up again in later turns or in several collections are scored once.
+
+    Rerankers built on `BaseReranker` (ColBERT, external APIs) only accept a
+    single query per call, their pairs are grouped by query. Rerankers whose
+    scores depend on the other candidates of the call (ColBERT normalizes
+    them with a softmax) set `scores_depend_on_batch` and are never cached.
+
+    Instances are callable with the `reranking_function(sentences, user=None)`
+    signature used across the retrieval code.
+    """
+
+    def __init__(
+        self,
+        reranker: Any,
+        model: str,
+        engine: str = "",
+        batch_size: int = 32,
+        cache_size: int = 10000,
+    ):
+        self.reranker = reranker
+        self.model = model
+        self.engine = engine
+        self.batch_size = max(1, batch_size)
+        self.cache_size = max(0, cache_size)
+
+        self.single_query = isinstance(reranker, BaseReranker)
+        self.cacheable = self.cache_size > 0 and not getattr(
+            reranker, "scores_depend_on_batch", False
+        )
+
+        self._cache: OrderedDict[tuple[str, str, str], float] = OrderedDict()
+        self._lock = threading.Lock()
+        self._metrics = {
+            "calls": 0,
+            "pairs": 0,
+            "cache_hits": 0,
+            "cache_misses": 0,
+            "model_calls": 0,
+            "model_pairs": 0,
+            "max_batch_size": 0,
+            "model_time_ms": 0.0,
+            "max_model_time_ms": 0.0,
+        }
+
+    def __call__(self, sentences: list[tuple[str, str]], user=None):
+        return self.predict(sentences, user=user)
+
+    def predict(
+        self, sentences: list[tuple[str, str]], user=None
+    ) -> Optional[list[float]]:
+        if not sentences:
+            return []
+
+        keys = [
+            (self.model, hash_text(query), hash_text(passage))
+            for query, passage in sentences
+        ]
+        scores: list[Optional[float]] = [None] * len(sentences)
+
+        if self.cacheable:
+            with self._lock:
+                for idx, key in enumerate(keys):
+                    if key in self._cache:
+                        self._cache.move_to_end(key)
+                        scores[idx] = self._cache[key]
+
+        # Score every distinct missing pair once
+        missing = OrderedDict()
+        for idx, key in enumerate(keys):
+            if scores[idx] is None:
+                missing.setdefault(key, []).append(idx)
+
+        hits = len(sentences) - sum(len(indices) for indices in missing.values())
+        self._record_lookup(len(sentences), hits)
+
+        if missing:
+            if self.single_query:
+                groups = defaultdict(list)
+                for key in missing:
+                    groups[key[1]].append(key)
+                groups = list(groups.values())
+            else:
+                groups = [list(missing)]
+
+            for group in groups:
+                pairs = [sentences[missing[key][0]] for key in group]
+                group_scores = self._predict(pairs, user=user)
+                if group_scores is None:
+                    return None
+
+                for key, score in zip(group, group_scores):
+                    score = float(score)
+                    for idx in missing[key]:
+                        scores[idx] = score
+                    if self.cacheable:
+                        self._store(key, score)
+
+        return scores
+
+    def get_metrics(self) -> dict:
+        with self._lock:
+            stats = dict(self._metrics)
+            stats["cache_entries"] = len(self._cache)
+
+        stats["model"] = self.model
+        stats["engine"] = self.engine
+        stats["batch_size"] = self.batch_size
+        stats["cache_size"] = self.cache_size if self.cacheable else 0
+        stats["avg_batch_size"] = (
+            stats["model_pairs"] / stats["model_calls"] if stats["model_calls"] else 0
+        )
+        stats["avg_model_time_ms"] = (
+            stats["model_time_ms"] / stats["model_calls"] if stats["model_calls"] else 0
+        )
+        return stats
+
+    def clear_cache(self) -> None:
+        with self._lock:
+            self._cache.clear()
+
+    def _predict(self, pairs: list[tuple[str, str]], user=None):
+        start = time.perf_counter()
+        if self.single_query:
+            if self.engine == "external":
+                scores = self.reranker.predict(pairs, user=user)
+            else:
+                scores = self.reranker.predict(pairs)
+        else:
+            # sentence_transformers.CrossEncoder splits into batches itself
+            scores = self.reranker.predict(pairs, batch_size=self.batch_size)
+        elapsed_ms = (time.perf_counter() - start) * 1000.0
+
+        attributes = {"model": self.model}
+        batch_size_histogram.record(len(pairs), attributes)
+        duration_histogram.record(elapsed_ms, attributes)
+        with self._lock:
+            self._metrics["model_calls"] += 1
+            self._metrics["model_pairs"] += len(pairs)
+            self._metrics["max_batch_size"] = max(
+                self._metrics["max_batch_size"], len(pairs)
+            )
+            self._metrics["model_time_ms"] += elapsed_ms
+            self._metrics["max_model_time_ms"] = max(
+                self._metrics["max_model_time_ms"], elapsed_ms
+            )
+
+        log.debug(
+            f"RerankingService: scored {len(pairs)} pairs with {self.model} in {elapsed_ms:.1f}ms"
+        )
+        if scores is None:
+            return None
+        return scores.tolist() if hasattr(scores, "tolist") else list(scores)
+
+    def _record_lookup(self, pairs: int, hits: int) -> None:
+        with self._lock:
+            self._metrics["calls"] += 1
+            self._metrics["pairs"] += pairs
+            self._metrics["cache_hits"] += hits
+            self._metrics["cache_misses"] += pairs - hits
+
+        if self.cacheable:
+            cache_counter.add(hits, {"model": self.model, "result": "hit"})
+            cache_counter.add(pairs - hits, {"model": self.model, "result": "miss"})
+
+    def _store(self, key: tuple[str, str, str], score: float) -> None:
+        with self._lock:
+            self._cache[key] = score
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
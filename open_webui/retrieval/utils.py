@@ -2,6 +2,7 @@ import logging
 import os
 from typing import Optional, Union
 
+import numpy as np
 import requests
 import hashlib
 from concurrent.futures import ThreadPoolExecutor
@@ -9,9 +10,6 @@ import time
 
 from urllib.parse import quote
 from huggingface_hub import snapshot_download
-from langchain.retrievers import ContextualCompressionRetriever, EnsembleRetriever
-from langchain_community.retrievers import BM25Retriever
-from langchain_core.documents import Document
 
 from open_webui.config import VECTOR_DB
 from open_webui.retrieval.vector.factory import VECTOR_DB_CLIENT
@@ -22,6 +20,7 @@ from open_webui.models.knowledge import Knowledges
 from open_webui.models.notes import Notes
 
 from open_webui.retrieval.vector.main import GetResult
+from open_webui.retrieval.rerank import RerankingService
 from open_webui.utils.access_control import has_access
 
 
@@ -34,6 +33,8 @@ from open_webui.config import (
     RAG_EMBEDDING_QUERY_PREFIX,
     RAG_EMBEDDING_CONTENT_PREFIX,
     RAG_EMBEDDING_PREFIX_FIELD_NAME,
+    RAG_RERANKING_BATCH_SIZE,
+    RAG_RERANKING_CACHE_SIZE,
 )
 
 log = logging.getLogger(__name__)
@@ -43,6 +44,7 @@ log.setLevel(SRC_LOG_LEVELS["RAG"])
 from typing import Any
 
 from langchain_core.callbacks import CallbackManagerForRetrieverRun
+from langchain_core.documents import Document
 from langchain_core.retrievers import BaseRetriever
 
 
@@ -71,6 +73,7 @@ class VectorSearchRetriever(BaseRetriever):
         for idx in range(len(ids)):
             results.append(
                 Document(
+                    id=ids[idx],
                     metadata=metadatas[idx],
                     page_content=documents[idx],
                 )
@@ -112,6 +115,103 @@ def get_doc(collection_name: str, user: UserModel = None):
         raise e
 
 
+def get_hybrid_search_candidates(
+    collection_name: str,
+    collection_result: GetResult,
+    query: str,
+    embedding_function,
+    k: int,
+    hybrid_bm25_weight: float,
+) -> list[Document]:
+    """Retrieve the BM25 and vector search candidates of one collection."""
+    # langchain and langchain_community take seconds to import, only hybrid
+    # search needs them
+    from langchain.retrievers import EnsembleRetriever
+    from langchain_community.retrievers import BM25Retriever
+
+    bm25_retriever = BM25Retriever.from_texts(
+        texts=collection_result.documents[0],
+        metadatas=collection_result.metadatas[0],
+        ids=collection_result.ids[0],
+    )
+    bm25_retriever.k = k
+
+    vector_search_retriever = VectorSearchRetriever(
+        collection_name=collection_name,
+        embedding_function=embedding_function,
+        top_k=k,
+    )
+
+    if hybrid_bm25_weight <= 0:
+        ensemble_retriever = EnsembleRetriever(
+            retrievers=[vector_search_retriever], weights=[1.0]
+        )
+    elif hybrid_bm25_weight >= 1:
+        ensemble_retriever = EnsembleRetriever(
+            retrievers=[bm25_retriever], weights=[1.0]
+        )
+    else:
+        ensemble_retriever = EnsembleRetriever(
+            retrievers=[bm25_retriever, vector_search_retriever],
+            weights=[hybrid_bm25_weight, 1.0 - hybrid_bm25_weight],
+        )
+
+    return ensemble_retriever.invoke(query)
+
+
+def rank_hybrid_search_candidates(
+    collection_name: str,
+    candidates: list[Document],
+    query: str,
+    embedding_function,
+    k: int,
+    reranking_function,
+    k_reranker: int,
+    r: float,
+    scores: Optional[list[float]] = None,
+) -> dict:
+    """
+    Rerank the candidates of one collection and keep the best ones. `scores`
+    are reranking scores already computed for `candidates`, if any.
+    """
+    compressor = RerankCompressor(
+        embedding_function=embedding_function,
+        top_n=k_reranker,
+        reranking_function=reranking_function,
+        r_score=r,
+        collection_name=collection_name,
+    )
+
+    if scores is not None:
+        result = compressor.select_documents(candidates, scores)
+    else:
+        result = compressor.compress_documents(candidates, query)
+
+    distances = [d.metadata.get("score") for d in result]
+    documents = [d.page_content for d in result]
+    metadatas = [d.metadata for d in result]
+
+    # retrieve only min(k, k_reranker) items, sort and cut by distance if k < k_reranker
+    if k < k_reranker and result:
+        sorted_items = sorted(
+            zip(distances, metadatas, documents), key=lambda x: x[0], reverse=True
+        )
+        sorted_items = sorted_items[:k]
+        distances, metadatas, documents = map(list, zip(*sorted_items))
+
+    result = {
+        "distances": [distances],
+        "documents": [documents],
+        "metadatas": [metadatas],
+    }
+
+    log.info(
+        "query_doc_with_hybrid_search:result "
+        + f'{result["metadatas"]} {result["distances"]}'
+    )
+    return result
+
+
 def query_doc_with_hybrid_search(
     collection_name: str,
     collection_result: GetResult,
@@ -125,68 +225,24 @@ def query_doc_with_hybrid_search(
 ) -> dict:
     try:
         log.debug(f"query_doc_with_hybrid_search:doc {collection_name}")
-        bm25_retriever = BM25Retriever.from_texts(
-            texts=collection_result.documents[0],
-            metadatas=collection_result.metadatas[0],
-        )
-        bm25_retriever.k = k
-
-        vector_search_retriever = VectorSearchRetriever(
+        candidates = get_hybrid_search_candidates(
             collection_name=collection_name,
+            collection_result=collection_result,
+            query=query,
             embedding_function=embedding_function,
-            top_k=k,
+            k=k,
+            hybrid_bm25_weight=hybrid_bm25_weight,
         )
-
-        if hybrid_bm25_weight <= 0:
-            ensemble_retriever = EnsembleRetriever(
-                retrievers=[vector_search_retriever], weights=[1.0]
-            )
-        elif hybrid_bm25_weight >= 1:
-            ensemble_retriever = EnsembleRetriever(
-                retrievers=[bm25_retriever], weights=[1.0]
-            )
-        else:
-            ensemble_retriever = EnsembleRetriever(
-                retrievers=[bm25_retriever, vector_search_retriever],
-                weights=[hybrid_bm25_weight, 1.0 - hybrid_bm25_weight],
-            )
-
-        compressor = RerankCompressor(
+        return rank_hybrid_search_candidates(
+            collection_name=collection_name,
+            candidates=candidates,
+            query=query,
             embedding_function=embedding_function,
-            top_n=k_reranker,
+            k=k,
             reranking_function=reranking_function,
-            r_score=r,
-        )
-
-        compression_retriever = ContextualCompressionRetriever(
-            base_compressor=compressor, base_retriever=ensemble_retriever
+            k_reranker=k_reranker,
+            r=r,
         )
-
-        result = compression_retriever.invoke(query)
-
-        distances = [d.metadata.get("score") for d in result]
-        documents = [d.page_content for d in result]
-        metadatas = [d.metadata for d in result]
-
-        # retrieve only min(k, k_reranker) items, sort and cut by distance if k < k_reranker
-        if k < k_reranker:
-            sorted_items = sorted(
-                zip(distances, metadatas, documents), key=lambda x: x[0], reverse=True
-            )
-            sorted_items = sorted_items[:k]
-            distances, documents, metadatas = map(list, zip(*sorted_items))
-
-        result = {
-            "distances": [distances],
-            "documents": [documents],
-            "metadatas": [metadatas],
-        }
-
-        log.info(
-            "query_doc_with_hybrid_search:result "
-            + f'{result["metadatas"]} {result["distances"]}'
-        )
-        return result
     except Exception as e:
         log.exception(f"Error querying doc {collection_name} with hybrid search: {e}")
         raise e
@@ -279,16 +335,26 @@ def query_collection(
     results = []
     error = False
 
-    def process_query_collection(collection_name, query_embedding):
+    def process_query_collection(collection_name, query_embeddings):
         try:
             if collection_name:
-                result = query_doc(
+                log.debug(f"query_collection:doc {collection_name}")
+                result = VECTOR_DB_CLIENT.search(
                     collection_name=collection_name,
-                    k=k,
-                    query_embedding=query_embedding,
+                    vectors=query_embeddings,
+                    limit=k,
                 )
                 if result is not None:
-                    return result.model_dump(), None
+                    # One result per query vector
+                    return [
+                        {
+                            "ids": [result.ids[idx]],
+                            "distances": [result.distances[idx]],
+                            "documents": [result.documents[idx]],
+                            "metadatas": [result.metadatas[idx]],
+                        }
+                        for idx in range(len(result.ids))
+                    ], None
             return None, None
         except Exception as e:
             log.exception(f"Error when querying the collection: {e}")
@@ -300,21 +366,24 @@ def query_collection(
         f"query_collection: processing {len(queries)} queries across {len(collection_names)} collections"
     )
 
+    if VECTOR_DB_CLIENT.supports_batch_search:
+        # A single search per collection answers all queries
+        tasks = [(cn, query_embeddings) for cn in collection_names]
+    else:
+        tasks = [(cn, [qe]) for qe in query_embeddings for cn in collection_names]
+
     with ThreadPoolExecutor() as executor:
-        future_results = []
-        for query_embedding in query_embeddings:
-            for collection_name in collection_names:
-                result = executor.submit(
-                    process_query_collection, collection_name, query_embedding
-                )
-                future_results.append(result)
+        future_results = [
+            executor.submit(process_query_collection, cn, embeddings)
+            for cn, embeddings in tasks
+        ]
         task_results = [future.result() for future in future_results]
 
     for result, err in task_results:
         if err is not None:
             error = True
         elif result is not None:
-            results.append(result)
+            results.extend(result)
 
     if error and not results:
         log.warning("All collection queries failed. No results returned.")
@@ -353,18 +422,34 @@ def query_collection_with_hybrid_search(
         f"Starting hybrid search for {len(queries)} queries in {len(collection_names)} collections..."
     )
 
-    def process_query(collection_name, query):
+    def retrieve_candidates(collection_name, query):
         try:
-            result = query_doc_with_hybrid_search(
+            log.debug(f"query_doc_with_hybrid_search:doc {collection_name}")
+            candidates = get_hybrid_search_candidates(
                 collection_name=collection_name,
                 collection_result=collection_results[collection_name],
                 query=query,
                 embedding_function=embedding_function,
                 k=k,
+                hybrid_bm25_weight=hybrid_bm25_weight,
+            )
+            return candidates, None
+        except Exception as e:
+            log.exception(f"Error when querying the collection with hybrid_search: {e}")
+            return None, e
+
+    def rank_candidates(collection_name, query, candidates, scores=None):
+        try:
+            result = rank_hybrid_search_candidates(
+                collection_name=collection_name,
+                candidates=candidates,
+                query=query,
+                embedding_function=embedding_function,
+                k=k,
                 reranking_function=reranking_function,
                 k_reranker=k_reranker,
                 r=r,
-                hybrid_bm25_weight=hybrid_bm25_weight,
+                scores=scores,
             )
             return result, None
         except Exception as e:
@@ -381,8 +466,48 @@ def query_collection_with_hybrid_search(
     ]
 
     with ThreadPoolExecutor() as executor:
-        future_results = [executor.submit(process_query, cn, q) for cn, q in tasks]
-        task_results = [future.result() for future in future_results]
+        future_candidates = [
+            executor.submit(retrieve_candidates, cn, q) for cn, q in tasks
+        ]
+        task_candidates = [future.result() for future in future_candidates]
+
+    task_results = [
+        (None, err) for candidates, err in task_candidates if err is not None
+    ]
+    ranked_tasks = [
+        (cn, q, candidates)
+        for (cn, q), (candidates, err) in zip(tasks, task_candidates)
+        if err is None
+    ]
+
+    if reranking_function:
+        # Score the candidates of all collections and queries in one reranking call
+        pairs = [
+            (q, doc.page_content)
+            for _, q, candidates in ranked_tasks
+            for doc in candidates
+        ]
+        scores = reranking_function(pairs) if pairs else []
+        if scores is None:
+            raise Exception(
+                "Reranking failed for hybrid search. Using Non-hybrid search as fallback."
+            )
+
+        offset = 0
+        for cn, q, candidates in ranked_tasks:
+            task_results.append(
+                rank_candidates(
+                    cn, q, candidates, list(scores[offset : offset + len(candidates)])
+                )
+            )
+            offset += len(candidates)
+    else:
+        with ThreadPoolExecutor() as executor:
+            future_results = [
+                executor.submit(rank_candidates, cn, q, candidates)
+                for cn, q, candidates in ranked_tasks
+            ]
+            task_results.extend(future.result() for future in future_results)
 
     for result, err in task_results:
         if err is not None:
@@ -448,12 +573,13 @@ def get_embedding_function(
 def get_reranking_function(reranking_engine, reranking_model, reranking_function):
     if reranking_function is None:
         return None
-    if reranking_engine == "external":
-        return lambda sentences, user=None: reranking_function.predict(
-            sentences, user=user
-        )
-    else:
-        return lambda sentences, user=None: reranking_function.predict(sentences)
+    return RerankingService(
+        reranking_function,
+        model=reranking_model,
+        engine=reranking_engine,
+        batch_size=RAG_RERANKING_BATCH_SIZE,
+        cache_size=RAG_RERANKING_CACHE_SIZE,
+    )
 
 
 def get_sources_from_items(
@@ -928,16 +1054,74 @@ from langchain_core.callbacks import Callbacks
 from langchain_core.documents import BaseDocumentCompressor, Document
 
 
+def cosine_similarity(query_embedding: list[float], embeddings: list[list[float]]):
+    """Cosine similarity of one query vector against each row of `embeddings`."""
+    query = np.asarray(query_embedding, dtype=np.float32)
+    matrix = np.asarray(embeddings, dtype=np.float32).reshape(-1, query.shape[0])
+
+    norms = np.linalg.norm(matrix, axis=1) * np.linalg.norm(query)
+    norms[norms == 0] = 1.0
+    return matrix @ query / norms
+
+
 class RerankCompressor(BaseDocumentCompressor):
     embedding_function: Any
     top_n: int
     reranking_function: Any
     r_score: float
+    # Collection the candidates came from, used to look up their stored vectors
+    collection_name: Optional[str] = None
 
     class Config:
         extra = "forbid"
         arbitrary_types_allowed = True
 
+    def get_document_embeddings(
+        self, documents: Sequence[Document], dimension: int
+    ) -> list[list[float]]:
+        """
+        Return one embedding per document, reusing the vectors already stored in
+        the vector DB and only embedding the documents that have none.
+        """
+        stored = {}
+        ids = [doc.id for doc in documents if doc.id]
+        if self.collection_name and ids:
+            try:
+                stored = (
+                    VECTOR_DB_CLIENT.get_vectors(
+                        collection_name=self.collection_name, ids=ids
+                    )
+                    or {}
+                )
+            except Exception as e:
+                log.debug(f"Failed to load stored vectors for reranking: {e}")
+
+        embeddings = []
+        missing = []
+        for idx, doc in enumerate(documents):
+            vector = stored.get(doc.id) if doc.id else None
+            if vector is not None and len(vector) > dimension:
+                # Some backends zero pad vectors to a fixed length
+                if not any(vector[dimension:]):
+                    vector = vector[:dimension]
+            if vector is None or len(vector) != dimension:
+                missing.append(idx)
+                vector = None
+            embeddings.append(vector)
+
+        if missing:
+            log.debug(
+                f"Embedding {len(missing)} of {len(documents)} candidates for reranking"
+            )
+            missing_embeddings = self.embedding_function(
+                [documents[idx].page_content for idx in missing],
+                RAG_EMBEDDING_CONTENT_PREFIX,
+            )
+            for idx, vector in zip(missing, missing_embeddings):
+                embeddings[idx] = vector
+
+        return embeddings
+
     def compress_documents(
         self,
         documents: Sequence[Document],
@@ -951,14 +1135,18 @@ class RerankCompressor(BaseDocumentCompressor):
                 [(query, doc.page_content) for doc in documents]
             )
         else:
-            from sentence_transformers import util
-
             query_embedding = self.embedding_function(query, RAG_EMBEDDING_QUERY_PREFIX)
-            document_embedding = self.embedding_function(
-                [doc.page_content for doc in documents], RAG_EMBEDDING_CONTENT_PREFIX
+            document_embeddings = self.get_document_embeddings(
+                documents, len(query_embedding)
             )
-            scores = util.cos_sim(query_embedding, document_embedding)[0]
+            scores = cosine_similarity(query_embedding, document_embeddings)
+
+        return self.select_documents(documents, scores)
 
+    def select_documents(
+        self, documents: Sequence[Document], scores
+    ) -> Sequence[Document]:
+        """Keep the `top_n` best scored documents above the relevance threshold."""
         docs_with_scores = list(
             zip(documents, scores.tolist() if not isinstance(scores, list) else scores)
         )
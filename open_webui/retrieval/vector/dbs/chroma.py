@@ -1,5 +1,6 @@
 import chromadb
 import logging
+import threading
 from chromadb import Settings
 from chromadb.utils.batch_utils import create_batches
 
@@ -10,6 +11,7 @@ from open_webui.retrieval.vector.main import (
     VectorItem,
     SearchResult,
     GetResult,
+    normalize_score,
 )
 from open_webui.retrieval.vector.utils import stringify_metadata
 
@@ -31,7 +33,16 @@ log.setLevel(SRC_LOG_LEVELS["RAG"])
 
 
 class ChromaClient(VectorDBBase):
+    supports_batch_search = True
+    # collections are created with "hnsw:space": "cosine"
+    metric = "cosine_distance"
+
     def __init__(self):
+        # Collection handles by name, invalidated on delete and reset and
+        # looked up again when an operation on one fails
+        self._collections = {}
+        self._collections_lock = threading.Lock()
+
         settings_dict = {
             "allow_reset": True,
             "anonymized_telemetry": False,
@@ -61,13 +72,59 @@ class ChromaClient(VectorDBBase):
                 database=CHROMA_DATABASE,
             )
 
+    def _get_collection(self, collection_name: str, create: bool = False):
+        # Look the collection up by name and cache its handle, None if it does not exist.
+        try:
+            if create:
+                collection = self.client.get_or_create_collection(
+                    name=collection_name, metadata={"hnsw:space": "cosine"}
+                )
+            else:
+                collection = self.client.get_collection(name=collection_name)
+        except Exception:
+            self._invalidate_collection(collection_name)
+            if create:
+                raise
+            return None
+
+        with self._collections_lock:
+            self._collections[collection_name] = collection
+        return collection
+
+    def _invalidate_collection(self, collection_name: str):
+        with self._collections_lock:
+            self._collections.pop(collection_name, None)
+
+    def _call(self, collection_name: str, operation, create: bool = False):
+        """
+        Run `operation` on the collection's handle, None if the collection does
+        not exist. Handles are cached per process, so a cached one may belong
+        to a collection another worker has deleted or recreated since: when the
+        operation fails, the collection is looked up again and the operation
+        retried on the new handle. Errors of a handle that is still current are
+        raised.
+        """
+        cached = self._collections.get(collection_name)
+        if cached is None:
+            collection = self._get_collection(collection_name, create)
+            return operation(collection) if collection is not None else None
+
+        try:
+            return operation(cached)
+        except Exception:
+            collection = self._get_collection(collection_name, create)
+            if collection is not None and collection.id == cached.id:
+                raise
+        return operation(collection) if collection is not None else None
+
     def has_collection(self, collection_name: str) -> bool:
-        # Check if the collection exists based on the collection name.
-        collection_names = self.client.list_collections()
-        return collection_name in collection_names
+        # Check if the collection exists based on the collection name. Always
+        # asks the server, the collection may have been deleted by another worker.
+        return self._get_collection(collection_name) is not None
 
     def delete_collection(self, collection_name: str):
         # Delete the collection based on the collection name.
+        self._invalidate_collection(collection_name)
         return self.client.delete_collection(name=collection_name)
 
     def search(
@@ -75,28 +132,32 @@ class ChromaClient(VectorDBBase):
     ) -> Optional[SearchResult]:
         # Search for the nearest neighbor items based on the vectors and return 'limit' number of results.
         try:
-            collection = self.client.get_collection(name=collection_name)
-            if collection:
-                result = collection.query(
+            # All query vectors are answered by a single request
+            result = self._call(
+                collection_name,
+                lambda collection: collection.query(
                     query_embeddings=vectors,
                     n_results=limit,
-                )
+                ),
+            )
+            if result is None:
+                return None
 
-                # chromadb has cosine distance, 2 (worst) -> 0 (best). Re-odering to 0 -> 1
-                # https://docs.trychroma.com/docs/collections/configure cosine equation
-                distances: list = result["distances"][0]
-                distances = [2 - dist for dist in distances]
-                distances = [[dist / 2 for dist in distances]]
-
-                return SearchResult(
-                    **{
-                        "ids": result["ids"],
-                        "distances": distances,
-                        "documents": result["documents"],
-                        "metadatas": result["metadatas"],
-                    }
-                )
-            return None
+            # https://docs.trychroma.com/docs/collections/configure cosine equation
+            distances = [
+                [normalize_score(dist, self.metric) for dist in row]
+                for row in result["distances"]
+            ]
+
+            return SearchResult(
+                **{
+                    "ids": result["ids"],
+                    "distances": distances,
+                    "documents": result["documents"],
+                    "metadatas": result["metadatas"],
+                    "metric": self.metric,
+                }
+            )
         except Exception as e:
             return None
 
@@ -105,29 +166,16 @@ class ChromaClient(VectorDBBase):
     ) -> Optional[GetResult]:
         # Query the items from the collection based on the filter.
         try:
-            collection = self.client.get_collection(name=collection_name)
-            if collection:
-                result = collection.get(
+            result = self._call(
+                collection_name,
+                lambda collection: collection.get(
                     where=filter,
                     limit=limit,
-                )
-
-                return GetResult(
-                    **{
-                        "ids": [result["ids"]],
-                        "documents": [result["documents"]],
-                        "metadatas": [result["metadatas"]],
-                    }
-                )
-            return None
-        except:
-            return None
+                ),
+            )
+            if result is None:
+                return None
 
-    def get(self, collection_name: str) -> Optional[GetResult]:
-        # Get all the items in the collection.
-        collection = self.client.get_collection(name=collection_name)
-        if collection:
-            result = collection.get()
             return GetResult(
                 **{
                     "ids": [result["ids"]],
@@ -135,41 +183,72 @@ class ChromaClient(VectorDBBase):
                     "metadatas": [result["metadatas"]],
                 }
             )
-        return None
+        except:
+            return None
 
-    def insert(self, collection_name: str, items: list[VectorItem]):
-        # Insert the items into the collection, if the collection does not exist, it will be created.
-        collection = self.client.get_or_create_collection(
-            name=collection_name, metadata={"hnsw:space": "cosine"}
+    def get(self, collection_name: str) -> Optional[GetResult]:
+        # Get all the items in the collection.
+        result = self._call(collection_name, lambda collection: collection.get())
+        if result is None:
+            return None
+        return GetResult(
+            **{
+                "ids": [result["ids"]],
+                "documents": [result["documents"]],
+                "metadatas": [result["metadatas"]],
+            }
         )
 
+    def get_vectors(
+        self, collection_name: str, ids: list[str]
+    ) -> Optional[dict[str, list[float]]]:
+        # Get the stored embeddings of the given ids.
+        try:
+            result = self._call(
+                collection_name,
+                lambda collection: collection.get(ids=ids, include=["embeddings"]),
+            )
+            if result is None:
+                return None
+            return {
+                id: list(embedding)
+                for id, embedding in zip(result["ids"], result["embeddings"])
+            }
+        except Exception:
+            return None
+
+    def insert(self, collection_name: str, items: list[VectorItem]):
+        # Insert the items into the collection, if the collection does not exist, it will be created.
         ids = [item["id"] for item in items]
         documents = [item["text"] for item in items]
         embeddings = [item["vector"] for item in items]
         metadatas = [stringify_metadata(item["metadata"]) for item in items]
 
-        for batch in create_batches(
-            api=self.client,
-            documents=documents,
-            embeddings=embeddings,
-            ids=ids,
-            metadatas=metadatas,
-        ):
-            collection.add(*batch)
+        def add(collection):
+            for batch in create_batches(
+                api=self.client,
+                documents=documents,
+                embeddings=embeddings,
+                ids=ids,
+                metadatas=metadatas,
+            ):
+                collection.add(*batch)
+
+        self._call(collection_name, add, create=True)
 
     def upsert(self, collection_name: str, items: list[VectorItem]):
         # Update the items in the collection, if the items are not present, insert them. If the collection does not exist, it will be created.
-        collection = self.client.get_or_create_collection(
-            name=collection_name, metadata={"hnsw:space": "cosine"}
-        )
-
         ids = [item["id"] for item in items]
         documents = [item["text"] for item in items]
         embeddings = [item["vector"] for item in items]
         metadatas = [stringify_metadata(item["metadata"]) for item in items]
 
-        collection.upsert(
-            ids=ids, documents=documents, embeddings=embeddings, metadatas=metadatas
+        self._call(
+            collection_name,
+            lambda collection: collection.upsert(
+                ids=ids, documents=documents, embeddings=embeddings, metadatas=metadatas
+            ),
+            create=True,
         )
 
     def delete(
@@ -180,12 +259,14 @@ class ChromaClient(VectorDBBase):
     ):
         # Delete the items from the collection based on the ids.
         try:
-            collection = self.client.get_collection(name=collection_name)
-            if collection:
-                if ids:
-                    collection.delete(ids=ids)
-                elif filter:
-                    collection.delete(where=filter)
+            if ids:
+                self._call(
+                    collection_name, lambda collection: collection.delete(ids=ids)
+                )
+            elif filter:
+                self._call(
+                    collection_name, lambda collection: collection.delete(where=filter)
+                )
         except Exception as e:
             # If collection doesn't exist, that's fine - nothing to delete
             log.debug(
@@ -195,4 +276,6 @@ class ChromaClient(VectorDBBase):
 
     def reset(self):
         # Resets the database. This will delete all collections and item entries.
+        with self._collections_lock:
+            self._collections.clear()
         return self.client.reset()
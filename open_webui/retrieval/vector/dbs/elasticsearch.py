@@ -8,6 +8,7 @@ from open_webui.retrieval.vector.main import (
     VectorDBBase,
     VectorItem,
     SearchResult,
+    normalize_score,
     GetResult,
 )
 from open_webui.config import (
@@ -30,6 +31,8 @@ class ElasticsearchClient(VectorDBBase):
     baesd on the embedding length.
     """
 
+    metric = "cosine_similarity"
+
     def __init__(self):
         self.index_prefix = ELASTICSEARCH_INDEX_PREFIX
         self.client = Elasticsearch(
@@ -88,7 +91,8 @@ class ElasticsearchClient(VectorDBBase):
 
         for hit in result["hits"]["hits"]:
             ids.append(hit["_id"])
-            distances.append(hit["_score"])
+            # script_score can't be negative, the script adds 1 to the similarity
+            distances.append(normalize_score(hit["_score"] - 1.0, self.metric))
             documents.append(hit["_source"].get("text"))
             metadatas.append(hit["_source"].get("metadata"))
 
@@ -97,6 +101,7 @@ class ElasticsearchClient(VectorDBBase):
             distances=[distances],
             documents=[documents],
             metadatas=[metadatas],
+            metric=self.metric,
         )
 
     # Status: works
@@ -0,0 +1,786 @@
+import hashlib
+import json
+import logging
+import os
+import re
+import shutil
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+import hnswlib
+import numpy as np
+
+from open_webui.retrieval.vector.main import (
+    VectorDBBase,
+    VectorItem,
+    SearchResult,
+    GetResult,
+    normalize_score,
+)
+from open_webui.retrieval.vector.utils import stringify_metadata
+from open_webui.config import (
+    HNSW_DATA_PATH,
+    HNSW_VECTOR_DTYPE,
+    HNSW_M,
+    HNSW_EF_CONSTRUCTION,
+    HNSW_EF_SEARCH,
+    HNSW_SNAPSHOT_INTERVAL,
+)
+from open_webui.env import SRC_LOG_LEVELS
+
+log = logging.getLogger(__name__)
+log.setLevel(SRC_LOG_LEVELS["RAG"])
+
+COLLECTION_NAME_PATTERN = re.compile(r"^[A-Za-z0-9_.-]{1,128}$")
+# Stay below SQLite's limit on bound parameters per statement
+BATCH_SIZE = 500
+
+
+def batched(values: list, size: int = BATCH_SIZE):
+    for start in range(0, len(values), size):
+        yield values[start : start + size]
+
+
+def placeholders(values: list) -> str:
+    return ",".join("?" * len(values))
+
+
+def build_where(filter: Dict[str, Any]) -> tuple[str, list]:
+    """Translate a metadata filter ({key: value} or {key: {"$in": [...]}}) to SQL."""
+    clauses, params = [], []
+    for key, value in filter.items():
+        path = "$." + json.dumps(str(key))
+        if isinstance(value, dict) and "$in" in value:
+            values = list(value["$in"])
+            if not values:
+                return "0", []
+            clauses.append(f"json_extract(metadata, ?) IN ({placeholders(values)})")
+            params.extend([path, *values])
+        else:
+            if isinstance(value, dict) and "$eq" in value:
+                value = value["$eq"]
+            clauses.append("json_extract(metadata, ?) = ?")
+            params.extend([path, value])
+    return " AND ".join(clauses) or "1", params
+
+
+def read_status(db_path: Path) -> dict:
+    """Item counts and versions of a collection, read without loading its index."""
+    conn = sqlite3.connect(f"{db_path.absolute().as_uri()}?mode=ro", uri=True)
+    try:
+        meta = dict(conn.execute("SELECT key, value FROM meta").fetchall())
+        total, live, unsaved = conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(deleted = 0), 0), COALESCE(SUM(version > ?), 0) FROM item",
+            (int(meta["snapshot_version"]),),
+        ).fetchone()
+    finally:
+        conn.close()
+
+    return {
+        "name": meta.get("name"),
+        "dimension": int(meta["dim"]) if "dim" in meta else None,
+        "dtype": meta.get("dtype"),
+        "items": live,
+        "deleted": total - live,
+        "generation": int(meta["generation"]),
+        "version": int(meta["version"]),
+        # items replayed from the log on load
+        "unsaved_items": unsaved,
+    }
+
+
+class CollectionNotFound(Exception):
+    pass
+
+
+class HNSWCollection:
+    """
+    One collection of the embedded backend, a self-contained segment directory:
+
+    - `vectors-<generation>.bin`: append-only float16/float32 vector rows, read
+      through a memory map. The row number is the hnswlib label.
+    - `items.db`: SQLite table mapping labels to ids, texts and metadata, and
+      the collection version. Every write bumps the version and stamps the rows
+      it adds or deletes. It is committed only after the vectors are fsynced,
+      so it is the append log the index is recovered from.
+    - `index-<generation>.bin`: hnswlib snapshot, current as of `snapshot_version`.
+
+    Loading reads the snapshot and replays the rows stamped after it, other
+    worker processes catch up the same way before every read. Writes are
+    serialized across processes by immediate SQLite transactions. Compaction
+    writes the files of the next generation and switches to them in one commit.
+    """
+
+    def __init__(self, path: Path, name: Optional[str] = None):
+        self.path = path
+        self.db_path = path / "items.db"
+        self._lock = threading.RLock()
+
+        self.index: Optional[hnswlib.Index] = None
+        self.dim: Optional[int] = None
+        self.dtype = np.dtype(HNSW_VECTOR_DTYPE)
+        self.generation = -1
+        self.version = 0
+        self.snapshot_version = 0
+        self.count = 0
+        self._memmap: Optional[np.memmap] = None
+
+        create = name is not None
+        if create:
+            path.mkdir(parents=True, exist_ok=True)
+        try:
+            self._conn = sqlite3.connect(
+                f"{self.db_path.absolute().as_uri()}?mode={'rwc' if create else 'rw'}",
+                uri=True,
+                timeout=30,
+                isolation_level=None,
+                check_same_thread=False,
+            )
+        except sqlite3.OperationalError as e:
+            raise CollectionNotFound(str(path)) from e
+
+        if create:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS item (label INTEGER PRIMARY KEY, id TEXT NOT NULL, "
+                "text TEXT, metadata TEXT, deleted INTEGER NOT NULL DEFAULT 0, version INTEGER NOT NULL)"
+            )
+            self._conn.execute(
+                "CREATE UNIQUE INDEX IF NOT EXISTS item_live_id ON item (id) WHERE deleted = 0"
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS item_version ON item (version)"
+            )
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)"
+            )
+            self._conn.execute(
+                "INSERT OR IGNORE INTO meta (key, value) VALUES "
+                "('name', ?), ('version', '0'), ('generation', '0'), ('snapshot_version', '0')",
+                (name,),
+            )
+
+        self.sync()
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+            self.index = None
+            self._memmap = None
+
+    def _meta(self) -> dict[str, str]:
+        return dict(self._conn.execute("SELECT key, value FROM meta").fetchall())
+
+    def _vectors_path(self, generation: int) -> Path:
+        return self.path / f"vectors-{generation}.bin"
+
+    def _index_path(self, generation: int) -> Path:
+        return self.path / f"index-{generation}.bin"
+
+    def _new_index(self, max_elements: int) -> hnswlib.Index:
+        index = hnswlib.Index(space="cosine", dim=self.dim)
+        index.init_index(
+            max_elements=max(max_elements, 1024),
+            ef_construction=HNSW_EF_CONSTRUCTION,
+            M=HNSW_M,
+        )
+        return index
+
+    def _rows(self) -> np.memmap:
+        """Memory map covering every vector row written so far, remapped when the file grew."""
+        path = self._vectors_path(self.generation)
+        rows = os.path.getsize(path) // (self.dim * self.dtype.itemsize)
+        if self._memmap is None or self._memmap.shape[0] < rows:
+            self._memmap = np.memmap(
+                path, dtype=self.dtype, mode="r", shape=(rows, self.dim)
+            )
+        return self._memmap
+
+    def _vectors(self, labels: list[int]) -> np.ndarray:
+        if not labels:
+            return np.zeros((0, self.dim), dtype=np.float32)
+        return np.asarray(self._rows()[labels], dtype=np.float32)
+
+    def _reserve(self, n: int) -> None:
+        needed = self.index.get_current_count() + n
+        if needed > self.index.get_max_elements():
+            self.index.resize_index(max(needed, 2 * self.index.get_max_elements()))
+
+    def sync(self) -> None:
+        """Catch up with writes committed by this or other processes."""
+        with self._lock:
+            if not self.db_path.exists():
+                raise CollectionNotFound(str(self.path))
+
+            self._conn.execute("BEGIN")
+            try:
+                meta = self._meta()
+                if int(meta["generation"]) != self.generation:
+                    self._load(meta)
+                elif int(meta["version"]) != self.version:
+                    self._replay(int(meta["version"]))
+                self.snapshot_version = int(meta["snapshot_version"])
+            finally:
+                self._conn.execute("COMMIT")
+
+    def _load(self, meta: dict[str, str]) -> None:
+        self.generation = int(meta["generation"])
+        self.snapshot_version = int(meta["snapshot_version"])
+        self.dim = int(meta["dim"]) if "dim" in meta else None
+        self.dtype = np.dtype(meta.get("dtype", HNSW_VECTOR_DTYPE))
+        self.index = None
+        self._memmap = None
+        self.version = 0
+        self.count = 0
+        if self.dim is None:
+            self.version = int(meta["version"])
+            return
+
+        index_path = self._index_path(self.generation)
+        if self.snapshot_version and index_path.exists():
+            self.index = hnswlib.Index(space="cosine", dim=self.dim)
+            self.index.load_index(str(index_path))
+            self.version = self.snapshot_version
+        else:
+            total = self._conn.execute("SELECT COUNT(*) FROM item").fetchone()[0]
+            self.index = self._new_index(total)
+
+        self._replay(int(meta["version"]))
+
+    def _replay(self, version: int) -> None:
+        rows = self._conn.execute(
+            "SELECT label, deleted FROM item WHERE version > ? ORDER BY label",
+            (self.version,),
+        ).fetchall()
+        if rows and self.index is None:
+            # first write of a collection that was empty when it was loaded
+            self._load(self._meta())
+            return
+
+        added = [label for label, deleted in rows if not deleted]
+        for chunk in batched(added, 10000):
+            self._reserve(len(chunk))
+            self.index.add_items(self._vectors(chunk), chunk)
+        for label, deleted in rows:
+            if deleted:
+                try:
+                    self.index.mark_deleted(label)
+                except RuntimeError:
+                    # deleted before this process indexed it, or already deleted
+                    pass
+
+        self.version = version
+        self.count = self._conn.execute(
+            "SELECT COUNT(*) FROM item WHERE deleted = 0"
+        ).fetchone()[0]
+        if rows:
+            log.debug(
+                f"HNSW {self.path.name}: replayed {len(added)} added and {len(rows) - len(added)} deleted items"
+            )
+
+    def _begin_write(self) -> dict[str, str]:
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            meta = self._meta()
+            if int(meta["generation"]) != self.generation:
+                self._load(meta)
+            return meta
+        except Exception:
+            self._conn.execute("ROLLBACK")
+            raise
+
+    def upsert(self, items: list[VectorItem]) -> None:
+        # later items win over earlier ones with the same id
+        latest = {item["id"]: item for item in items}
+        items = list(latest.values())
+        if not items:
+            return
+        vectors = np.asarray([item["vector"] for item in items], dtype=np.float32)
+
+        with self._lock:
+            if not self.db_path.exists():
+                raise CollectionNotFound(str(self.path))
+
+            meta = self._begin_write()
+            try:
+                if "dim" not in meta:
+                    self._conn.executemany(
+                        "INSERT INTO meta (key, value) VALUES (?, ?)",
+                        [("dim", str(vectors.shape[1])), ("dtype", HNSW_VECTOR_DTYPE)],
+                    )
+                    meta = self._meta()
+                    self.dim = vectors.shape[1]
+                    self.dtype = np.dtype(HNSW_VECTOR_DTYPE)
+                if vectors.shape[1] != int(meta["dim"]):
+                    raise ValueError(
+                        f"Vector dimension {vectors.shape[1]} does not match the collection dimension {meta['dim']}"
+                    )
+
+                version = int(meta["version"]) + 1
+                ids = list(latest)
+                for batch in batched(ids):
+                    self._conn.execute(
+                        f"UPDATE item SET deleted = 1, version = ? WHERE deleted = 0 AND id IN ({placeholders(batch)})",
+                        [version, *batch],
+                    )
+
+                # rows past the last committed label were never committed
+                offset = self._conn.execute(
+                    "SELECT COALESCE(MAX(label) + 1, 0) FROM item"
+                ).fetchone()[0]
+                with open(self._vectors_path(self.generation), "ab") as f:
+                    f.truncate(offset * self.dim * self.dtype.itemsize)
+                    f.write(vectors.astype(self.dtype).tobytes())
+                    f.flush()
+                    os.fsync(f.fileno())
+
+                self._conn.executemany(
+                    "INSERT INTO item (label, id, text, metadata, deleted, version) VALUES (?, ?, ?, ?, 0, ?)",
+                    [
+                        (
+                            offset + idx,
+                            item["id"],
+                            item["text"],
+                            json.dumps(
+                                stringify_metadata(item["metadata"] or {}), default=str
+                            ),
+                            version,
+                        )
+                        for idx, item in enumerate(items)
+                    ],
+                )
+                self._conn.execute(
+                    "UPDATE meta SET value = ? WHERE key = 'version'", (str(version),)
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+            self.sync()
+            self._maybe_snapshot()
+
+    def delete(
+        self, ids: Optional[list[str]] = None, filter: Optional[dict] = None
+    ) -> None:
+        with self._lock:
+            if not self.db_path.exists():
+                raise CollectionNotFound(str(self.path))
+
+            meta = self._begin_write()
+            try:
+                version = int(meta["version"]) + 1
+                deleted = 0
+                if ids:
+                    for batch in batched(ids):
+                        deleted += self._conn.execute(
+                            f"UPDATE item SET deleted = 1, version = ? WHERE deleted = 0 AND id IN ({placeholders(batch)})",
+                            [version, *batch],
+                        ).rowcount
+                elif filter:
+                    where, params = build_where(filter)
+                    deleted = self._conn.execute(
+                        f"UPDATE item SET deleted = 1, version = ? WHERE deleted = 0 AND {where}",
+                        [version, *params],
+                    ).rowcount
+                if deleted:
+                    self._conn.execute(
+                        "UPDATE meta SET value = ? WHERE key = 'version'",
+                        (str(version),),
+                    )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+            self.sync()
+            self._maybe_snapshot()
+
+    def _maybe_snapshot(self) -> None:
+        if self.index is None:
+            return
+        unsaved = self._conn.execute(
+            "SELECT COUNT(*) FROM item WHERE version > ?", (self.snapshot_version,)
+        ).fetchone()[0]
+        if unsaved < HNSW_SNAPSHOT_INTERVAL:
+            return
+
+        meta = self._begin_write()
+        try:
+            # no writer can commit in between, the snapshot matches `version`
+            self._replay(int(meta["version"]))
+            index_path = self._index_path(self.generation)
+            tmp_path = index_path.with_name(f"{index_path.name}.{os.getpid()}.tmp")
+            self.index.save_index(str(tmp_path))
+            os.replace(tmp_path, index_path)
+            self._conn.execute(
+                "UPDATE meta SET value = ? WHERE key = 'snapshot_version'",
+                (str(self.version),),
+            )
+            self._conn.execute("COMMIT")
+            self.snapshot_version = self.version
+        except Exception:
+            self._conn.execute("ROLLBACK")
+            raise
+        log.debug(f"HNSW {self.path.name}: saved index at version {self.version}")
+
+    def compact(self) -> None:
+        """Drop deleted rows from the vector file and rebuild the index without them."""
+        with self._lock:
+            if not self.db_path.exists():
+                raise CollectionNotFound(str(self.path))
+
+            meta = self._begin_write()
+            try:
+                if self.index is None:
+                    self._conn.execute("ROLLBACK")
+                    return
+                self._replay(int(meta["version"]))
+
+                labels = [
+                    row[0]
+                    for row in self._conn.execute(
+                        "SELECT label FROM item WHERE deleted = 0 ORDER BY label"
+                    )
+                ]
+                generation = self.generation + 1
+                version = int(meta["version"]) + 1
+
+                index = self._new_index(len(labels))
+                with open(self._vectors_path(generation), "wb") as f:
+                    for start, chunk in enumerate(batched(labels, 10000)):
+                        vectors = self._vectors(chunk)
+                        f.write(vectors.astype(self.dtype).tobytes())
+                        index.add_items(vectors, np.arange(len(chunk)) + start * 10000)
+                    f.flush()
+                    os.fsync(f.fileno())
+                index.save_index(str(self._index_path(generation)))
+
+                self._conn.execute("DELETE FROM item WHERE deleted = 1")
+                # new labels never exceed old ones, so ascending order never collides
+                self._conn.executemany(
+                    "UPDATE item SET label = ?, version = ? WHERE label = ?",
+                    [(idx, version, label) for idx, label in enumerate(labels)],
+                )
+                self._conn.executemany(
+                    "UPDATE meta SET value = ? WHERE key = ?",
+                    [
+                        (str(generation), "generation"),
+                        (str(version), "version"),
+                        (str(version), "snapshot_version"),
+                    ],
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+            for path in (
+                self._vectors_path(self.generation),
+                self._index_path(self.generation),
+            ):
+                path.unlink(missing_ok=True)
+
+            self.generation = generation
+            self.version = version
+            self.snapshot_version = version
+            self.index = index
+            self._memmap = None
+            self.count = len(labels)
+            log.info(f"HNSW {self.path.name}: compacted to {len(labels)} items")
+
+    def search(self, vectors: np.ndarray, limit: Optional[int]) -> list[list[tuple]]:
+        with self._lock:
+            self.sync()
+            k = self.count if limit is None else min(limit, self.count)
+            if self.index is None or k <= 0:
+                return [[] for _ in range(len(vectors))]
+
+            self.index.set_ef(max(HNSW_EF_SEARCH, k))
+            try:
+                labels, distances = self.index.knn_query(vectors, k=k)
+            except RuntimeError:
+                # too many deleted nodes around the query to collect k results
+                labels, distances = self._exact_search(vectors, k)
+
+            rows = self._fetch(sorted({int(label) for label in labels.flatten()}))
+            return [
+                [
+                    (*rows[int(label)], float(distance))
+                    for label, distance in zip(query_labels, query_distances)
+                    if int(label) in rows
+                ]
+                for query_labels, query_distances in zip(labels, distances)
+            ]
+
+    def _exact_search(self, vectors: np.ndarray, k: int) -> tuple:
+        live = np.array(
+            [
+                row[0]
+                for row in self._conn.execute(
+                    "SELECT label FROM item WHERE deleted = 0 ORDER BY label"
+                )
+            ]
+        )
+        candidates = self._vectors(live.tolist())
+        candidates /= np.linalg.norm(candidates, axis=1, keepdims=True) + 1e-12
+        queries = vectors / (np.linalg.norm(vectors, axis=1, keepdims=True) + 1e-12)
+        distances = 1.0 - queries @ candidates.T
+
+        top = np.argpartition(distances, k - 1, axis=1)[:, :k]
+        order = np.take_along_axis(distances, top, axis=1).argsort(axis=1)
+        top = np.take_along_axis(top, order, axis=1)
+        return live[top], np.take_along_axis(distances, top, axis=1)
+
+    def _fetch(self, labels: list[int]) -> dict[int, tuple]:
+        rows = {}
+        for batch in batched(labels):
+            for label, id, text, metadata in self._conn.execute(
+                f"SELECT label, id, text, metadata FROM item WHERE deleted = 0 AND label IN ({placeholders(batch)})",
+                batch,
+            ):
+                rows[label] = (id, text, json.loads(metadata))
+        return rows
+
+    def query(
+        self, filter: Optional[dict] = None, limit: Optional[int] = None
+    ) -> list[tuple]:
+        where, params = build_where(filter or {})
+        sql = f"SELECT id, text, metadata FROM item WHERE deleted = 0 AND {where} ORDER BY label"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params = [*params, limit]
+        with self._lock:
+            if not self.db_path.exists():
+                raise CollectionNotFound(str(self.path))
+            return [
+                (id, text, json.loads(metadata))
+                for id, text, metadata in self._conn.execute(sql, params)
+            ]
+
+    def get_vectors(self, ids: list[str]) -> dict[str, list[float]]:
+        with self._lock:
+            self.sync()
+            if self.dim is None:
+                return {}
+            labels = {}
+            for batch in batched(ids):
+                labels.update(
+                    self._conn.execute(
+                        f"SELECT id, label FROM item WHERE deleted = 0 AND id IN ({placeholders(batch)})",
+                        batch,
+                    ).fetchall()
+                )
+            vectors = self._vectors(list(labels.values()))
+            return {id: vector.tolist() for id, vector in zip(labels, vectors)}
+
+
+class HNSWClient(VectorDBBase):
+    """
+    Embedded vector backend: an in-process hnswlib index per collection on top
+    of memory-mapped vector files and SQLite metadata (see `HNSWCollection`),
+    without any external service. Collections live in HNSW_DATA_PATH.
+    """
+
+    supports_batch_search = True
+    # hnswlib "cosine" space returns 1 - cosine similarity
+    metric = "cosine_distance"
+
+    def __init__(self):
+        self.root = Path(HNSW_DATA_PATH)
+        self.root.mkdir(parents=True, exist_ok=True)
+        # Loaded collections by name, dropped on delete and reset
+        self._collections: dict[str, HNSWCollection] = {}
+        self._collections_lock = threading.Lock()
+
+    def _collection_path(self, collection_name: str) -> Path:
+        if COLLECTION_NAME_PATTERN.match(collection_name):
+            return self.root / collection_name
+        return self.root / hashlib.sha256(collection_name.encode()).hexdigest()
+
+    def _get_collection(
+        self, collection_name: str, create: bool = False
+    ) -> Optional[HNSWCollection]:
+        with self._collections_lock:
+            collection = self._collections.get(collection_name)
+            if collection is not None and not collection.db_path.exists():
+                # deleted by another process
+                self._collections.pop(collection_name).close()
+                collection = None
+
+            if collection is None:
+                path = self._collection_path(collection_name)
+                if not create and not (path / "items.db").exists():
+                    return None
+                try:
+                    collection = HNSWCollection(
+                        path, name=collection_name if create else None
+                    )
+                except CollectionNotFound:
+                    return None
+                self._collections[collection_name] = collection
+            return collection
+
+    def _invalidate_collection(self, collection_name: str) -> None:
+        with self._collections_lock:
+            collection = self._collections.pop(collection_name, None)
+        if collection is not None:
+            collection.close()
+
+    def has_collection(self, collection_name: str) -> bool:
+        return (self._collection_path(collection_name) / "items.db").exists()
+
+    def delete_collection(self, collection_name: str):
+        self._invalidate_collection(collection_name)
+        shutil.rmtree(self._collection_path(collection_name), ignore_errors=True)
+
+    def search(
+        self, collection_name: str, vectors: List[List[Union[float, int]]], limit: int
+    ) -> Optional[SearchResult]:
+        try:
+            collection = self._get_collection(collection_name)
+            if collection is None or not vectors:
+                return None
+            results = collection.search(np.asarray(vectors, dtype=np.float32), limit)
+        except CollectionNotFound:
+            self._invalidate_collection(collection_name)
+            return None
+        except Exception as e:
+            log.exception(f"Error searching HNSW collection {collection_name}: {e}")
+            return None
+
+        return SearchResult(
+            ids=[[row[0] for row in rows] for rows in results],
+            documents=[[row[1] for row in rows] for rows in results],
+            metadatas=[[row[2] for row in rows] for rows in results],
+            distances=[
+                [normalize_score(row[3], self.metric) for row in rows]
+                for rows in results
+            ],
+            metric=self.metric,
+        )
+
+    def query(
+        self, collection_name: str, filter: Dict, limit: Optional[int] = None
+    ) -> Optional[GetResult]:
+        try:
+            collection = self._get_collection(collection_name)
+            if collection is None:
+                return None
+            rows = collection.query(filter, limit)
+        except CollectionNotFound:
+            self._invalidate_collection(collection_name)
+            return None
+        except Exception as e:
+            log.exception(f"Error querying HNSW collection {collection_name}: {e}")
+            return None
+        return self._rows_to_get_result(rows)
+
+    def get(self, collection_name: str) -> Optional[GetResult]:
+        try:
+            collection = self._get_collection(collection_name)
+            if collection is None:
+                return None
+            rows = collection.query()
+        except CollectionNotFound:
+            self._invalidate_collection(collection_name)
+            return None
+        return self._rows_to_get_result(rows)
+
+    def get_vectors(
+        self, collection_name: str, ids: List[str]
+    ) -> Optional[Dict[str, List[float]]]:
+        try:
+            collection = self._get_collection(collection_name)
+            if collection is None:
+                return None
+            return collection.get_vectors(ids)
+        except Exception:
+            self._invalidate_collection(collection_name)
+            return None
+
+    def _rows_to_get_result(self, rows: list[tuple]) -> GetResult:
+        return GetResult(
+            ids=[[row[0] for row in rows]],
+            documents=[[row[1] for row in rows]],
+            metadatas=[[row[2] for row in rows]],
+        )
+
+    def insert(self, collection_name: str, items: List[VectorItem]):
+        self.upsert(collection_name, items)
+
+    def upsert(self, collection_name: str, items: List[VectorItem]):
+        try:
+            self._get_collection(collection_name, create=True).upsert(items)
+        except CollectionNotFound:
+            # deleted by another process while loaded, start over
+            self._invalidate_collection(collection_name)
+            self._get_collection(collection_name, create=True).upsert(items)
+
+    def delete(
+        self,
+        collection_name: str,
+        ids: Optional[List[str]] = None,
+        filter: Optional[Dict] = None,
+    ):
+        try:
+            collection = self._get_collection(collection_name)
+            if collection is not None:
+                collection.delete(ids=ids, filter=filter)
+        except CollectionNotFound:
+            self._invalidate_collection(collection_name)
+
+    def reset(self):
+        with self._collections_lock:
+            collections = list(self._collections.values())
+            self._collections.clear()
+        for collection in collections:
+            collection.close()
+        shutil.rmtree(self.root, ignore_errors=True)
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    def _collection_statuses(self) -> list[dict]:
+        statuses = []
+        for db_path in sorted(self.root.glob("*/items.db")):
+            try:
+                statuses.append(read_status(db_path))
+            except sqlite3.Error as e:
+                log.warning(
+                    f"Could not read HNSW collection {db_path.parent.name}: {e}"
+                )
+        return statuses
+
+    def get_index_status(self) -> Optional[Dict[str, Any]]:
+        return {
+            "backend": "hnsw",
+            "config": {
+                "path": str(self.root),
+                "dtype": HNSW_VECTOR_DTYPE,
+                "m": HNSW_M,
+                "ef_construction": HNSW_EF_CONSTRUCTION,
+                "ef_search": HNSW_EF_SEARCH,
+                "snapshot_interval": HNSW_SNAPSHOT_INTERVAL,
+            },
+            "collections": self._collection_statuses(),
+            "healthy": True,
+        }
+
+    def rebuild_index(self, collection_name: Optional[str] = None) -> bool:
+        """Compact and re-index one collection, or every collection with deleted items."""
+        if collection_name is not None:
+            collection_names = [collection_name]
+        else:
+            collection_names = [
+                status["name"]
+                for status in self._collection_statuses()
+                if status["deleted"]
+            ]
+
+        for name in collection_names:
+            collection = self._get_collection(name)
+            if collection is None:
+                raise ValueError(f"Collection {name} not found")
+            collection.compact()
+        return True
@@ -2,14 +2,18 @@ from pymilvus import MilvusClient as Client
 from pymilvus import FieldSchema, DataType
 import json
 import logging
+import math
 from typing import Optional
 
-from open_webui.retrieval.vector.utils import stringify_metadata
+import numpy as np
+
+from open_webui.retrieval.vector.utils import stringify_metadata, resolve_quantization
 from open_webui.retrieval.vector.main import (
     VectorDBBase,
     VectorItem,
     SearchResult,
     GetResult,
+    normalize_score,
 )
 from open_webui.config import (
     MILVUS_URI,
@@ -20,14 +24,28 @@ from open_webui.config import (
     MILVUS_HNSW_M,
     MILVUS_HNSW_EFCONSTRUCTION,
     MILVUS_IVF_FLAT_NLIST,
+    VECTOR_QUANTIZATION_OVERSAMPLING,
 )
 from open_webui.env import SRC_LOG_LEVELS
 
 log = logging.getLogger(__name__)
 log.setLevel(SRC_LOG_LEVELS["RAG"])
 
+# What search returns as "distance" for each metric type
+# https://milvus.io/docs/metric.md
+SEARCH_METRICS = {
+    "COSINE": "cosine_similarity",
+    "IP": "inner_product",
+    "L2": "l2_distance",
+}
+
 
 class MilvusClient(VectorDBBase):
+    supports_batch_search = True
+    metric = SEARCH_METRICS.get(MILVUS_METRIC_TYPE.upper(), "cosine_similarity")
+    # int8 collections are indexed with IVF_SQ8, rescored with the stored vectors
+    supported_quantization = ("none", "int8")
+
     def __init__(self):
         self.collection_prefix = "open_webui"
         if MILVUS_TOKEN is None:
@@ -70,10 +88,7 @@ class MilvusClient(VectorDBBase):
             _metadatas = []
             for item in match:
                 _ids.append(item.get("id"))
-                # normalize milvus score from [-1, 1] to [0, 1] range
-                # https://milvus.io/docs/de/metric.md
-                _dist = (item.get("distance") + 1.0) / 2.0
-                _distances.append(_dist)
+                _distances.append(normalize_score(item.get("distance"), self.metric))
                 _documents.append(item.get("entity", {}).get("data", {}).get("text"))
                 _metadatas.append(item.get("entity", {}).get("metadata"))
             ids.append(_ids)
@@ -86,10 +101,48 @@ class MilvusClient(VectorDBBase):
                 "distances": distances,
                 "documents": documents,
                 "metadatas": metadatas,
+                "metric": self.metric,
             }
         )
 
-    def _create_collection(self, collection_name: str, dimension: int):
+    def _rescore(self, vectors, result, limit: int) -> list:
+        # Exact scores of the IVF_SQ8 candidates, Milvus returns L2 squared
+        metric_type = MILVUS_METRIC_TYPE.upper()
+        rescored = []
+        for query, hits in zip(vectors, result):
+            hits = list(hits)
+            if not hits:
+                rescored.append([])
+                continue
+            query = np.asarray(query, dtype=np.float32)
+            stored = np.asarray(
+                [hit.get("entity", {}).get("vector") for hit in hits], dtype=np.float32
+            )
+            if metric_type == "L2":
+                scores = ((stored - query) ** 2).sum(axis=1)
+                order = np.argsort(scores, kind="stable")
+            else:
+                scores = stored @ query
+                if metric_type == "COSINE":
+                    scores /= np.maximum(
+                        np.linalg.norm(stored, axis=1) * np.linalg.norm(query), 1e-12
+                    )
+                order = np.argsort(-scores, kind="stable")
+            rescored.append(
+                [
+                    {
+                        "id": hits[idx].get("id"),
+                        "distance": float(scores[idx]),
+                        "entity": hits[idx].get("entity", {}),
+                    }
+                    for idx in order[:limit]
+                ]
+            )
+        return rescored
+
+    def _create_collection(
+        self, collection_name: str, dimension: int, quantization: str = "none"
+    ):
         schema = self.client.create_schema(
             auto_id=False,
             enable_dynamic_field=True,
@@ -116,6 +169,8 @@ class MilvusClient(VectorDBBase):
         # Use configurations from config.py
         index_type = MILVUS_INDEX_TYPE.upper()
         metric_type = MILVUS_METRIC_TYPE.upper()
+        if quantization == "int8":
+            index_type = "IVF_SQ8"
 
         log.info(f"Using Milvus index type: {index_type}, metric type: {metric_type}")
 
@@ -126,15 +181,15 @@ class MilvusClient(VectorDBBase):
                 "efConstruction": MILVUS_HNSW_EFCONSTRUCTION,
             }
             log.info(f"HNSW params: {index_creation_params}")
-        elif index_type == "IVF_FLAT":
+        elif index_type in ["IVF_FLAT", "IVF_SQ8"]:
             index_creation_params = {"nlist": MILVUS_IVF_FLAT_NLIST}
-            log.info(f"IVF_FLAT params: {index_creation_params}")
+            log.info(f"{index_type} params: {index_creation_params}")
         elif index_type in ["FLAT", "AUTOINDEX"]:
             log.info(f"Using {index_type} index with no specific build-time params.")
         else:
             log.warning(
                 f"Unsupported MILVUS_INDEX_TYPE: '{index_type}'. "
-                f"Supported types: HNSW, IVF_FLAT, FLAT, AUTOINDEX. "
+                f"Supported types: HNSW, IVF_FLAT, IVF_SQ8, FLAT, AUTOINDEX. "
                 f"Milvus will use its default for the collection if this type is not directly supported for index creation."
             )
             # For unsupported types, pass the type directly to Milvus; it might handle it or use a default.
@@ -174,10 +229,21 @@ class MilvusClient(VectorDBBase):
         self, collection_name: str, vectors: list[list[float | int]], limit: int
     ) -> Optional[SearchResult]:
         # Search for the nearest neighbor items based on the vectors and return 'limit' number of results.
+        quantization = resolve_quantization(self, collection_name)
         collection_name = collection_name.replace("-", "_")
         # For some index types like IVF_FLAT, search params like nprobe can be set.
         # Example: search_params = {"nprobe": 10} if using IVF_FLAT
         # For simplicity, not adding configurable search_params here, but could be extended.
+        if quantization == "int8" and limit:
+            # Oversample the quantized index and rescore with the stored vectors
+            result = self.client.search(
+                collection_name=f"{self.collection_prefix}_{collection_name}",
+                data=vectors,
+                limit=max(limit, math.ceil(limit * VECTOR_QUANTIZATION_OVERSAMPLING)),
+                output_fields=["data", "metadata", "vector"],
+            )
+            return self._result_to_search_result(self._rescore(vectors, result, limit))
+
         result = self.client.search(
             collection_name=f"{self.collection_prefix}_{collection_name}",
             data=vectors,
@@ -283,8 +349,27 @@ class MilvusClient(VectorDBBase):
         # This will use the paginated query logic.
         return self.query(collection_name=collection_name, filter={}, limit=None)
 
+    def get_vectors(
+        self, collection_name: str, ids: list[str]
+    ) -> Optional[dict[str, list[float]]]:
+        # Get the stored vectors of the given ids.
+        collection_name = collection_name.replace("-", "_")
+        try:
+            results = self.client.get(
+                collection_name=f"{self.collection_prefix}_{collection_name}",
+                ids=ids,
+                output_fields=["id", "vector"],
+            )
+            return {item["id"]: list(item["vector"]) for item in results}
+        except Exception as e:
+            log.exception(
+                f"Error getting vectors from {self.collection_prefix}_{collection_name}: {e}"
+            )
+            return None
+
     def insert(self, collection_name: str, items: list[VectorItem]):
         # Insert the items into the collection, if the collection does not exist, it will be created.
+        quantization = resolve_quantization(self, collection_name)
         collection_name = collection_name.replace("-", "_")
         if not self.client.has_collection(
             collection_name=f"{self.collection_prefix}_{collection_name}"
@@ -300,7 +385,9 @@ class MilvusClient(VectorDBBase):
                     "Cannot create Milvus collection without items to determine vector dimension."
                 )
             self._create_collection(
-                collection_name=collection_name, dimension=len(items[0]["vector"])
+                collection_name=collection_name,
+                dimension=len(items[0]["vector"]),
+                quantization=quantization,
             )
 
         log.info(
@@ -321,6 +408,7 @@ class MilvusClient(VectorDBBase):
 
     def upsert(self, collection_name: str, items: list[VectorItem]):
         # Update the items in the collection, if the items are not present, insert them. If the collection does not exist, it will be created.
+        quantization = resolve_quantization(self, collection_name)
         collection_name = collection_name.replace("-", "_")
         if not self.client.has_collection(
             collection_name=f"{self.collection_prefix}_{collection_name}"
@@ -336,7 +424,9 @@ class MilvusClient(VectorDBBase):
                     "Cannot create Milvus collection for upsert without items to determine vector dimension."
                 )
             self._create_collection(
-                collection_name=collection_name, dimension=len(items[0]["vector"])
+                collection_name=collection_name,
+                dimension=len(items[0]["vector"]),
+                quantization=quantization,
             )
 
         log.info(
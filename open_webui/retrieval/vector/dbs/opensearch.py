@@ -7,6 +7,7 @@ from open_webui.retrieval.vector.main import (
     VectorDBBase,
     VectorItem,
     SearchResult,
+    normalize_score,
     GetResult,
 )
 from open_webui.config import (
@@ -19,6 +20,8 @@ from open_webui.config import (
 
 
 class OpenSearchClient(VectorDBBase):
+    metric = "cosine_similarity"
+
     def __init__(self):
         self.index_prefix = "open_webui"
         self.client = OpenSearch(
@@ -57,7 +60,8 @@ class OpenSearchClient(VectorDBBase):
 
         for hit in result["hits"]["hits"]:
             ids.append(hit["_id"])
-            distances.append(hit["_score"])
+            # script_score can't be negative, the script adds 1 to the similarity
+            distances.append(normalize_score(hit["_score"] - 1.0, self.metric))
             documents.append(hit["_source"].get("text"))
             metadatas.append(hit["_source"].get("metadata"))
 
@@ -66,6 +70,7 @@ class OpenSearchClient(VectorDBBase):
             distances=[distances],
             documents=[documents],
             metadatas=[metadatas],
+            metric=self.metric,
         )
 
     def _create_index(self, collection_name: str, dimension: int):
@@ -126,7 +131,7 @@ class OpenSearchClient(VectorDBBase):
                     "script_score": {
                         "query": {"match_all": {}},
                         "script": {
-                            "source": "(cosineSimilarity(params.query_value, doc[params.field]) + 1.0) / 2.0",
+                            "source": "cosineSimilarity(params.query_value, doc[params.field]) + 1.0",
                             "params": {
                                 "field": "vector",
                                 "query_value": vectors[0],
@@ -41,6 +41,7 @@ from open_webui.retrieval.vector.main import (
     VectorItem,
     SearchResult,
     GetResult,
+    normalize_score,
 )
 
 from open_webui.config import (
@@ -73,6 +74,9 @@ class Oracle23aiClient(VectorDBBase):
         pool: Connection pool for Oracle database connections
     """
 
+    supports_batch_search = True
+    metric = "cosine_distance"
+
     def __init__(self) -> None:
         """
         Initialize the Oracle23aiClient with a connection pool.
@@ -528,7 +532,8 @@ class Oracle23aiClient(VectorDBBase):
         """
         Search for similar vectors in the database.
 
-        Performs vector similarity search using cosine distance.
+        Performs vector similarity search using cosine distance, returned as
+        normalized similarities (1 best, 0 worst).
 
         Args:
             collection_name (str): Name of the collection to search
@@ -545,7 +550,7 @@ class Oracle23aiClient(VectorDBBase):
             >>> if results:
             ...     log.info(f"Found {len(results.ids[0])} matches")
             ...     for i, (id, dist) in enumerate(zip(results.ids[0], results.distances[0])):
-            ...         log.info(f"Match {i+1}: id={id}, distance={dist}")
+            ...         log.info(f"Match {i+1}: id={id}, score={dist}")
         """
         log.info(
             f"Searching items from collection '{collection_name}' with limit {limit}."
@@ -601,14 +606,18 @@ class Oracle23aiClient(VectorDBBase):
                                 else row[2]
                             )
                             metadatas[qid].append(self._json_to_metadata(metadata_str))
-                            distances[qid].append(float(row[3]))
+                            distances[qid].append(normalize_score(row[3], self.metric))
 
             log.info(
                 f"Search completed. Found {sum(len(ids[i]) for i in range(num_queries))} total results."
             )
 
             return SearchResult(
-                ids=ids, distances=distances, documents=documents, metadatas=metadatas
+                ids=ids,
+                distances=distances,
+                documents=documents,
+                metadatas=metadatas,
+                metric=self.metric,
             )
 
         except Exception as e:
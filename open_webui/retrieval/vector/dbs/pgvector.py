@@ -1,6 +1,8 @@
 from typing import Optional, List, Dict, Any
+import hashlib
 import logging
 import json
+import math
 from sqlalchemy import (
     func,
     literal,
@@ -22,17 +24,18 @@ from sqlalchemy.pool import NullPool, QueuePool
 
 from sqlalchemy.orm import declarative_base, scoped_session, sessionmaker
 from sqlalchemy.dialects.postgresql import JSONB, array
-from pgvector.sqlalchemy import Vector
+from pgvector.sqlalchemy import BIT, HALFVEC, Vector
 from sqlalchemy.ext.mutable import MutableDict
 from sqlalchemy.exc import NoSuchTableError
 
 
-from open_webui.retrieval.vector.utils import stringify_metadata
+from open_webui.retrieval.vector.utils import stringify_metadata, resolve_quantization
 from open_webui.retrieval.vector.main import (
     VectorDBBase,
     VectorItem,
     SearchResult,
     GetResult,
+    normalize_score,
 )
 from open_webui.config import (
     PGVECTOR_DB_URL,
@@ -43,6 +46,19 @@ from open_webui.config import (
     PGVECTOR_POOL_MAX_OVERFLOW,
     PGVECTOR_POOL_TIMEOUT,
     PGVECTOR_POOL_RECYCLE,
+    PGVECTOR_INSERT_BATCH_SIZE,
+    PGVECTOR_INDEX_METHOD,
+    PGVECTOR_INDEX_OPCLASS,
+    PGVECTOR_HNSW_M,
+    PGVECTOR_HNSW_EF_CONSTRUCTION,
+    PGVECTOR_HNSW_EF_SEARCH,
+    PGVECTOR_HNSW_ITERATIVE_SCAN,
+    PGVECTOR_IVFFLAT_LISTS,
+    PGVECTOR_IVFFLAT_PROBES,
+    PGVECTOR_PARTIAL_INDEX_MIN_ROWS,
+    PGVECTOR_QUANTIZED_INDEX_MIN_ROWS,
+    VECTOR_QUANTIZATION_COLLECTIONS,
+    VECTOR_QUANTIZATION_OVERSAMPLING,
 )
 
 from open_webui.env import SRC_LOG_LEVELS
@@ -54,6 +70,74 @@ log = logging.getLogger(__name__)
 log.setLevel(SRC_LOG_LEVELS["RAG"])
 
 
+# Distance used for ordering must match the index opclass for the index to be used
+DISTANCE_FUNCTIONS = {
+    "vector_cosine_ops": "cosine_distance",
+    "vector_l2_ops": "l2_distance",
+    "vector_ip_ops": "max_inner_product",
+}
+if PGVECTOR_INDEX_OPCLASS not in DISTANCE_FUNCTIONS:
+    raise ValueError(
+        f"Unsupported PGVECTOR_INDEX_OPCLASS {PGVECTOR_INDEX_OPCLASS}, expected one of {', '.join(DISTANCE_FUNCTIONS)}."
+    )
+if PGVECTOR_INDEX_METHOD not in ("hnsw", "ivfflat", "none"):
+    raise ValueError(
+        f"Unsupported PGVECTOR_INDEX_METHOD {PGVECTOR_INDEX_METHOD}, expected hnsw, ivfflat or none."
+    )
+DISTANCE_FUNCTION = DISTANCE_FUNCTIONS[PGVECTOR_INDEX_OPCLASS]
+
+
+# Metric of the distance each operator returns
+# https://github.com/pgvector/pgvector?tab=readme-ov-file#querying
+SEARCH_METRICS = {
+    "cosine_distance": "cosine_distance",
+    "l2_distance": "l2_distance",
+    # <#> returns the negative inner product
+    "max_inner_product": "negative_inner_product",
+}
+
+
+def get_index_expression(quantization: str) -> str:
+    """
+    Indexed expression and operator class for a storage mode. The table keeps
+    the full precision vectors for rescoring, halfvec and bit indexes hold 2 and
+    32 times smaller copies.
+    """
+    if quantization == "half":
+        opclass = PGVECTOR_INDEX_OPCLASS.replace("vector_", "halfvec_", 1)
+        return f"(vector::halfvec({VECTOR_LENGTH})) {opclass}"
+    if quantization == "binary":
+        return f"(binary_quantize(vector)::bit({VECTOR_LENGTH})) bit_hamming_ops"
+    return f"vector {PGVECTOR_INDEX_OPCLASS}"
+
+
+def get_index_distance(vector, query_vector, quantization: str):
+    """Distance ordered by the index of a storage mode, same expression as `get_index_expression`."""
+    if quantization == "half":
+        return getattr(cast(vector, HALFVEC(VECTOR_LENGTH)), DISTANCE_FUNCTION)(
+            cast(query_vector, HALFVEC(VECTOR_LENGTH))
+        )
+    if quantization == "binary":
+        return cast(func.binary_quantize(vector), BIT(VECTOR_LENGTH)).hamming_distance(
+            cast(func.binary_quantize(query_vector), BIT(VECTOR_LENGTH))
+        )
+    return getattr(vector, DISTANCE_FUNCTION)(query_vector)
+
+
+def quote_literal(value: str) -> str:
+    return "'" + str(value).replace("'", "''") + "'"
+
+
+COLLECTION_INDEX_PREFIX = "idx_document_chunk_vector_c_"
+# Collections created per uploaded file, see routers/retrieval.py
+PER_FILE_COLLECTION_PREFIX = "file-"
+
+
+def get_collection_index_name(collection_name: str) -> str:
+    digest = hashlib.md5(collection_name.encode()).hexdigest()[:16]
+    return f"{COLLECTION_INDEX_PREFIX}{digest}"
+
+
 def pgcrypto_encrypt(val, key):
     return func.pgp_sym_encrypt(val, literal(key))
 
@@ -78,7 +162,27 @@ class DocumentChunk(Base):
 
 
 class PgvectorClient(VectorDBBase):
+    supports_batch_search = True
+    metric = SEARCH_METRICS[DISTANCE_FUNCTION]
+    # halfvec and bit expression indexes, rescored with the stored vectors
+    supported_quantization = ("none", "half", "binary")
+
     def __init__(self) -> None:
+        self.insert_batch_size = PGVECTOR_INSERT_BATCH_SIZE
+        # Storage mode of the global index, large collections configured
+        # otherwise get a partial index of their own from rebuild_index
+        self.quantization = resolve_quantization(self, None)
+        for prefix, mode in VECTOR_QUANTIZATION_COLLECTIONS.items():
+            if mode != self.quantization and (
+                prefix.startswith(PER_FILE_COLLECTION_PREFIX)
+                or PER_FILE_COLLECTION_PREFIX.startswith(prefix)
+            ):
+                log.warning(
+                    f"VECTOR_QUANTIZATION_COLLECTIONS prefix {prefix!r} matches the "
+                    f"per-file collections, pgvector only indexes collections with "
+                    f"at least {PGVECTOR_QUANTIZED_INDEX_MIN_ROWS} rows by their own "
+                    f"storage mode, smaller ones are searched by scanning their rows"
+                )
 
         # if no pgvector uri, use the existing database connection
         if not PGVECTOR_DB_URL:
@@ -131,13 +235,12 @@ class PgvectorClient(VectorDBBase):
             connection = self.session.connection()
             Base.metadata.create_all(bind=connection)
 
-            # Create an index on the vector column if it doesn't exist
-            self.session.execute(
-                text(
-                    "CREATE INDEX IF NOT EXISTS idx_document_chunk_vector "
-                    "ON document_chunk USING ivfflat (vector vector_cosine_ops) WITH (lists = 100);"
+            # Create an ANN index on the vector column unless one already exists;
+            # switching methods on a populated table goes through rebuild_index
+            if PGVECTOR_INDEX_METHOD != "none" and not self.get_vector_indexes():
+                self.session.execute(
+                    text(self.get_vector_index_sql("idx_document_chunk_vector"))
                 )
-            )
             self.session.execute(
                 text(
                     "CREATE INDEX IF NOT EXISTS idx_document_chunk_collection_name "
@@ -151,6 +254,196 @@ class PgvectorClient(VectorDBBase):
             log.exception(f"Error during initialization: {e}")
             raise
 
+    def get_vector_index_sql(
+        self,
+        index_name: str,
+        collection_name: Optional[str] = None,
+        concurrently: bool = False,
+    ) -> str:
+        if PGVECTOR_INDEX_METHOD == "hnsw":
+            params = f"m = {PGVECTOR_HNSW_M}, ef_construction = {PGVECTOR_HNSW_EF_CONSTRUCTION}"
+        else:
+            params = f"lists = {PGVECTOR_IVFFLAT_LISTS}"
+
+        quantization = (
+            self.quantization
+            if collection_name is None
+            else resolve_quantization(self, collection_name)
+        )
+        sql = (
+            f"CREATE INDEX {'CONCURRENTLY ' if concurrently else ''}IF NOT EXISTS {index_name} "
+            f"ON document_chunk USING {PGVECTOR_INDEX_METHOD} ({get_index_expression(quantization)}) "
+            f"WITH ({params})"
+        )
+        if collection_name is not None:
+            sql += " WHERE collection_name = " + quote_literal(collection_name)
+        return sql
+
+    def get_vector_indexes(self) -> List[Dict[str, Any]]:
+        """List the ANN indexes on document_chunk with their usage statistics."""
+        rows = self.session.execute(
+            text(
+                """
+                SELECT
+                    s.indexrelname AS name,
+                    am.amname AS method,
+                    pg_get_indexdef(s.indexrelid) AS definition,
+                    ix.indisvalid AS valid,
+                    pg_relation_size(s.indexrelid) AS size_bytes,
+                    s.idx_scan AS scans
+                FROM pg_stat_user_indexes s
+                JOIN pg_index ix ON ix.indexrelid = s.indexrelid
+                JOIN pg_class c ON c.oid = s.indexrelid
+                JOIN pg_am am ON am.oid = c.relam
+                WHERE s.relname = 'document_chunk'
+                  AND am.amname IN ('hnsw', 'ivfflat')
+                ORDER BY s.indexrelname
+                """
+            )
+        ).all()
+        return [dict(row._mapping) for row in rows]
+
+    def get_index_status(self) -> Optional[Dict[str, Any]]:
+        try:
+            indexes = self.get_vector_indexes()
+            table = self.session.execute(
+                text(
+                    """
+                    SELECT n_live_tup, n_dead_tup, seq_scan, idx_scan,
+                           last_analyze, last_autoanalyze
+                    FROM pg_stat_user_tables
+                    WHERE relname = 'document_chunk'
+                    """
+                )
+            ).first()
+            self.session.rollback()  # read-only transaction
+
+            table = dict(table._mapping) if table else {}
+            rows = table.get("n_live_tup") or 0
+            return {
+                "backend": "pgvector",
+                "config": {
+                    "method": PGVECTOR_INDEX_METHOD,
+                    "opclass": PGVECTOR_INDEX_OPCLASS,
+                    "hnsw_m": PGVECTOR_HNSW_M,
+                    "hnsw_ef_construction": PGVECTOR_HNSW_EF_CONSTRUCTION,
+                    "hnsw_ef_search": PGVECTOR_HNSW_EF_SEARCH,
+                    "hnsw_iterative_scan": PGVECTOR_HNSW_ITERATIVE_SCAN or None,
+                    "ivfflat_lists": PGVECTOR_IVFFLAT_LISTS,
+                    "ivfflat_probes": PGVECTOR_IVFFLAT_PROBES or None,
+                    "partial_index_min_rows": PGVECTOR_PARTIAL_INDEX_MIN_ROWS,
+                    "quantization": self.quantization,
+                },
+                "table": table,
+                "indexes": indexes,
+                "healthy": PGVECTOR_INDEX_METHOD == "none"
+                or any(
+                    index["valid"]
+                    and index["method"] == PGVECTOR_INDEX_METHOD
+                    and get_index_expression(self.quantization).split()[-1]
+                    in index["definition"]
+                    for index in indexes
+                ),
+                # pgvector recommends rows / 1000 lists up to 1M rows, sqrt(rows) above
+                "recommended_ivfflat_lists": max(
+                    1, rows // 1000 if rows <= 1_000_000 else int(rows**0.5)
+                ),
+            }
+        except Exception as e:
+            self.session.rollback()
+            log.exception(f"Error reading index status: {e}")
+            return None
+
+    def rebuild_index(self, collection_name: Optional[str] = None) -> bool:
+        """
+        Rebuild the ANN index with the configured method, opclass and storage
+        mode without blocking writes. With ``collection_name`` only that
+        collection's partial index is (re)built; otherwise the global index is
+        replaced and partial indexes are created for collections above
+        PGVECTOR_PARTIAL_INDEX_MIN_ROWS, or above PGVECTOR_QUANTIZED_INDEX_MIN_ROWS
+        with a storage mode of their own.
+        """
+        if PGVECTOR_INDEX_METHOD == "none":
+            return False
+
+        # CREATE/DROP INDEX CONCURRENTLY cannot run inside a transaction
+        engine = self.session.get_bind()
+        with engine.connect().execution_options(
+            isolation_level="AUTOCOMMIT"
+        ) as connection:
+            if collection_name is not None:
+                collection_names = [collection_name]
+            else:
+                self.swap_index(connection, "idx_document_chunk_vector", None)
+
+                collection_names = []
+                if PGVECTOR_PARTIAL_INDEX_MIN_ROWS > 0:
+                    collection_names = [
+                        row.collection_name
+                        for row in connection.execute(
+                            text(
+                                "SELECT collection_name FROM document_chunk "
+                                "GROUP BY collection_name HAVING count(*) >= :min_rows"
+                            ),
+                            {"min_rows": PGVECTOR_PARTIAL_INDEX_MIN_ROWS},
+                        )
+                    ]
+                if VECTOR_QUANTIZATION_COLLECTIONS:
+                    collection_names += [
+                        row.collection_name
+                        for row in connection.execute(
+                            text(
+                                "SELECT collection_name FROM document_chunk "
+                                "GROUP BY collection_name HAVING count(*) >= :min_rows"
+                            ),
+                            {"min_rows": max(1, PGVECTOR_QUANTIZED_INDEX_MIN_ROWS)},
+                        )
+                        if row.collection_name not in collection_names
+                        and resolve_quantization(self, row.collection_name)
+                        != self.quantization
+                    ]
+
+            for name in collection_names:
+                self.swap_index(connection, get_collection_index_name(name), name)
+
+        log.info(
+            f"Rebuilt {PGVECTOR_INDEX_METHOD} index ({PGVECTOR_INDEX_OPCLASS}) "
+            f"for {collection_name or 'document_chunk'} and {len(collection_names)} collection(s)."
+        )
+        return True
+
+    def swap_index(
+        self, connection, index_name: str, collection_name: Optional[str]
+    ) -> None:
+        # Build the replacement next to the live index, then swap them
+        new_index_name = f"{index_name}_new"
+        connection.execute(text(f"DROP INDEX CONCURRENTLY IF EXISTS {new_index_name}"))
+        connection.execute(
+            text(
+                self.get_vector_index_sql(
+                    new_index_name, collection_name, concurrently=True
+                )
+            )
+        )
+        connection.execute(text(f"DROP INDEX CONCURRENTLY IF EXISTS {index_name}"))
+        connection.execute(text(f"ALTER INDEX {new_index_name} RENAME TO {index_name}"))
+
+    def set_search_parameters(self, limit: Optional[int]) -> None:
+        # SET LOCAL only lasts for the current (read-only) transaction
+        ef_search = max(PGVECTOR_HNSW_EF_SEARCH, limit or 0)
+        self.session.execute(text(f"SET LOCAL hnsw.ef_search = {int(ef_search)}"))
+        if PGVECTOR_HNSW_ITERATIVE_SCAN:
+            self.session.execute(
+                text(
+                    "SET LOCAL hnsw.iterative_scan = "
+                    + quote_literal(PGVECTOR_HNSW_ITERATIVE_SCAN)
+                )
+            )
+        if PGVECTOR_IVFFLAT_PROBES > 0:
+            self.session.execute(
+                text(f"SET LOCAL ivfflat.probes = {int(PGVECTOR_IVFFLAT_PROBES)}")
+            )
+
     def check_vector_length(self) -> None:
         """
         Check if the VECTOR_LENGTH matches the existing vector column dimension in the database.
@@ -197,56 +490,121 @@ class PgvectorClient(VectorDBBase):
             vector = vector[:VECTOR_LENGTH]
         return vector
 
-    def insert(self, collection_name: str, items: List[VectorItem]) -> None:
-        try:
-            if PGVECTOR_PGCRYPTO:
-                for item in items:
-                    vector = self.adjust_vector_length(item["vector"])
-                    # Use raw SQL for BYTEA/pgcrypto
-                    # Ensure metadata is converted to its JSON text representation
-                    json_metadata = json.dumps(item["metadata"])
-                    self.session.execute(
-                        text(
-                            """
-                            INSERT INTO document_chunk
-                            (id, vector, collection_name, text, vmetadata)
-                            VALUES (
-                                :id, :vector, :collection_name,
-                                pgp_sym_encrypt(:text, :key),
-                                pgp_sym_encrypt(:metadata_text, :key)
-                            )
-                            ON CONFLICT (id) DO NOTHING
-                        """
-                        ),
-                        {
-                            "id": item["id"],
-                            "vector": vector,
-                            "collection_name": collection_name,
-                            "text": item["text"],
-                            "metadata_text": json_metadata,
-                            "key": PGVECTOR_PGCRYPTO_KEY,
-                        },
+    def write_items(
+        self, collection_name: str, items: List[VectorItem], upsert: bool = False
+    ) -> None:
+        """
+        Write ``items`` with one multi-row statement per batch of
+        ``insert_batch_size`` items. Rows are unnested from array parameters so
+        a batch is a single round trip, including pgcrypto encryption which is
+        applied server-side per row.
+        """
+        if PGVECTOR_PGCRYPTO:
+            text_expr = "pgp_sym_encrypt(t.text, :key)"
+            metadata_expr = "pgp_sym_encrypt(t.metadata_text, :key)"
+        else:
+            text_expr = "t.text"
+            metadata_expr = "CAST(t.metadata_text AS jsonb)"
+
+        if upsert:
+            conflict_clause = """
+                ON CONFLICT (id) DO UPDATE SET
+                  vector = EXCLUDED.vector,
+                  collection_name = EXCLUDED.collection_name,
+                  text = EXCLUDED.text,
+                  vmetadata = EXCLUDED.vmetadata
+            """
+        else:
+            conflict_clause = "ON CONFLICT (id) DO NOTHING"
+
+        stmt = text(
+            f"""
+            INSERT INTO document_chunk
+            (id, vector, collection_name, text, vmetadata)
+            SELECT
+                t.id,
+                CAST(t.vector AS vector({VECTOR_LENGTH})),
+                :collection_name,
+                {text_expr},
+                {metadata_expr}
+            FROM unnest(
+                CAST(:ids AS text[]),
+                CAST(:vectors AS text[]),
+                CAST(:texts AS text[]),
+                CAST(:metadata_texts AS text[])
+            ) AS t(id, vector, text, metadata_text)
+            {conflict_clause}
+            """
+        )
+
+        batch_size = max(1, self.insert_batch_size)
+        for start in range(0, len(items), batch_size):
+            batch = items[start : start + batch_size]
+            params = {
+                "collection_name": collection_name,
+                "ids": [item["id"] for item in batch],
+                "vectors": [
+                    "["
+                    + ",".join(map(str, self.adjust_vector_length(item["vector"])))
+                    + "]"
+                    for item in batch
+                ],
+                "texts": [item["text"] for item in batch],
+                "metadata_texts": [
+                    json.dumps(
+                        item["metadata"]
+                        if PGVECTOR_PGCRYPTO
+                        else stringify_metadata(item["metadata"])
                     )
-                self.session.commit()
-                log.info(f"Encrypted & inserted {len(items)} into '{collection_name}'")
+                    for item in batch
+                ],
+            }
+            if PGVECTOR_PGCRYPTO:
+                params["key"] = PGVECTOR_PGCRYPTO_KEY
 
-            else:
-                new_items = []
-                for item in items:
-                    vector = self.adjust_vector_length(item["vector"])
-                    new_chunk = DocumentChunk(
-                        id=item["id"],
-                        vector=vector,
-                        collection_name=collection_name,
-                        text=item["text"],
-                        vmetadata=stringify_metadata(item["metadata"]),
-                    )
-                    new_items.append(new_chunk)
-                self.session.bulk_save_objects(new_items)
-                self.session.commit()
-                log.info(
-                    f"Inserted {len(new_items)} items into collection '{collection_name}'."
+            self.session.execute(stmt, params)
+
+    def drop_collection_indexes(self, collection_name: Optional[str] = None) -> None:
+        """
+        Drop the partial index of a deleted collection, or of every collection,
+        without blocking writes. Deleting a collection's rows keeps its index.
+        """
+        pattern = (
+            get_collection_index_name(collection_name)
+            if collection_name is not None
+            else COLLECTION_INDEX_PREFIX + "%"
+        )
+        index_names = [
+            row.indexname
+            for row in self.session.execute(
+                text(
+                    "SELECT indexname FROM pg_indexes "
+                    "WHERE tablename = 'document_chunk' AND indexname LIKE :pattern"
+                ),
+                # "_" is a LIKE wildcard
+                {"pattern": pattern.replace("_", "\\_")},
+            )
+        ]
+        self.session.rollback()  # read-only transaction
+        if not index_names:
+            return
+
+        engine = self.session.get_bind()
+        with engine.connect().execution_options(
+            isolation_level="AUTOCOMMIT"
+        ) as connection:
+            for index_name in index_names:
+                connection.execute(
+                    text(f"DROP INDEX CONCURRENTLY IF EXISTS {index_name}")
                 )
+
+    def insert(self, collection_name: str, items: List[VectorItem]) -> None:
+        try:
+            self.write_items(collection_name, items)
+            self.session.commit()
+            log.info(
+                f"Inserted {len(items)} items into collection '{collection_name}'."
+            )
         except Exception as e:
             self.session.rollback()
             log.exception(f"Error during insert: {e}")
@@ -254,66 +612,11 @@ class PgvectorClient(VectorDBBase):
 
     def upsert(self, collection_name: str, items: List[VectorItem]) -> None:
         try:
-            if PGVECTOR_PGCRYPTO:
-                for item in items:
-                    vector = self.adjust_vector_length(item["vector"])
-                    json_metadata = json.dumps(item["metadata"])
-                    self.session.execute(
-                        text(
-                            """
-                            INSERT INTO document_chunk
-                            (id, vector, collection_name, text, vmetadata)
-                            VALUES (
-                                :id, :vector, :collection_name,
-                                pgp_sym_encrypt(:text, :key),
-                                pgp_sym_encrypt(:metadata_text, :key)
-                            )
-                            ON CONFLICT (id) DO UPDATE SET
-                              vector = EXCLUDED.vector,
-                              collection_name = EXCLUDED.collection_name,
-                              text = EXCLUDED.text,
-                              vmetadata = EXCLUDED.vmetadata
-                        """
-                        ),
-                        {
-                            "id": item["id"],
-                            "vector": vector,
-                            "collection_name": collection_name,
-                            "text": item["text"],
-                            "metadata_text": json_metadata,
-                            "key": PGVECTOR_PGCRYPTO_KEY,
-                        },
-                    )
-                self.session.commit()
-                log.info(f"Encrypted & upserted {len(items)} into '{collection_name}'")
-            else:
-                for item in items:
-                    vector = self.adjust_vector_length(item["vector"])
-                    existing = (
-                        self.session.query(DocumentChunk)
-                        .filter(DocumentChunk.id == item["id"])
-                        .first()
-                    )
-                    if existing:
-                        existing.vector = vector
-                        existing.text = item["text"]
-                        existing.vmetadata = stringify_metadata(item["metadata"])
-                        existing.collection_name = (
-                            collection_name  # Update collection_name if necessary
-                        )
-                    else:
-                        new_chunk = DocumentChunk(
-                            id=item["id"],
-                            vector=vector,
-                            collection_name=collection_name,
-                            text=item["text"],
-                            vmetadata=stringify_metadata(item["metadata"]),
-                        )
-                        self.session.add(new_chunk)
-                self.session.commit()
-                log.info(
-                    f"Upserted {len(items)} items into collection '{collection_name}'."
-                )
+            self.write_items(collection_name, items, upsert=True)
+            self.session.commit()
+            log.info(
+                f"Upserted {len(items)} items into collection '{collection_name}'."
+            )
         except Exception as e:
             self.session.rollback()
             log.exception(f"Error during upsert: {e}")
@@ -364,22 +667,32 @@ class PgvectorClient(VectorDBBase):
             else:
                 result_fields.append(DocumentChunk.text)
                 result_fields.append(DocumentChunk.vmetadata)
-            result_fields.append(
-                (DocumentChunk.vector.cosine_distance(query_vectors.c.q_vector)).label(
-                    "distance"
-                )
+            distance = getattr(DocumentChunk.vector, DISTANCE_FUNCTION)(
+                query_vectors.c.q_vector
             )
+            result_fields.append(distance.label("distance"))
+
+            # Quantized collections fetch more candidates through their compact
+            # index, ordered below by the full precision distance and cut to limit
+            quantization = resolve_quantization(self, collection_name)
+            candidates = limit
+            if quantization != "none" and limit is not None:
+                candidates = max(
+                    limit, math.ceil(limit * VECTOR_QUANTIZATION_OVERSAMPLING)
+                )
 
             # Build the lateral subquery for each query vector
             subq = (
                 select(*result_fields)
                 .where(DocumentChunk.collection_name == collection_name)
                 .order_by(
-                    (DocumentChunk.vector.cosine_distance(query_vectors.c.q_vector))
+                    get_index_distance(
+                        DocumentChunk.vector, query_vectors.c.q_vector, quantization
+                    )
                 )
             )
-            if limit is not None:
-                subq = subq.limit(limit)
+            if candidates is not None:
+                subq = subq.limit(candidates)
             subq = subq.lateral("result")
 
             # Build the main query by joining query_vectors and the lateral subquery
@@ -396,6 +709,7 @@ class PgvectorClient(VectorDBBase):
                 .order_by(query_vectors.c.qid, subq.c.distance)
             )
 
+            self.set_search_parameters(candidates)
             result_proxy = self.session.execute(stmt)
             results = result_proxy.all()
 
@@ -410,20 +724,25 @@ class PgvectorClient(VectorDBBase):
                     distances=distances,
                     documents=documents,
                     metadatas=metadatas,
+                    metric=self.metric,
                 )
 
             for row in results:
                 qid = int(row.qid)
+                if limit is not None and len(ids[qid]) >= limit:
+                    continue
                 ids[qid].append(row.id)
-                # normalize and re-orders pgvec distance from [2, 0] to [0, 1] score range
-                # https://github.com/pgvector/pgvector?tab=readme-ov-file#querying
-                distances[qid].append((2.0 - row.distance) / 2.0)
+                distances[qid].append(normalize_score(row.distance, self.metric))
                 documents[qid].append(row.text)
                 metadatas[qid].append(row.vmetadata)
 
             self.session.rollback()  # read-only transaction
             return SearchResult(
-                ids=ids, distances=distances, documents=documents, metadatas=metadatas
+                ids=ids,
+                distances=distances,
+                documents=documents,
+                metadatas=metadatas,
+                metric=self.metric,
             )
         except Exception as e:
             self.session.rollback()
@@ -534,6 +853,23 @@ class PgvectorClient(VectorDBBase):
             log.exception(f"Error during get: {e}")
             return None
 
+    def get_vectors(
+        self, collection_name: str, ids: List[str]
+    ) -> Optional[Dict[str, List[float]]]:
+        # Stored vectors are zero padded to VECTOR_LENGTH
+        try:
+            stmt = select(DocumentChunk.id, DocumentChunk.vector).where(
+                DocumentChunk.collection_name == collection_name,
+                DocumentChunk.id.in_(ids),
+            )
+            results = self.session.execute(stmt).all()
+            self.session.rollback()  # read-only transaction
+            return {row.id: list(row.vector) for row in results}
+        except Exception as e:
+            self.session.rollback()
+            log.exception(f"Error during get_vectors: {e}")
+            return None
+
     def delete(
         self,
         collection_name: str,
@@ -582,6 +918,7 @@ class PgvectorClient(VectorDBBase):
             log.info(
                 f"Reset complete. Deleted {deleted} items from 'document_chunk' table."
             )
+            self.drop_collection_indexes()
         except Exception as e:
             self.session.rollback()
             log.exception(f"Error during reset: {e}")
@@ -607,4 +944,8 @@ class PgvectorClient(VectorDBBase):
 
     def delete_collection(self, collection_name: str) -> None:
         self.delete(collection_name)
+        try:
+            self.drop_collection_indexes(collection_name)
+        except Exception as e:
+            log.warning(f"Error dropping index of collection '{collection_name}': {e}")
         log.info(f"Collection '{collection_name}' deleted.")
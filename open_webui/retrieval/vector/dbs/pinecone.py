@@ -22,6 +22,7 @@ from open_webui.retrieval.vector.main import (
     VectorItem,
     SearchResult,
     GetResult,
+    normalize_score,
 )
 from open_webui.config import (
     PINECONE_API_KEY,
@@ -41,6 +42,14 @@ BATCH_SIZE = 100  # Recommended batch size for Pinecone operations
 log = logging.getLogger(__name__)
 log.setLevel(SRC_LOG_LEVELS["RAG"])
 
+# What a match "score" is for each index metric
+# https://docs.pinecone.io/guides/index-data/indexing-overview#similarity-metrics
+SEARCH_METRICS = {
+    "cosine": "cosine_similarity",
+    "dotproduct": "inner_product",
+    "euclidean": "l2_distance",
+}
+
 
 class PineconeClient(VectorDBBase):
     def __init__(self):
@@ -54,7 +63,8 @@ class PineconeClient(VectorDBBase):
         self.environment = PINECONE_ENVIRONMENT
         self.index_name = PINECONE_INDEX_NAME
         self.dimension = PINECONE_DIMENSION
-        self.metric = PINECONE_METRIC
+        self.index_metric = PINECONE_METRIC
+        self.metric = SEARCH_METRICS.get(PINECONE_METRIC.lower(), "cosine_similarity")
         self.cloud = PINECONE_CLOUD
 
         # Initialize Pinecone client for improved performance
@@ -111,7 +121,7 @@ class PineconeClient(VectorDBBase):
                 self.client.create_index(
                     name=self.index_name,
                     dimension=self.dimension,
-                    metric=self.metric,
+                    metric=self.index_metric,
                     spec=ServerlessSpec(cloud=self.cloud, region=self.environment),
                 )
                 log.info(f"Successfully created Pinecone index '{self.index_name}'")
@@ -194,18 +204,6 @@ class PineconeClient(VectorDBBase):
         """Get the collection name with prefix."""
         return f"{self.collection_prefix}_{collection_name}"
 
-    def _normalize_distance(self, score: float) -> float:
-        """Normalize distance score based on the metric used."""
-        if self.metric.lower() == "cosine":
-            # Cosine similarity ranges from -1 to 1, normalize to 0 to 1
-            return (score + 1.0) / 2.0
-        elif self.metric.lower() in ["euclidean", "dotproduct"]:
-            # These are already suitable for ranking (smaller is better for Euclidean)
-            return score
-        else:
-            # For other metrics, use as is
-            return score
-
     def _result_to_get_result(self, matches: list) -> GetResult:
         """Convert Pinecone matches to GetResult format."""
         ids = []
@@ -427,15 +425,15 @@ class PineconeClient(VectorDBBase):
                     documents=[[]],
                     metadatas=[[]],
                     distances=[[]],
+                    metric=self.metric,
                 )
 
             # Convert to GetResult format
             get_result = self._result_to_get_result(matches)
 
-            # Calculate normalized distances based on metric
             distances = [
                 [
-                    self._normalize_distance(getattr(match, "score", 0.0))
+                    normalize_score(getattr(match, "score", 0.0), self.metric)
                     for match in matches
                 ]
             ]
@@ -445,6 +443,7 @@ class PineconeClient(VectorDBBase):
                 documents=get_result.documents,
                 metadatas=get_result.metadatas,
                 distances=distances,
+                metric=self.metric,
             )
         except Exception as e:
             log.error(f"Error searching in '{collection_name_with_prefix}': {e}")
@@ -11,6 +11,7 @@ from open_webui.retrieval.vector.main import (
     VectorItem,
     SearchResult,
     GetResult,
+    normalize_score,
 )
 from open_webui.config import (
     QDRANT_URI,
@@ -21,8 +22,10 @@ from open_webui.config import (
     QDRANT_COLLECTION_PREFIX,
     QDRANT_TIMEOUT,
     QDRANT_HNSW_M,
+    VECTOR_QUANTIZATION_OVERSAMPLING,
 )
 from open_webui.env import SRC_LOG_LEVELS
+from open_webui.retrieval.vector.utils import resolve_quantization
 
 NO_LIMIT = 999999999
 
@@ -30,7 +33,38 @@ log = logging.getLogger(__name__)
 log.setLevel(SRC_LOG_LEVELS["RAG"])
 
 
+def get_quantization_config(quantization: str):
+    """Quantization config of a new collection, the original vectors stay on disk for rescoring."""
+    if quantization == "int8":
+        return models.ScalarQuantization(
+            scalar=models.ScalarQuantizationConfig(
+                type=models.ScalarType.INT8, always_ram=True
+            )
+        )
+    if quantization == "binary":
+        return models.BinaryQuantization(
+            binary=models.BinaryQuantizationConfig(always_ram=True)
+        )
+    return None
+
+
+def get_search_params(quantization: str) -> Optional[models.SearchParams]:
+    if quantization not in ("int8", "binary"):
+        return None
+    return models.SearchParams(
+        quantization=models.QuantizationSearchParams(
+            rescore=True, oversampling=VECTOR_QUANTIZATION_OVERSAMPLING
+        )
+    )
+
+
 class QdrantClient(VectorDBBase):
+    # collections are created with models.Distance.COSINE
+    metric = "cosine_similarity"
+    # half stores float16 vectors, int8 and binary keep quantized copies in RAM
+    supported_quantization = ("none", "half", "int8", "binary")
+    supports_batch_search = True
+
     def __init__(self):
         self.collection_prefix = QDRANT_COLLECTION_PREFIX
         self.QDRANT_URI = QDRANT_URI
@@ -87,16 +121,19 @@ class QdrantClient(VectorDBBase):
 
     def _create_collection(self, collection_name: str, dimension: int):
         collection_name_with_prefix = f"{self.collection_prefix}_{collection_name}"
+        quantization = resolve_quantization(self, collection_name)
         self.client.create_collection(
             collection_name=collection_name_with_prefix,
             vectors_config=models.VectorParams(
                 size=dimension,
                 distance=models.Distance.COSINE,
                 on_disk=self.QDRANT_ON_DISK,
+                datatype=(models.Datatype.FLOAT16 if quantization == "half" else None),
             ),
             hnsw_config=models.HnswConfigDiff(
                 m=self.QDRANT_HNSW_M,
             ),
+            quantization_config=get_quantization_config(quantization),
         )
 
         # Create payload indexes for efficient filtering
@@ -153,18 +190,36 @@ class QdrantClient(VectorDBBase):
         if limit is None:
             limit = NO_LIMIT  # otherwise qdrant would set limit to 10!
 
-        query_response = self.client.query_points(
+        # One request answers every query vector
+        search_params = get_search_params(resolve_quantization(self, collection_name))
+        responses = self.client.query_batch_points(
             collection_name=f"{self.collection_prefix}_{collection_name}",
-            query=vectors[0],
-            limit=limit,
+            requests=[
+                models.QueryRequest(
+                    query=vector,
+                    limit=limit,
+                    params=search_params,
+                    with_payload=True,
+                )
+                for vector in vectors
+            ],
         )
-        get_result = self._result_to_get_result(query_response.points)
+
+        ids, documents, metadatas, distances = [], [], [], []
+        for response in responses:
+            get_result = self._result_to_get_result(response.points)
+            ids.extend(get_result.ids)
+            documents.extend(get_result.documents)
+            metadatas.extend(get_result.metadatas)
+            distances.append(
+                [normalize_score(point.score, self.metric) for point in response.points]
+            )
         return SearchResult(
-            ids=get_result.ids,
-            documents=get_result.documents,
-            metadatas=get_result.metadatas,
-            # qdrant distance is [-1, 1], normalize to [0, 1]
-            distances=[[(point.score + 1.0) / 2.0 for point in query_response.points]],
+            ids=ids,
+            documents=documents,
+            metadatas=metadatas,
+            distances=distances,
+            metric=self.metric,
         )
 
     def query(self, collection_name: str, filter: dict, limit: Optional[int] = None):
@@ -201,6 +256,22 @@ class QdrantClient(VectorDBBase):
         )
         return self._result_to_get_result(points[0])
 
+    def get_vectors(
+        self, collection_name: str, ids: list[str]
+    ) -> Optional[dict[str, list[float]]]:
+        # Get the stored vectors of the given ids.
+        try:
+            points = self.client.retrieve(
+                collection_name=f"{self.collection_prefix}_{collection_name}",
+                ids=ids,
+                with_payload=False,
+                with_vectors=True,
+            )
+            return {str(point.id): point.vector for point in points}
+        except Exception as e:
+            log.exception(f"Error getting vectors from '{collection_name}': {e}")
+            return None
+
     def insert(self, collection_name: str, items: list[VectorItem]):
         # Insert the items into the collection, if the collection does not exist, it will be created.
         self._create_collection_if_not_exists(collection_name, len(items[0]["vector"]))
@@ -1,5 +1,6 @@
 import logging
-from typing import Optional, Tuple, List, Dict, Any
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
 from urllib.parse import urlparse
 
 import grpc
@@ -12,13 +13,21 @@ from open_webui.config import (
     QDRANT_COLLECTION_PREFIX,
     QDRANT_TIMEOUT,
     QDRANT_HNSW_M,
+    QDRANT_UPSERT_BATCH_SIZE,
+    QDRANT_UPSERT_PARALLELISM,
 )
 from open_webui.env import SRC_LOG_LEVELS
+from open_webui.retrieval.vector.dbs.qdrant import (
+    get_quantization_config,
+    get_search_params,
+)
+from open_webui.retrieval.vector.utils import resolve_quantization
 from open_webui.retrieval.vector.main import (
     GetResult,
     SearchResult,
     VectorDBBase,
     VectorItem,
+    normalize_score,
 )
 from qdrant_client import QdrantClient as Qclient
 from qdrant_client.http.exceptions import UnexpectedResponse
@@ -26,7 +35,10 @@ from qdrant_client.http.models import PointStruct
 from qdrant_client.models import models
 
 NO_LIMIT = 999999999
+SCROLL_PAGE_SIZE = 1000
 TENANT_ID_FIELD = "tenant_id"
+# Payload fields filtered by query and delete, indexed as keywords
+METADATA_INDEX_FIELDS = ("metadata.hash", "metadata.file_id")
 DEFAULT_DIMENSION = 384
 
 log = logging.getLogger(__name__)
@@ -39,6 +51,15 @@ def _tenant_filter(tenant_id: str) -> models.FieldCondition:
     )
 
 
+def _is_not_found(e: Exception) -> bool:
+    """Whether a REST, gRPC or local mode error says the collection does not exist."""
+    if isinstance(e, UnexpectedResponse):
+        return e.status_code == 404
+    if isinstance(e, grpc.RpcError):
+        return e.code() == grpc.StatusCode.NOT_FOUND
+    return isinstance(e, ValueError) and "not found" in str(e)
+
+
 def _metadata_filter(key: str, value: Any) -> models.FieldCondition:
     return models.FieldCondition(
         key=f"metadata.{key}", match=models.MatchValue(value=value)
@@ -46,6 +67,12 @@ def _metadata_filter(key: str, value: Any) -> models.FieldCondition:
 
 
 class QdrantClient(VectorDBBase):
+    # collections are created with models.Distance.COSINE
+    supports_batch_search = True
+    metric = "cosine_similarity"
+    # half stores float16 vectors, int8 and binary keep quantized copies in RAM
+    supported_quantization = ("none", "half", "int8", "binary")
+
     def __init__(self):
         self.collection_prefix = QDRANT_COLLECTION_PREFIX
         self.QDRANT_URI = QDRANT_URI
@@ -90,6 +117,13 @@ class QdrantClient(VectorDBBase):
         self.WEB_SEARCH_COLLECTION = f"{self.collection_prefix}_web-search"
         self.HASH_BASED_COLLECTION = f"{self.collection_prefix}_hash-based"
 
+        # Shared collections known to exist with their payload indexes
+        self._ready_collections = set()
+        self._upsert_executor = ThreadPoolExecutor(
+            max_workers=max(1, QDRANT_UPSERT_PARALLELISM),
+            thread_name_prefix="qdrant-upsert",
+        )
+
     def _result_to_get_result(self, points) -> GetResult:
         ids, documents, metadatas = [], [], []
         for point in points:
@@ -130,7 +164,10 @@ class QdrantClient(VectorDBBase):
             return self.KNOWLEDGE_COLLECTION, tenant_id
 
     def _create_multi_tenant_collection(
-        self, mt_collection_name: str, dimension: int = DEFAULT_DIMENSION
+        self,
+        mt_collection_name: str,
+        dimension: int = DEFAULT_DIMENSION,
+        quantization: str = "none",
     ):
         """
         Creates a collection with multi-tenancy configuration and payload indexes for tenant_id and metadata fields.
@@ -141,7 +178,9 @@ class QdrantClient(VectorDBBase):
                 size=dimension,
                 distance=models.Distance.COSINE,
                 on_disk=self.QDRANT_ON_DISK,
+                datatype=(models.Datatype.FLOAT16 if quantization == "half" else None),
             ),
+            quantization_config=get_quantization_config(quantization),
             # Disable global index building due to multitenancy
             # For more details https://qdrant.tech/documentation/guides/multiple-partitions/#calibrate-performance
             hnsw_config=models.HnswConfigDiff(
@@ -152,26 +191,33 @@ class QdrantClient(VectorDBBase):
         log.info(
             f"Multi-tenant collection {mt_collection_name} created with dimension {dimension}!"
         )
+        self._ensure_payload_indexes(mt_collection_name, payload_schema={})
 
-        self.client.create_payload_index(
-            collection_name=mt_collection_name,
-            field_name=TENANT_ID_FIELD,
-            field_schema=models.KeywordIndexParams(
-                type=models.KeywordIndexType.KEYWORD,
-                is_tenant=True,
-                on_disk=self.QDRANT_ON_DISK,
-            ),
-        )
+    def _ensure_payload_indexes(
+        self, mt_collection_name: str, payload_schema: Optional[dict] = None
+    ):
+        """
+        Create the keyword indexes on tenant_id and the filtered metadata fields that the
+        collection lacks, including collections created before an index was added.
+        """
+        if payload_schema is None:
+            payload_schema = (
+                self.client.get_collection(mt_collection_name).payload_schema or {}
+            )
 
-        for field in ("metadata.hash", "metadata.file_id"):
+        for field in (TENANT_ID_FIELD, *METADATA_INDEX_FIELDS):
+            if field in payload_schema:
+                continue
             self.client.create_payload_index(
                 collection_name=mt_collection_name,
                 field_name=field,
                 field_schema=models.KeywordIndexParams(
                     type=models.KeywordIndexType.KEYWORD,
+                    is_tenant=field == TENANT_ID_FIELD,
                     on_disk=self.QDRANT_ON_DISK,
                 ),
             )
+            log.info(f"Created payload index {field} on {mt_collection_name}")
 
     def _create_points(
         self, items: List[VectorItem], tenant_id: str
@@ -193,13 +239,121 @@ class QdrantClient(VectorDBBase):
         ]
 
     def _ensure_collection(
-        self, mt_collection_name: str, dimension: int = DEFAULT_DIMENSION
+        self,
+        mt_collection_name: str,
+        dimension: int = DEFAULT_DIMENSION,
+        quantization: str = "none",
     ):
         """
         Ensure the collection exists and payload indexes are created for tenant_id and metadata fields.
+        The storage mode is fixed when the shared collection is created.
+        """
+        if not self._collection_exists(mt_collection_name):
+            try:
+                self._create_multi_tenant_collection(
+                    mt_collection_name, dimension, quantization
+                )
+            except Exception:
+                # another worker may have created it in the meantime
+                if not self.client.collection_exists(
+                    collection_name=mt_collection_name
+                ):
+                    raise
+                self._ensure_payload_indexes(mt_collection_name)
+            self._ready_collections.add(mt_collection_name)
+
+    def _collection_exists(self, mt_collection_name: str) -> bool:
+        """
+        Whether a shared collection exists, checked once per process. Existing
+        collections get their missing payload indexes on the first check.
+        Requests go through _retry_if_missing, which drops stale entries.
         """
+        if mt_collection_name in self._ready_collections:
+            return True
         if not self.client.collection_exists(collection_name=mt_collection_name):
-            self._create_multi_tenant_collection(mt_collection_name, dimension)
+            return False
+        self._ensure_payload_indexes(mt_collection_name)
+        self._ready_collections.add(mt_collection_name)
+        return True
+
+    def _retry_if_missing(
+        self,
+        mt_collection_name: str,
+        operation: Callable[[], Any],
+        ensure: Optional[Callable[[], None]] = None,
+    ):
+        """
+        Run ``operation()`` against a shared collection. The ready collections
+        are tracked per process, so a reset() in another worker or a collection
+        dropped outside the app leaves a stale entry: on a not found error the
+        entry is dropped and ``operation`` retried once, after ``ensure()``
+        recreated the collection on the write path. Reads of a collection that
+        is really gone return None.
+        """
+        try:
+            return operation()
+        except Exception as e:
+            if not _is_not_found(e):
+                raise
+
+        log.info(f"Collection {mt_collection_name} is gone, checking it again")
+        self._ready_collections.discard(mt_collection_name)
+        if ensure is not None:
+            ensure()
+        elif not self._collection_exists(mt_collection_name):
+            return None
+        return operation()
+
+    def _scroll(
+        self,
+        mt_collection_name: str,
+        scroll_filter: models.Filter,
+        limit: Optional[int] = None,
+    ) -> list:
+        """
+        Scroll matching points in pages of SCROLL_PAGE_SIZE instead of one unbounded request.
+        """
+        points, offset = [], None
+        while limit is None or len(points) < limit:
+            page_size = SCROLL_PAGE_SIZE
+            if limit is not None:
+                page_size = min(page_size, limit - len(points))
+            page, offset = self.client.scroll(
+                collection_name=mt_collection_name,
+                scroll_filter=scroll_filter,
+                limit=page_size,
+                offset=offset,
+            )
+            points.extend(page)
+            if offset is None:
+                break
+        return points
+
+    def _upload_points(self, mt_collection_name: str, points: List[PointStruct]):
+        """
+        Upsert points in chunks of QDRANT_UPSERT_BATCH_SIZE, QDRANT_UPSERT_PARALLELISM at a
+        time without waiting for them to be applied. The last chunk is sent once the
+        others are acknowledged and waited for: Qdrant applies the updates of a shard
+        in order, so when it returns every chunk is searchable.
+        """
+        chunks = [
+            points[i : i + QDRANT_UPSERT_BATCH_SIZE]
+            for i in range(0, len(points), max(1, QDRANT_UPSERT_BATCH_SIZE))
+        ]
+        futures = [
+            self._upsert_executor.submit(
+                self.client.upsert,
+                collection_name=mt_collection_name,
+                points=chunk,
+                wait=False,
+            )
+            for chunk in chunks[:-1]
+        ]
+        for future in futures:
+            future.result()
+        self.client.upsert(
+            collection_name=mt_collection_name, points=chunks[-1], wait=True
+        )
 
     def has_collection(self, collection_name: str) -> bool:
         """
@@ -208,14 +362,17 @@ class QdrantClient(VectorDBBase):
         if not self.client:
             return False
         mt_collection, tenant_id = self._get_collection_and_tenant_id(collection_name)
-        if not self.client.collection_exists(collection_name=mt_collection):
+        if not self._collection_exists(mt_collection):
             return False
         tenant_filter = _tenant_filter(tenant_id)
-        count_result = self.client.count(
-            collection_name=mt_collection,
-            count_filter=models.Filter(must=[tenant_filter]),
+        count_result = self._retry_if_missing(
+            mt_collection,
+            lambda: self.client.count(
+                collection_name=mt_collection,
+                count_filter=models.Filter(must=[tenant_filter]),
+            ),
         )
-        return count_result.count > 0
+        return count_result is not None and count_result.count > 0
 
     def delete(
         self,
@@ -230,7 +387,7 @@ class QdrantClient(VectorDBBase):
             return None
 
         mt_collection, tenant_id = self._get_collection_and_tenant_id(collection_name)
-        if not self.client.collection_exists(collection_name=mt_collection):
+        if not self._collection_exists(mt_collection):
             log.debug(f"Collection {mt_collection} doesn't exist, nothing to delete")
             return None
 
@@ -241,10 +398,13 @@ class QdrantClient(VectorDBBase):
         elif filter:
             must_conditions += [_metadata_filter(k, v) for k, v in filter.items()]
 
-        return self.client.delete(
-            collection_name=mt_collection,
-            points_selector=models.FilterSelector(
-                filter=models.Filter(must=must_conditions, should=should_conditions)
+        return self._retry_if_missing(
+            mt_collection,
+            lambda: self.client.delete(
+                collection_name=mt_collection,
+                points_selector=models.FilterSelector(
+                    filter=models.Filter(must=must_conditions, should=should_conditions)
+                ),
             ),
         )
 
@@ -257,23 +417,50 @@ class QdrantClient(VectorDBBase):
         if not self.client or not vectors:
             return None
         mt_collection, tenant_id = self._get_collection_and_tenant_id(collection_name)
-        if not self.client.collection_exists(collection_name=mt_collection):
+        if not self._collection_exists(mt_collection):
             log.debug(f"Collection {mt_collection} doesn't exist, search returns None")
             return None
 
-        tenant_filter = _tenant_filter(tenant_id)
-        query_response = self.client.query_points(
-            collection_name=mt_collection,
-            query=vectors[0],
-            limit=limit,
-            query_filter=models.Filter(must=[tenant_filter]),
+        if limit is None:
+            limit = NO_LIMIT  # otherwise qdrant would set limit to 10!
+
+        # One request answers every query vector
+        query_filter = models.Filter(must=[_tenant_filter(tenant_id)])
+        search_params = get_search_params(resolve_quantization(self, collection_name))
+        responses = self._retry_if_missing(
+            mt_collection,
+            lambda: self.client.query_batch_points(
+                collection_name=mt_collection,
+                requests=[
+                    models.QueryRequest(
+                        query=vector,
+                        filter=query_filter,
+                        limit=limit,
+                        params=search_params,
+                        with_payload=True,
+                    )
+                    for vector in vectors
+                ],
+            ),
         )
-        get_result = self._result_to_get_result(query_response.points)
+        if responses is None:
+            return None
+
+        ids, documents, metadatas, distances = [], [], [], []
+        for response in responses:
+            get_result = self._result_to_get_result(response.points)
+            ids.extend(get_result.ids)
+            documents.extend(get_result.documents)
+            metadatas.extend(get_result.metadatas)
+            distances.append(
+                [normalize_score(point.score, self.metric) for point in response.points]
+            )
         return SearchResult(
-            ids=get_result.ids,
-            documents=get_result.documents,
-            metadatas=get_result.metadatas,
-            distances=[[(point.score + 1.0) / 2.0 for point in query_response.points]],
+            ids=ids,
+            documents=documents,
+            metadatas=metadatas,
+            distances=distances,
+            metric=self.metric,
         )
 
     def query(
@@ -285,20 +472,16 @@ class QdrantClient(VectorDBBase):
         if not self.client:
             return None
         mt_collection, tenant_id = self._get_collection_and_tenant_id(collection_name)
-        if not self.client.collection_exists(collection_name=mt_collection):
+        if not self._collection_exists(mt_collection):
             log.debug(f"Collection {mt_collection} doesn't exist, query returns None")
             return None
-        if limit is None:
-            limit = NO_LIMIT
         tenant_filter = _tenant_filter(tenant_id)
         field_conditions = [_metadata_filter(k, v) for k, v in filter.items()]
         combined_filter = models.Filter(must=[tenant_filter, *field_conditions])
-        points = self.client.scroll(
-            collection_name=mt_collection,
-            scroll_filter=combined_filter,
-            limit=limit,
+        points = self._retry_if_missing(
+            mt_collection, lambda: self._scroll(mt_collection, combined_filter, limit)
         )
-        return self._result_to_get_result(points[0])
+        return self._result_to_get_result(points) if points is not None else None
 
     def get(self, collection_name: str) -> Optional[GetResult]:
         """
@@ -307,16 +490,16 @@ class QdrantClient(VectorDBBase):
         if not self.client:
             return None
         mt_collection, tenant_id = self._get_collection_and_tenant_id(collection_name)
-        if not self.client.collection_exists(collection_name=mt_collection):
+        if not self._collection_exists(mt_collection):
             log.debug(f"Collection {mt_collection} doesn't exist, get returns None")
             return None
-        tenant_filter = _tenant_filter(tenant_id)
-        points = self.client.scroll(
-            collection_name=mt_collection,
-            scroll_filter=models.Filter(must=[tenant_filter]),
-            limit=NO_LIMIT,
+        points = self._retry_if_missing(
+            mt_collection,
+            lambda: self._scroll(
+                mt_collection, models.Filter(must=[_tenant_filter(tenant_id)])
+            ),
         )
-        return self._result_to_get_result(points[0])
+        return self._result_to_get_result(points) if points is not None else None
 
     def upsert(self, collection_name: str, items: List[VectorItem]):
         """
@@ -326,9 +509,16 @@ class QdrantClient(VectorDBBase):
             return None
         mt_collection, tenant_id = self._get_collection_and_tenant_id(collection_name)
         dimension = len(items[0]["vector"])
-        self._ensure_collection(mt_collection, dimension)
+        quantization = resolve_quantization(self, collection_name)
+        self._ensure_collection(mt_collection, dimension, quantization)
         points = self._create_points(items, tenant_id)
-        self.client.upload_points(mt_collection, points)
+        self._retry_if_missing(
+            mt_collection,
+            lambda: self._upload_points(mt_collection, points),
+            ensure=lambda: self._ensure_collection(
+                mt_collection, dimension, quantization
+            ),
+        )
         return None
 
     def insert(self, collection_name: str, items: List[VectorItem]):
@@ -346,6 +536,7 @@ class QdrantClient(VectorDBBase):
         for collection in self.client.get_collections().collections:
             if collection.name.startswith(self.collection_prefix):
                 self.client.delete_collection(collection_name=collection.name)
+        self._ready_collections.clear()
 
     def delete_collection(self, collection_name: str):
         """
@@ -354,12 +545,15 @@ class QdrantClient(VectorDBBase):
         if not self.client:
             return None
         mt_collection, tenant_id = self._get_collection_and_tenant_id(collection_name)
-        if not self.client.collection_exists(collection_name=mt_collection):
+        if not self._collection_exists(mt_collection):
             log.debug(f"Collection {mt_collection} doesn't exist, nothing to delete")
             return None
-        self.client.delete(
-            collection_name=mt_collection,
-            points_selector=models.FilterSelector(
-                filter=models.Filter(must=[_tenant_filter(tenant_id)])
+        self._retry_if_missing(
+            mt_collection,
+            lambda: self.client.delete(
+                collection_name=mt_collection,
+                points_selector=models.FilterSelector(
+                    filter=models.Filter(must=[_tenant_filter(tenant_id)])
+                ),
             ),
         )
@@ -4,6 +4,7 @@ from open_webui.retrieval.vector.main import (
     VectorItem,
     GetResult,
     SearchResult,
+    normalize_score,
 )
 from open_webui.config import S3_VECTOR_BUCKET_NAME, S3_VECTOR_REGION
 from open_webui.env import SRC_LOG_LEVELS
@@ -20,6 +21,10 @@ class S3VectorClient(VectorDBBase):
     AWS S3 Vector integration for Open WebUI Knowledge.
     """
 
+    supports_batch_search = True
+    # indexes are created with the "cosine" distance metric
+    metric = "cosine_distance"
+
     def __init__(self):
         self.bucket_name = S3_VECTOR_BUCKET_NAME
         self.region = S3_VECTOR_REGION
@@ -326,7 +331,7 @@ class S3VectorClient(VectorDBBase):
                 for vector in result_vectors:
                     vector_id = vector.get("key")
                     vector_metadata = vector.get("metadata", {})
-                    vector_distance = vector.get("distance", 0.0)
+                    vector_distance = vector.get("distance")
 
                     # Extract document text from metadata
                     document_text = ""
@@ -346,7 +351,9 @@ class S3VectorClient(VectorDBBase):
                     query_ids.append(vector_id)
                     query_documents.append(document_text)
                     query_metadatas.append(vector_metadata)
-                    query_distances.append(vector_distance)
+                    query_distances.append(
+                        normalize_score(vector_distance, self.metric)
+                    )
 
                 # Add this query's results to the overall results
                 all_ids.append(query_ids)
@@ -362,6 +369,7 @@ class S3VectorClient(VectorDBBase):
                 documents=all_documents if all_documents else None,
                 metadatas=all_metadatas if all_metadatas else None,
                 distances=all_distances if all_distances else None,
+                metric=self.metric,
             )
 
         except Exception as e:
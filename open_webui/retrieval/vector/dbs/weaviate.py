@@ -1,18 +1,31 @@
 import logging
-from typing import Optional, List, Union, Any, Dict
+import re
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import reduce
+from typing import Optional, List, Union, Any, Dict, Iterator
 
 from open_webui.retrieval.vector.main import (
     VectorDBBase,
     VectorItem,
     SearchResult,
     GetResult,
+    normalize_score,
 )
 from open_webui.env import SRC_LOG_LEVELS
-from open_webui.config import WEAVIATE_URL, WEAVIATE_COLLECTION_PREFIX
+from open_webui.config import (
+    WEAVIATE_URL,
+    WEAVIATE_COLLECTION_PREFIX,
+    WEAVIATE_FILTERABLE_METADATA_KEYS,
+    WEAVIATE_PAGE_SIZE,
+    WEAVIATE_QUERY_MAXIMUM_RESULTS,
+)
 
 log = logging.getLogger(__name__)
 log.setLevel(SRC_LOG_LEVELS["RAG"])
 
+PROPERTY_NAME_PATTERN = re.compile(r"^[A-Za-z0-9_]+$")
+
 
 class WeaviateClient(VectorDBBase):
     """
@@ -24,12 +37,34 @@ class WeaviateClient(VectorDBBase):
       it will raise a clear error at runtime when selected.
     - Collections are created per `collection_name` with a configurable prefix.
     - Text stored under property `text`, metadata under property `metadata`.
+    - Weaviate cannot filter on nested object properties, so the metadata keys
+      in `WEAVIATE_FILTERABLE_METADATA_KEYS` are also stored as top-level
+      `meta_<key>` text properties. Filters on these keys run server side,
+      collections created before these properties existed are backfilled once
+      in a background thread, filters are matched locally until it finishes.
     """
 
+    supports_batch_search = True
+    # collections use Weaviate's default "cosine" distance
+    metric = "cosine_distance"
+
     def __init__(self) -> None:
         self.url = WEAVIATE_URL
         self.collection_prefix = WEAVIATE_COLLECTION_PREFIX
+        self.page_size = max(1, WEAVIATE_PAGE_SIZE)
+        self.query_maximum_results = max(1, WEAVIATE_QUERY_MAXIMUM_RESULTS)
+        self.filterable_keys = [
+            key
+            for key in WEAVIATE_FILTERABLE_METADATA_KEYS
+            if PROPERTY_NAME_PATTERN.match(key)
+        ]
         self._client = None
+        # Collections whose filterable properties have been verified
+        self._checked_collections = set()
+        # Backfills in progress: collection -> (future, missing keys)
+        self._backfills: Dict[str, tuple[Future, List[str]]] = {}
+        self._backfill_lock = threading.Lock()
+        self._backfill_executor = None
 
         if not self.url:
             log.warning("WEAVIATE_URL is not configured; WeaviateClient disabled")
@@ -80,23 +115,99 @@ class WeaviateClient(VectorDBBase):
     def _collection_name(self, name: str) -> str:
         return f"{self.collection_prefix}_{name}" if self.collection_prefix else name
 
+    def _is_v4(self, client) -> bool:
+        return hasattr(client, "collections")
+
+    def _property_name(self, key: str) -> str:
+        return f"meta_{key}"
+
+    def _filterable_properties(self, metadata: Any) -> Dict[str, str]:
+        """Top-level filter properties for one object's metadata."""
+        if not isinstance(metadata, dict):
+            return {}
+
+        properties = {}
+        for key in self.filterable_keys:
+            value = metadata.get(key)
+            if isinstance(value, (str, int, float, bool)):
+                properties[self._property_name(key)] = str(value)
+        return properties
+
+    def _can_filter(self, filter: Dict) -> bool:
+        return all(key in self.filterable_keys for key in filter)
+
+    def _build_filter(self, filter: Dict):
+        """Translate an equality metadata filter into a v4 `Filter` expression."""
+        from weaviate.classes.query import Filter
+
+        conditions = []
+        for key, value in filter.items():
+            prop = Filter.by_property(self._property_name(key))
+            if isinstance(value, (list, tuple, set)):
+                conditions.append(prop.contains_any([str(v) for v in value]))
+            else:
+                conditions.append(prop.equal(str(value)))
+        return reduce(lambda a, b: a & b, conditions)
+
+    def _match_filter(self, metadata: Any, filter: Dict) -> bool:
+        """Evaluate `_build_filter` locally against one object's metadata."""
+        properties = self._filterable_properties(metadata)
+        for key, value in filter.items():
+            values = value if isinstance(value, (list, tuple, set)) else [value]
+            if properties.get(self._property_name(key)) not in {str(v) for v in values}:
+                return False
+        return True
+
+    def _build_where(self, filter: Dict) -> Dict:
+        """Translate an equality metadata filter into a v3 GraphQL `where`."""
+        operands = []
+        for key, value in filter.items():
+            if isinstance(value, (list, tuple, set)):
+                operands.append(
+                    {
+                        "path": [self._property_name(key)],
+                        "operator": "ContainsAny",
+                        "valueTextArray": [str(v) for v in value],
+                    }
+                )
+            else:
+                operands.append(
+                    {
+                        "path": [self._property_name(key)],
+                        "operator": "Equal",
+                        "valueText": str(value),
+                    }
+                )
+        if len(operands) == 1:
+            return operands[0]
+        return {"operator": "And", "operands": operands}
+
     def _ensure_collection(self, collection_name: str, dim: int) -> None:
         client = self._require_client()
         name = self._collection_name(collection_name)
 
         # v4 API
-        if hasattr(client, "collections"):
+        if self._is_v4(client):
             if not client.collections.exists(name):
-                from weaviate.classes.config import Property, DataType
+                from weaviate.classes.config import Property, DataType, Tokenization
 
                 client.collections.create(
                     name=name,
                     properties=[
                         Property(name="text", data_type=DataType.TEXT),
                         Property(name="metadata", data_type=DataType.OBJECT),
+                    ]
+                    + [
+                        Property(
+                            name=self._property_name(key),
+                            data_type=DataType.TEXT,
+                            tokenization=Tokenization.FIELD,
+                        )
+                        for key in self.filterable_keys
                     ],
                     vectorizer_config={"vectorizer": "none"},
                 )
+                self._checked_collections.add(name)
         else:
             # v3 API
             schema = client.schema.get()
@@ -109,9 +220,244 @@ class WeaviateClient(VectorDBBase):
                         "properties": [
                             {"name": "text", "dataType": ["text"]},
                             {"name": "metadata", "dataType": ["object"]},
+                        ]
+                        + [
+                            {
+                                "name": self._property_name(key),
+                                "dataType": ["text"],
+                                "tokenization": "field",
+                            }
+                            for key in self.filterable_keys
                         ],
                     }
                 )
+                self._checked_collections.add(name)
+
+        self._ensure_filterable_properties(collection_name)
+
+    def _ensure_filterable_properties(self, collection_name: str) -> bool:
+        """
+        Add missing filter properties to a collection created by an older
+        version of this adapter and backfill them from the stored metadata in
+        a background thread. Returns whether the properties are populated,
+        callers match filters locally until then.
+        """
+        client = self._require_client()
+        name = self._collection_name(collection_name)
+        if name in self._checked_collections or not self.filterable_keys:
+            return True
+
+        with self._backfill_lock:
+            if name in self._backfills:
+                future, missing = self._backfills[name]
+                if not future.done():
+                    return False
+                del self._backfills[name]
+                if future.exception() is None:
+                    self._checked_collections.add(name)
+                    return True
+                log.error(
+                    f"Backfilling Weaviate collection {name} failed, retrying: "
+                    f"{future.exception()}"
+                )
+            else:
+                missing = self._add_filterable_properties(client, name)
+                if not missing:
+                    self._checked_collections.add(name)
+                    return True
+
+            if self._backfill_executor is None:
+                self._backfill_executor = ThreadPoolExecutor(
+                    max_workers=1, thread_name_prefix="weaviate-backfill"
+                )
+            self._backfills[name] = (
+                self._backfill_executor.submit(
+                    self._backfill_filterable_properties, collection_name, missing
+                ),
+                missing,
+            )
+            return False
+
+    def _add_filterable_properties(self, client, name: str) -> List[str]:
+        """Add the missing filter properties to the schema, return their keys."""
+        if self._is_v4(client):
+            from weaviate.classes.config import Property, DataType, Tokenization
+
+            coll = client.collections.get(name)
+            existing = {prop.name for prop in coll.config.get().properties}
+            missing = [
+                key
+                for key in self.filterable_keys
+                if self._property_name(key) not in existing
+            ]
+            for key in missing:
+                coll.config.add_property(
+                    Property(
+                        name=self._property_name(key),
+                        data_type=DataType.TEXT,
+                        tokenization=Tokenization.FIELD,
+                    )
+                )
+        else:
+            schema = client.schema.get(name)
+            existing = {prop.get("name") for prop in schema.get("properties", [])}
+            missing = [
+                key
+                for key in self.filterable_keys
+                if self._property_name(key) not in existing
+            ]
+            for key in missing:
+                client.schema.property.create(
+                    name,
+                    {
+                        "name": self._property_name(key),
+                        "dataType": ["text"],
+                        "tokenization": "field",
+                    },
+                )
+        return missing
+
+    def _backfill_filterable_properties(
+        self, collection_name: str, missing: List[str]
+    ) -> None:
+        client = self._require_client()
+        name = self._collection_name(collection_name)
+
+        log.info(
+            f"Backfilling filter properties {missing} for Weaviate collection {name}"
+        )
+        updated = 0
+        for _id, _, metadata in self._iterate_objects(collection_name):
+            properties = self._filterable_properties(metadata)
+            if not properties:
+                continue
+            if self._is_v4(client):
+                client.collections.get(name).data.update(
+                    uuid=_id, properties=properties
+                )
+            else:
+                client.data_object.update(
+                    data_object=properties, class_name=name, uuid=_id
+                )
+            updated += 1
+        log.info(f"Backfilled {updated} objects in Weaviate collection {name}")
+
+    def _iterate_objects(
+        self, collection_name: str
+    ) -> Iterator[tuple[str, Optional[str], Any]]:
+        """Yield `(id, text, metadata)` for every object using cursor paging."""
+        client = self._require_client()
+        name = self._collection_name(collection_name)
+
+        if self._is_v4(client):
+            coll = client.collections.get(name)
+            for obj in coll.iterator(cache_size=self.page_size):
+                properties = getattr(obj, "properties", {}) or {}
+                yield (
+                    str(obj.uuid),
+                    properties.get("text"),
+                    properties.get("metadata"),
+                )
+        else:
+            after = None
+            while True:
+                query = (
+                    client.query.get(name, ["text", "metadata"])
+                    .with_additional(["id"])
+                    .with_limit(self.page_size)
+                )
+                if after:
+                    query = query.with_after(after)
+                result = query.do()
+                data = (((result or {}).get("data") or {}).get("Get") or {}).get(
+                    name
+                ) or []
+                for obj in data:
+                    yield (
+                        obj.get("_additional", {}).get("id"),
+                        obj.get("text"),
+                        obj.get("metadata"),
+                    )
+                if len(data) < self.page_size:
+                    break
+                after = data[-1].get("_additional", {}).get("id")
+
+    def _query_objects(
+        self, collection_name: str, filter: Dict, limit: Optional[int]
+    ) -> Iterator[tuple[str, Optional[str], Any]]:
+        """
+        Yield `(id, text, metadata)` for the objects matching `filter`.
+        Weaviate does not combine cursors with filters and offsets stop at
+        QUERY_MAXIMUM_RESULTS, so past that the remaining matches are found by
+        a cursor scan of the collection.
+        """
+        client = self._require_client()
+        name = self._collection_name(collection_name)
+
+        seen = set()
+        offset = 0
+        while limit is None or offset < limit:
+            if offset >= self.query_maximum_results:
+                yield from (
+                    obj
+                    for obj in self._scan_objects(collection_name, filter)
+                    if obj[0] not in seen
+                )
+                return
+
+            page_size = min(self.page_size, self.query_maximum_results - offset)
+            if limit is not None:
+                page_size = min(page_size, limit - offset)
+            if self._is_v4(client):
+                res = client.collections.get(name).query.fetch_objects(
+                    filters=self._build_filter(filter),
+                    limit=page_size,
+                    offset=offset,
+                )
+                page = [
+                    (
+                        str(obj.uuid),
+                        (obj.properties or {}).get("text"),
+                        (obj.properties or {}).get("metadata"),
+                    )
+                    for obj in getattr(res, "objects", []) or []
+                ]
+            else:
+                result = (
+                    client.query.get(name, ["text", "metadata"])
+                    .with_additional(["id"])
+                    .with_where(self._build_where(filter))
+                    .with_limit(page_size)
+                    .with_offset(offset)
+                    .do()
+                )
+                data = (((result or {}).get("data") or {}).get("Get") or {}).get(
+                    name
+                ) or []
+                page = [
+                    (
+                        obj.get("_additional", {}).get("id"),
+                        obj.get("text"),
+                        obj.get("metadata"),
+                    )
+                    for obj in data
+                ]
+
+            seen.update(obj[0] for obj in page)
+            yield from page
+            if len(page) < page_size:
+                break
+            offset += len(page)
+
+    def _scan_objects(
+        self, collection_name: str, filter: Dict
+    ) -> Iterator[tuple[str, Optional[str], Any]]:
+        """Yield the objects matching `filter` from a cursor scan."""
+        return (
+            obj
+            for obj in self._iterate_objects(collection_name)
+            if self._match_filter(obj[2], filter)
+        )
 
     def _require_client(self):
         if self._client is None:
@@ -120,11 +466,18 @@ class WeaviateClient(VectorDBBase):
             )
         return self._client
 
+    def _to_get_result(self, objects: List[tuple]) -> GetResult:
+        return GetResult(
+            ids=[[obj[0] for obj in objects]],
+            documents=[[obj[1] for obj in objects]],
+            metadatas=[[obj[2] for obj in objects]],
+        )
+
     # ---------- VectorDBBase methods ----------
     def has_collection(self, collection_name: str) -> bool:
         client = self._require_client()
         name = self._collection_name(collection_name)
-        if hasattr(client, "collections"):
+        if self._is_v4(client):
             return client.collections.exists(name)
         else:
             schema = client.schema.get()
@@ -134,7 +487,10 @@ class WeaviateClient(VectorDBBase):
     def delete_collection(self, collection_name: str) -> None:
         client = self._require_client()
         name = self._collection_name(collection_name)
-        if hasattr(client, "collections"):
+        self._checked_collections.discard(name)
+        with self._backfill_lock:
+            self._backfills.pop(name, None)
+        if self._is_v4(client):
             if client.collections.exists(name):
                 client.collections.delete(name)
         else:
@@ -151,19 +507,24 @@ class WeaviateClient(VectorDBBase):
         self._ensure_collection(collection_name, dim)
         name = self._collection_name(collection_name)
 
-        if hasattr(client, "collections"):
+        if self._is_v4(client):
+            from weaviate.classes.data import DataObject
+
             coll = client.collections.get(name)
-            objects = []
-            vectors = []
-            for it in items:
-                objects.append(
-                    {
-                        "uuid": it["id"],
-                        "properties": {"text": it["text"], "metadata": it["metadata"]},
-                    }
-                )
-                vectors.append(it["vector"])
-            coll.data.insert_many(objects=objects, vectors=vectors)
+            coll.data.insert_many(
+                [
+                    DataObject(
+                        uuid=it["id"],
+                        properties={
+                            "text": it["text"],
+                            "metadata": it["metadata"],
+                            **self._filterable_properties(it["metadata"]),
+                        },
+                        vector=it["vector"],
+                    )
+                    for it in items
+                ]
+            )
         else:
             # v3 batch
             with client.batch as batch:
@@ -172,6 +533,7 @@ class WeaviateClient(VectorDBBase):
                         data_object={
                             "text": it["text"],
                             "metadata": it["metadata"],
+                            **self._filterable_properties(it["metadata"]),
                         },
                         class_name=name,
                         uuid=it["id"],
@@ -186,103 +548,165 @@ class WeaviateClient(VectorDBBase):
             return None
         name = self._collection_name(collection_name)
 
-        if hasattr(client, "collections"):
+        ids = []
+        texts = []
+        metas = []
+        scores = []
+
+        if self._is_v4(client):
+            from weaviate.classes.query import MetadataQuery
+
             coll = client.collections.get(name)
-            res = coll.query.near_vector(near_vector=vectors[0], limit=limit)
-            ids = []
-            texts = []
-            metas = []
-            dists = []
-            for obj in getattr(res, "objects", []) or []:
-                ids.append(getattr(obj, "uuid", None))
-                properties = getattr(obj, "properties", {}) or {}
-                texts.append(properties.get("text"))
-                metas.append(properties.get("metadata"))
-                meta = getattr(obj, "metadata", None)
-                dists.append(getattr(meta, "distance", 0.0) if meta else 0.0)
-
-            return SearchResult(
-                ids=[ids],
-                documents=[texts],
-                metadatas=[metas],
-                distances=[dists],
-            )
+
+            def near_vector(vector):
+                return coll.query.near_vector(
+                    near_vector=vector,
+                    limit=limit,
+                    return_metadata=MetadataQuery(distance=True),
+                )
+
+            # One request per query vector, issued concurrently
+            if len(vectors) == 1:
+                responses = [near_vector(vectors[0])]
+            else:
+                with ThreadPoolExecutor(max_workers=min(len(vectors), 8)) as executor:
+                    responses = list(executor.map(near_vector, vectors))
+
+            for res in responses:
+                objects = getattr(res, "objects", []) or []
+                ids.append([str(obj.uuid) for obj in objects])
+                texts.append([(obj.properties or {}).get("text") for obj in objects])
+                metas.append(
+                    [(obj.properties or {}).get("metadata") for obj in objects]
+                )
+                scores.append(
+                    [
+                        normalize_score(
+                            getattr(obj.metadata, "distance", None), self.metric
+                        )
+                        for obj in objects
+                    ]
+                )
         else:
-            # v3 GraphQL
-            query = (
-                client.query.get(name, ["text", "metadata"]).with_near_vector(
-                    {"vector": vectors[0]}
-                ).with_limit(limit)
+            # v3 GraphQL: all query vectors in a single request using aliases
+            queries = [
+                client.query.get(name, ["text", "metadata"])
+                .with_near_vector({"vector": vector})
+                .with_additional(["id", "distance"])
+                .with_limit(limit)
+                .with_alias(f"q{i}")
+                for i, vector in enumerate(vectors)
+            ]
+            result = client.query.multi_get(queries).do()
+            data = ((result or {}).get("data") or {}).get("Get") or {}
+
+            for i in range(len(vectors)):
+                objects = data.get(f"q{i}") or []
+                ids.append([obj.get("_additional", {}).get("id") for obj in objects])
+                texts.append([obj.get("text") for obj in objects])
+                metas.append([obj.get("metadata") for obj in objects])
+                scores.append(
+                    [
+                        normalize_score(
+                            obj.get("_additional", {}).get("distance"), self.metric
+                        )
+                        for obj in objects
+                    ]
+                )
+
+        return SearchResult(
+            ids=ids,
+            documents=texts,
+            metadatas=metas,
+            distances=scores,
+            metric=self.metric,
+        )
+
+    def query(
+        self, collection_name: str, filter: Dict, limit: Optional[int] = None
+    ) -> Optional[GetResult]:
+        if not self.has_collection(collection_name):
+            return None
+
+        if not filter:
+            objects = self._iterate_objects(collection_name)
+        elif self._can_filter(filter):
+            if self._ensure_filterable_properties(collection_name):
+                objects = self._query_objects(collection_name, filter, limit)
+            else:
+                # The filter properties are still being backfilled
+                objects = self._scan_objects(collection_name, filter)
+        else:
+            # Keys that are not stored as filter properties are matched locally
+            log.debug(
+                f"Filtering Weaviate collection {collection_name} locally on {list(filter)}"
+            )
+            objects = (
+                obj
+                for obj in self._iterate_objects(collection_name)
+                if isinstance(obj[2], dict)
+                and all(obj[2].get(k) == v for k, v in filter.items())
             )
-            result = query.do()
-            data = (((result or {}).get("data") or {}).get("Get") or {}).get(name) or []
-
-            ids = []
-            texts = []
-            metas = []
-            for obj in data:
-                texts.append(obj.get("text"))
-                metas.append(obj.get("metadata"))
-                ids.append(obj.get("_additional", {}).get("id"))
-
-            return SearchResult(ids=[ids], documents=[texts], metadatas=[metas], distances=[[]])
-
-    def query(self, collection_name: str, filter: Dict, limit: Optional[int] = None) -> Optional[GetResult]:
-        # 简化实现：取回集合后在本地基于 metadata 做过滤
-        all_items = self.get(collection_name)
-        if not all_items or not all_items.metadatas:
-            return all_items
-        metadatas = all_items.metadatas[0]
-        documents = all_items.documents[0]
-        # v4 fetch_objects 不返回 id，已在 get() 中尝试填充 ids
-        ids = (all_items.ids[0] if all_items.ids else [None] * len(metadatas))
-        def match(md):
-            if not isinstance(md, dict):
-                return False
-            for k, v in filter.items():
-                if md.get(k) != v:
-                    return False
-            return True
-        filtered = [(i, md, doc, _id) for i, (md, doc, _id) in enumerate(zip(metadatas, documents, ids)) if match(md)]
-        if limit is not None:
-            filtered = filtered[:limit]
-        if not filtered:
-            return GetResult(ids=[[]], documents=[[]], metadatas=[[]])
-        f_ids = [it[3] for it in filtered]
-        f_docs = [it[2] for it in filtered]
-        f_mds = [it[1] for it in filtered]
-        return GetResult(ids=[f_ids], documents=[f_docs], metadatas=[f_mds])
+
+        result = []
+        for obj in objects:
+            if limit is not None and len(result) >= limit:
+                break
+            result.append(obj)
+        return self._to_get_result(result)
 
     def get(self, collection_name: str) -> Optional[GetResult]:
+        if not self.has_collection(collection_name):
+            return None
+        return self._to_get_result(list(self._iterate_objects(collection_name)))
+
+    def get_vectors(
+        self, collection_name: str, ids: List[str]
+    ) -> Optional[Dict[str, List[float]]]:
         client = self._require_client()
         name = self._collection_name(collection_name)
+        if not self.has_collection(collection_name):
+            return None
 
-        if hasattr(client, "collections"):
-            coll = client.collections.get(name)
-            # No direct list-all API with vectors; fetch limited objects
-            res = coll.query.fetch_objects(limit=1000)
-            ids = []
-            texts = []
-            metas = []
-            for obj in getattr(res, "objects", []) or []:
-                ids.append(getattr(obj, "uuid", None))
-                properties = getattr(obj, "properties", {}) or {}
-                texts.append(properties.get("text"))
-                metas.append(properties.get("metadata"))
-            return GetResult(ids=[ids], documents=[texts], metadatas=[metas])
-        else:
-            result = (
-                client.query.get(name, ["text", "metadata"]).with_additional(["id"]).do()
-            )
-            data = (((result or {}).get("data") or {}).get("Get") or {}).get(name) or []
-            ids = []
-            texts = []
-            metas = []
-            for obj in data:
-                ids.append(obj.get("_additional", {}).get("id"))
-                texts.append(obj.get("text"))
-                metas.append(obj.get("metadata"))
-            return GetResult(ids=[ids], documents=[texts], metadatas=[metas])
+        vectors = {}
+        for start in range(0, len(ids), self.page_size):
+            batch = ids[start : start + self.page_size]
+            if self._is_v4(client):
+                from weaviate.classes.query import Filter
+
+                res = client.collections.get(name).query.fetch_objects(
+                    filters=Filter.by_id().contains_any(batch),
+                    include_vector=True,
+                    limit=len(batch),
+                )
+                for obj in getattr(res, "objects", []) or []:
+                    vector = obj.vector
+                    if isinstance(vector, dict):
+                        vector = vector.get("default")
+                    if vector:
+                        vectors[str(obj.uuid)] = vector
+            else:
+                result = (
+                    client.query.get(name, [])
+                    .with_additional(["id", "vector"])
+                    .with_where(
+                        {
+                            "path": ["id"],
+                            "operator": "ContainsAny",
+                            "valueTextArray": batch,
+                        }
+                    )
+                    .with_limit(len(batch))
+                    .do()
+                )
+                data = (((result or {}).get("data") or {}).get("Get") or {}).get(
+                    name
+                ) or []
+                for obj in data:
+                    additional = obj.get("_additional", {})
+                    if additional.get("vector"):
+                        vectors[additional.get("id")] = additional["vector"]
+        return vectors
 
     def delete(
         self,
@@ -293,52 +717,65 @@ class WeaviateClient(VectorDBBase):
         client = self._require_client()
         name = self._collection_name(collection_name)
 
-        if hasattr(client, "collections"):
-            # v4: 无直接精确 where 模式，退化为 get + 逐个删除
-            coll = client.collections.get(name)
-            to_delete = []
-            if ids:
-                to_delete = ids
-            elif filter:
-                qr = self.query(collection_name, filter)
-                to_delete = (qr.ids[0] if qr and qr.ids else [])
-            else:
-                # 全量删除：直接删除集合
-                try:
-                    client.collections.delete(name)
-                except Exception:
-                    pass
+        if not ids and not filter:
+            # Deleting everything: drop the collection (v4) or recreate it (v3)
+            try:
+                self.delete_collection(collection_name)
+            except Exception:
+                pass
+            if not self._is_v4(client):
+                self._ensure_collection(collection_name, 0)
+            return
+
+        if not self.has_collection(collection_name):
+            return
+
+        if filter and not ids:
+            if self._can_filter(filter) and self._ensure_filterable_properties(
+                collection_name
+            ):
+                if self._is_v4(client):
+                    client.collections.get(name).data.delete_many(
+                        where=self._build_filter(filter)
+                    )
+                else:
+                    client.batch.delete_objects(
+                        class_name=name, where=self._build_where(filter)
+                    )
                 return
-            for i in to_delete:
-                try:
-                    coll.data.delete_by_id(i)
-                except Exception:
-                    pass
-        else:
-            if ids or filter:
-                to_delete = ids or []
-                if filter and not to_delete:
-                    qr = self.query(collection_name, filter)
-                    to_delete = (qr.ids[0] if qr and qr.ids else [])
-                for i in to_delete:
-                    try:
-                        client.data_object.delete(uuid=i, class_name=name)
-                    except Exception:
-                        pass
+
+            result = self.query(collection_name, filter)
+            ids = result.ids[0] if result and result.ids else []
+
+        for start in range(0, len(ids), self.page_size):
+            batch = ids[start : start + self.page_size]
+            if self._is_v4(client):
+                from weaviate.classes.query import Filter
+
+                client.collections.get(name).data.delete_many(
+                    where=Filter.by_id().contains_any(batch)
+                )
             else:
-                # v3: 全量删除 => 重建类
-                try:
-                    client.schema.delete_class(name)
-                except Exception:
-                    pass
-                self._ensure_collection(collection_name, 0)
+                client.batch.delete_objects(
+                    class_name=name,
+                    where={
+                        "path": ["id"],
+                        "operator": "ContainsAny",
+                        "valueTextArray": batch,
+                    },
+                )
 
     def reset(self) -> None:
         client = self._require_client()
-        if hasattr(client, "collections"):
+        self._checked_collections.clear()
+        with self._backfill_lock:
+            self._backfills.clear()
+        if self._is_v4(client):
             # v4: list and delete prefixed collections only
             for c in client.collections.list_all():
-                if not self.collection_prefix or str(c).startswith(self.collection_prefix):
+                if not self.collection_prefix or str(c).startswith(
+                    self.collection_prefix
+                ):
                     try:
                         client.collections.delete(str(c))
                     except Exception:
@@ -347,7 +784,9 @@ class WeaviateClient(VectorDBBase):
             schema = client.schema.get()
             for cls in schema.get("classes", []) or []:
                 name = cls.get("class")
-                if not self.collection_prefix or name.startswith(self.collection_prefix):
+                if not self.collection_prefix or name.startswith(
+                    self.collection_prefix
+                ):
                     try:
                         client.schema.delete_class(name)
                     except Exception:
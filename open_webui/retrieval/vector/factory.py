@@ -1,6 +1,9 @@
+import threading
+
 from open_webui.retrieval.vector.main import VectorDBBase
 from open_webui.retrieval.vector.type import VectorType
 from open_webui.config import VECTOR_DB, ENABLE_QDRANT_MULTITENANCY_MODE
+from open_webui.env import ENABLE_LAZY_LOADING
 
 
 class Vector:
@@ -61,8 +64,39 @@ class Vector:
                 from open_webui.retrieval.vector.dbs.weaviate import WeaviateClient
 
                 return WeaviateClient()
+            case VectorType.HNSW:
+                from open_webui.retrieval.vector.dbs.hnsw import HNSWClient
+
+                return HNSWClient()
             case _:
                 raise ValueError(f"Unsupported vector type: {vector_type}")
 
 
-VECTOR_DB_CLIENT = Vector.get_vector(VECTOR_DB)
+class LazyVectorDBClient:
+    """
+    Stands in for the vector db client and creates it on first use, so
+    importing the app neither imports the client library nor connects to the
+    database.
+    """
+
+    def __init__(self, vector_type: str):
+        self.vector_type = vector_type
+        self._client = None
+        self._lock = threading.Lock()
+
+    def get_client(self) -> VectorDBBase:
+        if self._client is None:
+            with self._lock:
+                if self._client is None:
+                    self._client = Vector.get_vector(self.vector_type)
+        return self._client
+
+    def __getattr__(self, name):
+        return getattr(self.get_client(), name)
+
+
+VECTOR_DB_CLIENT = (
+    LazyVectorDBClient(VECTOR_DB)
+    if ENABLE_LAZY_LOADING
+    else Vector.get_vector(VECTOR_DB)
+)
@@ -17,7 +17,52 @@ class GetResult(BaseModel):
 
 
 class SearchResult(GetResult):
+    # Normalized similarity of every match, 0 (worst) -> 1 (best), whatever the
+    # backend ranked by (see `normalize_score`).
     distances: Optional[List[List[float | int]]]
+    # Metric the backend ranked by, one of `SEARCH_METRICS`.
+    metric: Optional[str] = None
+
+
+# Raw values a backend may return for a match, and how each maps to [0, 1]
+SEARCH_METRICS = (
+    # 0 (identical) -> 2 (opposite)
+    "cosine_distance",
+    # 1 (identical) -> -1 (opposite)
+    "cosine_similarity",
+    # 0 (identical) -> unbounded
+    "l2_distance",
+    # dot product, equals cosine similarity for normalized embeddings
+    "inner_product",
+    # -dot product, as returned by pgvector's <#> operator
+    "negative_inner_product",
+)
+
+
+def normalize_score(value: Optional[float], metric: str) -> float:
+    """
+    Map a raw backend distance or similarity to a similarity in [0, 1], higher
+    is better. Every adapter returns these in `SearchResult.distances`, so
+    results of different backends and collections can be merged, thresholded
+    and cut to top-k directly.
+    """
+    if value is None:
+        return 0.0
+
+    value = float(value)
+    if metric == "cosine_distance":
+        score = (2.0 - value) / 2.0
+    elif metric in ("cosine_similarity", "inner_product"):
+        score = (value + 1.0) / 2.0
+    elif metric == "negative_inner_product":
+        score = (1.0 - value) / 2.0
+    elif metric == "l2_distance":
+        score = 1.0 / (1.0 + max(value, 0.0))
+    else:
+        raise ValueError(
+            f"Unsupported search metric {metric}, expected one of {', '.join(SEARCH_METRICS)}."
+        )
+    return min(max(score, 0.0), 1.0)
 
 
 class VectorDBBase(ABC):
@@ -31,6 +76,18 @@ class VectorDBBase(ABC):
     implement all abstract methods.
     """
 
+    # Whether `search` answers every query vector in `vectors` (one result row
+    # per vector). Backends that only search the first vector leave this False.
+    supports_batch_search: bool = False
+
+    # Metric `search` ranks by, declared in `SearchResult.metric`. Scores in
+    # `SearchResult.distances` are always normalized with `normalize_score`.
+    metric: str = "cosine_distance"
+
+    # Reduced-precision storage modes (VECTOR_QUANTIZATION) the backend can
+    # index, collections configured with any other mode store float32.
+    supported_quantization: tuple[str, ...] = ("none",)
+
     @abstractmethod
     def has_collection(self, collection_name: str) -> bool:
         """Check if the collection exists in the vector DB."""
@@ -55,7 +112,10 @@ class VectorDBBase(ABC):
     def search(
         self, collection_name: str, vectors: List[List[Union[float, int]]], limit: int
     ) -> Optional[SearchResult]:
-        """Search for similar vectors in a collection."""
+        """
+        Search for similar vectors in a collection, scores are normalized
+        similarities (see `normalize_score`).
+        """
         pass
 
     @abstractmethod
@@ -84,3 +144,17 @@ class VectorDBBase(ABC):
     def reset(self) -> None:
         """Reset the vector database by removing all collections or those matching a condition."""
         pass
+
+    def get_index_status(self) -> Optional[Dict[str, Any]]:
+        """Report ANN index health, or None if the backend does not manage indexes."""
+        return None
+
+    def rebuild_index(self, collection_name: Optional[str] = None) -> bool:
+        """Rebuild the ANN index. Returns False if the backend does not manage indexes."""
+        return False
+
+    def get_vectors(
+        self, collection_name: str, ids: List[str]
+    ) -> Optional[Dict[str, List[float]]]:
+        """Return the stored vectors for `ids`, or None if the backend cannot return them."""
+        return None
@@ -1,4 +1,19 @@
+import logging
 from datetime import datetime
+from typing import Optional
+
+from open_webui.config import (
+    VECTOR_DB,
+    VECTOR_QUANTIZATION,
+    VECTOR_QUANTIZATION_COLLECTIONS,
+    VECTOR_QUANTIZATION_OVERSAMPLING,
+)
+from open_webui.env import SRC_LOG_LEVELS
+
+log = logging.getLogger(__name__)
+log.setLevel(SRC_LOG_LEVELS["RAG"])
+
+_unsupported_quantization_warned = set()
 
 
 def stringify_metadata(
@@ -12,3 +27,48 @@ def stringify_metadata(
         ):
             metadata[key] = str(value)
     return metadata
+
+
+def get_collection_quantization(collection_name: Optional[str]) -> str:
+    """
+    Configured storage mode of a collection (VECTOR_QUANTIZATION_MODES): the
+    override with the longest matching prefix, else VECTOR_QUANTIZATION. The
+    default mode is returned for `None`.
+    """
+    if collection_name is None:
+        return VECTOR_QUANTIZATION
+
+    prefixes = [
+        prefix
+        for prefix in VECTOR_QUANTIZATION_COLLECTIONS
+        if collection_name.startswith(prefix)
+    ]
+    if prefixes:
+        return VECTOR_QUANTIZATION_COLLECTIONS[max(prefixes, key=len)]
+    return VECTOR_QUANTIZATION
+
+
+def resolve_quantization(client, collection_name: Optional[str]) -> str:
+    """Storage mode `client` uses for a collection, "none" if the configured one is unsupported."""
+    mode = get_collection_quantization(collection_name)
+    if mode in client.supported_quantization:
+        return mode
+
+    if mode not in _unsupported_quantization_warned:
+        _unsupported_quantization_warned.add(mode)
+        log.warning(
+            f"{type(client).__name__} does not support {mode} vector quantization, "
+            "storing full precision vectors"
+        )
+    return "none"
+
+
+def get_vector_storage_config(client) -> dict:
+    """Vector storage settings as reported in the retrieval config."""
+    return {
+        "VECTOR_DB": VECTOR_DB,
+        "VECTOR_QUANTIZATION": VECTOR_QUANTIZATION,
+        "VECTOR_QUANTIZATION_COLLECTIONS": VECTOR_QUANTIZATION_COLLECTIONS,
+        "VECTOR_QUANTIZATION_OVERSAMPLING": VECTOR_QUANTIZATION_OVERSAMPLING,
+        "SUPPORTED_QUANTIZATION": list(client.supported_quantization),
+    }
@@ -5,8 +5,6 @@ import os
 import uuid
 from functools import lru_cache
 from pathlib import Path
-from pydub import AudioSegment
-from pydub.silence import split_on_silence
 from concurrent.futures import ThreadPoolExecutor
 from typing import Optional
 
@@ -34,6 +32,7 @@ from pydantic import BaseModel
 
 
 from open_webui.utils.auth import get_admin_user, get_verified_user
+from open_webui.utils.http_client import get_http_session
 from open_webui.config import (
     WHISPER_MODEL_AUTO_UPDATE,
     WHISPER_MODEL_DIR,
@@ -73,9 +72,6 @@ SPEECH_CACHE_DIR.mkdir(parents=True, exist_ok=True)
 #
 ##########################################
 
-from pydub import AudioSegment
-from pydub.utils import mediainfo
-
 
 def is_audio_conversion_required(file_path):
     """
@@ -88,6 +84,8 @@ def is_audio_conversion_required(file_path):
         return False
 
     try:
+        from pydub.utils import mediainfo
+
         info = mediainfo(file_path)
         codec_name = info.get("codec_name", "").lower()
         codec_type = info.get("codec_type", "").lower()
@@ -110,6 +108,8 @@ def is_audio_conversion_required(file_path):
 def convert_audio_to_mp3(file_path):
     """Convert audio file to mp3 format."""
     try:
+        from pydub import AudioSegment
+
         output_path = os.path.splitext(file_path)[0] + ".mp3"
         audio = AudioSegment.from_file(file_path)
         audio.export(output_path, format="mp3")
@@ -334,36 +334,36 @@ async def speech(request: Request, user=Depends(get_verified_user)):
 
         try:
             timeout = aiohttp.ClientTimeout(total=AIOHTTP_CLIENT_TIMEOUT)
-            async with aiohttp.ClientSession(
-                timeout=timeout, trust_env=True
-            ) as session:
-                r = await session.post(
-                    url=f"{request.app.state.config.TTS_OPENAI_API_BASE_URL}/audio/speech",
-                    json=payload,
-                    headers={
-                        "Content-Type": "application/json",
-                        "Authorization": f"Bearer {request.app.state.config.TTS_OPENAI_API_KEY}",
-                        **(
-                            {
-                                "X-OpenWebUI-User-Name": quote(user.name, safe=" "),
-                                "X-OpenWebUI-User-Id": user.id,
-                                "X-OpenWebUI-User-Email": user.email,
-                                "X-OpenWebUI-User-Role": user.role,
-                            }
-                            if ENABLE_FORWARD_USER_INFO_HEADERS
-                            else {}
-                        ),
-                    },
-                    ssl=AIOHTTP_CLIENT_SESSION_SSL,
-                )
+            r = await get_http_session(
+                request.app.state.config.TTS_OPENAI_API_BASE_URL
+            ).post(
+                url=f"{request.app.state.config.TTS_OPENAI_API_BASE_URL}/audio/speech",
+                json=payload,
+                headers={
+                    "Content-Type": "application/json",
+                    "Authorization": f"Bearer {request.app.state.config.TTS_OPENAI_API_KEY}",
+                    **(
+                        {
+                            "X-OpenWebUI-User-Name": quote(user.name, safe=" "),
+                            "X-OpenWebUI-User-Id": user.id,
+                            "X-OpenWebUI-User-Email": user.email,
+                            "X-OpenWebUI-User-Role": user.role,
+                        }
+                        if ENABLE_FORWARD_USER_INFO_HEADERS
+                        else {}
+                    ),
+                },
+                ssl=AIOHTTP_CLIENT_SESSION_SSL,
+                timeout=timeout,
+            )
 
-                r.raise_for_status()
+            r.raise_for_status()
 
-                async with aiofiles.open(file_path, "wb") as f:
-                    await f.write(await r.read())
+            async with aiofiles.open(file_path, "wb") as f:
+                await f.write(await r.read())
 
-                async with aiofiles.open(file_body_path, "w") as f:
-                    await f.write(json.dumps(payload))
+            async with aiofiles.open(file_body_path, "w") as f:
+                await f.write(json.dumps(payload))
 
             return FileResponse(file_path)
 
@@ -400,30 +400,28 @@ async def speech(request: Request, user=Depends(get_verified_user)):
 
         try:
             timeout = aiohttp.ClientTimeout(total=AIOHTTP_CLIENT_TIMEOUT)
-            async with aiohttp.ClientSession(
-                timeout=timeout, trust_env=True
-            ) as session:
-                async with session.post(
-                    f"https://api.elevenlabs.io/v1/text-to-speech/{voice_id}",
-                    json={
-                        "text": payload["input"],
-                        "model_id": request.app.state.config.TTS_MODEL,
-                        "voice_settings": {"stability": 0.5, "similarity_boost": 0.5},
-                    },
-                    headers={
-                        "Accept": "audio/mpeg",
-                        "Content-Type": "application/json",
-                        "xi-api-key": request.app.state.config.TTS_API_KEY,
-                    },
-                    ssl=AIOHTTP_CLIENT_SESSION_SSL,
-                ) as r:
-                    r.raise_for_status()
+            async with get_http_session("https://api.elevenlabs.io").post(
+                f"https://api.elevenlabs.io/v1/text-to-speech/{voice_id}",
+                json={
+                    "text": payload["input"],
+                    "model_id": request.app.state.config.TTS_MODEL,
+                    "voice_settings": {"stability": 0.5, "similarity_boost": 0.5},
+                },
+                headers={
+                    "Accept": "audio/mpeg",
+                    "Content-Type": "application/json",
+                    "xi-api-key": request.app.state.config.TTS_API_KEY,
+                },
+                ssl=AIOHTTP_CLIENT_SESSION_SSL,
+                timeout=timeout,
+            ) as r:
+                r.raise_for_status()
 
-                    async with aiofiles.open(file_path, "wb") as f:
-                        await f.write(await r.read())
+                async with aiofiles.open(file_path, "wb") as f:
+                    await f.write(await r.read())
 
-                    async with aiofiles.open(file_body_path, "w") as f:
-                        await f.write(json.dumps(payload))
+                async with aiofiles.open(file_body_path, "w") as f:
+                    await f.write(json.dumps(payload))
 
             return FileResponse(file_path)
 
@@ -462,29 +460,29 @@ async def speech(request: Request, user=Depends(get_verified_user)):
                 <voice name="{language}">{payload["input"]}</voice>
             </speak>"""
             timeout = aiohttp.ClientTimeout(total=AIOHTTP_CLIENT_TIMEOUT)
-            async with aiohttp.ClientSession(
-                timeout=timeout, trust_env=True
-            ) as session:
-                async with session.post(
-                    (base_url or f"https://{region}.tts.speech.microsoft.com")
-                    + "/cognitiveservices/v1",
-                    headers={
-                        "Ocp-Apim-Subscription-Key": request.app.state.config.TTS_API_KEY,
-                        "Content-Type": "application/ssml+xml",
-                        "X-Microsoft-OutputFormat": output_format,
-                    },
-                    data=data,
-                    ssl=AIOHTTP_CLIENT_SESSION_SSL,
-                ) as r:
-                    r.raise_for_status()
+            async with get_http_session(
+                base_url or f"https://{region}.tts.speech.microsoft.com"
+            ).post(
+                (base_url or f"https://{region}.tts.speech.microsoft.com")
+                + "/cognitiveservices/v1",
+                headers={
+                    "Ocp-Apim-Subscription-Key": request.app.state.config.TTS_API_KEY,
+                    "Content-Type": "application/ssml+xml",
+                    "X-Microsoft-OutputFormat": output_format,
+                },
+                data=data,
+                ssl=AIOHTTP_CLIENT_SESSION_SSL,
+                timeout=timeout,
+            ) as r:
+                r.raise_for_status()
 
-                    async with aiofiles.open(file_path, "wb") as f:
-                        await f.write(await r.read())
+                async with aiofiles.open(file_path, "wb") as f:
+                    await f.write(await r.read())
 
-                    async with aiofiles.open(file_body_path, "w") as f:
-                        await f.write(json.dumps(payload))
+                async with aiofiles.open(file_body_path, "w") as f:
+                    await f.write(json.dumps(payload))
 
-                    return FileResponse(file_path)
+                return FileResponse(file_path)
 
         except Exception as e:
             log.exception(e)
@@ -861,6 +859,8 @@ def transcribe(request: Request, file_path: str, metadata: Optional[dict] = None
 
 def compress_audio(file_path):
     if os.path.getsize(file_path) > MAX_FILE_SIZE:
+        from pydub import AudioSegment
+
         id = os.path.splitext(os.path.basename(file_path))[
             0
         ]  # Handles names with multiple dots
@@ -887,6 +887,8 @@ def split_audio(file_path, max_bytes, format="mp3", bitrate="32k"):
     if file_size <= max_bytes:
         return [file_path]  # Nothing to split
 
+    from pydub import AudioSegment
+
     audio = AudioSegment.from_file(file_path)
     duration_ms = len(audio)
     orig_size = file_size
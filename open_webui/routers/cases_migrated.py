@@ -33,7 +33,6 @@ from open_webui.config import (
     RAG_OPENAI_API_BASE_URL,
     RAG_OPENAI_API_KEY,
     RAG_AZURE_OPENAI_BASE_URL,
-    VECTOR_DB,
 )
 
 log = logging.getLogger(__name__)
@@ -669,7 +668,8 @@ async def get_node_knowledge(
             for i, _id in enumerate(res.ids[0]):
                 item = {
                     "knowledge_id": kb.id,
-                    "distance": float(res.distances[0][i]) if res.distances else None,
+                    # 所有后端均返回归一化的相似度（0~1，越大越好）
+                    "score": float(res.distances[0][i]) if res.distances else 0.0,
                     "content": res.documents[0][i] if res.documents else "",
                     "metadata": res.metadatas[0][i] if res.metadatas else {},
                 }
@@ -678,22 +678,11 @@ async def get_node_knowledge(
             log.debug(f"knowledge search failed for {kb.id}: {e}")
             continue
 
-    # 归一化评分并可选按 vendor 过滤
-    for it in agg:
-        d = it.get("distance")
-        if d is None:
-            it["score"] = 0.0
-        else:
-            if str(VECTOR_DB).lower() == "weaviate":
-                it["score"] = 1.0 / (1.0 + float(d))
-            else:
-                it["score"] = float(d)
+    # 可选按 vendor 过滤
     if vendor:
         agg = [x for x in agg if isinstance(x.get("metadata"), dict) and (x["metadata"].get("vendor") == vendor)]
 
     agg_sorted = sorted(agg, key=lambda x: x.get("score", 0), reverse=True)[:topK]
-    for it in agg_sorted:
-        it.pop("distance", None)
 
     elapsed_ms = int((time.time() - start) * 1000)
     return {
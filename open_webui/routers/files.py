@@ -33,10 +33,15 @@ from open_webui.models.files import (
 from open_webui.models.knowledge import Knowledges
 
 from open_webui.routers.knowledge import get_knowledge, get_knowledge_list
-from open_webui.routers.retrieval import ProcessFileForm, process_file
+from open_webui.routers.retrieval import (
+    ProcessFileForm,
+    delete_reranking_embeddings,
+    process_file,
+)
 from open_webui.routers.audio import transcribe
 from open_webui.storage.provider import Storage
 from open_webui.utils.auth import get_admin_user, get_verified_user
+from open_webui.utils.startup import wait_for_warm_up_async
 from pydantic import BaseModel
 
 log = logging.getLogger(__name__)
@@ -288,6 +293,7 @@ async def delete_all_files(user=Depends(get_admin_user)):
         try:
             Storage.delete_all_files()
             VECTOR_DB_CLIENT.reset()
+            delete_reranking_embeddings()
         except Exception as e:
             log.exception(e)
             log.error("Error deleting files")
@@ -386,6 +392,8 @@ async def update_file_data_content_by_id(
         or has_access_to_file(id, "write", user)
     ):
         try:
+            # the local models may still be loading with ENABLE_LAZY_LOADING
+            await wait_for_warm_up_async("retrieval_models")
             process_file(
                 request,
                 ProcessFileForm(file_id=id, content=form_data.content),
@@ -611,6 +619,7 @@ async def delete_file_by_id(id: str, user=Depends(get_verified_user)):
             try:
                 Storage.delete_file(file.path)
                 VECTOR_DB_CLIENT.delete(collection_name=f"file-{id}")
+                delete_reranking_embeddings(f"file-{id}")
             except Exception as e:
                 log.exception(e)
                 log.error("Error deleting files")
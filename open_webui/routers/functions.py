@@ -15,7 +15,11 @@ from open_webui.models.functions import (
 from open_webui.utils.plugin import (
     load_function_module_by_id,
     replace_imports,
+    get_content_version,
     get_function_module_from_cache,
+    cache_function_module,
+    invalidate_function_module,
+    REQUIREMENTS_STATUS,
 )
 from open_webui.config import CACHE_DIR
 from open_webui.constants import ERROR_MESSAGES
@@ -51,6 +55,17 @@ async def get_functions(user=Depends(get_admin_user)):
     return Functions.get_functions()
 
 
+############################
+# GetRequirementsStatus
+############################
+
+
+@router.get("/requirements", response_model=dict[str, str])
+async def get_requirements_status(user=Depends(get_admin_user)):
+    # install status of the startup requirements, keyed by "function:<id>" or "tool:<id>"
+    return REQUIREMENTS_STATUS
+
+
 ############################
 # LoadFunctionFromLink
 ############################
@@ -147,7 +162,9 @@ async def sync_functions(
                 content=function.content,
             )
 
-        return Functions.sync_functions(user.id, form_data.functions)
+        functions = Functions.sync_functions(user.id, form_data.functions)
+        await invalidate_function_module(request.app)
+        return functions
     except Exception as e:
         log.exception(f"Failed to load a function: {e}")
         raise HTTPException(
@@ -183,8 +200,9 @@ async def create_new_function(
             )
             form_data.meta.manifest = frontmatter
 
-            FUNCTIONS = request.app.state.FUNCTIONS
-            FUNCTIONS[form_data.id] = function_module
+            cache_function_module(
+                request.app, form_data.id, function_module, form_data.content
+            )
 
             function = Functions.insert_new_function(user.id, function_type, form_data)
 
@@ -299,8 +317,7 @@ async def update_function_by_id(
         )
         form_data.meta.manifest = frontmatter
 
-        FUNCTIONS = request.app.state.FUNCTIONS
-        FUNCTIONS[id] = function_module
+        cache_function_module(request.app, id, function_module, form_data.content)
 
         updated = {**form_data.model_dump(exclude={"id"}), "type": function_type}
         log.debug(updated)
@@ -308,6 +325,10 @@ async def update_function_by_id(
         function = Functions.update_function_by_id(id, updated)
 
         if function:
+            # other nodes drop their module, ours is already at this version
+            await invalidate_function_module(
+                request.app, id, version=get_content_version(form_data.content)
+            )
             return function
         else:
             raise HTTPException(
@@ -334,9 +355,7 @@ async def delete_function_by_id(
     result = Functions.delete_function_by_id(id)
 
     if result:
-        FUNCTIONS = request.app.state.FUNCTIONS
-        if id in FUNCTIONS:
-            del FUNCTIONS[id]
+        await invalidate_function_module(request.app, id)
 
     return result
 
@@ -9,19 +9,26 @@ from open_webui.models.knowledge import (
     KnowledgeResponse,
     KnowledgeUserResponse,
 )
-from open_webui.models.files import Files, FileModel, FileMetadataResponse
+from open_webui.models.files import (
+    FileCollections,
+    Files,
+    FileModel,
+    FileMetadataResponse,
+)
 from open_webui.retrieval.vector.factory import VECTOR_DB_CLIENT
 from open_webui.routers.retrieval import (
     process_file,
     ProcessFileForm,
     process_files_batch,
     BatchProcessFilesForm,
+    delete_reranking_embeddings,
 )
 from open_webui.storage.provider import Storage
 
 from open_webui.constants import ERROR_MESSAGES
 from open_webui.utils.auth import get_verified_user
 from open_webui.utils.access_control import has_access, has_permission
+from open_webui.utils.startup import wait_for_warm_up_async
 
 
 from open_webui.env import SRC_LOG_LEVELS
@@ -181,6 +188,9 @@ async def reindex_knowledge_files(request: Request, user=Depends(get_verified_us
 
     deleted_knowledge_bases = []
 
+    # the local models may still be loading with ENABLE_LAZY_LOADING
+    await wait_for_warm_up_async("retrieval_models")
+
     for knowledge_base in knowledge_bases:
         # -- Robust error handling for missing or invalid data
         if not knowledge_base.data or not isinstance(knowledge_base.data, dict):
@@ -204,6 +214,8 @@ async def reindex_knowledge_files(request: Request, user=Depends(get_verified_us
                     VECTOR_DB_CLIENT.delete_collection(
                         collection_name=knowledge_base.id
                     )
+                FileCollections.delete_collection(knowledge_base.id)
+                delete_reranking_embeddings(knowledge_base.id)
             except Exception as e:
                 log.error(f"Error deleting collection {knowledge_base.id}: {str(e)}")
                 continue  # Skip, don't raise
@@ -452,6 +464,7 @@ def update_file_from_knowledge_by_id(
     VECTOR_DB_CLIENT.delete(
         collection_name=knowledge.id, filter={"file_id": form_data.file_id}
     )
+    FileCollections.remove_file_from_collection(knowledge.id, form_data.file_id)
 
     # Add content to the vector database
     try:
@@ -533,6 +546,7 @@ def remove_file_from_knowledge_by_id(
         file_collection = f"file-{form_data.file_id}"
         if VECTOR_DB_CLIENT.has_collection(collection_name=file_collection):
             VECTOR_DB_CLIENT.delete_collection(collection_name=file_collection)
+            delete_reranking_embeddings(file_collection)
     except Exception as e:
         log.debug("This was most likely caused by bypassing embedding processing")
         log.debug(e)
@@ -634,6 +648,7 @@ async def delete_knowledge_by_id(id: str, user=Depends(get_verified_user)):
     except Exception as e:
         log.debug(e)
         pass
+    delete_reranking_embeddings(id)
     result = Knowledges.delete_knowledge_by_id(id=id)
     return result
 
@@ -667,6 +682,7 @@ async def reset_knowledge_by_id(id: str, user=Depends(get_verified_user)):
     except Exception as e:
         log.debug(e)
         pass
+    delete_reranking_embeddings(id)
 
     knowledge = Knowledges.update_knowledge_data_by_id(id=id, data={"file_ids": []})
 
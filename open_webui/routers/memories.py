@@ -1,3 +1,5 @@
+import asyncio
+
 from fastapi import APIRouter, Depends, HTTPException, Request
 from pydantic import BaseModel
 import logging
@@ -17,7 +19,11 @@ router = APIRouter()
 
 @router.get("/ef")
 async def get_embeddings(request: Request):
-    return {"result": request.app.state.EMBEDDING_FUNCTION("hello world")}
+    return {
+        "result": await asyncio.to_thread(
+            request.app.state.EMBEDDING_FUNCTION, "hello world"
+        )
+    }
 
 
 ############################
@@ -57,8 +63,8 @@ async def add_memory(
             {
                 "id": memory.id,
                 "text": memory.content,
-                "vector": request.app.state.EMBEDDING_FUNCTION(
-                    memory.content, user=user
+                "vector": await asyncio.to_thread(
+                    request.app.state.EMBEDDING_FUNCTION, memory.content, user=user
                 ),
                 "metadata": {"created_at": memory.created_at},
             }
@@ -88,7 +94,11 @@ async def query_memory(
 
     results = VECTOR_DB_CLIENT.search(
         collection_name=f"user-memory-{user.id}",
-        vectors=[request.app.state.EMBEDDING_FUNCTION(form_data.content, user=user)],
+        vectors=[
+            await asyncio.to_thread(
+                request.app.state.EMBEDDING_FUNCTION, form_data.content, user=user
+            )
+        ],
         limit=form_data.k,
     )
 
@@ -105,21 +115,25 @@ async def reset_memory_from_vector_db(
     VECTOR_DB_CLIENT.delete_collection(f"user-memory-{user.id}")
 
     memories = Memories.get_memories_by_user_id(user.id)
+    vectors = await asyncio.to_thread(
+        lambda: [
+            request.app.state.EMBEDDING_FUNCTION(memory.content, user=user)
+            for memory in memories
+        ]
+    )
     VECTOR_DB_CLIENT.upsert(
         collection_name=f"user-memory-{user.id}",
         items=[
             {
                 "id": memory.id,
                 "text": memory.content,
-                "vector": request.app.state.EMBEDDING_FUNCTION(
-                    memory.content, user=user
-                ),
+                "vector": vector,
                 "metadata": {
                     "created_at": memory.created_at,
                     "updated_at": memory.updated_at,
                 },
             }
-            for memory in memories
+            for memory, vector in zip(memories, vectors)
         ],
     )
 
@@ -170,8 +184,8 @@ async def update_memory_by_id(
                 {
                     "id": memory.id,
                     "text": memory.content,
-                    "vector": request.app.state.EMBEDDING_FUNCTION(
-                        memory.content, user=user
+                    "vector": await asyncio.to_thread(
+                        request.app.state.EMBEDDING_FUNCTION, memory.content, user=user
                     ),
                     "metadata": {
                         "created_at": memory.created_at,
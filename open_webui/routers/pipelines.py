@@ -26,6 +26,7 @@ from open_webui.constants import ERROR_MESSAGES
 from open_webui.routers.openai import get_all_models_responses
 
 from open_webui.utils.auth import get_admin_user
+from open_webui.utils.http_client import get_http_session
 
 log = logging.getLogger(__name__)
 log.setLevel(SRC_LOG_LEVELS["MAIN"])
@@ -66,46 +67,45 @@ async def process_pipeline_inlet_filter(request, payload, user, models):
     if "pipeline" in model:
         sorted_filters.append(model)
 
-    async with aiohttp.ClientSession(trust_env=True) as session:
-        for filter in sorted_filters:
-            urlIdx = filter.get("urlIdx")
+    for filter in sorted_filters:
+        urlIdx = filter.get("urlIdx")
 
-            try:
-                urlIdx = int(urlIdx)
-            except:
-                continue
-
-            url = request.app.state.config.OPENAI_API_BASE_URLS[urlIdx]
-            key = request.app.state.config.OPENAI_API_KEYS[urlIdx]
+        try:
+            urlIdx = int(urlIdx)
+        except:
+            continue
 
-            if not key:
-                continue
-
-            headers = {"Authorization": f"Bearer {key}"}
-            request_data = {
-                "user": user,
-                "body": payload,
-            }
+        url = request.app.state.config.OPENAI_API_BASE_URLS[urlIdx]
+        key = request.app.state.config.OPENAI_API_KEYS[urlIdx]
 
-            try:
-                async with session.post(
-                    f"{url}/{filter['id']}/filter/inlet",
-                    headers=headers,
-                    json=request_data,
-                    ssl=AIOHTTP_CLIENT_SESSION_SSL,
-                ) as response:
-                    payload = await response.json()
-                    response.raise_for_status()
-            except aiohttp.ClientResponseError as e:
-                res = (
-                    await response.json()
-                    if response.content_type == "application/json"
-                    else {}
-                )
-                if "detail" in res:
-                    raise Exception(response.status, res["detail"])
-            except Exception as e:
-                log.exception(f"Connection error: {e}")
+        if not key:
+            continue
+
+        headers = {"Authorization": f"Bearer {key}"}
+        request_data = {
+            "user": user,
+            "body": payload,
+        }
+
+        try:
+            async with get_http_session(url).post(
+                f"{url}/{filter['id']}/filter/inlet",
+                headers=headers,
+                json=request_data,
+                ssl=AIOHTTP_CLIENT_SESSION_SSL,
+            ) as response:
+                payload = await response.json()
+                response.raise_for_status()
+        except aiohttp.ClientResponseError as e:
+            res = (
+                await response.json()
+                if response.content_type == "application/json"
+                else {}
+            )
+            if "detail" in res:
+                raise Exception(response.status, res["detail"])
+        except Exception as e:
+            log.exception(f"Connection error: {e}")
 
     return payload
 
@@ -119,49 +119,48 @@ async def process_pipeline_outlet_filter(request, payload, user, models):
     if "pipeline" in model:
         sorted_filters = [model] + sorted_filters
 
-    async with aiohttp.ClientSession(trust_env=True) as session:
-        for filter in sorted_filters:
-            urlIdx = filter.get("urlIdx")
+    for filter in sorted_filters:
+        urlIdx = filter.get("urlIdx")
 
-            try:
-                urlIdx = int(urlIdx)
-            except:
-                continue
-
-            url = request.app.state.config.OPENAI_API_BASE_URLS[urlIdx]
-            key = request.app.state.config.OPENAI_API_KEYS[urlIdx]
+        try:
+            urlIdx = int(urlIdx)
+        except:
+            continue
 
-            if not key:
-                continue
-
-            headers = {"Authorization": f"Bearer {key}"}
-            request_data = {
-                "user": user,
-                "body": payload,
-            }
+        url = request.app.state.config.OPENAI_API_BASE_URLS[urlIdx]
+        key = request.app.state.config.OPENAI_API_KEYS[urlIdx]
 
+        if not key:
+            continue
+
+        headers = {"Authorization": f"Bearer {key}"}
+        request_data = {
+            "user": user,
+            "body": payload,
+        }
+
+        try:
+            async with get_http_session(url).post(
+                f"{url}/{filter['id']}/filter/outlet",
+                headers=headers,
+                json=request_data,
+                ssl=AIOHTTP_CLIENT_SESSION_SSL,
+            ) as response:
+                payload = await response.json()
+                response.raise_for_status()
+        except aiohttp.ClientResponseError as e:
             try:
-                async with session.post(
-                    f"{url}/{filter['id']}/filter/outlet",
-                    headers=headers,
-                    json=request_data,
-                    ssl=AIOHTTP_CLIENT_SESSION_SSL,
-                ) as response:
-                    payload = await response.json()
-                    response.raise_for_status()
-            except aiohttp.ClientResponseError as e:
-                try:
-                    res = (
-                        await response.json()
-                        if "application/json" in response.content_type
-                        else {}
-                    )
-                    if "detail" in res:
-                        raise Exception(response.status, res)
-                except Exception:
-                    pass
-            except Exception as e:
-                log.exception(f"Connection error: {e}")
+                res = (
+                    await response.json()
+                    if "application/json" in response.content_type
+                    else {}
+                )
+                if "detail" in res:
+                    raise Exception(response.status, res)
+            except Exception:
+                pass
+        except Exception as e:
+            log.exception(f"Connection error: {e}")
 
     return payload
 
@@ -4,12 +4,13 @@ import mimetypes
 import os
 import shutil
 import asyncio
+import itertools
+from collections import defaultdict
 
 
-import uuid
 from datetime import datetime
 from pathlib import Path
-from typing import Iterator, List, Optional, Sequence, Union
+from typing import Callable, Iterable, Iterator, List, Optional, Sequence, Union
 
 from fastapi import (
     Depends,
@@ -25,19 +26,17 @@ from fastapi import (
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.concurrency import run_in_threadpool
 from pydantic import BaseModel
-import tiktoken
 
 
-from langchain.text_splitter import RecursiveCharacterTextSplitter, TokenTextSplitter
-from langchain_text_splitters import MarkdownHeaderTextSplitter
 from langchain_core.documents import Document
 
-from open_webui.models.files import FileModel, Files
+from open_webui.models.files import FileCollections, FileModel, Files
 from open_webui.models.knowledge import Knowledges
 from open_webui.storage.provider import Storage
 
 
 from open_webui.retrieval.vector.factory import VECTOR_DB_CLIENT
+from open_webui.retrieval.vector.utils import get_vector_storage_config
 
 # Document loaders
 from open_webui.retrieval.loaders.main import Loader
@@ -77,10 +76,15 @@ from open_webui.retrieval.utils import (
     query_doc,
     query_doc_with_hybrid_search,
 )
+from open_webui.retrieval.ingest import run_ingestion_pipeline
+from open_webui.retrieval.models.colbert_index import (
+    remove_collections as remove_colbert_collections,
+)
 from open_webui.utils.misc import (
     calculate_sha256_string,
 )
 from open_webui.utils.auth import get_admin_user, get_verified_user
+from open_webui.utils.startup import wait_for_warm_up
 
 from open_webui.config import (
     ENV,
@@ -92,6 +96,11 @@ from open_webui.config import (
     DEFAULT_LOCALE,
     RAG_EMBEDDING_CONTENT_PREFIX,
     RAG_EMBEDDING_QUERY_PREFIX,
+    RAG_INGESTION_BATCH_SIZE,
+    RAG_EMBEDDING_CONCURRENT_REQUESTS,
+    RAG_COLBERT_PRECOMPUTE_EMBEDDINGS,
+    RAG_COLBERT_INDEX_DIR,
+    RAG_COLBERT_INDEX_MAX_SIZE_MB,
 )
 from open_webui.env import (
     SRC_LOG_LEVELS,
@@ -154,6 +163,12 @@ def get_rf(
                 rf = ColBERT(
                     get_model_path(reranking_model, auto_update),
                     env="docker" if DOCKER else None,
+                    index_path=(
+                        RAG_COLBERT_INDEX_DIR
+                        if RAG_COLBERT_PRECOMPUTE_EMBEDDINGS
+                        else None
+                    ),
+                    index_max_size=RAG_COLBERT_INDEX_MAX_SIZE_MB * 1024 * 1024,
                 )
 
             except Exception as e:
@@ -442,6 +457,8 @@ async def get_rag_config(request: Request, user=Depends(get_admin_user)):
         # Integration settings
         "ENABLE_GOOGLE_DRIVE_INTEGRATION": request.app.state.config.ENABLE_GOOGLE_DRIVE_INTEGRATION,
         "ENABLE_ONEDRIVE_INTEGRATION": request.app.state.config.ENABLE_ONEDRIVE_INTEGRATION,
+        # Vector storage settings (read-only, from the environment)
+        "vector": get_vector_storage_config(VECTOR_DB_CLIENT),
         # Web search settings
         "web": {
             "ENABLE_WEB_SEARCH": request.app.state.config.ENABLE_WEB_SEARCH,
@@ -1060,6 +1077,8 @@ async def update_rag_config(
         # Integration settings
         "ENABLE_GOOGLE_DRIVE_INTEGRATION": request.app.state.config.ENABLE_GOOGLE_DRIVE_INTEGRATION,
         "ENABLE_ONEDRIVE_INTEGRATION": request.app.state.config.ENABLE_ONEDRIVE_INTEGRATION,
+        # Vector storage settings (read-only, from the environment)
+        "vector": get_vector_storage_config(VECTOR_DB_CLIENT),
         # Web search settings
         "web": {
             "ENABLE_WEB_SEARCH": request.app.state.config.ENABLE_WEB_SEARCH,
@@ -1123,6 +1142,181 @@ async def update_rag_config(
 ####################################
 
 
+def split_docs(request: Request, docs: list[Document]) -> Iterator[Document]:
+    """
+    Split ``docs`` with the configured text splitter, one source document at a
+    time, so chunks can be consumed before the whole input has been split.
+    """
+    from langchain.text_splitter import (
+        RecursiveCharacterTextSplitter,
+        TokenTextSplitter,
+    )
+    from langchain_text_splitters import MarkdownHeaderTextSplitter
+
+    if request.app.state.config.TEXT_SPLITTER in ["", "character"]:
+        text_splitter = RecursiveCharacterTextSplitter(
+            chunk_size=request.app.state.config.CHUNK_SIZE,
+            chunk_overlap=request.app.state.config.CHUNK_OVERLAP,
+            add_start_index=True,
+        )
+        for doc in docs:
+            yield from text_splitter.split_documents([doc])
+    elif request.app.state.config.TEXT_SPLITTER == "token":
+        log.info(
+            f"Using token text splitter: {request.app.state.config.TIKTOKEN_ENCODING_NAME}"
+        )
+
+        import tiktoken
+
+        tiktoken.get_encoding(str(request.app.state.config.TIKTOKEN_ENCODING_NAME))
+        text_splitter = TokenTextSplitter(
+            encoding_name=str(request.app.state.config.TIKTOKEN_ENCODING_NAME),
+            chunk_size=request.app.state.config.CHUNK_SIZE,
+            chunk_overlap=request.app.state.config.CHUNK_OVERLAP,
+            add_start_index=True,
+        )
+        for doc in docs:
+            yield from text_splitter.split_documents([doc])
+    elif request.app.state.config.TEXT_SPLITTER == "markdown_header":
+        log.info("Using markdown header text splitter")
+
+        # Define headers to split on - covering most common markdown header levels
+        headers_to_split_on = [
+            ("#", "Header 1"),
+            ("##", "Header 2"),
+            ("###", "Header 3"),
+            ("####", "Header 4"),
+            ("#####", "Header 5"),
+            ("######", "Header 6"),
+        ]
+
+        markdown_splitter = MarkdownHeaderTextSplitter(
+            headers_to_split_on=headers_to_split_on,
+            strip_headers=False,  # Keep headers in content for context
+        )
+        text_splitter = RecursiveCharacterTextSplitter(
+            chunk_size=request.app.state.config.CHUNK_SIZE,
+            chunk_overlap=request.app.state.config.CHUNK_OVERLAP,
+            add_start_index=True,
+        )
+
+        for doc in docs:
+            md_header_splits = markdown_splitter.split_text(doc.page_content)
+            md_header_splits = text_splitter.split_documents(md_header_splits)
+
+            # Convert back to Document objects, preserving original metadata
+            for split_chunk in md_header_splits:
+                headings_list = []
+                # Extract header values in order based on headers_to_split_on
+                for _, header_meta_key_name in headers_to_split_on:
+                    if header_meta_key_name in split_chunk.metadata:
+                        headings_list.append(split_chunk.metadata[header_meta_key_name])
+
+                yield Document(
+                    page_content=split_chunk.page_content,
+                    metadata={**doc.metadata, "headings": headings_list},
+                )
+    else:
+        raise ValueError(ERROR_MESSAGES.DEFAULT("Invalid text splitter"))
+
+
+def delete_reranking_embeddings(collection_name: Optional[str] = None) -> None:
+    """
+    Drop the precomputed ColBERT token embeddings of a deleted collection, or
+    of every collection when ``collection_name`` is None.
+    """
+    if not RAG_COLBERT_PRECOMPUTE_EMBEDDINGS:
+        return
+    try:
+        remove_colbert_collections(
+            RAG_COLBERT_INDEX_DIR,
+            [collection_name] if collection_name is not None else None,
+        )
+    except Exception as e:
+        log.warning(f"Failed to delete reranking embeddings: {e}")
+
+
+def embed_and_write_chunks(
+    request: Request,
+    chunks: Iterable[dict],
+    write: Callable[[list[dict]], None],
+    user=None,
+    on_error: Optional[Callable[[list[dict], Exception], None]] = None,
+    collection_name: Optional[str] = None,
+) -> int:
+    """
+    Run ``chunks`` through the ingestion pipeline with the configured embedding
+    engine, handing every embedded batch of vector items to ``write``.
+    """
+    # the local models may still be loading with ENABLE_LAZY_LOADING
+    wait_for_warm_up("retrieval_models")
+
+    embedding_function = get_embedding_function(
+        request.app.state.config.RAG_EMBEDDING_ENGINE,
+        request.app.state.config.RAG_EMBEDDING_MODEL,
+        request.app.state.ef,
+        (
+            request.app.state.config.RAG_OPENAI_API_BASE_URL
+            if request.app.state.config.RAG_EMBEDDING_ENGINE == "openai"
+            else (
+                request.app.state.config.RAG_OLLAMA_BASE_URL
+                if request.app.state.config.RAG_EMBEDDING_ENGINE == "ollama"
+                else request.app.state.config.RAG_AZURE_OPENAI_BASE_URL
+            )
+        ),
+        (
+            request.app.state.config.RAG_OPENAI_API_KEY
+            if request.app.state.config.RAG_EMBEDDING_ENGINE == "openai"
+            else (
+                request.app.state.config.RAG_OLLAMA_API_KEY
+                if request.app.state.config.RAG_EMBEDDING_ENGINE == "ollama"
+                else request.app.state.config.RAG_AZURE_OPENAI_API_KEY
+            )
+        ),
+        request.app.state.config.RAG_EMBEDDING_BATCH_SIZE,
+        azure_api_version=(
+            request.app.state.config.RAG_AZURE_OPENAI_API_VERSION
+            if request.app.state.config.RAG_EMBEDDING_ENGINE == "azure_openai"
+            else None
+        ),
+    )
+
+    reranker = request.app.state.rf
+    if collection_name and getattr(reranker, "index", None) is not None:
+        write_items = write
+
+        def write(items: list[dict]) -> None:
+            write_items(items)
+            # Store late interaction token embeddings for reranking
+            try:
+                reranker.index_documents(
+                    [item["text"] for item in items], collection_name
+                )
+            except Exception as e:
+                log.warning(f"Failed to index documents for reranking: {e}")
+
+    return run_ingestion_pipeline(
+        chunks,
+        embed=lambda texts: embedding_function(
+            [text.replace("\n", " ") for text in texts],
+            prefix=RAG_EMBEDDING_CONTENT_PREFIX,
+            user=user,
+        ),
+        write=write,
+        batch_size=max(
+            request.app.state.config.RAG_EMBEDDING_BATCH_SIZE,
+            RAG_INGESTION_BATCH_SIZE,
+        ),
+        # Local models already parallelise internally
+        concurrency=(
+            RAG_EMBEDDING_CONCURRENT_REQUESTS
+            if request.app.state.config.RAG_EMBEDDING_ENGINE
+            else 1
+        ),
+        on_error=on_error,
+    )
+
+
 def save_docs_to_vector_db(
     request: Request,
     docs,
@@ -1155,102 +1349,35 @@ def save_docs_to_vector_db(
 
     # Check if entries with the same hash (metadata.hash) already exist
     if metadata and "hash" in metadata:
-        result = VECTOR_DB_CLIENT.query(
-            collection_name=collection_name,
-            filter={"hash": metadata["hash"]},
-        )
-
-        if result is not None:
-            existing_doc_ids = result.ids[0]
-            if existing_doc_ids:
-                log.info(f"Document with hash {metadata['hash']} already exists")
-                raise ValueError(ERROR_MESSAGES.DUPLICATE_CONTENT)
+        if FileCollections.has_hash(collection_name, metadata["hash"]):
+            log.info(f"Document with hash {metadata['hash']} already exists")
+            raise ValueError(ERROR_MESSAGES.DUPLICATE_CONTENT)
 
     if split:
-        if request.app.state.config.TEXT_SPLITTER in ["", "character"]:
-            text_splitter = RecursiveCharacterTextSplitter(
-                chunk_size=request.app.state.config.CHUNK_SIZE,
-                chunk_overlap=request.app.state.config.CHUNK_OVERLAP,
-                add_start_index=True,
-            )
-            docs = text_splitter.split_documents(docs)
-        elif request.app.state.config.TEXT_SPLITTER == "token":
-            log.info(
-                f"Using token text splitter: {request.app.state.config.TIKTOKEN_ENCODING_NAME}"
-            )
-
-            tiktoken.get_encoding(str(request.app.state.config.TIKTOKEN_ENCODING_NAME))
-            text_splitter = TokenTextSplitter(
-                encoding_name=str(request.app.state.config.TIKTOKEN_ENCODING_NAME),
-                chunk_size=request.app.state.config.CHUNK_SIZE,
-                chunk_overlap=request.app.state.config.CHUNK_OVERLAP,
-                add_start_index=True,
-            )
-            docs = text_splitter.split_documents(docs)
-        elif request.app.state.config.TEXT_SPLITTER == "markdown_header":
-            log.info("Using markdown header text splitter")
-
-            # Define headers to split on - covering most common markdown header levels
-            headers_to_split_on = [
-                ("#", "Header 1"),
-                ("##", "Header 2"),
-                ("###", "Header 3"),
-                ("####", "Header 4"),
-                ("#####", "Header 5"),
-                ("######", "Header 6"),
-            ]
-
-            markdown_splitter = MarkdownHeaderTextSplitter(
-                headers_to_split_on=headers_to_split_on,
-                strip_headers=False,  # Keep headers in content for context
-            )
-
-            md_split_docs = []
-            for doc in docs:
-                md_header_splits = markdown_splitter.split_text(doc.page_content)
-                text_splitter = RecursiveCharacterTextSplitter(
-                    chunk_size=request.app.state.config.CHUNK_SIZE,
-                    chunk_overlap=request.app.state.config.CHUNK_OVERLAP,
-                    add_start_index=True,
-                )
-                md_header_splits = text_splitter.split_documents(md_header_splits)
-
-                # Convert back to Document objects, preserving original metadata
-                for split_chunk in md_header_splits:
-                    headings_list = []
-                    # Extract header values in order based on headers_to_split_on
-                    for _, header_meta_key_name in headers_to_split_on:
-                        if header_meta_key_name in split_chunk.metadata:
-                            headings_list.append(
-                                split_chunk.metadata[header_meta_key_name]
-                            )
-
-                    md_split_docs.append(
-                        Document(
-                            page_content=split_chunk.page_content,
-                            metadata={**doc.metadata, "headings": headings_list},
-                        )
-                    )
+        docs = split_docs(request, docs)
 
-            docs = md_split_docs
-        else:
-            raise ValueError(ERROR_MESSAGES.DEFAULT("Invalid text splitter"))
-
-    if len(docs) == 0:
-        raise ValueError(ERROR_MESSAGES.EMPTY_CONTENT)
-
-    texts = [doc.page_content for doc in docs]
-    metadatas = [
+    embedding_config = {
+        "engine": request.app.state.config.RAG_EMBEDDING_ENGINE,
+        "model": request.app.state.config.RAG_EMBEDDING_MODEL,
+    }
+    chunks = (
         {
-            **doc.metadata,
-            **(metadata if metadata else {}),
-            "embedding_config": {
-                "engine": request.app.state.config.RAG_EMBEDDING_ENGINE,
-                "model": request.app.state.config.RAG_EMBEDDING_MODEL,
+            "text": doc.page_content,
+            "metadata": {
+                **doc.metadata,
+                **(metadata if metadata else {}),
+                "embedding_config": embedding_config,
             },
         }
         for doc in docs
-    ]
+    )
+
+    # Chunks are produced lazily, peek at the first one to reject empty content
+    # before the collection is touched
+    first_chunk = next(chunks, None)
+    if first_chunk is None:
+        raise ValueError(ERROR_MESSAGES.EMPTY_CONTENT)
+    chunks = itertools.chain([first_chunk], chunks)
 
     try:
         if VECTOR_DB_CLIENT.has_collection(collection_name=collection_name):
@@ -1258,6 +1385,8 @@ def save_docs_to_vector_db(
 
             if overwrite:
                 VECTOR_DB_CLIENT.delete_collection(collection_name=collection_name)
+                FileCollections.delete_collection(collection_name)
+                delete_reranking_embeddings(collection_name)
                 log.info(f"deleting existing collection {collection_name}")
             elif add is False:
                 log.info(
@@ -1266,57 +1395,41 @@ def save_docs_to_vector_db(
                 return True
 
         log.info(f"adding to collection {collection_name}")
-        embedding_function = get_embedding_function(
-            request.app.state.config.RAG_EMBEDDING_ENGINE,
-            request.app.state.config.RAG_EMBEDDING_MODEL,
-            request.app.state.ef,
-            (
-                request.app.state.config.RAG_OPENAI_API_BASE_URL
-                if request.app.state.config.RAG_EMBEDDING_ENGINE == "openai"
-                else (
-                    request.app.state.config.RAG_OLLAMA_BASE_URL
-                    if request.app.state.config.RAG_EMBEDDING_ENGINE == "ollama"
-                    else request.app.state.config.RAG_AZURE_OPENAI_BASE_URL
-                )
-            ),
-            (
-                request.app.state.config.RAG_OPENAI_API_KEY
-                if request.app.state.config.RAG_EMBEDDING_ENGINE == "openai"
-                else (
-                    request.app.state.config.RAG_OLLAMA_API_KEY
-                    if request.app.state.config.RAG_EMBEDDING_ENGINE == "ollama"
-                    else request.app.state.config.RAG_AZURE_OPENAI_API_KEY
-                )
-            ),
-            request.app.state.config.RAG_EMBEDDING_BATCH_SIZE,
-            azure_api_version=(
-                request.app.state.config.RAG_AZURE_OPENAI_API_VERSION
-                if request.app.state.config.RAG_EMBEDDING_ENGINE == "azure_openai"
-                else None
-            ),
-        )
+        inserted_ids = []
 
-        embeddings = embedding_function(
-            list(map(lambda x: x.replace("\n", " "), texts)),
-            prefix=RAG_EMBEDDING_CONTENT_PREFIX,
-            user=user,
-        )
-
-        items = [
-            {
-                "id": str(uuid.uuid4()),
-                "text": text,
-                "vector": embeddings[idx],
-                "metadata": metadatas[idx],
-            }
-            for idx, text in enumerate(texts)
-        ]
+        def write_items(items):
+            VECTOR_DB_CLIENT.insert(
+                collection_name=collection_name,
+                items=items,
+            )
+            inserted_ids.extend(item["id"] for item in items)
 
-        VECTOR_DB_CLIENT.insert(
-            collection_name=collection_name,
-            items=items,
-        )
+        try:
+            count = embed_and_write_chunks(
+                request,
+                chunks,
+                write_items,
+                user=user,
+                collection_name=collection_name,
+            )
+        except Exception:
+            # Do not leave a partially ingested document behind
+            if inserted_ids:
+                try:
+                    VECTOR_DB_CLIENT.delete(
+                        collection_name=collection_name, ids=inserted_ids
+                    )
+                except Exception as e:
+                    log.warning(
+                        f"Failed to clean up partial ingestion in {collection_name}: {e}"
+                    )
+            raise
 
+        log.info(f"added {count} chunks to collection {collection_name}")
+        if metadata and metadata.get("file_id"):
+            FileCollections.add_file_to_collection(
+                collection_name, metadata["file_id"], metadata.get("hash")
+            )
         return True
     except Exception as e:
         log.exception(e)
@@ -1350,6 +1463,8 @@ def process_file(
             try:
                 # /files/{file_id}/data/content/update
                 VECTOR_DB_CLIENT.delete_collection(collection_name=f"file-{file.id}")
+                FileCollections.delete_collection(f"file-{file.id}")
+                delete_reranking_embeddings(f"file-{file.id}")
             except:
                 # Audio file upload pipeline
                 pass
@@ -2190,6 +2305,7 @@ def delete_entries_from_collection(form_data: DeleteForm, user=Depends(get_admin
                 collection_name=form_data.collection_name,
                 metadata={"hash": hash},
             )
+            FileCollections.remove_hash_from_collection(form_data.collection_name, hash)
             return {"status": True}
         else:
             return {"status": False}
@@ -2198,9 +2314,69 @@ def delete_entries_from_collection(form_data: DeleteForm, user=Depends(get_admin
         return {"status": False}
 
 
+@router.get("/vector/index")
+def get_vector_index_status(user=Depends(get_admin_user)):
+    index_status = VECTOR_DB_CLIENT.get_index_status()
+    if index_status is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=ERROR_MESSAGES.DEFAULT(
+                "Index status is not available for the configured vector database"
+            ),
+        )
+    return index_status
+
+
+class RebuildIndexForm(BaseModel):
+    collection_name: Optional[str] = None
+
+
+@router.post("/vector/index/rebuild")
+def rebuild_vector_index(form_data: RebuildIndexForm, user=Depends(get_admin_user)):
+    try:
+        rebuilt = VECTOR_DB_CLIENT.rebuild_index(
+            collection_name=form_data.collection_name
+        )
+    except Exception as e:
+        log.exception(e)
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=ERROR_MESSAGES.DEFAULT(e),
+        )
+
+    if not rebuilt:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=ERROR_MESSAGES.DEFAULT(
+                "Index management is not supported by the configured vector database"
+            ),
+        )
+    return {"status": True}
+
+
+@router.get("/reranking/metrics")
+def get_reranking_metrics(request: Request, user=Depends(get_admin_user)):
+    reranking_function = request.app.state.RERANKING_FUNCTION
+    if reranking_function is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=ERROR_MESSAGES.DEFAULT("No reranking model is configured"),
+        )
+    return reranking_function.get_metrics()
+
+
+@router.post("/reranking/cache/clear")
+def clear_reranking_cache(request: Request, user=Depends(get_admin_user)):
+    if request.app.state.RERANKING_FUNCTION is not None:
+        request.app.state.RERANKING_FUNCTION.clear_cache()
+    return {"status": True}
+
+
 @router.post("/reset/db")
 def reset_vector_db(user=Depends(get_admin_user)):
     VECTOR_DB_CLIENT.reset()
+    FileCollections.delete_all()
+    delete_reranking_embeddings()
     Knowledges.delete_all_knowledge()
 
 
@@ -2232,8 +2408,10 @@ if ENV == "dev":
     @router.get("/ef/{text}")
     async def get_embeddings(request: Request, text: Optional[str] = "Hello World!"):
         return {
-            "result": request.app.state.EMBEDDING_FUNCTION(
-                text, prefix=RAG_EMBEDDING_QUERY_PREFIX
+            "result": await asyncio.to_thread(
+                request.app.state.EMBEDDING_FUNCTION,
+                text,
+                prefix=RAG_EMBEDDING_QUERY_PREFIX,
             )
         }
 
@@ -2262,6 +2440,10 @@ def process_files_batch(
 ) -> BatchProcessFilesResponse:
     """
     Process a batch of files and save them to the vector database.
+
+    Chunks of all files are packed into shared embedding batches, the vectors
+    are routed back to their files on write and every file reports its own
+    success or failure.
     """
     results: List[BatchProcessFilesResult] = []
     errors: List[BatchProcessFilesResult] = []
@@ -2269,11 +2451,20 @@ def process_files_batch(
 
     # Prepare all documents first
     all_docs: List[Document] = []
+    file_hashes: dict[str, str] = {}
     for file in form_data.files:
         try:
             text_content = file.data.get("content", "")
 
-            docs: List[Document] = [
+            hash = calculate_sha256_string(text_content)
+            Files.update_file_hash_by_id(file.id, hash)
+            Files.update_file_data_by_id(file.id, {"content": text_content})
+
+            if FileCollections.has_hash(collection_name, hash):
+                raise ValueError(ERROR_MESSAGES.DUPLICATE_CONTENT)
+
+            file_hashes[file.id] = hash
+            all_docs.append(
                 Document(
                     page_content=text_content.replace("<br/>", "\n"),
                     metadata={
@@ -2282,15 +2473,10 @@ def process_files_batch(
                         "created_by": file.user_id,
                         "file_id": file.id,
                         "source": file.filename,
+                        "hash": hash,
                     },
                 )
-            ]
-
-            hash = calculate_sha256_string(text_content)
-            Files.update_file_hash_by_id(file.id, hash)
-            Files.update_file_data_by_id(file.id, {"content": text_content})
-
-            all_docs.extend(docs)
+            )
             results.append(BatchProcessFilesResult(file_id=file.id, status="prepared"))
 
         except Exception as e:
@@ -2299,32 +2485,101 @@ def process_files_batch(
                 BatchProcessFilesResult(file_id=file.id, status="failed", error=str(e))
             )
 
-    # Save all documents in one batch
-    if all_docs:
+    if not all_docs:
+        return BatchProcessFilesResponse(results=results, errors=errors)
+
+    file_errors: dict[str, str] = {}
+    inserted_ids: dict[str, list[str]] = defaultdict(list)
+
+    def insert_items(items):
+        VECTOR_DB_CLIENT.insert(collection_name=collection_name, items=items)
+        for item in items:
+            inserted_ids[item["metadata"]["file_id"]].append(item["id"])
+
+    def write_items(items):
+        items = [
+            item for item in items if item["metadata"]["file_id"] not in file_errors
+        ]
+        if not items:
+            return
+
         try:
-            save_docs_to_vector_db(
-                request=request,
-                docs=all_docs,
-                collection_name=collection_name,
-                add=True,
-                user=user,
-            )
+            insert_items(items)
+        except Exception:
+            # Retry file by file so one bad file does not fail the whole batch
+            items_by_file = defaultdict(list)
+            for item in items:
+                items_by_file[item["metadata"]["file_id"]].append(item)
+
+            for file_id, file_items in items_by_file.items():
+                try:
+                    insert_items(file_items)
+                except Exception as e:
+                    log.error(
+                        f"process_files_batch: Error saving file {file_id} to vector DB: {e}"
+                    )
+                    file_errors[file_id] = str(e)
 
-            # Update all files with collection name
-            for result in results:
-                Files.update_file_metadata_by_id(
-                    result.file_id, {"collection_name": collection_name}
-                )
-                result.status = "completed"
+    def fail_chunks(chunks, e):
+        for chunk in chunks:
+            file_errors.setdefault(chunk["metadata"]["file_id"], str(e))
 
-        except Exception as e:
-            log.error(
-                f"process_files_batch: Error saving documents to vector DB: {str(e)}"
+    embedding_config = {
+        "engine": request.app.state.config.RAG_EMBEDDING_ENGINE,
+        "model": request.app.state.config.RAG_EMBEDDING_MODEL,
+    }
+
+    try:
+        embed_and_write_chunks(
+            request,
+            (
+                {
+                    "text": doc.page_content,
+                    "metadata": {**doc.metadata, "embedding_config": embedding_config},
+                }
+                for doc in split_docs(request, all_docs)
+            ),
+            write_items,
+            user=user,
+            on_error=fail_chunks,
+            collection_name=collection_name,
+        )
+    except Exception as e:
+        log.error(f"process_files_batch: Error saving documents to vector DB: {str(e)}")
+        for result in results:
+            file_errors.setdefault(result.file_id, str(e))
+
+    for result in results:
+        error = file_errors.get(result.file_id)
+        if error is None and not inserted_ids.get(result.file_id):
+            error = ERROR_MESSAGES.EMPTY_CONTENT
+
+        if error is None:
+            Files.update_file_metadata_by_id(
+                result.file_id, {"collection_name": collection_name}
             )
-            for result in results:
-                result.status = "failed"
-                errors.append(
-                    BatchProcessFilesResult(file_id=result.file_id, error=str(e))
+            FileCollections.add_file_to_collection(
+                collection_name, result.file_id, file_hashes[result.file_id]
+            )
+            result.status = "completed"
+        else:
+            # Drop whatever was written before the file failed
+            if inserted_ids.get(result.file_id):
+                try:
+                    VECTOR_DB_CLIENT.delete(
+                        collection_name=collection_name,
+                        ids=inserted_ids[result.file_id],
+                    )
+                except Exception as e:
+                    log.warning(
+                        f"process_files_batch: Failed to clean up file {result.file_id}: {e}"
+                    )
+
+            result.status = "failed"
+            errors.append(
+                BatchProcessFilesResult(
+                    file_id=result.file_id, status="failed", error=error
                 )
+            )
 
     return BatchProcessFilesResponse(results=results, errors=errors)
@@ -90,6 +90,7 @@ async def regenerate_with_model(
         "messages": messages,
         "stream": False,
         "metadata": {
+            "priority": "regeneration",
             **(metadata or {}),
         },
     }
@@ -0,0 +1,71 @@
+import numpy as np
+
+from open_webui.retrieval.models.colbert_index import (
+    ColBERTTokenIndex,
+    hash_passage,
+    maxsim_scores,
+)
+
+
+def test_maxsim_matches_per_document_loop():
+    rng = np.random.default_rng(0)
+    query = rng.standard_normal((4, 8)).astype(np.float32)
+    docs = [rng.standard_normal((n, 8)).astype(np.float16) for n in (3, 1, 7)]
+
+    expected = [(doc.astype(np.float32) @ query.T).max(axis=0).sum() for doc in docs]
+    np.testing.assert_allclose(maxsim_scores(query, docs), expected, rtol=1e-5)
+
+
+def test_index_round_trip(tmp_path):
+    index = ColBERTTokenIndex(tmp_path)
+    first = np.arange(6, dtype=np.float16).reshape(3, 2)
+    second = np.ones((2, 2), dtype=np.float16)
+
+    index.add({hash_passage("a"): first}, "file-1")
+    index.add({hash_passage("a"): second, hash_passage("b"): second}, "file-2")
+
+    stored = ColBERTTokenIndex(tmp_path).get(
+        [hash_passage("a"), hash_passage("b"), hash_passage("c")]
+    )
+    assert set(stored) == {hash_passage("a"), hash_passage("b")}
+    # Passages that are already indexed are not overwritten
+    np.testing.assert_array_equal(stored[hash_passage("a")], first)
+    np.testing.assert_array_equal(stored[hash_passage("b")], second)
+
+
+def test_remove_collections_compacts(tmp_path):
+    index = ColBERTTokenIndex(tmp_path)
+    index.add({hash_passage("a"): np.ones((3, 2), dtype=np.float16)}, "file-1")
+    index.add({hash_passage("b"): np.zeros((2, 2), dtype=np.float16)}, "file-2")
+    index.add({hash_passage("a"): np.ones((3, 2), dtype=np.float16)}, "file-2")
+
+    # "a" is still part of file-2
+    index.remove_collections(["file-1"])
+    assert set(index.get([hash_passage("a"), hash_passage("b")])) == {
+        hash_passage("a"),
+        hash_passage("b"),
+    }
+
+    index.remove_collections(["file-2"])
+    assert index.get([hash_passage("a"), hash_passage("b")]) == {}
+    assert sum(path.stat().st_size for path in tmp_path.glob("tokens*.f16")) == 0
+
+
+def test_size_cap_evicts_oldest(tmp_path):
+    # 4 tokens of 2 float16 values take 16 bytes
+    index = ColBERTTokenIndex(tmp_path, max_size=30)
+    for idx, key in enumerate("abc"):
+        index.add({hash_passage(key): np.full((4, 2), idx, dtype=np.float16)}, key)
+
+    stored = index.get([hash_passage(key) for key in "abc"])
+    assert set(stored) == {hash_passage("c")}
+    np.testing.assert_array_equal(stored[hash_passage("c")], np.full((4, 2), 2))
+    assert sum(path.stat().st_size for path in tmp_path.glob("tokens*.f16")) == 16
+
+
+def test_clear(tmp_path):
+    index = ColBERTTokenIndex(tmp_path)
+    index.add({hash_passage("a"): np.ones((2, 2), dtype=np.float16)}, "file-1")
+    index.clear()
+
+    assert index.get([hash_passage("a")]) == {}
@@ -0,0 +1,98 @@
+import numpy as np
+import pytest
+
+pytest.importorskip("hnswlib")
+
+from open_webui.retrieval.vector.dbs import hnsw
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    monkeypatch.setattr(hnsw, "HNSW_DATA_PATH", str(tmp_path))
+    return hnsw.HNSWClient()
+
+
+def make_items(n, dim=16, seed=0, prefix="doc"):
+    rng = np.random.default_rng(seed)
+    return [
+        {
+            "id": f"{prefix}-{idx}",
+            "text": f"text {idx}",
+            "vector": rng.standard_normal(dim).tolist(),
+            "metadata": {"file_id": f"file-{idx % 3}", "n": idx},
+        }
+        for idx in range(n)
+    ]
+
+
+def test_search_returns_nearest_items_per_query(client):
+    items = make_items(50)
+    client.insert("file-a", items)
+
+    result = client.search(
+        "file-a", vectors=[items[7]["vector"], items[21]["vector"]], limit=3
+    )
+    assert [ids[0] for ids in result.ids] == ["doc-7", "doc-21"]
+    assert result.documents[0][0] == "text 7"
+    assert result.metadatas[1][0] == {"file_id": "file-0", "n": 21}
+    assert result.distances[0][0] == pytest.approx(1.0, abs=1e-3)
+    assert result.metric == "cosine_distance"
+
+
+def test_upsert_delete_and_query(client):
+    items = make_items(30)
+    client.insert("file-a", items)
+    client.upsert("file-a", [{**items[0], "text": "updated"}])
+    client.delete("file-a", ids=["doc-1"])
+    client.delete("file-a", filter={"file_id": "file-2"})
+
+    remaining = client.get("file-a").ids[0]
+    assert "doc-1" not in remaining and "doc-2" not in remaining
+    assert len(remaining) == 30 - 1 - 10
+
+    result = client.query("file-a", filter={"file_id": "file-0"}, limit=2)
+    assert result.ids[0] == ["doc-3", "doc-6"]
+    assert client.query("file-a", filter={"file_id": "file-0"}).documents[0][-1] == (
+        "updated"
+    )
+
+    result = client.search("file-a", vectors=[items[1]["vector"]], limit=50)
+    assert "doc-1" not in result.ids[0]
+    assert len(result.ids[0]) == 19
+
+
+def test_state_is_recovered_and_compacted(client, monkeypatch):
+    monkeypatch.setattr(hnsw, "HNSW_SNAPSHOT_INTERVAL", 2)
+    items = make_items(20)
+    client.insert("file-a", items[:10])
+    client.insert("file-a", items[10:])
+    client.delete("file-a", ids=["doc-0", "doc-1"])
+
+    # a fresh client (e.g. another worker or a restart) loads snapshot + log
+    other = hnsw.HNSWClient()
+    result = other.search("file-a", vectors=[items[5]["vector"]], limit=1)
+    assert result.ids[0] == ["doc-5"]
+    vectors = other.get_vectors("file-a", ["doc-5", "doc-0"])
+    assert list(vectors) == ["doc-5"]
+    np.testing.assert_allclose(vectors["doc-5"], items[5]["vector"], atol=1e-2)
+
+    assert other.rebuild_index()
+    status = client.get_index_status()["collections"][0]
+    assert (status["items"], status["deleted"], status["generation"]) == (18, 0, 1)
+
+    # the first client notices the new generation
+    result = client.search("file-a", vectors=[items[5]["vector"]], limit=20)
+    assert result.ids[0][0] == "doc-5" and len(result.ids[0]) == 18
+
+
+def test_delete_collection_and_reset(client):
+    client.insert("file-a", make_items(5))
+    client.insert("user-memory-1", make_items(5))
+    assert client.has_collection("file-a")
+
+    client.delete_collection("file-a")
+    assert not client.has_collection("file-a")
+    assert client.search("file-a", vectors=[[0.0] * 16], limit=1) is None
+
+    client.reset()
+    assert not client.has_collection("user-memory-1")
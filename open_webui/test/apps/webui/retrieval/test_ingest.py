@@ -0,0 +1,106 @@
+import threading
+import time
+
+import pytest
+
+from open_webui.retrieval.ingest import batched, run_ingestion_pipeline
+
+
+def make_chunks(n):
+    return ({"text": f"chunk {i}", "metadata": {"index": i}} for i in range(n))
+
+
+def fake_embed(texts):
+    return [[float(len(text))] for text in texts]
+
+
+def test_batched():
+    assert list(batched(range(5), 2)) == [[0, 1], [2, 3], [4]]
+    assert list(batched([], 3)) == []
+
+
+def test_writes_every_chunk_in_order():
+    written = []
+    count = run_ingestion_pipeline(
+        make_chunks(10),
+        embed=fake_embed,
+        write=written.append,
+        batch_size=3,
+        concurrency=2,
+    )
+
+    assert count == 10
+    assert [len(batch) for batch in written] == [3, 3, 3, 1]
+    items = [item for batch in written for item in batch]
+    assert [item["metadata"]["index"] for item in items] == list(range(10))
+    assert all(item["id"] and item["vector"] for item in items)
+
+
+def test_memory_is_bounded_by_concurrency():
+    produced = 0
+    consumed = 0
+    max_buffered = 0
+    lock = threading.Lock()
+
+    def chunks():
+        nonlocal produced, max_buffered
+        for i in range(100):
+            with lock:
+                produced += 1
+                max_buffered = max(max_buffered, produced - consumed)
+            yield {"text": str(i), "metadata": {}}
+
+    def write(items):
+        nonlocal consumed
+        time.sleep(0.001)
+        with lock:
+            consumed += len(items)
+
+    run_ingestion_pipeline(
+        chunks(), embed=fake_embed, write=write, batch_size=5, concurrency=3
+    )
+
+    assert consumed == 100
+    assert max_buffered <= (3 + 1) * 5
+
+
+def test_embedding_failure_stops_pipeline():
+    written = []
+
+    def embed(texts):
+        if "chunk 4" in texts:
+            return None
+        return fake_embed(texts)
+
+    with pytest.raises(ValueError):
+        run_ingestion_pipeline(
+            make_chunks(20),
+            embed=embed,
+            write=written.append,
+            batch_size=2,
+            concurrency=1,
+        )
+
+    assert [len(batch) for batch in written] == [2, 2]
+
+
+def test_on_error_reports_failed_batch_and_continues():
+    written = []
+    failed = []
+
+    def embed(texts):
+        if "chunk 4" in texts:
+            raise RuntimeError("upstream error")
+        return fake_embed(texts)
+
+    count = run_ingestion_pipeline(
+        make_chunks(8),
+        embed=embed,
+        write=written.append,
+        batch_size=2,
+        concurrency=2,
+        on_error=lambda batch, e: failed.extend(c["metadata"]["index"] for c in batch),
+    )
+
+    assert count == 6
+    assert failed == [4, 5]
@@ -0,0 +1,66 @@
+from open_webui.retrieval.models.base_reranker import BaseReranker
+from open_webui.retrieval.rerank import RerankingService
+
+
+class FakeCrossEncoder:
+    def __init__(self):
+        self.calls = []
+
+    def predict(self, sentences, batch_size=32):
+        self.calls.append(list(sentences))
+        return [float(len(passage)) for _, passage in sentences]
+
+
+class FakeSingleQueryReranker(BaseReranker):
+    def __init__(self):
+        self.calls = []
+
+    def predict(self, sentences):
+        self.calls.append(list(sentences))
+        assert len({query for query, _ in sentences}) == 1
+        return [float(len(passage)) for _, passage in sentences]
+
+
+def test_scores_all_pairs_in_one_call():
+    reranker = FakeCrossEncoder()
+    service = RerankingService(reranker, model="m")
+
+    pairs = [("q1", "a"), ("q2", "bb"), ("q1", "ccc"), ("q1", "a")]
+    assert service(pairs) == [1.0, 2.0, 3.0, 1.0]
+    # Duplicate pairs are only scored once
+    assert reranker.calls == [[("q1", "a"), ("q2", "bb"), ("q1", "ccc")]]
+
+
+def test_caches_scores():
+    reranker = FakeCrossEncoder()
+    service = RerankingService(reranker, model="m")
+
+    service([("q", "a"), ("q", "bb")])
+    assert service([("q", "bb"), ("q", "ddd")]) == [2.0, 3.0]
+    assert reranker.calls[-1] == [("q", "ddd")]
+
+    metrics = service.get_metrics()
+    assert metrics["cache_hits"] == 1
+    assert metrics["cache_misses"] == 3
+    assert metrics["model_calls"] == 2
+
+
+def test_evicts_least_recently_used():
+    reranker = FakeCrossEncoder()
+    service = RerankingService(reranker, model="m", cache_size=2)
+
+    service([("q", "a"), ("q", "bb")])
+    service([("q", "a")])
+    service([("q", "ccc")])
+    reranker.calls.clear()
+
+    service([("q", "a"), ("q", "bb")])
+    assert reranker.calls == [[("q", "bb")]]
+
+
+def test_groups_pairs_by_query_for_single_query_rerankers():
+    reranker = FakeSingleQueryReranker()
+    service = RerankingService(reranker, model="m")
+
+    assert service([("q1", "a"), ("q2", "bb"), ("q1", "ccc")]) == [1.0, 2.0, 3.0]
+    assert reranker.calls == [[("q1", "a"), ("q1", "ccc")], [("q2", "bb")]]
@@ -0,0 +1,114 @@
+import os
+import uuid
+
+import numpy as np
+import pytest
+
+from open_webui.retrieval.vector.main import SEARCH_METRICS, SearchResult
+
+DIM = 16
+
+
+def make_client(backend, tmp_path, monkeypatch):
+    if backend == "hnsw":
+        pytest.importorskip("hnswlib")
+        from open_webui.retrieval.vector.dbs import hnsw
+
+        monkeypatch.setattr(hnsw, "HNSW_DATA_PATH", str(tmp_path))
+        return hnsw.HNSWClient()
+    if backend == "chroma":
+        pytest.importorskip("chromadb")
+        from open_webui.retrieval.vector.dbs import chroma
+
+        monkeypatch.setattr(chroma, "CHROMA_DATA_PATH", str(tmp_path))
+        return chroma.ChromaClient()
+    if backend == "qdrant":
+        qdrant_client = pytest.importorskip("qdrant_client")
+        from open_webui.retrieval.vector.dbs import qdrant
+
+        monkeypatch.setattr(qdrant, "QDRANT_URI", None)
+        client = qdrant.QdrantClient()
+        client.client = qdrant_client.QdrantClient(path=str(tmp_path))
+        return client
+    if backend == "milvus":
+        pytest.importorskip("pymilvus")
+        pytest.importorskip("milvus_lite")
+        from open_webui.retrieval.vector.dbs import milvus
+
+        monkeypatch.setattr(milvus, "MILVUS_URI", str(tmp_path / "milvus.db"))
+        monkeypatch.setattr(milvus, "MILVUS_TOKEN", None)
+        return milvus.MilvusClient()
+
+    # pgvector needs a running server, point PGVECTOR_TEST_DB_URL at a
+    # disposable database to include it
+    db_url = os.environ.get("PGVECTOR_TEST_DB_URL")
+    if not db_url:
+        pytest.skip("PGVECTOR_TEST_DB_URL is not set")
+    pytest.importorskip("pgvector")
+    pytest.importorskip("psycopg2")
+    from open_webui.retrieval.vector.dbs import pgvector
+
+    monkeypatch.setattr(pgvector, "PGVECTOR_DB_URL", db_url)
+    return pgvector.PgvectorClient()
+
+
+@pytest.fixture(params=["hnsw", "chroma", "qdrant", "milvus", "pgvector"])
+def client(request, tmp_path, monkeypatch):
+    # backends with an embedded mode or a test server, skipped when unavailable
+    client = make_client(request.param, tmp_path, monkeypatch)
+    yield client
+    if client.has_collection("contract"):
+        client.delete_collection("contract")
+
+
+def make_items(n, seed=0):
+    rng = np.random.default_rng(seed)
+    return [
+        {
+            "id": str(uuid.UUID(int=idx + 1)),
+            "text": f"text {idx}",
+            "vector": rng.standard_normal(DIM).tolist(),
+            "metadata": {"file_id": f"file-{idx % 3}"},
+        }
+        for idx in range(n)
+    ]
+
+
+def test_search_contract(client):
+    items = make_items(30)
+    client.insert("contract", items)
+    assert client.has_collection("contract")
+
+    result = client.search(
+        "contract", vectors=[items[4]["vector"], items[9]["vector"]], limit=5
+    )
+    assert isinstance(result, SearchResult)
+    assert result.metric in SEARCH_METRICS
+    assert [str(ids[0]) for ids in result.ids] == [items[4]["id"], items[9]["id"]]
+    for ids, documents, metadatas, scores in zip(
+        result.ids, result.documents, result.metadatas, result.distances
+    ):
+        assert len(ids) == len(documents) == len(metadatas) == len(scores) == 5
+        assert all(0.0 <= score <= 1.0 for score in scores)
+        assert scores == sorted(scores, reverse=True)
+    assert result.distances[0][0] == pytest.approx(1.0, abs=1e-2)
+    assert result.documents[0][0] == "text 4"
+
+
+def test_query_upsert_and_delete_contract(client):
+    items = make_items(30)
+    client.insert("contract", items)
+
+    result = client.query("contract", filter={"file_id": "file-1"})
+    assert len(result.ids[0]) == 10
+    assert all(m["file_id"] == "file-1" for m in result.metadatas[0])
+
+    client.upsert("contract", [{**items[1], "text": "updated"}])
+    result = client.query("contract", filter={"file_id": "file-1"})
+    assert len(result.ids[0]) == 10 and "updated" in result.documents[0]
+
+    client.delete("contract", filter={"file_id": "file-1"})
+    assert len(client.get("contract").ids[0]) == 20
+
+    client.delete_collection("contract")
+    assert not client.has_collection("contract")
@@ -0,0 +1,33 @@
+import pytest
+
+from open_webui.retrieval.vector import utils
+
+
+class Client:
+    supported_quantization = ("none", "half")
+
+
+@pytest.fixture(autouse=True)
+def config(monkeypatch):
+    monkeypatch.setattr(utils, "VECTOR_QUANTIZATION", "half")
+    monkeypatch.setattr(
+        utils,
+        "VECTOR_QUANTIZATION_COLLECTIONS",
+        {"file-": "binary", "file-pinned-": "none", "user-memory-": "int8"},
+    )
+
+
+def test_longest_prefix_override_wins():
+    assert utils.get_collection_quantization(None) == "half"
+    assert utils.get_collection_quantization("knowledge-1") == "half"
+    assert utils.get_collection_quantization("file-1") == "binary"
+    assert utils.get_collection_quantization("file-pinned-1") == "none"
+
+
+def test_unsupported_modes_fall_back_to_full_precision():
+    assert utils.resolve_quantization(Client(), "knowledge-1") == "half"
+    assert utils.resolve_quantization(Client(), "user-memory-1") == "none"
+    assert utils.get_vector_storage_config(Client())["SUPPORTED_QUANTIZATION"] == [
+        "none",
+        "half",
+    ]
@@ -0,0 +1,33 @@
+import pytest
+
+from open_webui.retrieval.vector.main import SEARCH_METRICS, normalize_score
+
+
+@pytest.mark.parametrize(
+    "metric, best, worst",
+    [
+        ("cosine_distance", 0.0, 2.0),
+        ("cosine_similarity", 1.0, -1.0),
+        ("inner_product", 1.0, -1.0),
+        ("negative_inner_product", -1.0, 1.0),
+        ("l2_distance", 0.0, 1e9),
+    ],
+)
+def test_scores_are_normalized_similarities(metric, best, worst):
+    assert metric in SEARCH_METRICS
+    assert normalize_score(best, metric) == pytest.approx(1.0)
+    assert normalize_score(worst, metric) == pytest.approx(0.0, abs=1e-6)
+
+
+def test_equal_matches_score_equal_across_metrics():
+    # an orthogonal match, as cosine distance and as cosine similarity
+    assert normalize_score(1.0, "cosine_distance") == normalize_score(
+        0.0, "cosine_similarity"
+    )
+
+
+def test_scores_are_clamped():
+    assert normalize_score(1.5, "inner_product") == 1.0
+    assert normalize_score(None, "cosine_distance") == 0.0
+    with pytest.raises(ValueError):
+        normalize_score(0.5, "hamming")
@@ -0,0 +1,101 @@
+"""
+Measure collection lookups and searches of ChromaClient with many collections.
+
+    python -m open_webui.test.benchmarks.chroma_collections --collections 10000
+
+Uses a throwaway persistent Chroma directory (CHROMA_DATA_PATH is overridden)
+holding one small `file-<n>` collection per simulated file. Compares the former
+list_collections() scan with has_collection's direct get_collection() lookup,
+and one search per query through get_collection() with a single batched
+search on the cached handle.
+"""
+
+import argparse
+import os
+import random
+import tempfile
+import time
+import uuid
+
+
+def timed(label: str, calls: int, func):
+    start = time.perf_counter()
+    for idx in range(calls):
+        func(idx)
+    elapsed = time.perf_counter() - start
+    print(f"{label:<40} {elapsed / calls * 1000:8.3f} ms/call")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--collections", type=int, default=10000)
+    parser.add_argument("--dim", type=int, default=384)
+    parser.add_argument("--calls", type=int, default=200)
+    parser.add_argument("--queries", type=int, default=3)
+    args = parser.parse_args()
+
+    os.environ["VECTOR_DB"] = "chroma"
+
+    from open_webui.retrieval.vector.dbs import chroma
+    from open_webui.retrieval.vector.dbs.chroma import ChromaClient
+
+    # CHROMA_DATA_PATH derives from DATA_DIR and is not read from the environment
+    chroma.CHROMA_DATA_PATH = tempfile.mkdtemp(prefix="chroma-benchmark-")
+
+    client = ChromaClient()
+    names = [f"file-{uuid.uuid4()}" for _ in range(args.collections)]
+
+    start = time.perf_counter()
+    for name in names:
+        client.insert(
+            name,
+            [
+                {
+                    "id": str(uuid.uuid4()),
+                    "text": f"chunk {idx} of {name}",
+                    "vector": [random.random() for _ in range(args.dim)],
+                    "metadata": {"file_id": name},
+                }
+                for idx in range(4)
+            ],
+        )
+    print(
+        f"created {args.collections} collections in {time.perf_counter() - start:.1f}s"
+    )
+
+    def pick(idx):
+        return names[(idx * 7919) % len(names)]
+
+    queries = [[random.random() for _ in range(args.dim)] for _ in range(args.queries)]
+
+    timed(
+        "has_collection (list_collections scan)",
+        args.calls,
+        lambda idx: pick(idx) in client.client.list_collections(),
+    )
+    timed(
+        "has_collection (get_collection)",
+        args.calls,
+        lambda idx: client.has_collection(pick(idx)),
+    )
+    timed(
+        "search per query (get_collection)",
+        args.calls,
+        lambda idx: [
+            client.client.get_collection(name=pick(idx)).query(
+                query_embeddings=[query], n_results=4
+            )
+            for query in queries
+        ],
+    )
+    timed(
+        "batched search (cached handles)",
+        args.calls,
+        lambda idx: client.search(pick(idx), vectors=queries, limit=4),
+    )
+
+    client.reset()
+
+
+if __name__ == "__main__":
+    main()
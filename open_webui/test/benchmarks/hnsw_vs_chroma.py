@@ -0,0 +1,148 @@
+"""
+Compare the embedded HNSW backend with persistent Chroma on one large collection.
+
+    python -m open_webui.test.benchmarks.hnsw_vs_chroma --vectors 1000000
+
+Both backends write to throwaway directories (HNSW_DATA_PATH and
+CHROMA_DATA_PATH are overridden). Reports insert throughput, cold load time,
+search latency percentiles and recall@k against an exact numpy search over the
+same (float16 stored) vectors. Use --backends hnsw to skip Chroma.
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+import numpy as np
+
+CHUNK_ROWS = 100_000
+
+
+def percentiles(samples: list[float]) -> str:
+    p50, p95, p99 = np.percentile(np.array(samples) * 1000, [50, 95, 99])
+    return f"p50 {p50:7.2f} ms  p95 {p95:7.2f} ms  p99 {p99:7.2f} ms"
+
+
+def run(name, make_client, vectors, queries, expected, args):
+    client = make_client()
+    start = time.perf_counter()
+    for offset in range(0, len(vectors), args.batch):
+        client.insert(
+            "benchmark",
+            [
+                {
+                    "id": str(offset + idx),
+                    "text": f"chunk {offset + idx}",
+                    "vector": vector.tolist(),
+                    "metadata": {"file_id": f"file-{(offset + idx) % 100}"},
+                }
+                for idx, vector in enumerate(
+                    vectors[offset : offset + args.batch].astype(np.float32)
+                )
+            ],
+        )
+    elapsed = time.perf_counter() - start
+    print(f"{name:<8} insert  {len(vectors) / elapsed:10.0f} vectors/s")
+
+    # a new client loads the collection from disk, as after a restart
+    del client
+    client = make_client()
+    start = time.perf_counter()
+    client.search("benchmark", vectors=[queries[0].tolist()], limit=args.k)
+    print(f"{name:<8} load    {time.perf_counter() - start:10.2f} s")
+
+    latencies, hits = [], 0
+    for query, truth in zip(queries, expected):
+        start = time.perf_counter()
+        result = client.search("benchmark", vectors=[query.tolist()], limit=args.k)
+        latencies.append(time.perf_counter() - start)
+        hits += len(set(map(int, result.ids[0])) & set(truth.tolist()))
+    print(f"{name:<8} search  {percentiles(latencies)}")
+    print(f"{name:<8} recall@{args.k} {hits / (len(queries) * args.k):8.3f}")
+
+    start = time.perf_counter()
+    client.search("benchmark", vectors=queries.tolist(), limit=args.k)
+    elapsed = time.perf_counter() - start
+    print(f"{name:<8} batched {elapsed / len(queries) * 1000:10.2f} ms/query")
+
+    client.reset()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--vectors", type=int, default=1000000)
+    parser.add_argument("--dim", type=int, default=384)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--batch", type=int, default=5000)
+    parser.add_argument("--backends", default="hnsw,chroma")
+    args = parser.parse_args()
+
+    os.environ["HNSW_DATA_PATH"] = tempfile.mkdtemp(prefix="hnsw-benchmark-")
+
+    # clustered like embeddings of related chunks, uniform random vectors in
+    # this many dimensions have no meaningful nearest neighbours. Generated and
+    # kept as float16, the precision HNSW stores by default, to bound memory.
+    rng = np.random.default_rng(0)
+    centers = rng.standard_normal(
+        (max(1, args.vectors // 1000), args.dim), dtype=np.float32
+    )
+    vectors = np.empty((args.vectors, args.dim), dtype=np.float16)
+    for start in range(0, args.vectors, CHUNK_ROWS):
+        rows = min(CHUNK_ROWS, args.vectors - start)
+        chunk = rng.standard_normal((rows, args.dim), dtype=np.float32) * 0.5
+        chunk += centers[rng.integers(len(centers), size=rows)]
+        chunk /= np.linalg.norm(chunk, axis=1, keepdims=True)
+        vectors[start : start + rows] = chunk
+    queries = vectors[rng.choice(args.vectors, args.queries, replace=False)]
+    queries = queries.astype(np.float32) + rng.standard_normal(
+        (args.queries, args.dim), dtype=np.float32
+    ) * (0.1 / np.sqrt(args.dim))
+
+    # exact neighbours, merging the best k of every chunk of stored vectors
+    best_scores = np.full((args.queries, args.k), -np.inf, dtype=np.float32)
+    best_ids = np.zeros((args.queries, args.k), dtype=np.int64)
+    for start in range(0, args.vectors, CHUNK_ROWS):
+        scores = queries @ vectors[start : start + CHUNK_ROWS].astype(np.float32).T
+        scores = np.concatenate([best_scores, scores], axis=1)
+        ids = np.concatenate(
+            [
+                best_ids,
+                np.broadcast_to(
+                    np.arange(start, start + scores.shape[1] - args.k),
+                    (args.queries, scores.shape[1] - args.k),
+                ),
+            ],
+            axis=1,
+        )
+        top = np.argpartition(-scores, args.k - 1, axis=1)[:, : args.k]
+        best_scores = np.take_along_axis(scores, top, axis=1)
+        best_ids = np.take_along_axis(ids, top, axis=1)
+    expected = list(best_ids)
+
+    backends = args.backends.split(",")
+    if "hnsw" in backends:
+        from open_webui.retrieval.vector.dbs.hnsw import HNSWClient
+
+        run("hnsw", HNSWClient, vectors, queries, expected, args)
+    if "chroma" in backends:
+        os.environ["VECTOR_DB"] = "chroma"
+        from open_webui.retrieval.vector.dbs import chroma
+        from open_webui.retrieval.vector.dbs.chroma import ChromaClient
+
+        from chromadb.api.client import SharedSystemClient
+
+        chroma.CHROMA_DATA_PATH = tempfile.mkdtemp(prefix="chroma-benchmark-")
+
+        def make_chroma_client():
+            # Chroma shares one system per path within a process, drop it so the
+            # second client loads the collection from disk like HNSWClient does
+            SharedSystemClient.clear_system_cache()
+            return ChromaClient()
+
+        run("chroma", make_chroma_client, vectors, queries, expected, args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""
+Measure JSON encoding/decoding of the hot paths with each installed library.
+
+    python -m open_webui.test.benchmarks.json_serialization --calls 20000
+
+Times, per call, decoding a streamed completion chunk and encoding an SSE
+event (utils/middleware.py), a socket pool entry round trip through RedisDict
+(socket/utils.py), a chat row round trip through a JSON column
+(models/chats.py) and storing a Yjs update as a JSON list of byte values
+against the base64 text YdocManager now stores.
+"""
+
+import argparse
+import json
+import os
+import time
+import uuid
+
+from open_webui.utils.serialization import (
+    JSON_BACKENDS,
+    decode_binary,
+    encode_binary,
+    load_json_backend,
+)
+
+
+def timed(label: str, calls: int, func):
+    start = time.perf_counter()
+    for _ in range(calls):
+        func()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<32} {elapsed / calls * 1e6:10.2f} us/call")
+
+
+def make_chat(messages: int) -> dict:
+    history = {
+        str(uuid.uuid4()): {
+            "id": str(uuid.uuid4()),
+            "role": "assistant" if idx % 2 else "user",
+            "content": "Lorem ipsum dolor sit amet, consectetur adipiscing. " * 40,
+            "timestamp": 1700000000 + idx,
+            "models": ["llama3:8b"],
+        }
+        for idx in range(messages)
+    }
+    return {"title": "Chat", "history": {"messages": history}, "tags": []}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--calls", type=int, default=20000)
+    parser.add_argument("--chat-messages", type=int, default=100)
+    args = parser.parse_args()
+
+    chunk = json.dumps(
+        {
+            "id": "chatcmpl-1",
+            "object": "chat.completion.chunk",
+            "created": 1700000000,
+            "model": "llama3:8b",
+            "choices": [{"index": 0, "delta": {"content": " token"}}],
+        }
+    )
+    event = {"type": "chat:completion", "data": {"content": "Lorem ipsum " * 200}}
+    sessions = [str(uuid.uuid4()) for _ in range(4)]
+    chat = make_chat(args.chat_messages)
+    update = os.urandom(2048)
+    chat_calls = max(args.calls // 100, 1)
+
+    for name in JSON_BACKENDS:
+        functions = load_json_backend(name)
+        if functions is None:
+            print(f"{name}: not installed\n")
+            continue
+        dumps, loads = functions
+
+        print(f"{name}:")
+        timed("stream chunk decode", args.calls, lambda: loads(chunk))
+        timed("SSE event encode", args.calls, lambda: dumps(event))
+        timed("RedisDict set/get", args.calls, lambda: loads(dumps(sessions)))
+        timed(
+            f"chat row ({len(dumps(chat)) // 1024} KB) write/read",
+            chat_calls,
+            lambda: loads(dumps(chat)),
+        )
+        timed(
+            "Yjs update as JSON list",
+            args.calls,
+            lambda: bytes(loads(dumps(list(update)))),
+        )
+        print()
+
+    timed(
+        "Yjs update as base64", args.calls, lambda: decode_binary(encode_binary(update))
+    )
+    print(
+        f"{'Yjs update size':<32} {len(json.dumps(list(update)))} bytes as JSON,"
+        f" {len(encode_binary(update))} as base64"
+    )
+
+
+if __name__ == "__main__":
+    main()
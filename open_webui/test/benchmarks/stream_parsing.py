@@ -0,0 +1,138 @@
+"""
+Measure the per-delta work of parsing a streamed chat response.
+
+    python -m open_webui.test.benchmarks.stream_parsing --tokens 100000
+
+Streams a synthetic reasoning response (a long <think> block followed by the
+answer, one SSE line per token) through what stream_body_handler does for
+every delta: decode the line, parse the chunk, split the content into blocks
+at tags and serialize the blocks. Compares the incremental ContentBlockParser
+and ContentBlockSerializer with the former handling, which searched the whole
+response for every tag and serialized every block again on each delta.
+"""
+
+import argparse
+import json
+import random
+import re
+import time
+
+from open_webui.utils.content_blocks import (
+    ContentBlockParser,
+    ContentBlockSerializer,
+    get_start_tag_pattern,
+    serialize_content_blocks,
+)
+
+TAGS = [
+    (
+        "reasoning",
+        [
+            ("<think>", "</think>"),
+            ("<thinking>", "</thinking>"),
+            ("<reason>", "</reason>"),
+            ("<reasoning>", "</reasoning>"),
+            ("<thought>", "</thought>"),
+            ("<Thought>", "</Thought>"),
+            ("<|begin_of_thought|>", "<|end_of_thought|>"),
+            ("◁think▷", "◁/think▷"),
+        ],
+    ),
+    ("code_interpreter", [("<code_interpreter>", "</code_interpreter>")]),
+    ("solution", [("<|begin_of_solution|>", "<|end_of_solution|>")]),
+]
+
+WORDS = "the model considers each step of the problem before it answers".split()
+
+
+def make_lines(tokens: int) -> list[bytes]:
+    rng = random.Random(0)
+    reasoning = int(tokens * 0.8)
+
+    values = ["<think>", "\n"]
+    for idx in range(tokens):
+        if idx == reasoning:
+            values.append("\n</think>\n\n")
+        value = f" {rng.choice(WORDS)}"
+        if rng.random() < 0.05:
+            value += "\n"
+        values.append(value)
+
+    return [
+        f"data: {json.dumps({'choices': [{'delta': {'content': value}}]})}\n\n".encode()
+        for value in values
+    ]
+
+
+def parse(line: bytes) -> str:
+    line = line.decode("utf-8")
+    data = json.loads(line[len("data:") :].strip())
+    return data["choices"][0]["delta"]["content"]
+
+
+def run_incremental(lines: list[bytes]) -> str:
+    parser, serializer = ContentBlockParser(TAGS), ContentBlockSerializer()
+    content_blocks = [{"type": "text", "content": ""}]
+
+    for line in lines:
+        parser.feed(content_blocks, parse(line))
+        serialized = serializer.serialize(content_blocks)
+    return serialized
+
+
+def run_former(lines: list[bytes]) -> str:
+    parser = ContentBlockParser(TAGS)
+    content_blocks = [{"type": "text", "content": ""}]
+    start_patterns = [
+        get_start_tag_pattern(start_tag) for _, tags in TAGS for start_tag, _ in tags
+    ]
+
+    content = ""
+    for line in lines:
+        value = parse(line)
+        content = f"{content}{value}"
+        parser.feed(content_blocks, value)
+
+        # the whole response was searched for the tags on every delta
+        if content_blocks[-1]["type"] == "text":
+            for pattern in start_patterns:
+                pattern.search(content)
+        else:
+            re.search(re.escape(content_blocks[-1]["end_tag"]), content)
+        serialized = serialize_content_blocks(content_blocks)
+    return serialized
+
+
+def timed(label: str, lines: list[bytes], func) -> str:
+    start = time.perf_counter()
+    result = func(lines)
+    elapsed = time.perf_counter() - start
+    print(
+        f"{label:<14} {len(lines):>8} deltas {elapsed:8.2f} s"
+        f" {elapsed / len(lines) * 1e6:10.1f} us/delta"
+    )
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--tokens", type=int, default=100000)
+    parser.add_argument(
+        "--former-tokens",
+        type=int,
+        default=20000,
+        help="tokens streamed through the former handling, which is quadratic",
+    )
+    args = parser.parse_args()
+
+    lines = make_lines(args.tokens)
+    incremental = timed("incremental", lines, run_incremental)
+    print(f"{'':<14} {len(incremental):>8} characters serialized")
+
+    if args.former_tokens:
+        lines = make_lines(args.former_tokens)
+        timed("former", lines, run_former)
+
+
+if __name__ == "__main__":
+    main()
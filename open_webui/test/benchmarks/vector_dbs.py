@@ -0,0 +1,255 @@
+"""
+Benchmark the VectorDBBase adapters on synthetic corpora at several scales.
+
+    python -m open_webui.test.benchmarks.vector_dbs \\
+        --backends chroma,qdrant,milvus,hnsw --scales 1000,10000,100000 \\
+        --output vector_dbs.json
+
+Every backend runs against a local stand-in in a throwaway directory:
+persistent Chroma, embedded Qdrant (qdrant_client local mode), Milvus Lite and
+the embedded hnsw backend. pgvector runs against PGVECTOR_DB_URL, point it at
+a local Postgres with the vector extension. For each backend and scale it
+measures insert throughput, single and batched search latency, recall@k
+against a brute-force NumPy search, filtered query latency and delete latency,
+and writes everything to a JSON report. A backend whose client library or
+server is unavailable is reported with its error and skipped.
+"""
+
+import argparse
+import json
+import os
+import tempfile
+import time
+import uuid
+from datetime import datetime, timezone
+
+import numpy as np
+
+FILES = 100
+
+
+def make_chroma(path: str):
+    from open_webui.retrieval.vector.dbs import chroma
+
+    chroma.CHROMA_DATA_PATH = path
+    return chroma.ChromaClient()
+
+
+def make_qdrant(path: str):
+    from qdrant_client import QdrantClient as Qclient
+    from open_webui.retrieval.vector.dbs import qdrant
+
+    # local mode, the adapter leaves its client unset without a URI
+    qdrant.QDRANT_URI = None
+    client = qdrant.QdrantClient()
+    client.client = Qclient(path=path)
+    return client
+
+
+def make_milvus(path: str):
+    from open_webui.retrieval.vector.dbs import milvus
+
+    # Milvus Lite, which has no HNSW index
+    milvus.MILVUS_URI = os.path.join(path, "milvus.db")
+    milvus.MILVUS_TOKEN = None
+    milvus.MILVUS_INDEX_TYPE = "AUTOINDEX"
+    return milvus.MilvusClient()
+
+
+def make_pgvector(path: str):
+    if not os.environ.get("PGVECTOR_DB_URL"):
+        raise RuntimeError("PGVECTOR_DB_URL is not set")
+
+    from open_webui.retrieval.vector.dbs.pgvector import PgvectorClient
+
+    return PgvectorClient()
+
+
+def make_hnsw(path: str):
+    from open_webui.retrieval.vector.dbs import hnsw
+
+    hnsw.HNSW_DATA_PATH = path
+    return hnsw.HNSWClient()
+
+
+BACKENDS = {
+    "chroma": make_chroma,
+    "qdrant": make_qdrant,
+    "milvus": make_milvus,
+    "pgvector": make_pgvector,
+    "hnsw": make_hnsw,
+}
+
+
+def make_corpus(size: int, args, rng) -> tuple[np.ndarray, np.ndarray]:
+    # clustered unit vectors, closer to real embeddings than uniform noise
+    centers = rng.standard_normal((max(1, size // 100), args.dim), dtype=np.float32)
+    vectors = centers[rng.integers(0, len(centers), size)]
+    vectors += rng.standard_normal(vectors.shape, dtype=np.float32) * 0.5
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+
+    queries = vectors[rng.choice(size, min(args.queries, size), replace=False)]
+    queries = queries + rng.standard_normal(queries.shape, dtype=np.float32) * 0.1
+    queries /= np.linalg.norm(queries, axis=1, keepdims=True)
+    return vectors, queries
+
+
+def brute_force(vectors: np.ndarray, queries: np.ndarray, k: int) -> list[set]:
+    expected = []
+    for chunk in np.array_split(queries, max(1, len(queries) // 10)):
+        scores = chunk @ vectors.T
+        top = np.argpartition(-scores, min(k, vectors.shape[0] - 1), axis=1)[:, :k]
+        expected.extend(set(row.tolist()) for row in top)
+    return expected
+
+
+def item_id(idx: int) -> str:
+    # UUIDs are the only string ids every backend accepts (Qdrant)
+    return str(uuid.UUID(int=idx))
+
+
+def item_index(value) -> int:
+    return uuid.UUID(str(value)).int
+
+
+def latency(samples: list[float]) -> dict:
+    p50, p95, p99 = np.percentile(np.array(samples) * 1000, [50, 95, 99])
+    return {
+        "p50_ms": round(float(p50), 3),
+        "p95_ms": round(float(p95), 3),
+        "p99_ms": round(float(p99), 3),
+        "calls": len(samples),
+    }
+
+
+def run(client, size: int, args, rng) -> dict:
+    collection_name = f"benchmark-{size}"
+    if client.has_collection(collection_name):
+        client.delete_collection(collection_name)
+
+    vectors, queries = make_corpus(size, args, rng)
+    expected = brute_force(vectors, queries, args.k)
+    report = {"scale": size, "dim": args.dim, "k": args.k}
+
+    start = time.perf_counter()
+    for offset in range(0, size, args.batch):
+        client.insert(
+            collection_name,
+            [
+                {
+                    "id": item_id(idx),
+                    "text": f"benchmark chunk {idx}",
+                    "vector": vectors[idx].tolist(),
+                    "metadata": {"file_id": f"file-{idx % FILES}", "hash": str(idx)},
+                }
+                for idx in range(offset, min(offset + args.batch, size))
+            ],
+        )
+    elapsed = time.perf_counter() - start
+    report["insert"] = {
+        "seconds": round(elapsed, 3),
+        "vectors_per_s": round(size / elapsed, 1),
+    }
+
+    samples, hits = [], 0
+    for query, truth in zip(queries, expected):
+        start = time.perf_counter()
+        result = client.search(collection_name, vectors=[query.tolist()], limit=args.k)
+        samples.append(time.perf_counter() - start)
+        hits += len({item_index(value) for value in result.ids[0]} & truth)
+    report["search"] = latency(samples)
+    report["recall"] = round(hits / (len(queries) * args.k), 4)
+
+    start = time.perf_counter()
+    result = client.search(collection_name, vectors=queries.tolist(), limit=args.k)
+    elapsed = time.perf_counter() - start
+    report["batched_search"] = {
+        "queries": len(queries),
+        "ms_per_query": round(elapsed / len(queries) * 1000, 3),
+    }
+    hits = sum(
+        len({item_index(value) for value in ids} & truth)
+        for ids, truth in zip(result.ids, expected)
+    )
+    report["batched_recall"] = round(hits / (len(queries) * args.k), 4)
+
+    samples = []
+    for idx in range(args.repeat):
+        start = time.perf_counter()
+        client.query(collection_name, filter={"file_id": f"file-{idx % FILES}"})
+        samples.append(time.perf_counter() - start)
+    report["query"] = latency(samples)
+
+    samples = []
+    for idx in range(args.repeat):
+        start = time.perf_counter()
+        client.delete(collection_name, ids=[item_id(idx)])
+        samples.append(time.perf_counter() - start)
+    report["delete_by_id"] = latency(samples)
+
+    samples = []
+    for idx in range(min(args.repeat, FILES)):
+        start = time.perf_counter()
+        client.delete(collection_name, filter={"file_id": f"file-{idx}"})
+        samples.append(time.perf_counter() - start)
+    report["delete_by_filter"] = latency(samples)
+
+    client.delete_collection(collection_name)
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--backends", default="chroma,qdrant,milvus,hnsw")
+    parser.add_argument("--scales", default="1000,10000,100000")
+    parser.add_argument("--dim", type=int, default=384)
+    parser.add_argument("--queries", type=int, default=100)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--batch", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default="vector_dbs.json")
+    args = parser.parse_args()
+
+    results = []
+    for backend in args.backends.split(","):
+        try:
+            client = BACKENDS[backend](tempfile.mkdtemp(prefix=f"{backend}-benchmark-"))
+        except Exception as e:
+            print(f"{backend:<8} skipped: {e}")
+            results.append({"backend": backend, "error": str(e)})
+            continue
+
+        for size in map(int, args.scales.split(",")):
+            try:
+                report = run(client, size, args, np.random.default_rng(args.seed))
+            except Exception as e:
+                print(f"{backend:<8} {size:>8} failed: {e}")
+                results.append({"backend": backend, "scale": size, "error": str(e)})
+                continue
+
+            results.append({"backend": backend, **report})
+            print(
+                f"{backend:<8} {size:>8}  insert {report['insert']['vectors_per_s']:>9.0f}/s"
+                f"  search p50 {report['search']['p50_ms']:8.2f} ms"
+                f"  p99 {report['search']['p99_ms']:8.2f} ms"
+                f"  recall@{args.k} {report['recall']:.3f}"
+                f"  query p50 {report['query']['p50_ms']:8.2f} ms"
+                f"  delete p50 {report['delete_by_filter']['p50_ms']:8.2f} ms"
+            )
+
+    with open(args.output, "w") as f:
+        json.dump(
+            {
+                "created_at": datetime.now(timezone.utc).isoformat(),
+                "args": vars(args),
+                "results": results,
+            },
+            f,
+            indent=2,
+        )
+    print(f"report written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+from types import SimpleNamespace
+
+import pytest
+
+from open_webui.utils.completion_cache import CompletionCache, get_cache_key
+
+
+def make_request(embedding_function=None):
+    return SimpleNamespace(
+        app=SimpleNamespace(
+            state=SimpleNamespace(redis=None, EMBEDDING_FUNCTION=embedding_function)
+        )
+    )
+
+
+def make_form_data(content, task="title_generation", **params):
+    return {
+        "model": "task-model",
+        "messages": [{"role": "user", "content": content}],
+        "stream": False,
+        "metadata": {"task": task, "chat_id": "chat"},
+        **params,
+    }
+
+
+def make_generate(calls):
+    async def generate():
+        calls.append(None)
+        return {"choices": [{"message": {"content": f"answer {len(calls)}"}}]}
+
+    return generate
+
+
+def test_cache_key_normalizes_messages():
+    assert get_cache_key(make_form_data("a  title\n")) == get_cache_key(
+        make_form_data("a title")
+    )
+    assert get_cache_key(make_form_data("a title")) != get_cache_key(
+        make_form_data("a title", temperature=0.5)
+    )
+
+
+@pytest.mark.asyncio
+async def test_exact_match_cache():
+    cache = CompletionCache(ttl=60, maxsize=2, tasks={"title_generation"})
+    request, calls = make_request(), []
+    generate = make_generate(calls)
+
+    assert cache.is_cacheable(make_form_data("hi"))
+    assert not cache.is_cacheable(make_form_data("hi", task="tags_generation"))
+    assert not cache.is_cacheable({**make_form_data("hi"), "stream": True})
+
+    first = await cache.get_or_generate(request, make_form_data("hi"), generate)
+    second = await cache.get_or_generate(request, make_form_data(" hi "), generate)
+    assert first == second and len(calls) == 1
+
+    # least recently used entries are evicted
+    await cache.get_or_generate(request, make_form_data("a"), generate)
+    await cache.get_or_generate(request, make_form_data("b"), generate)
+    await cache.get_or_generate(request, make_form_data("hi"), generate)
+    assert len(calls) == 4
+
+
+@pytest.mark.asyncio
+async def test_similar_prompt_cache():
+    def embed(text):
+        return [1.0, 0.1] if "weather" in text else [0.0, 1.0]
+
+    cache = CompletionCache(
+        ttl=60, maxsize=10, tasks={"title_generation"}, similarity_threshold=0.95
+    )
+    request, calls = make_request(embed), []
+    generate = make_generate(calls)
+
+    await cache.get_or_generate(request, make_form_data("weather today"), generate)
+    await cache.get_or_generate(request, make_form_data("the weather now"), generate)
+    assert len(calls) == 1
+
+    await cache.get_or_generate(request, make_form_data("python lists"), generate)
+    assert len(calls) == 2
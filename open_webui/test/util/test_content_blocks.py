@@ -0,0 +1,89 @@
+import random
+
+from open_webui.utils.content_blocks import (
+    ContentBlockParser,
+    ContentBlockSerializer,
+    serialize_content_blocks,
+)
+
+TAGS = [
+    ("reasoning", [("<think>", "</think>"), ("◁think▷", "◁/think▷")]),
+    ("code_interpreter", [("<code_interpreter>", "</code_interpreter>")]),
+    ("solution", [("<|begin_of_solution|>", "<|end_of_solution|>")]),
+]
+
+
+def stream(text, chunk_size=None, seed=0):
+    rng = random.Random(seed)
+    parser, serializer = ContentBlockParser(TAGS), ContentBlockSerializer()
+    content_blocks = [{"type": "text", "content": ""}]
+
+    idx, end = 0, False
+    while idx < len(text) and not end:
+        size = chunk_size or rng.randint(1, 7)
+        end = parser.feed(content_blocks, text[idx : idx + size])
+        idx += size
+
+        # the cached serialization matches a full one after every delta
+        assert serializer.serialize(content_blocks) == serialize_content_blocks(
+            content_blocks
+        )
+    return parser, content_blocks, end
+
+
+def test_tags_split_across_chunks():
+    text = 'Sure.\n<think a="1">\nstep one\n> quoted\n</think>\n\nThe answer ◁think▷x◁/think▷ is 42.'
+    for seed in range(20):
+        parser, content_blocks, end = stream(text, seed=seed)
+        assert not end
+        assert [block["type"] for block in content_blocks] == [
+            "text",
+            "reasoning",
+            "text",
+            "reasoning",
+            "text",
+        ]
+        assert content_blocks[1]["content"] == "step one\n> quoted"
+        assert content_blocks[1]["attributes"] == {"a": "1"}
+        assert content_blocks[2]["content"].strip() == "The answer"
+        assert content_blocks[4]["content"].strip() == "is 42."
+        assert parser.content == "Sure.\n\n\nThe answer  is 42."
+
+    assert serialize_content_blocks(content_blocks) == (
+        "Sure.\n"
+        '<details type="reasoning" done="true" duration="0">\n'
+        "<summary>Thought for 0 seconds</summary>\n"
+        "> step one\n"
+        "> quoted\n"
+        "</details>\n"
+        "The answer\n"
+        '<details type="reasoning" done="true" duration="0">\n'
+        "<summary>Thought for 0 seconds</summary>\n"
+        "> x\n"
+        "</details>\n"
+        "is 42."
+    )
+
+
+def test_code_interpreter_ends_the_stream():
+    text = '<code_interpreter type="code" lang="python">\nprint(1)\n</code_interpreter> ignored'
+    parser, content_blocks, end = stream(text, chunk_size=3)
+    assert end
+    assert content_blocks[-1]["type"] == "code_interpreter"
+    assert content_blocks[-1]["content"] == "print(1)"
+    assert content_blocks[-1]["attributes"] == {"type": "code", "lang": "python"}
+
+
+def test_open_reasoning_block():
+    parser, content_blocks, _ = stream("<think>\nfirst\r\nsecond\nthi", chunk_size=2)
+    assert content_blocks == [
+        {
+            "type": "reasoning",
+            "start_tag": "<think>",
+            "end_tag": "</think>",
+            "attributes": {},
+            "content": "\nfirst\r\nsecond\nthi",
+            "started_at": content_blocks[0]["started_at"],
+        }
+    ]
+    assert parser.content == "<think>\nfirst\r\nsecond\nthi"
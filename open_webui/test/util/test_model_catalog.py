@@ -0,0 +1,89 @@
+import asyncio
+
+import pytest
+
+from open_webui.utils import model_catalog
+from open_webui.utils.model_catalog import (
+    ModelCatalog,
+    bump_catalog_revision,
+    get_catalog_key,
+    get_catalog_revision,
+)
+
+
+class TestModelCatalog:
+    """Test the source caching behind get_all_models"""
+
+    @staticmethod
+    def make_fetch(calls):
+        async def fetch():
+            calls.append(None)
+            return [{"id": f"model-{len(calls)}"}]
+
+        return fetch
+
+    @pytest.mark.asyncio
+    async def test_source_cached_until_key_changes(self):
+        catalog = ModelCatalog(ttl=None)
+        calls = []
+        fetch = self.make_fetch(calls)
+
+        first = await catalog.get_source("openai", "a", fetch)
+        second = await catalog.get_source("openai", "a", fetch)
+        assert first is second
+        assert len(calls) == 1
+
+        third = await catalog.get_source("openai", "b", fetch)
+        assert third["models"] == [{"id": "model-2"}]
+        assert third["generation"] > first["generation"]
+
+        await catalog.get_source("openai", "b", fetch, refresh=True)
+        assert len(calls) == 3
+
+    @pytest.mark.asyncio
+    async def test_concurrent_misses_fetch_once(self):
+        catalog = ModelCatalog(ttl=None)
+        calls = []
+        fetch = self.make_fetch(calls)
+
+        entries = await asyncio.gather(
+            *[catalog.get_source("ollama", "a", fetch) for _ in range(5)]
+        )
+        assert len(calls) == 1
+        assert all(entry is entries[0] for entry in entries)
+
+    @pytest.mark.asyncio
+    async def test_stale_source_refreshed_in_background(self):
+        catalog = ModelCatalog(ttl=0)
+        calls = []
+        fetch = self.make_fetch(calls)
+
+        first = await catalog.get_source("function", "a", fetch)
+        await asyncio.sleep(0.01)
+
+        # the stale entry is served while the refresh runs
+        stale = await catalog.get_source("function", "a", fetch)
+        assert stale is first
+        await catalog._tasks["function"]
+
+        assert len(calls) == 2
+        assert catalog.sources["function"]["models"] == [{"id": "model-2"}]
+
+        # background refresh is off when the base models cache is pinned
+        await asyncio.sleep(0.01)
+        await catalog.get_source("function", "a", fetch, background=False)
+        assert catalog._tasks["function"].done() and len(calls) == 2
+
+
+def test_catalog_key_is_stable():
+    assert get_catalog_key(["a"], {"x": 1, "y": 2}) == get_catalog_key(
+        ["a"], {"y": 2, "x": 1}
+    )
+    assert get_catalog_key(["a"]) != get_catalog_key(["b"])
+
+
+def test_catalog_revision_bumps(monkeypatch):
+    monkeypatch.setattr(model_catalog, "REDIS_URL", "")
+    revision = get_catalog_revision("models")
+    bump_catalog_revision("models")
+    assert get_catalog_revision("models") != revision
@@ -0,0 +1,86 @@
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+from starlette.responses import StreamingResponse
+
+from open_webui.utils.scheduler import (
+    BACKGROUND,
+    INTERACTIVE,
+    REGENERATION,
+    UpstreamScheduler,
+    get_priority,
+    get_schedule_keys,
+)
+
+
+def test_priority_and_keys():
+    assert get_priority(None) == INTERACTIVE
+    assert get_priority({"task": "query_generation"}) == INTERACTIVE
+    assert get_priority({"task": "title_generation"}) == BACKGROUND
+    assert get_priority({"task": "case_node_regenerate"}) == REGENERATION
+
+    models = {
+        "gpt": {"id": "gpt", "owned_by": "openai", "urlIdx": 1},
+        "custom": {"id": "custom", "info": {"base_model_id": "gpt"}},
+    }
+    assert get_schedule_keys(models["custom"], models) == ["custom", "openai:1"]
+
+
+@pytest.mark.asyncio
+async def test_waiters_served_by_priority():
+    scheduler = UpstreamScheduler(limits={"m": 1})
+    order = []
+
+    release = await scheduler.acquire(["m"], INTERACTIVE)
+
+    async def request(priority):
+        release = await scheduler.acquire(["m"], priority)
+        order.append(priority)
+        release()
+
+    waiters = [
+        asyncio.create_task(request(priority))
+        for priority in (BACKGROUND, REGENERATION, INTERACTIVE)
+    ]
+    await asyncio.sleep(0.01)
+    assert scheduler.stats()["m"]["waiting"] == {
+        BACKGROUND: 1,
+        REGENERATION: 1,
+        INTERACTIVE: 1,
+    }
+
+    release()
+    await asyncio.gather(*waiters)
+    assert order == [INTERACTIVE, REGENERATION, BACKGROUND]
+    assert scheduler.stats()["m"]["in_flight"] == 0
+
+
+@pytest.mark.asyncio
+async def test_waiting_past_deadline_fails():
+    scheduler = UpstreamScheduler(limits={"m": 1}, timeouts={BACKGROUND: 0.01})
+    release = await scheduler.acquire(["m"], INTERACTIVE)
+
+    with pytest.raises(HTTPException) as e:
+        await scheduler.acquire(["m"], BACKGROUND)
+    assert e.value.status_code == 503
+
+    release()
+    assert scheduler.stats()["m"]["in_flight"] == 0
+
+
+@pytest.mark.asyncio
+async def test_stream_holds_slot_until_exhausted():
+    scheduler = UpstreamScheduler(default_limit=1)
+
+    async def stream():
+        async def body():
+            yield b"data: 1\n\n"
+
+        return StreamingResponse(body())
+
+    response = await scheduler.run(["openai:0"], INTERACTIVE, stream)
+    assert scheduler.stats()["openai:0"]["in_flight"] == 1
+
+    assert [chunk async for chunk in response.body_iterator] == [b"data: 1\n\n"]
+    assert scheduler.stats()["openai:0"]["in_flight"] == 0
@@ -0,0 +1,56 @@
+import json
+import math
+
+import pytest
+
+from open_webui.utils.serialization import (
+    JSON_BACKENDS,
+    decode_binary,
+    encode_binary,
+    get_json_backend,
+    json_dumps,
+    json_loads,
+)
+
+VALUE = {"text": "héllo ✓\n", "items": [1, 2.5, None, True, ""], "nested": {"a": {}}}
+
+
+@pytest.mark.parametrize("name", JSON_BACKENDS)
+def test_backends_read_each_other(name):
+    backend, dumps, loads = get_json_backend(name)
+    if backend != name:
+        pytest.skip(f"{name} is not installed")
+
+    assert loads(dumps(VALUE)) == VALUE
+    assert json.loads(dumps(VALUE)) == VALUE
+    assert loads(json.dumps(VALUE)) == VALUE
+
+
+@pytest.mark.parametrize("name", JSON_BACKENDS)
+def test_non_finite_floats(name):
+    backend, dumps, loads = get_json_backend(name)
+    if backend != name:
+        pytest.skip(f"{name} is not installed")
+
+    encoded = dumps({"nan": math.nan, "inf": math.inf})
+    if name == "json":
+        assert encoded == '{"nan": NaN, "inf": Infinity}'
+    else:
+        # orjson and msgspec write null, which JSON parsers outside Python accept
+        assert json.loads(encoded) == {"nan": None, "inf": None}
+
+
+def test_falls_back_to_the_standard_library():
+    # integers over 64 bits and non-string keys
+    assert json_loads(json_dumps({1: 2**70})) == {"1": 2**70}
+    assert math.isnan(json_loads('{"a": NaN}')["a"])
+
+    with pytest.raises(json.JSONDecodeError):
+        json_loads("{not json")
+
+
+def test_binary_values():
+    update = bytes(range(256))
+    assert decode_binary(encode_binary(update)) == update
+    # updates stored as JSON lists of byte values
+    assert decode_binary(json.dumps(list(update))) == update
@@ -0,0 +1,104 @@
+import asyncio
+import threading
+
+import pytest
+
+from open_webui.utils import startup
+from open_webui.utils.startup import (
+    LazyFunction,
+    WarmUp,
+    parse_import_time,
+    summarize_import_time,
+)
+
+IMPORT_TIME = """\
+import time: self [us] | cumulative | imported package
+import time:       120 |        120 |   _io
+import time:       300 |        420 | io
+import time:      1500 |       1500 |     encodings.aliases
+import time:       200 |       1700 |   encodings
+import time:       100 |       1800 | site
+"""
+
+
+def test_parse_import_time():
+    modules = parse_import_time(IMPORT_TIME)
+    assert [(m["module"], m["depth"]) for m in modules] == [
+        ("_io", 1),
+        ("io", 0),
+        ("encodings.aliases", 2),
+        ("encodings", 1),
+        ("site", 0),
+    ]
+
+    summary = summarize_import_time(modules, limit=2)
+    assert summary["total"] == pytest.approx(2.22)
+    assert [m["module"] for m in summary["cumulative"]] == ["site", "encodings"]
+    assert [m["module"] for m in summary["self"]] == ["encodings.aliases", "io"]
+
+
+def test_warm_up_runs_once():
+    state = {"func": None, "loads": 0}
+
+    def load():
+        state["loads"] += 1
+        state["func"] = lambda x: x * 2
+
+    warm_up = WarmUp("test", load)
+    lazy = LazyFunction(warm_up, lambda: state["func"])
+    state["func"] = lazy
+
+    assert lazy(2) == 4
+    assert lazy(3) == 6
+    assert state["loads"] == 1 and warm_up.state == "ready"
+
+
+def test_failed_warm_up_raises_on_use():
+    def load():
+        raise RuntimeError("model missing")
+
+    warm_up = WarmUp("test", load)
+    lazy = LazyFunction(warm_up, lambda: lazy)
+
+    with pytest.raises(Exception, match="model missing"):
+        lazy("query")
+    assert warm_up.status()["state"] == "failed"
+
+
+@pytest.mark.asyncio
+async def test_wait_async_keeps_event_loop_running():
+    release = threading.Event()
+    warm_up = WarmUp("test", release.wait)
+
+    waiter = asyncio.create_task(warm_up.wait_async())
+    # the loop still runs other tasks while the warm-up is loading
+    await asyncio.sleep(0.05)
+    assert warm_up.state == "loading" and not waiter.done()
+
+    release.set()
+    await waiter
+    assert warm_up.state == "ready"
+
+
+@pytest.mark.asyncio
+async def test_import_time_is_profiled_once(monkeypatch):
+    calls = []
+
+    async def profile(module):
+        calls.append(module)
+        await asyncio.sleep(0.01)
+        return {
+            "module": module,
+            "returncode": 0,
+            "modules": parse_import_time(IMPORT_TIME),
+        }
+
+    monkeypatch.setattr(startup, "IMPORT_TIME_PROFILE", None)
+    monkeypatch.setattr(startup, "profile_import_time", profile)
+
+    first, second = await asyncio.gather(
+        startup.get_import_time(limit=1), startup.get_import_time(limit=2)
+    )
+    assert calls == ["open_webui.main"]
+    assert [m["module"] for m in first["cumulative"]] == ["site"]
+    assert [m["module"] for m in second["cumulative"]] == ["site", "encodings"]
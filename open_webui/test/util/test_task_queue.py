@@ -0,0 +1,59 @@
+import asyncio
+
+import pytest
+
+from open_webui.utils.task_queue import BackgroundTaskQueue
+
+
+@pytest.mark.asyncio
+async def test_queue_bounds_concurrency_and_size():
+    queue = BackgroundTaskQueue(workers=2, maxsize=3)
+    release = asyncio.Event()
+    running, done = [], []
+
+    async def work():
+        running.append(None)
+        await release.wait()
+        done.append(None)
+
+    # two run right away, three wait in the queue, the rest are dropped
+    accepted = [await queue.submit(work, name="test") for _ in range(2)]
+    await asyncio.sleep(0.01)
+    accepted += [await queue.submit(work, name="test") for _ in range(5)]
+    assert accepted == [True] * 5 + [False] * 2
+    assert len(running) == 2 and queue.qsize() == 3
+
+    release.set()
+    await queue._queue.join()
+    assert len(done) == 5
+    await queue.close()
+
+
+@pytest.mark.asyncio
+async def test_queue_without_workers_runs_inline():
+    queue = BackgroundTaskQueue(workers=0)
+    done = []
+
+    async def work():
+        done.append(None)
+
+    assert await queue.submit(work)
+    assert done == [None]
+
+
+@pytest.mark.asyncio
+async def test_queue_size_zero_stays_bounded():
+    queue = BackgroundTaskQueue(workers=1, maxsize=0)
+    release = asyncio.Event()
+
+    async def work():
+        await release.wait()
+
+    assert await queue.submit(work, name="test")
+    await asyncio.sleep(0.01)
+    accepted = [await queue.submit(work, name="test") for _ in range(2)]
+    assert accepted == [True, False]
+
+    release.set()
+    await queue._queue.join()
+    await queue.close()
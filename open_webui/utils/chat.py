@@ -41,11 +41,18 @@ from open_webui.models.models import Models
 
 
 from open_webui.utils.plugin import (
+    RequirementsNotReadyError,
     load_function_module_by_id,
     get_function_module_from_cache,
 )
 from open_webui.utils.models import get_all_models, check_model_access
 from open_webui.utils.payload import convert_payload_openai_to_ollama
+from open_webui.utils.completion_cache import COMPLETION_CACHE
+from open_webui.utils.scheduler import (
+    get_priority,
+    get_schedule_keys,
+    get_upstream_scheduler,
+)
 from open_webui.utils.response import (
     convert_response_ollama_to_openai,
     convert_streaming_response_ollama_to_openai,
@@ -256,31 +263,52 @@ async def generate_chat_completion(
             return await generate_function_chat_completion(
                 request, form_data, user=user, models=models
             )
-        if model.get("owned_by") == "ollama":
-            # Using /ollama/api/chat endpoint
-            form_data = convert_payload_openai_to_ollama(form_data)
-            response = await generate_ollama_chat_completion(
-                request=request,
-                form_data=form_data,
-                user=user,
-                bypass_filter=bypass_filter,
-            )
-            if form_data.get("stream"):
-                response.headers["content-type"] = "text/event-stream"
-                return StreamingResponse(
-                    convert_streaming_response_ollama_to_openai(response),
-                    headers=dict(response.headers),
-                    background=response.background,
+
+        # Upstream requests wait for a slot of the model and its connection
+        scheduler = get_upstream_scheduler()
+        schedule_keys = get_schedule_keys(model, models)
+        priority = get_priority(form_data.get("metadata"))
+
+        async def generate_upstream_chat_completion():
+            if model.get("owned_by") == "ollama":
+                # Using /ollama/api/chat endpoint
+                ollama_form_data = convert_payload_openai_to_ollama(form_data)
+                response = await scheduler.run(
+                    schedule_keys,
+                    priority,
+                    lambda: generate_ollama_chat_completion(
+                        request=request,
+                        form_data=ollama_form_data,
+                        user=user,
+                        bypass_filter=bypass_filter,
+                    ),
                 )
+                if ollama_form_data.get("stream"):
+                    response.headers["content-type"] = "text/event-stream"
+                    return StreamingResponse(
+                        convert_streaming_response_ollama_to_openai(response),
+                        headers=dict(response.headers),
+                        background=response.background,
+                    )
+                else:
+                    return convert_response_ollama_to_openai(response)
             else:
-                return convert_response_ollama_to_openai(response)
-        else:
-            return await generate_openai_chat_completion(
-                request=request,
-                form_data=form_data,
-                user=user,
-                bypass_filter=bypass_filter,
+                return await scheduler.run(
+                    schedule_keys,
+                    priority,
+                    lambda: generate_openai_chat_completion(
+                        request=request,
+                        form_data=form_data,
+                        user=user,
+                        bypass_filter=bypass_filter,
+                    ),
+                )
+
+        if COMPLETION_CACHE is not None and COMPLETION_CACHE.is_cacheable(form_data):
+            return await COMPLETION_CACHE.get_or_generate(
+                request, form_data, generate_upstream_chat_completion
             )
+        return await generate_upstream_chat_completion()
 
 
 chat_completion = generate_chat_completion
@@ -329,7 +357,7 @@ async def chat_completed(request: Request, form_data: dict, user: Any):
     try:
         filter_functions = [
             Functions.get_function_by_id(filter_id)
-            for filter_id in get_sorted_filter_ids(
+            for filter_id in await get_sorted_filter_ids(
                 request, model, metadata.get("filter_ids", [])
             )
         ]
@@ -342,6 +370,8 @@ async def chat_completed(request: Request, form_data: dict, user: Any):
             extra_params=extra_params,
         )
         return result
+    except RequirementsNotReadyError:
+        raise
     except Exception as e:
         return Exception(f"Error: {e}")
 
@@ -0,0 +1,251 @@
+import asyncio
+import copy
+import hashlib
+import json
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Optional
+
+import numpy as np
+from opentelemetry import metrics
+
+from open_webui.env import (
+    ENABLE_TASK_COMPLETION_CACHE,
+    REDIS_KEY_PREFIX,
+    SRC_LOG_LEVELS,
+    TASK_COMPLETION_CACHE_SIMILARITY_THRESHOLD,
+    TASK_COMPLETION_CACHE_SIZE,
+    TASK_COMPLETION_CACHE_TASKS,
+    TASK_COMPLETION_CACHE_TTL,
+)
+
+log = logging.getLogger(__name__)
+log.setLevel(SRC_LOG_LEVELS["MODELS"])
+
+meter = metrics.get_meter(__name__)
+cache_counter = meter.create_counter(
+    name="webui.task_cache.requests",
+    description="Task completion cache lookups, by task and result=hit|similar|miss",
+    unit="1",
+)
+
+# Payload fields that don't change what the model generates
+IGNORED_PARAMS = {"messages", "metadata", "stream", "user", "chat_id", "session_id"}
+
+
+def normalize_content(content: Any) -> Any:
+    if isinstance(content, str):
+        return " ".join(content.split())
+    if isinstance(content, list):
+        return [
+            (
+                {**item, "text": normalize_content(item.get("text", ""))}
+                if isinstance(item, dict) and item.get("type") == "text"
+                else item
+            )
+            for item in content
+        ]
+    return content
+
+
+def normalize_messages(messages: list[dict]) -> list[dict]:
+    """Messages reduced to what the model sees, with whitespace collapsed."""
+    return [
+        {"role": m.get("role"), "content": normalize_content(m.get("content"))}
+        for m in messages
+    ]
+
+
+def get_params(form_data: dict) -> dict:
+    return {k: v for k, v in form_data.items() if k not in IGNORED_PARAMS}
+
+
+def get_hash(value) -> str:
+    return hashlib.sha256(
+        json.dumps(value, sort_keys=True, default=str).encode()
+    ).hexdigest()
+
+
+def get_cache_key(form_data: dict) -> str:
+    """Key of a completion: the model, its normalized messages and the request params."""
+    return get_hash(
+        {
+            "params": get_params(form_data),
+            "messages": normalize_messages(form_data.get("messages", [])),
+        }
+    )
+
+
+def get_messages_text(messages: list[dict]) -> str:
+    parts = []
+    for message in normalize_messages(messages):
+        content = message["content"]
+        if isinstance(content, list):
+            content = " ".join(
+                item.get("text", "") for item in content if isinstance(item, dict)
+            )
+        parts.append(f"{message['role']}: {content}")
+    return "\n".join(parts)
+
+
+class CompletionCache:
+    """
+    Cache of non-streaming task model completions (titles, queries,
+    autocompletions, ...), whose prompts often repeat across users.
+
+    Completions are stored in a local LRU with a TTL and, when Redis is
+    configured, in Redis so other nodes can answer from them. With a
+    similarity threshold, a miss is also answered by a local entry of the same
+    model, task and params whose prompt embedding is at least that similar.
+    """
+
+    def __init__(
+        self,
+        ttl: int = TASK_COMPLETION_CACHE_TTL,
+        maxsize: int = TASK_COMPLETION_CACHE_SIZE,
+        tasks: Optional[set[str]] = None,
+        similarity_threshold: float = TASK_COMPLETION_CACHE_SIMILARITY_THRESHOLD,
+    ):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self.tasks = TASK_COMPLETION_CACHE_TASKS if tasks is None else tasks
+        self.similarity_threshold = similarity_threshold
+
+        # key -> (expires_at, response)
+        self._entries: OrderedDict[str, tuple[float, dict]] = OrderedDict()
+        # key -> (scope, normalized prompt embedding), for similarity lookups
+        self._vectors: dict[str, tuple[str, np.ndarray]] = {}
+
+    def is_cacheable(self, form_data: dict) -> bool:
+        task = (form_data.get("metadata") or {}).get("task")
+        return (
+            task is not None
+            and str(task) in self.tasks
+            and not form_data.get("stream", False)
+        )
+
+    def _get_local(self, key: str) -> Optional[dict]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry[0] < time.monotonic():
+            self._pop(key)
+            return None
+        self._entries.move_to_end(key)
+        return entry[1]
+
+    def _set_local(self, key: str, response: dict):
+        self._entries[key] = (time.monotonic() + self.ttl, response)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._pop(next(iter(self._entries)))
+
+    def _pop(self, key: str):
+        self._entries.pop(key, None)
+        self._vectors.pop(key, None)
+
+    async def _get_redis(self, redis, key: str) -> Optional[dict]:
+        if redis is None:
+            return None
+        try:
+            value = await redis.get(f"{REDIS_KEY_PREFIX}:task_cache:{key}")
+            return json.loads(value) if value else None
+        except Exception as e:
+            log.warning(f"Failed to read task completion cache: {e}")
+            return None
+
+    async def _set_redis(self, redis, key: str, response: dict):
+        if redis is None:
+            return
+        try:
+            await redis.set(
+                f"{REDIS_KEY_PREFIX}:task_cache:{key}",
+                json.dumps(response),
+                ex=self.ttl,
+            )
+        except Exception as e:
+            log.warning(f"Failed to write task completion cache: {e}")
+
+    async def _embed(self, request, form_data: dict) -> Optional[np.ndarray]:
+        embedding_function = getattr(request.app.state, "EMBEDDING_FUNCTION", None)
+        if embedding_function is None:
+            return None
+        try:
+            vector = np.asarray(
+                await asyncio.to_thread(
+                    embedding_function,
+                    get_messages_text(form_data.get("messages", [])),
+                ),
+                dtype=np.float32,
+            )
+        except Exception as e:
+            log.warning(f"Failed to embed task prompt: {e}")
+            return None
+
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else None
+
+    def _get_similar(self, scope: str, vector: np.ndarray) -> Optional[dict]:
+        keys, vectors = [], []
+        for key, (entry_scope, entry_vector) in self._vectors.items():
+            if entry_scope == scope and entry_vector.shape == vector.shape:
+                keys.append(key)
+                vectors.append(entry_vector)
+        if not keys:
+            return None
+
+        scores = np.stack(vectors) @ vector
+        best = int(np.argmax(scores))
+        if scores[best] < self.similarity_threshold:
+            return None
+        return self._get_local(keys[best])
+
+    async def get_or_generate(
+        self,
+        request,
+        form_data: dict,
+        generate: Callable[[], Awaitable[Any]],
+    ) -> Any:
+        task = str(form_data["metadata"]["task"])
+        key = get_cache_key(form_data)
+        redis = getattr(request.app.state, "redis", None)
+
+        response = self._get_local(key)
+        if response is None:
+            response = await self._get_redis(redis, key)
+            if response is not None:
+                self._set_local(key, response)
+
+        if response is not None:
+            cache_counter.add(1, {"task": task, "result": "hit"})
+            return copy.deepcopy(response)
+
+        vector = None
+        if self.similarity_threshold > 0:
+            # scoped so only prompts of the same model, task and params match
+            scope = get_hash({"task": task, "params": get_params(form_data)})
+            vector = await self._embed(request, form_data)
+            if vector is not None:
+                response = self._get_similar(scope, vector)
+                if response is not None:
+                    cache_counter.add(1, {"task": task, "result": "similar"})
+                    return copy.deepcopy(response)
+
+        cache_counter.add(1, {"task": task, "result": "miss"})
+        response = await generate()
+
+        # only successful completions are cached, errors come back as responses
+        if isinstance(response, dict) and response.get("choices"):
+            self._set_local(key, copy.deepcopy(response))
+            if vector is not None:
+                self._vectors[key] = (scope, vector)
+            await self._set_redis(redis, key, response)
+        return response
+
+    def clear(self):
+        self._entries.clear()
+        self._vectors.clear()
+
+
+COMPLETION_CACHE = CompletionCache() if ENABLE_TASK_COMPLETION_CACHE else None
@@ -0,0 +1,419 @@
+import copy
+import html
+import json
+import re
+import time
+from typing import Any, Optional
+
+# How far back a tag split across stream chunks is looked for; start tags with
+# attributes longer than this are not detected when they arrive in pieces
+TAG_LOOKBEHIND = 256
+
+# Stands in for the formatted reasoning while a reasoning block is serialized
+DISPLAY_CONTENT_MARKER = "\x00"
+
+
+####################################
+# Serialization
+####################################
+
+
+def split_content_and_whitespace(content):
+    content_stripped = content.rstrip()
+    original_whitespace = (
+        content[len(content_stripped) :] if len(content) > len(content_stripped) else ""
+    )
+    return content_stripped, original_whitespace
+
+
+def is_opening_code_block(content):
+    backtick_segments = content.split("```")
+    # Even number of segments means the last backticks are opening a new block
+    return len(backtick_segments) > 1 and len(backtick_segments) % 2 == 0
+
+
+def format_reasoning_content(reasoning_content: str) -> str:
+    return "\n".join(
+        (f"> {line}" if not line.startswith(">") else line)
+        for line in reasoning_content.splitlines()
+    )
+
+
+def serialize_content_block(
+    content: str,
+    block: dict,
+    raw: bool = False,
+    reasoning_display_content: Optional[str] = None,
+) -> str:
+    """Append ``block`` to the serialized ``content`` of the blocks before it."""
+    if block["type"] == "text":
+        block_content = block["content"].strip()
+        if block_content:
+            content = f"{content}{block_content}\n"
+    elif block["type"] == "tool_calls":
+        attributes = block.get("attributes", {})
+
+        tool_calls = block.get("content", [])
+        results = block.get("results", [])
+
+        if content and not content.endswith("\n"):
+            content += "\n"
+
+        if results:
+
+            tool_calls_display_content = ""
+            for tool_call in tool_calls:
+
+                tool_call_id = tool_call.get("id", "")
+                tool_name = tool_call.get("function", {}).get("name", "")
+                tool_arguments = tool_call.get("function", {}).get("arguments", "")
+
+                tool_result = None
+                tool_result_files = None
+                for result in results:
+                    if tool_call_id == result.get("tool_call_id", ""):
+                        tool_result = result.get("content", None)
+                        tool_result_files = result.get("files", None)
+                        break
+
+                if tool_result:
+                    tool_calls_display_content = f'{tool_calls_display_content}<details type="tool_calls" done="true" id="{tool_call_id}" name="{tool_name}" arguments="{html.escape(json.dumps(tool_arguments))}" result="{html.escape(json.dumps(tool_result, ensure_ascii=False))}" files="{html.escape(json.dumps(tool_result_files)) if tool_result_files else ""}">\n<summary>Tool Executed</summary>\n</details>\n'
+                else:
+                    tool_calls_display_content = f'{tool_calls_display_content}<details type="tool_calls" done="false" id="{tool_call_id}" name="{tool_name}" arguments="{html.escape(json.dumps(tool_arguments))}">\n<summary>Executing...</summary>\n</details>\n'
+
+            if not raw:
+                content = f"{content}{tool_calls_display_content}"
+        else:
+            tool_calls_display_content = ""
+
+            for tool_call in tool_calls:
+                tool_call_id = tool_call.get("id", "")
+                tool_name = tool_call.get("function", {}).get("name", "")
+                tool_arguments = tool_call.get("function", {}).get("arguments", "")
+
+                tool_calls_display_content = f'{tool_calls_display_content}\n<details type="tool_calls" done="false" id="{tool_call_id}" name="{tool_name}" arguments="{html.escape(json.dumps(tool_arguments))}">\n<summary>Executing...</summary>\n</details>\n'
+
+            if not raw:
+                content = f"{content}{tool_calls_display_content}"
+
+    elif block["type"] == "reasoning":
+        if reasoning_display_content is None:
+            reasoning_display_content = format_reasoning_content(block["content"])
+
+        reasoning_duration = block.get("duration", None)
+
+        start_tag = block.get("start_tag", "")
+        end_tag = block.get("end_tag", "")
+
+        if content and not content.endswith("\n"):
+            content += "\n"
+
+        if reasoning_duration is not None:
+            if raw:
+                content = f'{content}{start_tag}{block["content"]}{end_tag}\n'
+            else:
+                content = f'{content}<details type="reasoning" done="true" duration="{reasoning_duration}">\n<summary>Thought for {reasoning_duration} seconds</summary>\n{reasoning_display_content}\n</details>\n'
+        else:
+            if raw:
+                content = f'{content}{start_tag}{block["content"]}{end_tag}\n'
+            else:
+                content = f'{content}<details type="reasoning" done="false">\n<summary>Thinking…</summary>\n{reasoning_display_content}\n</details>\n'
+
+    elif block["type"] == "code_interpreter":
+        attributes = block.get("attributes", {})
+        output = block.get("output", None)
+        lang = attributes.get("lang", "")
+
+        content_stripped, original_whitespace = split_content_and_whitespace(content)
+        if is_opening_code_block(content_stripped):
+            # Remove trailing backticks that would open a new block
+            content = content_stripped.rstrip("`").rstrip() + original_whitespace
+        else:
+            # Keep content as is - either closing backticks or no backticks
+            content = content_stripped + original_whitespace
+
+        if content and not content.endswith("\n"):
+            content += "\n"
+
+        if output:
+            output = html.escape(json.dumps(output))
+
+            if raw:
+                content = f'{content}<code_interpreter type="code" lang="{lang}">\n{block["content"]}\n</code_interpreter>\n```output\n{output}\n```\n'
+            else:
+                content = f'{content}<details type="code_interpreter" done="true" output="{output}">\n<summary>Analyzed</summary>\n```{lang}\n{block["content"]}\n```\n</details>\n'
+        else:
+            if raw:
+                content = f'{content}<code_interpreter type="code" lang="{lang}">\n{block["content"]}\n</code_interpreter>\n'
+            else:
+                content = f'{content}<details type="code_interpreter" done="false">\n<summary>Analyzing...</summary>\n```{lang}\n{block["content"]}\n```\n</details>\n'
+
+    else:
+        block_content = str(block["content"]).strip()
+        if block_content:
+            content = f"{content}{block['type']}: {block_content}\n"
+
+    return content
+
+
+def serialize_content_blocks(content_blocks: list[dict], raw: bool = False) -> str:
+    content = ""
+    for block in content_blocks:
+        content = serialize_content_block(content, block, raw)
+    return content.strip()
+
+
+class ContentBlockSerializer:
+    """
+    serialize_content_blocks for a response that is being streamed, where
+    only the last block grows between calls.
+
+    The serialized prefix of the blocks before the last one is kept, as long
+    as none of them changed, and so is a reasoning block serialized up to its
+    last complete line, so each call only formats the text that is new and
+    copies the rest once.
+    """
+
+    def __init__(self):
+        # (block, snapshot of the block when it was serialized)
+        self._blocks: list[tuple[dict, dict]] = []
+        self._prefix = ""
+        self._stripped_prefix = ""
+        # (block, prefix, duration, raw reasoning up to its last line break,
+        # serialized content up to there, serialized content after the lines)
+        self._reasoning: Optional[tuple[dict, str, Any, str, str, str]] = None
+
+    def _get_prefix(self, blocks: list[dict]) -> str:
+        for idx, (block, snapshot) in enumerate(self._blocks):
+            if idx >= len(blocks) or blocks[idx] is not block or block != snapshot:
+                self._blocks, self._prefix = [], ""
+                break
+
+        if len(blocks) > len(self._blocks) or not self._blocks:
+            for block in blocks[len(self._blocks) :]:
+                self._prefix = serialize_content_block(self._prefix, block)
+                self._blocks.append((block, copy.deepcopy(block)))
+            self._stripped_prefix = self._prefix.lstrip()
+        return self._prefix
+
+    def _serialize_reasoning(self, prefix: str, block: dict) -> str:
+        reasoning_content = block["content"]
+        duration = block.get("duration", None)
+
+        cached = self._reasoning
+        if (
+            cached is None
+            or cached[0] is not block
+            or cached[1] is not prefix
+            or cached[2] != duration
+            or not reasoning_content.startswith(cached[3])
+        ):
+            head, _, footer = serialize_content_block(
+                prefix, block, reasoning_display_content=DISPLAY_CONTENT_MARKER
+            ).rpartition(DISPLAY_CONTENT_MARKER)
+            cached = (block, prefix, duration, "", head.lstrip(), footer.rstrip())
+        _, _, _, lines, head, footer = cached
+
+        # only complete lines are cached, the last one may still grow
+        end = reasoning_content.rfind("\n") + 1
+        if end > len(lines):
+            display_content = format_reasoning_content(
+                reasoning_content[len(lines) : end]
+            )
+            head = f"{head}\n{display_content}" if lines else f"{head}{display_content}"
+            lines = reasoning_content[:end]
+        self._reasoning = (block, prefix, duration, lines, head, footer)
+
+        tail = reasoning_content[len(lines) :]
+        if not tail:
+            return f"{head}{footer}"
+        display_content = format_reasoning_content(tail)
+        if not lines:
+            return f"{head}{display_content}{footer}"
+        return f"{head}\n{display_content}{footer}"
+
+    def serialize(self, content_blocks: list[dict]) -> str:
+        if not content_blocks:
+            return ""
+
+        prefix = self._get_prefix(content_blocks[:-1])
+        block = content_blocks[-1]
+
+        if block["type"] == "reasoning":
+            return self._serialize_reasoning(prefix, block)
+        if block["type"] == "text":
+            block_content = block["content"].strip()
+            if block_content:
+                return f"{self._stripped_prefix}{block_content}"
+        return serialize_content_block(prefix, block).strip()
+
+
+####################################
+# Tag parsing
+####################################
+
+
+def extract_attributes(tag_content):
+    """Extract attributes from a tag if they exist."""
+    attributes = {}
+    if not tag_content:  # Ensure tag_content is not None
+        return attributes
+    # Match attributes in the format: key="value" (ignores single quotes for simplicity)
+    matches = re.findall(r'(\w+)\s*=\s*"([^"]+)"', tag_content)
+    for key, value in matches:
+        attributes[key] = value
+    return attributes
+
+
+def get_start_tag_pattern(start_tag: str) -> re.Pattern:
+    if start_tag.startswith("<") and start_tag.endswith(">"):
+        # Match start tag e.g., <tag> or <tag attr="value">
+        return re.compile(rf"<{re.escape(start_tag[1:-1])}(\s.*?)?>")
+    return re.compile(re.escape(start_tag))
+
+
+class ContentBlockParser:
+    """
+    Splits the streamed text of a response into content blocks at reasoning,
+    code interpreter and solution tags.
+
+    A state machine over the last content block: while it is text, the start
+    tags are looked for in the text that arrived since the last call (plus a
+    few characters before it, for tags split across chunks); while it is a
+    tagged block, its end tag is. Earlier text is never scanned again.
+    """
+
+    def __init__(self, tags: list[tuple[str, list[tuple[str, str]]]], content=""):
+        # content_type, start_tag, end_tag, start tag pattern
+        self.tags = [
+            (content_type, start_tag, end_tag, get_start_tag_pattern(start_tag))
+            for content_type, content_tags in tags
+            for start_tag, end_tag in content_tags
+        ]
+        self.content_types = {content_type for content_type, _ in tags}
+
+        # The streamed text without the tagged blocks that were closed
+        self._content = [content]
+        self._tagged_content: Optional[list[str]] = None
+
+        # Last block and how much of its content was looked at
+        self._block: Optional[dict] = None
+        self._scanned = 0
+
+    @property
+    def content(self) -> str:
+        return "".join(self._content + (self._tagged_content or []))
+
+    def _get_scan_position(self, block: dict, lookbehind: int) -> int:
+        if block is not self._block:
+            self._block, self._scanned = block, 0
+        return max(self._scanned - lookbehind, 0)
+
+    def _open(self, content_blocks: list[dict]) -> bool:
+        block = content_blocks[-1]
+        text = block["content"]
+        pos = self._get_scan_position(block, TAG_LOOKBEHIND)
+
+        match = None
+        for content_type, start_tag, end_tag, pattern in self.tags:
+            tag_match = pattern.search(text, pos)
+            if tag_match and (match is None or tag_match.start() < match[0].start()):
+                match = (tag_match, content_type, start_tag, end_tag)
+
+        if match is None:
+            self._scanned = len(text)
+            return False
+
+        match, content_type, start_tag, end_tag = match
+        before_tag = text[: match.start()]
+        after_tag = text[match.end() :]
+
+        if before_tag:
+            block["content"] = before_tag
+        else:
+            content_blocks.pop()
+
+        content_blocks.append(
+            {
+                "type": content_type,
+                "start_tag": start_tag,
+                "end_tag": end_tag,
+                "attributes": extract_attributes(
+                    match.group(1) if match.re.groups else None
+                ),
+                "content": after_tag,
+                "started_at": time.time(),
+            }
+        )
+
+        tagged_content = text[match.start() :]
+        content = "".join(self._content)
+        if content.endswith(tagged_content):
+            self._content = [content[: len(content) - len(tagged_content)]]
+        else:
+            self._content = [content]
+            tagged_content = ""
+        self._tagged_content = [tagged_content]
+        return True
+
+    def _close(self, content_blocks: list[dict]) -> Optional[str]:
+        """Closes the last block at its end tag, returns its type if it was."""
+        block = content_blocks[-1]
+        end_tag = block["end_tag"]
+        text = block["content"]
+
+        idx = text.find(end_tag, self._get_scan_position(block, len(end_tag) - 1))
+        if idx == -1:
+            self._scanned = len(text)
+            return None
+
+        content_type = block["type"]
+        block_content = text[:idx].strip()
+        leftover_content = text[idx + len(end_tag) :]
+
+        if block_content:
+            block["content"] = block_content
+            block["ended_at"] = time.time()
+            block["duration"] = int(block["ended_at"] - block["started_at"])
+        else:
+            # Remove the block if content is empty
+            content_blocks.pop()
+
+        # a code interpreter block is followed by its output, not by text
+        if not block_content or content_type != "code_interpreter":
+            content_blocks.append(
+                {"type": "text", "content": leftover_content.lstrip()}
+            )
+
+        if self._tagged_content is not None:
+            self._content.append(leftover_content)
+            self._tagged_content = None
+        return content_type
+
+    def feed(self, content_blocks: list[dict], value: str) -> bool:
+        """
+        Append streamed text to the last block and split it at any tags,
+        returns True when a code interpreter block was closed.
+        """
+        if self._tagged_content is not None:
+            self._tagged_content.append(value)
+        else:
+            self._content.append(value)
+
+        if not content_blocks:
+            content_blocks.append({"type": "text", "content": ""})
+        content_blocks[-1]["content"] = content_blocks[-1]["content"] + value
+
+        while True:
+            block_type = content_blocks[-1]["type"]
+            if block_type == "text":
+                if not self._open(content_blocks):
+                    return False
+            elif block_type in self.content_types and "end_tag" in content_blocks[-1]:
+                content_type = self._close(content_blocks)
+                if content_type is None:
+                    return False
+                if content_type == "code_interpreter":
+                    return True
+            else:
+                return False
@@ -17,6 +17,11 @@ from open_webui.routers.ollama import (
 
 from open_webui.utils.payload import convert_embedding_payload_openai_to_ollama
 from open_webui.utils.response import convert_embedding_response_ollama_to_openai
+from open_webui.utils.scheduler import (
+    get_priority,
+    get_schedule_keys,
+    get_upstream_scheduler,
+)
 
 logging.basicConfig(stream=sys.stdout, level=GLOBAL_LOG_LEVEL)
 log = logging.getLogger(__name__)
@@ -72,19 +77,32 @@ async def generate_embeddings(
         if not bypass_filter and user.role == "user":
             check_model_access(user, model)
 
+    # Upstream requests wait for a slot of the model and its connection
+    scheduler = get_upstream_scheduler()
+    schedule_keys = get_schedule_keys(model, models)
+    priority = get_priority(form_data.get("metadata"))
+
     # Ollama backend
     if model.get("owned_by") == "ollama":
         ollama_payload = convert_embedding_payload_openai_to_ollama(form_data)
-        response = await ollama_embeddings(
-            request=request,
-            form_data=GenerateEmbeddingsForm(**ollama_payload),
-            user=user,
+        response = await scheduler.run(
+            schedule_keys,
+            priority,
+            lambda: ollama_embeddings(
+                request=request,
+                form_data=GenerateEmbeddingsForm(**ollama_payload),
+                user=user,
+            ),
         )
         return convert_embedding_response_ollama_to_openai(response)
 
     # Default: OpenAI or compatible backend
-    return await openai_embeddings(
-        request=request,
-        form_data=form_data,
-        user=user,
+    return await scheduler.run(
+        schedule_keys,
+        priority,
+        lambda: openai_embeddings(
+            request=request,
+            form_data=form_data,
+            user=user,
+        ),
     )
@@ -1,12 +1,14 @@
+import asyncio
 import inspect
 import logging
 
 from open_webui.utils.plugin import (
+    RequirementsNotReadyError,
     load_function_module_by_id,
     get_function_module_from_cache,
 )
 from open_webui.models.functions import Functions
-from open_webui.env import SRC_LOG_LEVELS
+from open_webui.env import REQUIREMENTS_READY_TIMEOUT, SRC_LOG_LEVELS
 
 log = logging.getLogger(__name__)
 log.setLevel(SRC_LOG_LEVELS["MAIN"])
@@ -22,7 +24,30 @@ def get_function_module(request, function_id, load_from_db=True):
     return function_module
 
 
-def get_sorted_filter_ids(request, model: dict, enabled_filter_ids: list = None):
+async def get_filter_function_module(request, filter_id, load_from_db=True):
+    """
+    Get the filter module by its ID. A filter is never skipped while the
+    startup install of its requirements runs, the request waits for the
+    install instead, and RequirementsNotReadyError is raised when it is still
+    not done after REQUIREMENTS_READY_TIMEOUT seconds.
+    """
+    try:
+        return get_function_module(request, filter_id, load_from_db)
+    except RequirementsNotReadyError:
+        task = getattr(request.app.state, "requirements_install_task", None)
+        if task is None or task.done():
+            raise
+
+    log.info(f"Waiting for the requirements of filter {filter_id}")
+    try:
+        await asyncio.wait_for(asyncio.shield(task), REQUIREMENTS_READY_TIMEOUT)
+    except Exception:
+        # timed out or failed, loading raises again if it is still not ready
+        pass
+    return get_function_module(request, filter_id, load_from_db)
+
+
+async def get_sorted_filter_ids(request, model: dict, enabled_filter_ids: list = None):
     def get_priority(function_id):
         function = Functions.get_function_by_id(function_id)
         if function is not None:
@@ -39,19 +64,19 @@ def get_sorted_filter_ids(request, model: dict, enabled_filter_ids: list = None)
         for function in Functions.get_functions_by_type("filter", active_only=True)
     ]
 
-    def get_active_status(filter_id):
-        function_module = get_function_module(request, filter_id)
+    async def get_active_status(filter_id):
+        function_module = await get_filter_function_module(request, filter_id)
 
         if getattr(function_module, "toggle", None):
             return filter_id in (enabled_filter_ids or [])
 
         return True
 
-    active_filter_ids = [
-        filter_id for filter_id in active_filter_ids if get_active_status(filter_id)
+    filter_ids = [
+        fid
+        for fid in filter_ids
+        if fid in active_filter_ids and await get_active_status(fid)
     ]
-
-    filter_ids = [fid for fid in filter_ids if fid in active_filter_ids]
     filter_ids.sort(key=get_priority)
 
     return filter_ids
@@ -68,7 +93,7 @@ async def process_filter_functions(
         if not filter:
             continue
 
-        function_module = get_function_module(
+        function_module = await get_filter_function_module(
             request, filter_id, load_from_db=(filter_type != "stream")
         )
         # Prepare handler function
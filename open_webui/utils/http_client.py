@@ -0,0 +1,157 @@
+import asyncio
+import logging
+from collections import defaultdict
+from typing import Optional
+from urllib.parse import urlparse
+
+import aiohttp
+from opentelemetry import metrics
+
+from open_webui.env import (
+    AIOHTTP_CLIENT_POOL_KEEPALIVE_TIMEOUT,
+    AIOHTTP_CLIENT_POOL_LIMIT_PER_HOST,
+    SRC_LOG_LEVELS,
+)
+
+log = logging.getLogger(__name__)
+log.setLevel(SRC_LOG_LEVELS["MAIN"])
+
+meter = metrics.get_meter(__name__)
+connection_counter = meter.create_counter(
+    name="webui.http_client.connections",
+    description="Upstream connections by origin, result=created|reused",
+    unit="1",
+)
+
+
+def get_origin(url: str) -> str:
+    parsed = urlparse(url)
+    return f"{parsed.scheme}://{parsed.netloc}"
+
+
+class HTTPClientPool:
+    """
+    Application-lifetime aiohttp sessions for upstream backends, one per origin
+    so each keeps its own pool of keep-alive connections instead of paying DNS,
+    TCP and TLS setup on every request. Sessions belong to the event loop that
+    created them.
+
+    Responses must be released (``async with`` or ``response.release()``), not
+    closed, for their connection to be reused; the sessions themselves are
+    only closed by ``close()`` on shutdown.
+    """
+
+    def __init__(
+        self,
+        limit_per_host: int = AIOHTTP_CLIENT_POOL_LIMIT_PER_HOST,
+        keepalive_timeout: float = AIOHTTP_CLIENT_POOL_KEEPALIVE_TIMEOUT,
+    ):
+        self.limit_per_host = limit_per_host
+        self.keepalive_timeout = keepalive_timeout
+        self._sessions: dict[tuple[str, int], aiohttp.ClientSession] = {}
+        self._counts = defaultdict(lambda: {"created": 0, "reused": 0})
+
+    def _trace_config(self, origin: str) -> aiohttp.TraceConfig:
+        trace_config = aiohttp.TraceConfig()
+
+        async def on_connection_create_end(session, context, params):
+            self._counts[origin]["created"] += 1
+            connection_counter.add(1, {"origin": origin, "result": "created"})
+
+        async def on_connection_reuseconn(session, context, params):
+            self._counts[origin]["reused"] += 1
+            connection_counter.add(1, {"origin": origin, "result": "reused"})
+
+        trace_config.on_connection_create_end.append(on_connection_create_end)
+        trace_config.on_connection_reuseconn.append(on_connection_reuseconn)
+        return trace_config
+
+    def get_session(self, url: str) -> aiohttp.ClientSession:
+        origin = get_origin(url)
+        key = (origin, id(asyncio.get_running_loop()))
+
+        session = self._sessions.get(key)
+        if session is None or session.closed:
+            session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=self.limit_per_host,
+                    limit_per_host=self.limit_per_host,
+                    keepalive_timeout=self.keepalive_timeout,
+                    ttl_dns_cache=300,
+                ),
+                trust_env=True,
+                trace_configs=[self._trace_config(origin)],
+            )
+            self._sessions[key] = session
+            log.debug(f"Created pooled HTTP session for {origin}")
+        return session
+
+    def stats(self) -> dict[str, dict]:
+        """Pool utilization per origin."""
+        stats = {}
+        for (origin, _), session in list(self._sessions.items()):
+            connector = session.connector
+            if session.closed or connector is None:
+                continue
+            # aiohttp exposes no public pool counters, read them defensively
+            in_use = len(getattr(connector, "_acquired", ()))
+            idle = sum(
+                len(conns) for conns in getattr(connector, "_conns", {}).values()
+            )
+            entry = stats.setdefault(
+                origin,
+                {
+                    "in_use": 0,
+                    "idle": 0,
+                    "limit": self.limit_per_host,
+                    **self._counts[origin],
+                },
+            )
+            entry["in_use"] += in_use
+            entry["idle"] += idle
+        return stats
+
+    async def close(self):
+        sessions, self._sessions = self._sessions, {}
+        loop_id = id(asyncio.get_running_loop())
+        for (origin, session_loop_id), session in sessions.items():
+            # sessions of other (finished) event loops cannot be awaited here
+            if session_loop_id == loop_id and not session.closed:
+                await session.close()
+
+
+HTTP_CLIENT_POOL: Optional[HTTPClientPool] = None
+
+
+def init_http_client_pool() -> HTTPClientPool:
+    global HTTP_CLIENT_POOL
+    if HTTP_CLIENT_POOL is None:
+        HTTP_CLIENT_POOL = HTTPClientPool()
+
+        def observe_pool(options: metrics.CallbackOptions):
+            return [
+                metrics.Observation(value, {"origin": origin, "state": state})
+                for origin, entry in HTTP_CLIENT_POOL.stats().items()
+                for state, value in (
+                    ("in_use", entry["in_use"]),
+                    ("idle", entry["idle"]),
+                )
+            ]
+
+        meter.create_observable_gauge(
+            name="webui.http_client.pool",
+            description="Pooled upstream connections by origin, state=in_use|idle",
+            unit="1",
+            callbacks=[observe_pool],
+        )
+    return HTTP_CLIENT_POOL
+
+
+def get_http_session(url: str) -> aiohttp.ClientSession:
+    """Pooled session for the origin of ``url``, the pool is created on first use outside the app lifespan."""
+    return init_http_client_pool().get_session(url)
+
+
+async def close_http_client_pool():
+    if HTTP_CLIENT_POOL is not None:
+        await HTTP_CLIENT_POOL.close()
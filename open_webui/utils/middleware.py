@@ -9,7 +9,6 @@ from aiocache import cached
 from typing import Any, Optional
 import random
 import json
-import html
 import inspect
 import re
 import ast
@@ -36,6 +35,7 @@ from open_webui.routers.tasks import (
     generate_follow_ups,
     generate_image_prompt,
     generate_chat_tags,
+    generate_combined_tasks,
 )
 from open_webui.routers.retrieval import process_web_search, SearchForm
 from open_webui.routers.images import (
@@ -77,15 +77,25 @@ from open_webui.utils.misc import (
     convert_logit_bias_input_to_json,
 )
 from open_webui.utils.tools import get_tools
-from open_webui.utils.plugin import load_function_module_by_id
+from open_webui.utils.plugin import (
+    RequirementsNotReadyError,
+    load_function_module_by_id,
+)
 from open_webui.utils.filter import (
     get_sorted_filter_ids,
     process_filter_functions,
 )
 from open_webui.utils.code_interpreter import execute_code_jupyter
+from open_webui.utils.content_blocks import (
+    ContentBlockParser,
+    ContentBlockSerializer,
+    serialize_content_blocks,
+)
 from open_webui.utils.payload import apply_model_system_prompt_to_body
+from open_webui.utils.serialization import json_dumps, json_loads
 
 from open_webui.tasks import create_task
+from open_webui.utils.task_queue import BACKGROUND_TASK_QUEUE
 
 from open_webui.config import (
     CACHE_DIR,
@@ -841,7 +851,7 @@ async def process_chat_payload(request, form_data, user, metadata, model):
     try:
         filter_functions = [
             Functions.get_function_by_id(filter_id)
-            for filter_id in get_sorted_filter_ids(
+            for filter_id in await get_sorted_filter_ids(
                 request, model, metadata.get("filter_ids", [])
             )
         ]
@@ -853,6 +863,8 @@ async def process_chat_payload(request, form_data, user, metadata, model):
             form_data=form_data,
             extra_params=extra_params,
         )
+    except RequirementsNotReadyError:
+        raise
     except Exception as e:
         raise Exception(f"Error: {e}")
 
@@ -1042,8 +1054,25 @@ async def process_chat_payload(request, form_data, user, metadata, model):
 async def process_chat_response(
     request, response, form_data, user, metadata, model, events, tasks
 ):
+    def get_task_output(res) -> Optional[dict]:
+        """JSON object a task model responded with, None if there is none."""
+        if not res or not isinstance(res, dict):
+            return None
+
+        if len(res.get("choices", [])) == 1:
+            content = res["choices"][0].get("message", {}).get("content", "") or ""
+        else:
+            content = ""
+
+        try:
+            output = json.loads(content[content.find("{") : content.rfind("}") + 1])
+        except Exception:
+            return None
+        return output if isinstance(output, dict) else None
+
     async def background_tasks_handler():
-        message_map = Chats.get_messages_by_chat_id(metadata["chat_id"])
+        chat = Chats.get_chat_by_id(metadata["chat_id"])
+        message_map = chat.chat.get("history", {}).get("messages", {}) if chat else None
         message = message_map.get(metadata["message_id"]) if message_map else None
 
         if message:
@@ -1081,162 +1110,151 @@ async def process_chat_response(
                 )
 
             if tasks and messages:
-                if (
-                    TASKS.FOLLOW_UP_GENERATION in tasks
-                    and tasks[TASKS.FOLLOW_UP_GENERATION]
-                ):
-                    res = await generate_follow_ups(
-                        request,
-                        {
-                            "model": message["model"],
-                            "messages": messages,
-                            "message_id": metadata["message_id"],
-                            "chat_id": metadata["chat_id"],
-                        },
-                        user,
-                    )
+                user_message = get_last_user_message(messages)
+                if user_message and len(user_message) > 100:
+                    user_message = user_message[:100] + "..."
 
-                    if res and isinstance(res, dict):
-                        if len(res.get("choices", [])) == 1:
-                            follow_ups_string = (
-                                res.get("choices", [])[0]
-                                .get("message", {})
-                                .get("content", "")
-                            )
-                        else:
-                            follow_ups_string = ""
-
-                        follow_ups_string = follow_ups_string[
-                            follow_ups_string.find("{") : follow_ups_string.rfind("}")
-                            + 1
-                        ]
-
-                        try:
-                            follow_ups = json.loads(follow_ups_string).get(
-                                "follow_ups", []
-                            )
-
-                            Chats.upsert_message_to_chat_by_id_and_message_id(
-                                metadata["chat_id"],
-                                metadata["message_id"],
-                                {
-                                    "followUps": follow_ups,
-                                },
-                            )
-
-                            await event_emitter(
-                                {
-                                    "type": "chat:message:follow_ups",
-                                    "data": {
-                                        "follow_ups": follow_ups,
-                                    },
-                                }
-                            )
-                        except Exception as e:
-                            pass
+                form_data = {
+                    "model": message["model"],
+                    "messages": messages,
+                    "chat_id": metadata["chat_id"],
+                }
 
-                if TASKS.TITLE_GENERATION in tasks:
-                    user_message = get_last_user_message(messages)
-                    if user_message and len(user_message) > 100:
-                        user_message = user_message[:100] + "..."
+                # Titles and tags are only generated once per chat, later turns
+                # keep what the chat already has
+                has_title = bool(chat.title) and len(messages) > 2
+                has_tags = bool((chat.meta or {}).get("tags"))
 
-                    if tasks[TASKS.TITLE_GENERATION]:
+                generate = {
+                    "follow_ups": bool(tasks.get(TASKS.FOLLOW_UP_GENERATION)),
+                    "title": bool(tasks.get(TASKS.TITLE_GENERATION)) and not has_title,
+                    "tags": bool(tasks.get(TASKS.TAGS_GENERATION)) and not has_tags,
+                }
 
-                        res = await generate_title(
+                outputs = {}
+                combined = [
+                    key
+                    for key, enabled in (
+                        (
+                            "follow_ups",
+                            request.app.state.config.ENABLE_FOLLOW_UP_GENERATION,
+                        ),
+                        ("title", request.app.state.config.ENABLE_TITLE_GENERATION),
+                        ("tags", request.app.state.config.ENABLE_TAGS_GENERATION),
+                    )
+                    if generate[key] and enabled
+                ]
+                if (
+                    request.app.state.config.ENABLE_COMBINED_TASK_GENERATION
+                    and len(combined) > 1
+                ):
+                    output = get_task_output(
+                        await generate_combined_tasks(
                             request,
                             {
-                                "model": message["model"],
-                                "messages": messages,
-                                "chat_id": metadata["chat_id"],
+                                **form_data,
+                                "message_id": metadata["message_id"],
+                                "outputs": combined,
                             },
                             user,
                         )
+                    )
+                    if output is not None:
+                        # missing or malformed outputs fall back to their own request
+                        outputs = {
+                            key: output[key]
+                            for key in combined
+                            if isinstance(
+                                output.get(key), str if key == "title" else list
+                            )
+                        }
+                        log.debug(f"generated chat {', '.join(outputs)} in one call")
 
-                        if res and isinstance(res, dict):
-                            if len(res.get("choices", [])) == 1:
-                                title_string = (
-                                    res.get("choices", [])[0]
-                                    .get("message", {})
-                                    .get(
-                                        "content", message.get("content", user_message)
-                                    )
-                                )
-                            else:
-                                title_string = ""
-
-                            title_string = title_string[
-                                title_string.find("{") : title_string.rfind("}") + 1
-                            ]
+                if generate["follow_ups"]:
+                    if "follow_ups" in outputs:
+                        follow_ups = outputs["follow_ups"]
+                    else:
+                        output = get_task_output(
+                            await generate_follow_ups(
+                                request,
+                                {**form_data, "message_id": metadata["message_id"]},
+                                user,
+                            )
+                        )
+                        follow_ups = output.get("follow_ups") if output else None
 
-                            try:
-                                title = json.loads(title_string).get(
-                                    "title", user_message
-                                )
-                            except Exception as e:
-                                title = ""
+                    if isinstance(follow_ups, list):
+                        Chats.upsert_message_to_chat_by_id_and_message_id(
+                            metadata["chat_id"],
+                            metadata["message_id"],
+                            {
+                                "followUps": follow_ups,
+                            },
+                        )
 
-                            if not title:
-                                title = messages[0].get("content", user_message)
+                        await event_emitter(
+                            {
+                                "type": "chat:message:follow_ups",
+                                "data": {
+                                    "follow_ups": follow_ups,
+                                },
+                            }
+                        )
 
-                            Chats.update_chat_title_by_id(metadata["chat_id"], title)
+                if generate["title"]:
+                    if "title" in outputs:
+                        res, title = outputs, outputs["title"]
+                    else:
+                        res = await generate_title(request, form_data, user)
+                        output = get_task_output(res)
+                        title = output.get("title", user_message) if output else ""
 
-                            await event_emitter(
-                                {
-                                    "type": "chat:title",
-                                    "data": title,
-                                }
-                            )
-                    elif len(messages) == 2:
-                        title = messages[0].get("content", user_message)
+                    if res and isinstance(res, dict):
+                        if not title or not isinstance(title, str):
+                            title = messages[0].get("content", user_message)
 
                         Chats.update_chat_title_by_id(metadata["chat_id"], title)
 
                         await event_emitter(
                             {
                                 "type": "chat:title",
-                                "data": message.get("content", user_message),
+                                "data": title,
                             }
                         )
+                elif (
+                    TASKS.TITLE_GENERATION in tasks
+                    and not tasks[TASKS.TITLE_GENERATION]
+                    and len(messages) == 2
+                ):
+                    title = messages[0].get("content", user_message)
+
+                    Chats.update_chat_title_by_id(metadata["chat_id"], title)
 
-                if TASKS.TAGS_GENERATION in tasks and tasks[TASKS.TAGS_GENERATION]:
-                    res = await generate_chat_tags(
-                        request,
+                    await event_emitter(
                         {
-                            "model": message["model"],
-                            "messages": messages,
-                            "chat_id": metadata["chat_id"],
-                        },
-                        user,
+                            "type": "chat:title",
+                            "data": message.get("content", user_message),
+                        }
                     )
 
-                    if res and isinstance(res, dict):
-                        if len(res.get("choices", [])) == 1:
-                            tags_string = (
-                                res.get("choices", [])[0]
-                                .get("message", {})
-                                .get("content", "")
-                            )
-                        else:
-                            tags_string = ""
-
-                        tags_string = tags_string[
-                            tags_string.find("{") : tags_string.rfind("}") + 1
-                        ]
+                if generate["tags"]:
+                    if "tags" in outputs:
+                        tags = outputs["tags"]
+                    else:
+                        output = get_task_output(
+                            await generate_chat_tags(request, form_data, user)
+                        )
+                        tags = output.get("tags") if output else None
 
-                        try:
-                            tags = json.loads(tags_string).get("tags", [])
-                            Chats.update_chat_tags_by_id(
-                                metadata["chat_id"], tags, user
-                            )
+                    if isinstance(tags, list):
+                        Chats.update_chat_tags_by_id(metadata["chat_id"], tags, user)
 
-                            await event_emitter(
-                                {
-                                    "type": "chat:tags",
-                                    "data": tags,
-                                }
-                            )
-                        except Exception as e:
-                            pass
+                        await event_emitter(
+                            {
+                                "type": "chat:tags",
+                                "data": tags,
+                            }
+                        )
 
     event_emitter = None
     event_caller = None
@@ -1336,7 +1354,9 @@ async def process_chat_response(
                                     },
                                 )
 
-                        await background_tasks_handler()
+                        await BACKGROUND_TASK_QUEUE.submit(
+                            background_tasks_handler, name="chat_tasks"
+                        )
 
                 if events and isinstance(events, list):
                     extra_response = {}
@@ -1394,7 +1414,7 @@ async def process_chat_response(
     }
     filter_functions = [
         Functions.get_function_by_id(filter_id)
-        for filter_id in get_sorted_filter_ids(
+        for filter_id in await get_sorted_filter_ids(
             request, model, metadata.get("filter_ids", [])
         )
     ]
@@ -1404,154 +1424,8 @@ async def process_chat_response(
         task_id = str(uuid4())  # Create a unique task ID.
         model_id = form_data.get("model", "")
 
-        def split_content_and_whitespace(content):
-            content_stripped = content.rstrip()
-            original_whitespace = (
-                content[len(content_stripped) :]
-                if len(content) > len(content_stripped)
-                else ""
-            )
-            return content_stripped, original_whitespace
-
-        def is_opening_code_block(content):
-            backtick_segments = content.split("```")
-            # Even number of segments means the last backticks are opening a new block
-            return len(backtick_segments) > 1 and len(backtick_segments) % 2 == 0
-
         # Handle as a background task
         async def response_handler(response, events):
-            def serialize_content_blocks(content_blocks, raw=False):
-                content = ""
-
-                for block in content_blocks:
-                    if block["type"] == "text":
-                        block_content = block["content"].strip()
-                        if block_content:
-                            content = f"{content}{block_content}\n"
-                    elif block["type"] == "tool_calls":
-                        attributes = block.get("attributes", {})
-
-                        tool_calls = block.get("content", [])
-                        results = block.get("results", [])
-
-                        if content and not content.endswith("\n"):
-                            content += "\n"
-
-                        if results:
-
-                            tool_calls_display_content = ""
-                            for tool_call in tool_calls:
-
-                                tool_call_id = tool_call.get("id", "")
-                                tool_name = tool_call.get("function", {}).get(
-                                    "name", ""
-                                )
-                                tool_arguments = tool_call.get("function", {}).get(
-                                    "arguments", ""
-                                )
-
-                                tool_result = None
-                                tool_result_files = None
-                                for result in results:
-                                    if tool_call_id == result.get("tool_call_id", ""):
-                                        tool_result = result.get("content", None)
-                                        tool_result_files = result.get("files", None)
-                                        break
-
-                                if tool_result:
-                                    tool_calls_display_content = f'{tool_calls_display_content}<details type="tool_calls" done="true" id="{tool_call_id}" name="{tool_name}" arguments="{html.escape(json.dumps(tool_arguments))}" result="{html.escape(json.dumps(tool_result, ensure_ascii=False))}" files="{html.escape(json.dumps(tool_result_files)) if tool_result_files else ""}">\n<summary>Tool Executed</summary>\n</details>\n'
-                                else:
-                                    tool_calls_display_content = f'{tool_calls_display_content}<details type="tool_calls" done="false" id="{tool_call_id}" name="{tool_name}" arguments="{html.escape(json.dumps(tool_arguments))}">\n<summary>Executing...</summary>\n</details>\n'
-
-                            if not raw:
-                                content = f"{content}{tool_calls_display_content}"
-                        else:
-                            tool_calls_display_content = ""
-
-                            for tool_call in tool_calls:
-                                tool_call_id = tool_call.get("id", "")
-                                tool_name = tool_call.get("function", {}).get(
-                                    "name", ""
-                                )
-                                tool_arguments = tool_call.get("function", {}).get(
-                                    "arguments", ""
-                                )
-
-                                tool_calls_display_content = f'{tool_calls_display_content}\n<details type="tool_calls" done="false" id="{tool_call_id}" name="{tool_name}" arguments="{html.escape(json.dumps(tool_arguments))}">\n<summary>Executing...</summary>\n</details>\n'
-
-                            if not raw:
-                                content = f"{content}{tool_calls_display_content}"
-
-                    elif block["type"] == "reasoning":
-                        reasoning_display_content = "\n".join(
-                            (f"> {line}" if not line.startswith(">") else line)
-                            for line in block["content"].splitlines()
-                        )
-
-                        reasoning_duration = block.get("duration", None)
-
-                        start_tag = block.get("start_tag", "")
-                        end_tag = block.get("end_tag", "")
-
-                        if content and not content.endswith("\n"):
-                            content += "\n"
-
-                        if reasoning_duration is not None:
-                            if raw:
-                                content = (
-                                    f'{content}{start_tag}{block["content"]}{end_tag}\n'
-                                )
-                            else:
-                                content = f'{content}<details type="reasoning" done="true" duration="{reasoning_duration}">\n<summary>Thought for {reasoning_duration} seconds</summary>\n{reasoning_display_content}\n</details>\n'
-                        else:
-                            if raw:
-                                content = (
-                                    f'{content}{start_tag}{block["content"]}{end_tag}\n'
-                                )
-                            else:
-                                content = f'{content}<details type="reasoning" done="false">\n<summary>Thinking…</summary>\n{reasoning_display_content}\n</details>\n'
-
-                    elif block["type"] == "code_interpreter":
-                        attributes = block.get("attributes", {})
-                        output = block.get("output", None)
-                        lang = attributes.get("lang", "")
-
-                        content_stripped, original_whitespace = (
-                            split_content_and_whitespace(content)
-                        )
-                        if is_opening_code_block(content_stripped):
-                            # Remove trailing backticks that would open a new block
-                            content = (
-                                content_stripped.rstrip("`").rstrip()
-                                + original_whitespace
-                            )
-                        else:
-                            # Keep content as is - either closing backticks or no backticks
-                            content = content_stripped + original_whitespace
-
-                        if content and not content.endswith("\n"):
-                            content += "\n"
-
-                        if output:
-                            output = html.escape(json.dumps(output))
-
-                            if raw:
-                                content = f'{content}<code_interpreter type="code" lang="{lang}">\n{block["content"]}\n</code_interpreter>\n```output\n{output}\n```\n'
-                            else:
-                                content = f'{content}<details type="code_interpreter" done="true" output="{output}">\n<summary>Analyzed</summary>\n```{lang}\n{block["content"]}\n```\n</details>\n'
-                        else:
-                            if raw:
-                                content = f'{content}<code_interpreter type="code" lang="{lang}">\n{block["content"]}\n</code_interpreter>\n'
-                            else:
-                                content = f'{content}<details type="code_interpreter" done="false">\n<summary>Analyzing...</summary>\n```{lang}\n{block["content"]}\n```\n</details>\n'
-
-                    else:
-                        block_content = str(block["content"]).strip()
-                        if block_content:
-                            content = f"{content}{block['type']}: {block_content}\n"
-
-                return content.strip()
-
             def convert_content_blocks_to_messages(content_blocks, raw=False):
                 messages = []
 
@@ -1592,178 +1466,6 @@ async def process_chat_response(
 
                 return messages
 
-            def tag_content_handler(content_type, tags, content, content_blocks):
-                end_flag = False
-
-                def extract_attributes(tag_content):
-                    """Extract attributes from a tag if they exist."""
-                    attributes = {}
-                    if not tag_content:  # Ensure tag_content is not None
-                        return attributes
-                    # Match attributes in the format: key="value" (ignores single quotes for simplicity)
-                    matches = re.findall(r'(\w+)\s*=\s*"([^"]+)"', tag_content)
-                    for key, value in matches:
-                        attributes[key] = value
-                    return attributes
-
-                if content_blocks[-1]["type"] == "text":
-                    for start_tag, end_tag in tags:
-
-                        start_tag_pattern = rf"{re.escape(start_tag)}"
-                        if start_tag.startswith("<") and start_tag.endswith(">"):
-                            # Match start tag e.g., <tag> or <tag attr="value">
-                            # remove both '<' and '>' from start_tag
-                            # Match start tag with attributes
-                            start_tag_pattern = (
-                                rf"<{re.escape(start_tag[1:-1])}(\s.*?)?>"
-                            )
-
-                        match = re.search(start_tag_pattern, content)
-                        if match:
-                            attr_content = (
-                                match.group(1) if match.group(1) else ""
-                            )  # Ensure it's not None
-                            attributes = extract_attributes(
-                                attr_content
-                            )  # Extract attributes safely
-
-                            # Capture everything before and after the matched tag
-                            before_tag = content[
-                                : match.start()
-                            ]  # Content before opening tag
-                            after_tag = content[
-                                match.end() :
-                            ]  # Content after opening tag
-
-                            # Remove the start tag and after from the currently handling text block
-                            content_blocks[-1]["content"] = content_blocks[-1][
-                                "content"
-                            ].replace(match.group(0) + after_tag, "")
-
-                            if before_tag:
-                                content_blocks[-1]["content"] = before_tag
-
-                            if not content_blocks[-1]["content"]:
-                                content_blocks.pop()
-
-                            # Append the new block
-                            content_blocks.append(
-                                {
-                                    "type": content_type,
-                                    "start_tag": start_tag,
-                                    "end_tag": end_tag,
-                                    "attributes": attributes,
-                                    "content": "",
-                                    "started_at": time.time(),
-                                }
-                            )
-
-                            if after_tag:
-                                content_blocks[-1]["content"] = after_tag
-                                tag_content_handler(
-                                    content_type, tags, after_tag, content_blocks
-                                )
-
-                            break
-                elif content_blocks[-1]["type"] == content_type:
-                    start_tag = content_blocks[-1]["start_tag"]
-                    end_tag = content_blocks[-1]["end_tag"]
-
-                    if end_tag.startswith("<") and end_tag.endswith(">"):
-                        # Match end tag e.g., </tag>
-                        end_tag_pattern = rf"{re.escape(end_tag)}"
-                    else:
-                        # Handle cases where end_tag is just a tag name
-                        end_tag_pattern = rf"{re.escape(end_tag)}"
-
-                    # Check if the content has the end tag
-                    if re.search(end_tag_pattern, content):
-                        end_flag = True
-
-                        block_content = content_blocks[-1]["content"]
-                        # Strip start and end tags from the content
-                        start_tag_pattern = rf"<{re.escape(start_tag)}(.*?)>"
-                        block_content = re.sub(
-                            start_tag_pattern, "", block_content
-                        ).strip()
-
-                        end_tag_regex = re.compile(end_tag_pattern, re.DOTALL)
-                        split_content = end_tag_regex.split(block_content, maxsplit=1)
-
-                        # Content inside the tag
-                        block_content = (
-                            split_content[0].strip() if split_content else ""
-                        )
-
-                        # Leftover content (everything after `</tag>`)
-                        leftover_content = (
-                            split_content[1].strip() if len(split_content) > 1 else ""
-                        )
-
-                        if block_content:
-                            content_blocks[-1]["content"] = block_content
-                            content_blocks[-1]["ended_at"] = time.time()
-                            content_blocks[-1]["duration"] = int(
-                                content_blocks[-1]["ended_at"]
-                                - content_blocks[-1]["started_at"]
-                            )
-
-                            # Reset the content_blocks by appending a new text block
-                            if content_type != "code_interpreter":
-                                if leftover_content:
-
-                                    content_blocks.append(
-                                        {
-                                            "type": "text",
-                                            "content": leftover_content,
-                                        }
-                                    )
-                                else:
-                                    content_blocks.append(
-                                        {
-                                            "type": "text",
-                                            "content": "",
-                                        }
-                                    )
-
-                        else:
-                            # Remove the block if content is empty
-                            content_blocks.pop()
-
-                            if leftover_content:
-                                content_blocks.append(
-                                    {
-                                        "type": "text",
-                                        "content": leftover_content,
-                                    }
-                                )
-                            else:
-                                content_blocks.append(
-                                    {
-                                        "type": "text",
-                                        "content": "",
-                                    }
-                                )
-
-                        # Clean processed content
-                        start_tag_pattern = rf"{re.escape(start_tag)}"
-                        if start_tag.startswith("<") and start_tag.endswith(">"):
-                            # Match start tag e.g., <tag> or <tag attr="value">
-                            # remove both '<' and '>' from start_tag
-                            # Match start tag with attributes
-                            start_tag_pattern = (
-                                rf"<{re.escape(start_tag[1:-1])}(\s.*?)?>"
-                            )
-
-                        content = re.sub(
-                            rf"{start_tag_pattern}(.|\n)*?{re.escape(end_tag)}",
-                            "",
-                            content,
-                            flags=re.DOTALL,
-                        )
-
-                return content, content_blocks, end_flag
-
             message = Chats.get_message_by_id_and_message_id(
                 metadata["chat_id"], metadata["message_id"]
             )
@@ -1814,6 +1516,23 @@ async def process_chat_response(
 
             solution_tags = [("<|begin_of_solution|>", "<|end_of_solution|>")]
 
+            content_parser = ContentBlockParser(
+                [
+                    (content_type, tags)
+                    for content_type, tags, enabled in (
+                        ("reasoning", reasoning_tags, DETECT_REASONING),
+                        (
+                            "code_interpreter",
+                            code_interpreter_tags,
+                            DETECT_CODE_INTERPRETER,
+                        ),
+                        ("solution", solution_tags, DETECT_SOLUTION),
+                    )
+                    if enabled
+                ],
+                content,
+            )
+
             try:
                 for event in events:
                     await event_emitter(
@@ -1833,10 +1552,8 @@ async def process_chat_response(
                     )
 
                 async def stream_body_handler(response, form_data):
-                    nonlocal content
-                    nonlocal content_blocks
-
                     response_tool_calls = []
+                    content_serializer = ContentBlockSerializer()
 
                     delta_count = 0
                     delta_chunk_size = max(
@@ -1863,7 +1580,7 @@ async def process_chat_response(
                         data = data[len("data:") :].strip()
 
                         try:
-                            data = json.loads(data)
+                            data = json_loads(data)
 
                             data, _ = await process_filter_functions(
                                 request=request,
@@ -2001,7 +1718,7 @@ async def process_chat_response(
                                         reasoning_block["content"] += reasoning_content
 
                                         data = {
-                                            "content": serialize_content_blocks(
+                                            "content": content_serializer.serialize(
                                                 content_blocks
                                             )
                                         }
@@ -2030,51 +1747,9 @@ async def process_chat_response(
                                                 }
                                             )
 
-                                        content = f"{content}{value}"
-                                        if not content_blocks:
-                                            content_blocks.append(
-                                                {
-                                                    "type": "text",
-                                                    "content": "",
-                                                }
-                                            )
-
-                                        content_blocks[-1]["content"] = (
-                                            content_blocks[-1]["content"] + value
-                                        )
-
-                                        if DETECT_REASONING:
-                                            content, content_blocks, _ = (
-                                                tag_content_handler(
-                                                    "reasoning",
-                                                    reasoning_tags,
-                                                    content,
-                                                    content_blocks,
-                                                )
-                                            )
-
-                                        if DETECT_CODE_INTERPRETER:
-                                            content, content_blocks, end = (
-                                                tag_content_handler(
-                                                    "code_interpreter",
-                                                    code_interpreter_tags,
-                                                    content,
-                                                    content_blocks,
-                                                )
-                                            )
-
-                                            if end:
-                                                break
-
-                                        if DETECT_SOLUTION:
-                                            content, content_blocks, _ = (
-                                                tag_content_handler(
-                                                    "solution",
-                                                    solution_tags,
-                                                    content,
-                                                    content_blocks,
-                                                )
-                                            )
+                                        if content_parser.feed(content_blocks, value):
+                                            # the code interpreter runs before the response goes on
+                                            break
 
                                         if ENABLE_REALTIME_CHAT_SAVE:
                                             # Save message in the database
@@ -2082,14 +1757,14 @@ async def process_chat_response(
                                                 metadata["chat_id"],
                                                 metadata["message_id"],
                                                 {
-                                                    "content": serialize_content_blocks(
+                                                    "content": content_serializer.serialize(
                                                         content_blocks
                                                     ),
                                                 },
                                             )
                                         else:
                                             data = {
-                                                "content": serialize_content_blocks(
+                                                "content": content_serializer.serialize(
                                                     content_blocks
                                                 ),
                                             }
@@ -2523,10 +2198,10 @@ async def process_chat_response(
                         post_webhook(
                             request.app.state.WEBUI_NAME,
                             webhook_url,
-                            f"{title} - {request.app.state.config.WEBUI_URL}/c/{metadata['chat_id']}\n\n{content}",
+                            f"{title} - {request.app.state.config.WEBUI_URL}/c/{metadata['chat_id']}\n\n{content_parser.content}",
                             {
                                 "action": "chat",
-                                "message": content,
+                                "message": content_parser.content,
                                 "title": title,
                                 "url": f"{request.app.state.config.WEBUI_URL}/c/{metadata['chat_id']}",
                             },
@@ -2539,7 +2214,9 @@ async def process_chat_response(
                     }
                 )
 
-                await background_tasks_handler()
+                await BACKGROUND_TASK_QUEUE.submit(
+                    background_tasks_handler, name="chat_tasks"
+                )
             except asyncio.CancelledError:
                 log.warning("Task was cancelled!")
                 await event_emitter({"type": "task-cancelled"})
@@ -2581,7 +2258,7 @@ async def process_chat_response(
                 )
 
                 if event:
-                    yield wrap_item(json.dumps(event))
+                    yield wrap_item(json_dumps(event))
 
             async for data in original_generator:
                 data, _ = await process_filter_functions(
@@ -0,0 +1,152 @@
+import asyncio
+import hashlib
+import json
+import logging
+import time
+from collections import defaultdict
+from itertools import count
+from typing import Awaitable, Callable, Optional
+
+from open_webui.env import (
+    MODELS_CACHE_TTL,
+    REDIS_CLUSTER,
+    REDIS_KEY_PREFIX,
+    REDIS_SENTINEL_HOSTS,
+    REDIS_SENTINEL_PORT,
+    REDIS_URL,
+    SRC_LOG_LEVELS,
+)
+from open_webui.utils.redis import get_redis_connection, get_sentinels_from_env
+
+log = logging.getLogger(__name__)
+log.setLevel(SRC_LOG_LEVELS["MODELS"])
+
+
+def get_catalog_key(*values) -> str:
+    """Stable hash of the JSON-serializable settings a cached model list depends on."""
+    return hashlib.sha256(
+        json.dumps(values, sort_keys=True, default=str).encode()
+    ).hexdigest()
+
+
+####################################
+# Revisions
+#
+# Custom models and functions live in the database, so the catalog cannot key
+# on them directly. Their table writes bump a revision instead: locally, and
+# in Redis when configured so every worker sees the change.
+####################################
+
+_revisions: dict[str, int] = defaultdict(int)
+_redis = None
+
+
+def _get_redis():
+    global _redis
+    if _redis is None and REDIS_URL:
+        _redis = get_redis_connection(
+            redis_url=REDIS_URL,
+            redis_sentinels=get_sentinels_from_env(
+                REDIS_SENTINEL_HOSTS, REDIS_SENTINEL_PORT
+            ),
+            redis_cluster=REDIS_CLUSTER,
+            decode_responses=True,
+        )
+    return _redis
+
+
+def bump_catalog_revision(name: str):
+    _revisions[name] += 1
+
+    redis = _get_redis()
+    if redis:
+        try:
+            redis.incr(f"{REDIS_KEY_PREFIX}:model_catalog:{name}")
+        except Exception as e:
+            log.warning(f"Failed to publish {name} catalog revision: {e}")
+
+
+def get_catalog_revision(name: str) -> str:
+    revision = str(_revisions[name])
+
+    redis = _get_redis()
+    if redis:
+        try:
+            revision += f":{redis.get(f'{REDIS_KEY_PREFIX}:model_catalog:{name}')}"
+        except Exception as e:
+            log.warning(f"Failed to read {name} catalog revision: {e}")
+    return revision
+
+
+class ModelCatalog:
+    """
+    Process-wide cache of the model list.
+
+    Each source (function pipes, OpenAI, Ollama) is cached under a key that
+    describes its inputs and refetched when the key changes. Once an entry is
+    older than ``ttl`` it is still served while a background task refreshes
+    it, so listing models never waits on upstream backends after the first
+    fetch. The merged list is cached separately and rebuilt only when a source
+    generation or one of the merge inputs changes.
+    """
+
+    def __init__(self, ttl: Optional[int] = MODELS_CACHE_TTL):
+        self.ttl = ttl
+        self.sources: dict[str, dict] = {}
+        self.models: Optional[list[dict]] = None
+        self.models_key: Optional[tuple] = None
+
+        self._generations = count(1)
+        self._locks = defaultdict(asyncio.Lock)
+        self._tasks: dict[str, asyncio.Task] = {}
+
+    async def _fetch(
+        self, name: str, key: str, fetch: Callable[[], Awaitable[list]]
+    ) -> dict:
+        models = await fetch()
+        entry = {
+            "key": key,
+            "models": models,
+            "fetched_at": time.monotonic(),
+            "generation": next(self._generations),
+        }
+        self.sources[name] = entry
+        log.debug(f"Fetched {len(models)} {name} models")
+        return entry
+
+    async def _refresh(self, name: str, key: str, fetch):
+        try:
+            async with self._locks[name]:
+                # skip if the inputs changed and a newer entry replaced ours
+                entry = self.sources.get(name)
+                if entry is not None and entry["key"] == key:
+                    await self._fetch(name, key, fetch)
+        except Exception as e:
+            log.warning(f"Background refresh of {name} models failed: {e}")
+
+    async def get_source(
+        self,
+        name: str,
+        key: str,
+        fetch: Callable[[], Awaitable[list]],
+        refresh: bool = False,
+        background: bool = True,
+    ) -> dict:
+        entry = self.sources.get(name)
+
+        if refresh or entry is None or entry["key"] != key:
+            async with self._locks[name]:
+                # another request may have fetched it while we waited
+                entry = self.sources.get(name)
+                if refresh or entry is None or entry["key"] != key:
+                    entry = await self._fetch(name, key, fetch)
+        elif (
+            background
+            and self.ttl is not None
+            and time.monotonic() - entry["fetched_at"] > self.ttl
+        ):
+            task = self._tasks.get(name)
+            if task is None or task.done():
+                self._tasks[name] = asyncio.create_task(self._refresh(name, key, fetch))
+
+        return entry
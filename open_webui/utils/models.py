@@ -17,8 +17,10 @@ from open_webui.models.models import Models
 from open_webui.utils.plugin import (
     load_function_module_by_id,
     get_function_module_from_cache,
+    is_requirements_ready,
 )
 from open_webui.utils.access_control import has_access
+from open_webui.utils.model_catalog import get_catalog_key, get_catalog_revision
 
 
 from open_webui.config import (
@@ -34,8 +36,13 @@ log = logging.getLogger(__name__)
 log.setLevel(SRC_LOG_LEVELS["MAIN"])
 
 
-async def fetch_ollama_models(request: Request, user: UserModel = None):
-    raw_ollama_models = await ollama.get_all_models(request, user=user)
+async def fetch_ollama_models(
+    request: Request, user: UserModel = None, refresh: bool = False
+):
+    # cache_read=False bypasses the router's cached model list
+    raw_ollama_models = await ollama.get_all_models(
+        request, user=user, cache_read=not refresh
+    )
     return [
         {
             "id": model["model"],
@@ -51,8 +58,12 @@ async def fetch_ollama_models(request: Request, user: UserModel = None):
     ]
 
 
-async def fetch_openai_models(request: Request, user: UserModel = None):
-    openai_response = await openai.get_all_models(request, user=user)
+async def fetch_openai_models(
+    request: Request, user: UserModel = None, refresh: bool = False
+):
+    openai_response = await openai.get_all_models(
+        request, user=user, cache_read=not refresh
+    )
     return openai_response["data"]
 
 
@@ -76,184 +87,59 @@ async def get_all_base_models(request: Request, user: UserModel = None):
     return function_models + openai_models + ollama_models
 
 
-async def get_all_models(request, refresh: bool = False, user: UserModel = None):
-    if (
-        request.app.state.MODELS
-        and request.app.state.BASE_MODELS
-        and (request.app.state.config.ENABLE_BASE_MODELS_CACHE and not refresh)
-    ):
-        base_models = request.app.state.BASE_MODELS
-    else:
-        base_models = await get_all_base_models(request, user=user)
-        request.app.state.BASE_MODELS = base_models
-
-    # deep copy the base models to avoid modifying the original list
-    models = [model.copy() for model in base_models]
-
-    # If there are no models, return an empty list
-    if len(models) == 0:
-        return []
-
-    # Add arena models
-    if request.app.state.config.ENABLE_EVALUATION_ARENA_MODELS:
-        arena_models = []
-        if len(request.app.state.config.EVALUATION_ARENA_MODELS) > 0:
-            arena_models = [
-                {
-                    "id": model["id"],
-                    "name": model["name"],
-                    "info": {
-                        "meta": model["meta"],
-                    },
-                    "object": "model",
-                    "created": int(time.time()),
-                    "owned_by": "arena",
-                    "arena": True,
-                }
-                for model in request.app.state.config.EVALUATION_ARENA_MODELS
-            ]
-        else:
-            # Add default arena model
-            arena_models = [
-                {
-                    "id": DEFAULT_ARENA_MODEL["id"],
-                    "name": DEFAULT_ARENA_MODEL["name"],
-                    "info": {
-                        "meta": DEFAULT_ARENA_MODEL["meta"],
-                    },
-                    "object": "model",
-                    "created": int(time.time()),
-                    "owned_by": "arena",
-                    "arena": True,
-                }
-            ]
-        models = models + arena_models
-
-    global_action_ids = [
-        function.id for function in Functions.get_global_action_functions()
-    ]
-    enabled_action_ids = [
-        function.id
-        for function in Functions.get_functions_by_type("action", active_only=True)
-    ]
+def get_arena_models(request: Request) -> list[dict]:
+    if len(request.app.state.config.EVALUATION_ARENA_MODELS) > 0:
+        return [
+            {
+                "id": model["id"],
+                "name": model["name"],
+                "info": {
+                    "meta": model["meta"],
+                },
+                "object": "model",
+                "created": int(time.time()),
+                "owned_by": "arena",
+                "arena": True,
+            }
+            for model in request.app.state.config.EVALUATION_ARENA_MODELS
+        ]
 
-    global_filter_ids = [
-        function.id for function in Functions.get_global_filter_functions()
-    ]
-    enabled_filter_ids = [
-        function.id
-        for function in Functions.get_functions_by_type("filter", active_only=True)
+    # Add default arena model
+    return [
+        {
+            "id": DEFAULT_ARENA_MODEL["id"],
+            "name": DEFAULT_ARENA_MODEL["name"],
+            "info": {
+                "meta": DEFAULT_ARENA_MODEL["meta"],
+            },
+            "object": "model",
+            "created": int(time.time()),
+            "owned_by": "arena",
+            "arena": True,
+        }
     ]
 
-    custom_models = Models.get_all_models()
-    for custom_model in custom_models:
-        if custom_model.base_model_id is None:
-            # Applied directly to a base model
-            for model in models:
-                if custom_model.id == model["id"] or (
-                    model.get("owned_by") == "ollama"
-                    and custom_model.id
-                    == model["id"].split(":")[
-                        0
-                    ]  # Ollama may return model ids in different formats (e.g., 'llama3' vs. 'llama3:7b')
-                ):
-                    if custom_model.is_active:
-                        model["name"] = custom_model.name
-                        model["info"] = custom_model.model_dump()
-
-                        # Set action_ids and filter_ids
-                        action_ids = []
-                        filter_ids = []
-
-                        if "info" in model and "meta" in model["info"]:
-                            action_ids.extend(
-                                model["info"]["meta"].get("actionIds", [])
-                            )
-                            filter_ids.extend(
-                                model["info"]["meta"].get("filterIds", [])
-                            )
-
-                        model["action_ids"] = action_ids
-                        model["filter_ids"] = filter_ids
-                    else:
-                        models.remove(model)
-
-        elif custom_model.is_active and (
-            custom_model.id not in [model["id"] for model in models]
-        ):
-            owned_by = "openai"
-            pipe = None
-
-            action_ids = []
-            filter_ids = []
-
-            for model in models:
-                if (
-                    custom_model.base_model_id == model["id"]
-                    or custom_model.base_model_id == model["id"].split(":")[0]
-                ):
-                    owned_by = model.get("owned_by", "unknown owner")
-                    if "pipe" in model:
-                        pipe = model["pipe"]
-                    break
-
-            if custom_model.meta:
-                meta = custom_model.meta.model_dump()
-
-                if "actionIds" in meta:
-                    action_ids.extend(meta["actionIds"])
-
-                if "filterIds" in meta:
-                    filter_ids.extend(meta["filterIds"])
-
-            models.append(
-                {
-                    "id": f"{custom_model.id}",
-                    "name": custom_model.name,
-                    "object": "model",
-                    "created": custom_model.created_at,
-                    "owned_by": owned_by,
-                    "info": custom_model.model_dump(),
-                    "preset": True,
-                    **({"pipe": pipe} if pipe is not None else {}),
-                    "action_ids": action_ids,
-                    "filter_ids": filter_ids,
-                }
-            )
 
-    # Process action_ids to get the actions
-    def get_action_items_from_module(function, module):
-        actions = []
-        if hasattr(module, "actions"):
-            actions = module.actions
-            return [
-                {
-                    "id": f"{function.id}.{action['id']}",
-                    "name": action.get("name", f"{function.name} ({action['id']})"),
-                    "description": function.meta.description,
-                    "icon": action.get(
-                        "icon_url",
-                        function.meta.manifest.get("icon_url", None)
-                        or getattr(module, "icon_url", None)
-                        or getattr(module, "icon", None),
-                    ),
-                }
-                for action in actions
-            ]
-        else:
-            return [
-                {
-                    "id": function.id,
-                    "name": function.name,
-                    "description": function.meta.description,
-                    "icon": function.meta.manifest.get("icon_url", None)
+# Process action_ids to get the actions
+def get_action_items_from_module(function, module):
+    actions = []
+    if hasattr(module, "actions"):
+        actions = module.actions
+        return [
+            {
+                "id": f"{function.id}.{action['id']}",
+                "name": action.get("name", f"{function.name} ({action['id']})"),
+                "description": function.meta.description,
+                "icon": action.get(
+                    "icon_url",
+                    function.meta.manifest.get("icon_url", None)
                     or getattr(module, "icon_url", None)
                     or getattr(module, "icon", None),
-                }
-            ]
-
-    # Process filter_ids to get the filters
-    def get_filter_items_from_module(function, module):
+                ),
+            }
+            for action in actions
+        ]
+    else:
         return [
             {
                 "id": function.id,
@@ -265,52 +151,236 @@ async def get_all_models(request, refresh: bool = False, user: UserModel = None)
             }
         ]
 
-    def get_function_module_by_id(function_id):
-        function_module, _, _ = get_function_module_from_cache(request, function_id)
-        return function_module
 
+# Process filter_ids to get the filters
+def get_filter_items_from_module(function, module):
+    return [
+        {
+            "id": function.id,
+            "name": function.name,
+            "description": function.meta.description,
+            "icon": function.meta.manifest.get("icon_url", None)
+            or getattr(module, "icon_url", None)
+            or getattr(module, "icon", None),
+        }
+    ]
+
+
+def get_toggle_filter_items_from_module(function, module):
+    # only filters with a toggle are listed on the model
+    if getattr(module, "toggle", None):
+        return get_filter_items_from_module(function, module)
+    return []
+
+
+def build_models(request: Request, base_models: list[dict]) -> list[dict]:
+    # copy the base models, the cached source lists are shared between builds
+    models = [model.copy() for model in base_models]
+
+    # If there are no models, return an empty list
+    if len(models) == 0:
+        return []
+
+    # Add arena models
+    if request.app.state.config.ENABLE_EVALUATION_ARENA_MODELS:
+        models = models + get_arena_models(request)
+
+    # One query for every active function instead of one per lookup
+    functions = Functions.get_functions(active_only=True)
+    action_functions = {f.id: f for f in functions if f.type == "action"}
+    filter_functions = {f.id: f for f in functions if f.type == "filter"}
+    global_action_ids = [id for id, f in action_functions.items() if f.is_global]
+    global_filter_ids = [id for id, f in filter_functions.items() if f.is_global]
+
+    custom_models = Models.get_all_models()
+
+    # Custom models applied directly to a base model. Ollama may return model
+    # ids in different formats (e.g., 'llama3' vs. 'llama3:7b'), so its models
+    # are also indexed by their untagged name.
+    models_by_id = {}
     for model in models:
-        action_ids = [
-            action_id
-            for action_id in list(set(model.pop("action_ids", []) + global_action_ids))
-            if action_id in enabled_action_ids
-        ]
-        filter_ids = [
-            filter_id
-            for filter_id in list(set(model.pop("filter_ids", []) + global_filter_ids))
-            if filter_id in enabled_filter_ids
-        ]
+        models_by_id.setdefault(model["id"], []).append(model)
+        if model.get("owned_by") == "ollama" and ":" in model["id"]:
+            models_by_id.setdefault(model["id"].split(":")[0], []).append(model)
 
-        model["actions"] = []
-        for action_id in action_ids:
-            action_function = Functions.get_function_by_id(action_id)
-            if action_function is None:
-                raise Exception(f"Action not found: {action_id}")
-
-            function_module = get_function_module_by_id(action_id)
-            model["actions"].extend(
-                get_action_items_from_module(action_function, function_module)
-            )
+    removed = set()
+    for custom_model in custom_models:
+        if custom_model.base_model_id is not None:
+            continue
+
+        for model in models_by_id.get(custom_model.id, []):
+            if custom_model.is_active:
+                model["name"] = custom_model.name
+                model["info"] = custom_model.model_dump()
+
+                # Set action_ids and filter_ids
+                meta = model["info"].get("meta") or {}
+                model["action_ids"] = list(meta.get("actionIds", []))
+                model["filter_ids"] = list(meta.get("filterIds", []))
+            else:
+                removed.add(id(model))
+
+    if removed:
+        models = [model for model in models if id(model) not in removed]
+
+    # Custom models built on top of a base model. The first model whose id or
+    # untagged id matches is the base, so only the first one is indexed.
+    model_ids = set()
+    base_models_by_id = {}
+
+    def index_base_model(model):
+        model_ids.add(model["id"])
+        base_models_by_id.setdefault(model["id"], model)
+        base_models_by_id.setdefault(model["id"].split(":")[0], model)
 
-        model["filters"] = []
-        for filter_id in filter_ids:
-            filter_function = Functions.get_function_by_id(filter_id)
-            if filter_function is None:
-                raise Exception(f"Filter not found: {filter_id}")
+    for model in models:
+        index_base_model(model)
 
-            function_module = get_function_module_by_id(filter_id)
+    for custom_model in custom_models:
+        if (
+            custom_model.base_model_id is None
+            or not custom_model.is_active
+            or custom_model.id in model_ids
+        ):
+            continue
 
-            if getattr(function_module, "toggle", None):
-                model["filters"].extend(
-                    get_filter_items_from_module(filter_function, function_module)
+        owned_by = "openai"
+        pipe = None
+
+        base_model = base_models_by_id.get(custom_model.base_model_id)
+        if base_model is not None:
+            owned_by = base_model.get("owned_by", "unknown owner")
+            if "pipe" in base_model:
+                pipe = base_model["pipe"]
+
+        action_ids = []
+        filter_ids = []
+
+        if custom_model.meta:
+            meta = custom_model.meta.model_dump()
+
+            if "actionIds" in meta:
+                action_ids.extend(meta["actionIds"])
+
+            if "filterIds" in meta:
+                filter_ids.extend(meta["filterIds"])
+
+        model = {
+            "id": f"{custom_model.id}",
+            "name": custom_model.name,
+            "object": "model",
+            "created": custom_model.created_at,
+            "owned_by": owned_by,
+            "info": custom_model.model_dump(),
+            "preset": True,
+            **({"pipe": pipe} if pipe is not None else {}),
+            "action_ids": action_ids,
+            "filter_ids": filter_ids,
+        }
+        models.append(model)
+        index_base_model(model)
+
+    # Resolve each action and filter function once, not once per model
+    function_items = {}
+
+    def get_function_items(function_id, function, get_items):
+        if not is_requirements_ready("function", function_id):
+            return []
+        if function_id not in function_items:
+            function_module, _, _ = get_function_module_from_cache(request, function_id)
+            function_items[function_id] = get_items(function, function_module)
+        return function_items[function_id]
+
+    for model in models:
+        model["actions"] = []
+        for action_id in dict.fromkeys(model.pop("action_ids", []) + global_action_ids):
+            if action_id in action_functions:
+                model["actions"].extend(
+                    get_function_items(
+                        action_id,
+                        action_functions[action_id],
+                        get_action_items_from_module,
+                    )
                 )
 
-    log.debug(f"get_all_models() returned {len(models)} models")
+        model["filters"] = []
+        for filter_id in dict.fromkeys(model.pop("filter_ids", []) + global_filter_ids):
+            if filter_id in filter_functions:
+                model["filters"].extend(
+                    get_function_items(
+                        filter_id,
+                        filter_functions[filter_id],
+                        get_toggle_filter_items_from_module,
+                    )
+                )
 
-    request.app.state.MODELS = {model["id"]: model for model in models}
     return models
 
 
+async def get_all_models(request, refresh: bool = False, user: UserModel = None):
+    """
+    Merged model list, served from the process-wide model catalog.
+
+    Upstream lists are cached per connection settings and refreshed in the
+    background once older than MODELS_CACHE_TTL (never, with
+    ENABLE_BASE_MODELS_CACHE). The merged list is rebuilt only when a source,
+    the custom models, the functions or the arena settings change, or when
+    ``refresh`` is set.
+    """
+    config = request.app.state.config
+    catalog = request.app.state.MODEL_CATALOG
+
+    sources = [
+        (
+            "function",
+            get_catalog_revision("functions"),
+            lambda: get_function_models(request),
+        ),
+        (
+            "openai",
+            openai.get_models_cache_key(openai.get_all_models, request, user=user),
+            lambda: fetch_openai_models(request, user, refresh=refresh),
+        ),
+        (
+            "ollama",
+            ollama.get_models_cache_key(ollama.get_all_models, request, user=user),
+            lambda: fetch_ollama_models(request, user, refresh=refresh),
+        ),
+    ]
+    entries = await asyncio.gather(
+        *[
+            catalog.get_source(
+                name,
+                key,
+                fetch,
+                refresh=refresh,
+                background=not config.ENABLE_BASE_MODELS_CACHE,
+            )
+            for name, key, fetch in sources
+        ]
+    )
+
+    models_key = (
+        tuple(entry["generation"] for entry in entries),
+        get_catalog_revision("models"),
+        get_catalog_revision("functions"),
+        get_catalog_key(
+            config.ENABLE_EVALUATION_ARENA_MODELS, config.EVALUATION_ARENA_MODELS
+        ),
+    )
+    if refresh or catalog.models is None or catalog.models_key != models_key:
+        catalog.models = build_models(
+            request, [model for entry in entries for model in entry["models"]]
+        )
+        catalog.models_key = models_key
+        log.debug(f"get_all_models() rebuilt {len(catalog.models)} models")
+
+        request.app.state.MODELS = {model["id"]: model for model in catalog.models}
+
+    # callers annotate the returned models, keep the cached ones intact
+    return [model.copy() for model in catalog.models]
+
+
 def check_model_access(user, model):
     if model.get("arena"):
         if not has_access(
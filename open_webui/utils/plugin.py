@@ -6,14 +6,33 @@ from importlib import util
 import types
 import tempfile
 import logging
-
-from open_webui.env import SRC_LOG_LEVELS, PIP_OPTIONS, PIP_PACKAGE_INDEX_OPTIONS
+import hashlib
+import json
+import threading
+import time
+import importlib.metadata
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+from packaging.requirements import InvalidRequirement, Requirement
+
+from open_webui.env import (
+    SRC_LOG_LEVELS,
+    PIP_OPTIONS,
+    PIP_PACKAGE_INDEX_OPTIONS,
+    REDIS_KEY_PREFIX,
+    REQUIREMENTS_CACHE_DIR,
+    REQUIREMENTS_INSTALL_PARALLELISM,
+)
 from open_webui.models.functions import Functions
 from open_webui.models.tools import Tools
+from open_webui.utils.model_catalog import bump_catalog_revision
 
 log = logging.getLogger(__name__)
 log.setLevel(SRC_LOG_LEVELS["MAIN"])
 
+REDIS_FUNCTIONS_PUBSUB_CHANNEL = f"{REDIS_KEY_PREFIX}:functions:commands"
+
 
 def extract_frontmatter(content):
     """
@@ -71,6 +90,8 @@ def replace_imports(content):
 def load_tool_module_by_id(tool_id, content=None):
 
     if content is None:
+        check_requirements_ready("tool", tool_id)
+
         tool = Tools.get_tool_by_id(tool_id)
         if not tool:
             raise Exception(f"Toolkit not found: {tool_id}")
@@ -166,12 +187,39 @@ def load_function_module_by_id(function_id: str, content: str | None = None):
         os.unlink(temp_file.name)
 
 
+def get_content_version(content: str) -> str:
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+def cache_function_module(app, function_id: str, function_module, content=None):
+    app.state.FUNCTIONS[function_id] = function_module
+    app.state.FUNCTION_VERSIONS[function_id] = (
+        get_content_version(content) if content is not None else None
+    )
+
+
 def get_function_module_from_cache(request, function_id, load_from_db=True):
-    if load_from_db:
-        # Always load from the database by default
-        # This is useful for hooks like "inlet" or "outlet" where the content might change
-        # and we want to ensure the latest content is used.
+    """
+    Compiled module of a function, reused until invalidate_function_module()
+    drops it, so resolving a cached function (e.g. the inlet and outlet
+    filters of every chat request) is a dict lookup.
+
+    On a miss, load_from_db loads the current content from the database and
+    installs its requirements; otherwise the module is loaded as stored.
+    """
+    if not hasattr(request.app.state, "FUNCTIONS"):
+        request.app.state.FUNCTIONS = {}
 
+    if not hasattr(request.app.state, "FUNCTION_VERSIONS"):
+        request.app.state.FUNCTION_VERSIONS = {}
+
+    if function_id in request.app.state.FUNCTIONS:
+        return request.app.state.FUNCTIONS[function_id], None, None
+
+    check_requirements_ready("function", function_id)
+
+    content = None
+    if load_from_db:
         function = Functions.get_function_by_id(function_id)
         if not function:
             raise Exception(f"Function not found: {function_id}")
@@ -183,88 +231,314 @@ def get_function_module_from_cache(request, function_id, load_from_db=True):
             # Update the function content in the database
             Functions.update_function_by_id(function_id, {"content": content})
 
-        if (
-            hasattr(request.app.state, "FUNCTION_CONTENTS")
-            and function_id in request.app.state.FUNCTION_CONTENTS
-        ) and (
-            hasattr(request.app.state, "FUNCTIONS")
-            and function_id in request.app.state.FUNCTIONS
-        ):
-            if request.app.state.FUNCTION_CONTENTS[function_id] == content:
-                return request.app.state.FUNCTIONS[function_id], None, None
-
         function_module, function_type, frontmatter = load_function_module_by_id(
             function_id, content
         )
     else:
-        # Load from cache (e.g. "stream" hook)
-        # This is useful for performance reasons
-
-        if (
-            hasattr(request.app.state, "FUNCTIONS")
-            and function_id in request.app.state.FUNCTIONS
-        ):
-            return request.app.state.FUNCTIONS[function_id], None, None
-
         function_module, function_type, frontmatter = load_function_module_by_id(
             function_id
         )
 
-    if not hasattr(request.app.state, "FUNCTIONS"):
-        request.app.state.FUNCTIONS = {}
+    cache_function_module(request.app, function_id, function_module, content)
+    return function_module, function_type, frontmatter
 
-    if not hasattr(request.app.state, "FUNCTION_CONTENTS"):
-        request.app.state.FUNCTION_CONTENTS = {}
 
-    request.app.state.FUNCTIONS[function_id] = function_module
-    request.app.state.FUNCTION_CONTENTS[function_id] = content
+async def invalidate_function_module(
+    app,
+    function_id: Optional[str] = None,
+    version: Optional[str] = None,
+    publish: bool = True,
+):
+    """
+    Drop the cached module of a function (of every function when
+    ``function_id`` is None) unless it was compiled from ``version``, and
+    broadcast the invalidation to the other nodes over Redis.
+    """
+    for id in [function_id] if function_id else list(app.state.FUNCTIONS):
+        if version is None or app.state.FUNCTION_VERSIONS.get(id) != version:
+            app.state.FUNCTIONS.pop(id, None)
+            app.state.FUNCTION_VERSIONS.pop(id, None)
+
+    if publish and getattr(app.state, "redis", None) is not None:
+        try:
+            await app.state.redis.publish(
+                REDIS_FUNCTIONS_PUBSUB_CHANNEL,
+                json.dumps(
+                    {
+                        "action": "invalidate",
+                        "function_id": function_id,
+                        "version": version,
+                    }
+                ),
+            )
+        except Exception as e:
+            log.warning(f"Failed to broadcast function invalidation: {e}")
+
+
+async def redis_function_command_listener(app):
+    pubsub = app.state.redis.pubsub()
+    await pubsub.subscribe(REDIS_FUNCTIONS_PUBSUB_CHANNEL)
+
+    async for message in pubsub.listen():
+        if message["type"] != "message":
+            continue
+        try:
+            command = json.loads(message["data"])
+            if command.get("action") == "invalidate":
+                await invalidate_function_module(
+                    app,
+                    command.get("function_id"),
+                    command.get("version"),
+                    publish=False,
+                )
+        except Exception as e:
+            log.exception(f"Error handling function cache command: {e}")
+
+
+####################################
+# Requirements
+#
+# Frontmatter requirements of active functions and admin tools are installed
+# in the background at startup. A function or tool whose requirements are
+# still pending can't be loaded until they are installed, everything else is
+# available right away. Requirement sets already satisfied by the
+# environment, or installed before, skip pip entirely.
+####################################
+
+REQUIREMENTS_STATUS: dict[str, str] = {}
+
+
+class RequirementsNotReadyError(Exception):
+    """A function or tool was loaded while its requirements are being installed."""
+
+    def __init__(self, kind: str, id: str):
+        super().__init__(
+            f"The requirements of {kind} {id} are still being installed, try again shortly"
+        )
+        self.kind = kind
+        self.id = id
+
+
+_requirements_lock = threading.Lock()
+_installed_requirements: Optional[set[str]] = None
+
+
+def parse_requirements(requirements: str) -> list[str]:
+    return [req.strip() for req in requirements.split(",") if req.strip()]
+
+
+def get_requirements_key(req_list: list[str]) -> str:
+    return hashlib.sha256(
+        json.dumps([sys.executable, sorted(set(req_list))]).encode("utf-8")
+    ).hexdigest()
+
+
+def get_installed_requirements() -> set[str]:
+    global _installed_requirements
+    if _installed_requirements is None:
+        try:
+            with open(REQUIREMENTS_CACHE_DIR / "installed.json") as f:
+                _installed_requirements = set(json.load(f))
+        except Exception:
+            _installed_requirements = set()
+    return _installed_requirements
 
-    return function_module, function_type, frontmatter
+
+def mark_requirements_installed(req_list: list[str]):
+    installed = get_installed_requirements()
+    installed.add(get_requirements_key(req_list))
+    try:
+        REQUIREMENTS_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        with open(REQUIREMENTS_CACHE_DIR / "installed.json", "w") as f:
+            json.dump(sorted(installed), f)
+    except Exception as e:
+        log.warning(f"Failed to save installed requirements: {e}")
+
+
+def is_requirement_installed(requirement: str) -> Optional[bool]:
+    """
+    Whether an installed distribution satisfies the requirement, None when
+    that can't be told without pip (e.g. URL or VCS requirements).
+    """
+    try:
+        req = Requirement(requirement)
+    except InvalidRequirement:
+        return None
+
+    if req.marker is not None and not req.marker.evaluate():
+        return True
+    if req.url:
+        return None
+
+    try:
+        version = importlib.metadata.version(req.name)
+    except importlib.metadata.PackageNotFoundError:
+        return False
+    return req.specifier.contains(version, prereleases=True)
+
+
+def are_requirements_installed(req_list: list[str]) -> bool:
+    # requirements that can't be checked are trusted once pip installed them
+    installed = get_requirements_key(req_list) in get_installed_requirements()
+    for requirement in req_list:
+        status = is_requirement_installed(requirement)
+        if status is False or (status is None and not installed):
+            return False
+    return True
+
+
+def is_requirements_ready(kind: str, id: str) -> bool:
+    return REQUIREMENTS_STATUS.get(f"{kind}:{id}") not in ("pending", "installing")
+
+
+def check_requirements_ready(kind: str, id: str):
+    if not is_requirements_ready(kind, id):
+        raise RequirementsNotReadyError(kind, id)
+
+
+def pip_install(req_list: list[str], find_links: bool = False):
+    wheel_dir = REQUIREMENTS_CACHE_DIR / "wheels"
+    subprocess.check_call(
+        [sys.executable, "-m", "pip", "install"]
+        + PIP_OPTIONS
+        + (["--find-links", str(wheel_dir)] if find_links else [])
+        + req_list
+        + PIP_PACKAGE_INDEX_OPTIONS
+    )
+
+
+def build_requirement_wheels(req_list: list[str]):
+    # downloads and builds happen in parallel, the wheels land in a shared
+    # directory the serialized installs then pick them up from
+    wheel_dir = REQUIREMENTS_CACHE_DIR / "wheels"
+    try:
+        subprocess.check_call(
+            [sys.executable, "-m", "pip", "wheel", "--wheel-dir", str(wheel_dir)]
+            + req_list
+            + PIP_PACKAGE_INDEX_OPTIONS,
+            stdout=subprocess.DEVNULL,
+        )
+    except Exception as e:
+        log.warning(f"Failed to build wheels for {' '.join(req_list)}: {e}")
 
 
 def install_frontmatter_requirements(requirements: str):
-    if requirements:
+    req_list = parse_requirements(requirements)
+    if not req_list:
+        log.info("No requirements found in frontmatter.")
+        return
+
+    if are_requirements_installed(req_list):
+        log.debug(f"Requirements already installed: {' '.join(req_list)}")
+        return
+
+    # concurrent pip installs into the same environment race each other
+    with _requirements_lock:
         try:
-            req_list = [req.strip() for req in requirements.split(",")]
             log.info(f"Installing requirements: {' '.join(req_list)}")
-            subprocess.check_call(
-                [sys.executable, "-m", "pip", "install"]
-                + PIP_OPTIONS
-                + req_list
-                + PIP_PACKAGE_INDEX_OPTIONS
+            pip_install(
+                req_list, find_links=(REQUIREMENTS_CACHE_DIR / "wheels").exists()
             )
         except Exception as e:
             log.error(f"Error installing packages: {' '.join(req_list)}")
             raise e
-
-    else:
-        log.info("No requirements found in frontmatter.")
+        mark_requirements_installed(req_list)
 
 
-def install_tool_and_function_dependencies():
+def get_tool_and_function_requirements() -> dict[str, list[str]]:
     """
-    Install all dependencies for all admin tools and active functions.
-
-    By first collecting all dependencies from the frontmatter of each tool and function,
-    and then installing them using pip. Duplicates or similar version specifications are
-    handled by pip as much as possible.
+    Requirements of all active functions and admin tools that are not
+    installed yet, keyed by "function:<id>" or "tool:<id>". Those functions and
+    tools are marked pending until install_requirements() has run.
     """
-    function_list = Functions.get_functions(active_only=True)
-    tool_list = Tools.get_tools()
-
-    all_dependencies = ""
+    requirements = {}
     try:
-        for function in function_list:
+        for function in Functions.get_functions(active_only=True):
             frontmatter = extract_frontmatter(replace_imports(function.content))
             if dependencies := frontmatter.get("requirements"):
-                all_dependencies += f"{dependencies}, "
-        for tool in tool_list:
+                requirements[f"function:{function.id}"] = parse_requirements(
+                    dependencies
+                )
+        for tool in Tools.get_tools():
             # Only install requirements for admin tools
             if tool.user.role == "admin":
                 frontmatter = extract_frontmatter(replace_imports(tool.content))
                 if dependencies := frontmatter.get("requirements"):
-                    all_dependencies += f"{dependencies}, "
-
-        install_frontmatter_requirements(all_dependencies.strip(", "))
+                    requirements[f"tool:{tool.id}"] = parse_requirements(dependencies)
     except Exception as e:
-        log.error(f"Error installing requirements: {e}")
+        log.error(f"Error collecting requirements: {e}")
+
+    missing = {}
+    for owner, req_list in requirements.items():
+        if req_list and not are_requirements_installed(req_list):
+            missing[owner] = req_list
+            REQUIREMENTS_STATUS[owner] = "pending"
+        else:
+            REQUIREMENTS_STATUS[owner] = "installed"
+
+    log.info(
+        f"{len(requirements) - len(missing)} of {len(requirements)} functions and tools have their requirements installed"
+    )
+    return missing
+
+
+def install_requirements(requirements: dict[str, list[str]]):
+    """
+    Install the requirements returned by get_tool_and_function_requirements():
+    wheels for every distinct requirement set are built in parallel, then
+    installed together in one pip run so the resolver sees all of them. When
+    that fails each set is installed on its own, so one broken requirement
+    only holds back the functions and tools that need it.
+    """
+    if not requirements:
+        return
+
+    start = time.perf_counter()
+    req_sets = {}
+    for owner, req_list in requirements.items():
+        req_sets.setdefault(tuple(req_list), []).append(owner)
+        REQUIREMENTS_STATUS[owner] = "installing"
+
+    (REQUIREMENTS_CACHE_DIR / "wheels").mkdir(parents=True, exist_ok=True)
+    with ThreadPoolExecutor(
+        max_workers=max(1, REQUIREMENTS_INSTALL_PARALLELISM)
+    ) as executor:
+        list(executor.map(build_requirement_wheels, map(list, req_sets)))
+
+    all_requirements = list(dict.fromkeys(req for reqs in req_sets for req in reqs))
+    failed = set()
+    with _requirements_lock:
+        try:
+            log.info(f"Installing requirements: {' '.join(all_requirements)}")
+            pip_install(all_requirements, find_links=True)
+            for req_list in req_sets:
+                mark_requirements_installed(list(req_list))
+        except Exception as e:
+            log.error(f"Error installing requirements together: {e}")
+            for req_list in req_sets:
+                try:
+                    pip_install(list(req_list), find_links=True)
+                    mark_requirements_installed(list(req_list))
+                except Exception as e:
+                    log.error(f"Error installing packages: {' '.join(req_list)}: {e}")
+                    failed.add(req_list)
+
+    for req_list, owners in req_sets.items():
+        for owner in owners:
+            REQUIREMENTS_STATUS[owner] = "failed" if req_list in failed else "installed"
+
+    # list the pipes, actions and filters that were held back
+    bump_catalog_revision("functions")
+    log.info(
+        f"Installed requirements of {len(requirements)} functions and tools in {time.perf_counter() - start:.1f}s"
+    )
+
+
+def install_tool_and_function_dependencies():
+    """
+    Install all dependencies for all admin tools and active functions.
+
+    Blocks until pip is done; the server lifespan instead runs
+    install_requirements() in the background.
+    """
+    install_requirements(get_tool_and_function_requirements())
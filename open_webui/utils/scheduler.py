@@ -0,0 +1,305 @@
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+import weakref
+from collections import defaultdict
+from typing import Any, Awaitable, Callable, Optional
+
+from fastapi import HTTPException, status
+from opentelemetry import metrics
+from starlette.responses import StreamingResponse
+
+from open_webui.constants import TASKS
+from open_webui.env import (
+    SRC_LOG_LEVELS,
+    UPSTREAM_CONCURRENCY_LIMITS,
+    UPSTREAM_MAX_CONCURRENCY,
+    UPSTREAM_QUEUE_TIMEOUTS,
+)
+
+log = logging.getLogger(__name__)
+log.setLevel(SRC_LOG_LEVELS["MODELS"])
+
+meter = metrics.get_meter(__name__)
+wait_histogram = meter.create_histogram(
+    name="webui.scheduler.wait",
+    description="Time upstream requests waited for a slot, by priority",
+    unit="ms",
+)
+rejected_counter = meter.create_counter(
+    name="webui.scheduler.rejected",
+    description="Upstream requests that timed out waiting for a slot, by key and priority",
+    unit="1",
+)
+
+
+####################################
+# Priorities
+####################################
+
+INTERACTIVE = "interactive"
+REGENERATION = "regeneration"
+BACKGROUND = "background"
+
+# Lower is served first
+PRIORITIES = {INTERACTIVE: 0, REGENERATION: 1, BACKGROUND: 2}
+
+# Tasks nobody is waiting on; everything else (query generation, autocomplete,
+# ...) holds up a user and is interactive
+BACKGROUND_TASKS = {
+    str(TASKS.TITLE_GENERATION),
+    str(TASKS.TAGS_GENERATION),
+    str(TASKS.FOLLOW_UP_GENERATION),
+    str(TASKS.COMBINED_GENERATION),
+}
+REGENERATION_TASKS = {"case_node_regenerate"}
+
+
+def get_priority(metadata: Optional[dict]) -> str:
+    """Priority class of an upstream request from its metadata."""
+    metadata = metadata or {}
+    if metadata.get("priority") in PRIORITIES:
+        return metadata["priority"]
+
+    task = metadata.get("task")
+    if task in BACKGROUND_TASKS:
+        return BACKGROUND
+    if task in REGENERATION_TASKS:
+        return REGENERATION
+    return INTERACTIVE
+
+
+def get_schedule_keys(model: dict, models: dict) -> list[str]:
+    """
+    Keys whose concurrency limits apply to a request for ``model``: the model
+    itself and the connection serving it, e.g. ``openai:0``.
+    """
+    keys = [model["id"]]
+
+    # custom models are served by the connection of their base model
+    base_model_id = (model.get("info") or {}).get("base_model_id")
+    if base_model_id and base_model_id in models:
+        model = models[base_model_id]
+
+    if model.get("owned_by") == "openai" and "urlIdx" in model:
+        keys.append(f"openai:{model['urlIdx']}")
+    elif model.get("owned_by") == "ollama" and len(model.get("urls", [])) == 1:
+        # requests for models on several connections are spread over them
+        keys.append(f"ollama:{model['urls'][0]}")
+    return keys
+
+
+####################################
+# Scheduler
+####################################
+
+
+class _Slots:
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.in_flight = 0
+        self.waiters: list[tuple[int, int, asyncio.Future]] = []
+        self.waiting: dict[str, int] = defaultdict(int)
+
+
+class UpstreamScheduler:
+    """
+    Admission control for upstream model requests.
+
+    Each key (a model id or a connection such as ``openai:0``) has a cap on
+    concurrent requests. Requests over the cap wait in a priority queue, so
+    interactive chat is served before case regeneration and both before
+    background tasks, and fail with 503 once they waited longer than the
+    timeout of their priority class. Keys without a limit are not tracked.
+    """
+
+    def __init__(
+        self,
+        limits: Optional[dict[str, int]] = None,
+        default_limit: int = 0,
+        timeouts: Optional[dict[str, float]] = None,
+        connection_prefixes: tuple[str, ...] = ("openai:", "ollama:"),
+    ):
+        self.limits = limits or {}
+        self.default_limit = default_limit
+        self.timeouts = timeouts or {}
+        self.connection_prefixes = connection_prefixes
+        self._slots: dict[str, _Slots] = {}
+        self._seq = itertools.count()
+
+    def get_limit(self, key: str) -> int:
+        if key in self.limits:
+            return self.limits[key]
+        # the default cap protects the backends, it applies to connections only
+        if key.startswith(self.connection_prefixes):
+            return self.default_limit
+        return 0
+
+    def _release(self, key: str):
+        slots = self._slots[key]
+        while slots.waiters:
+            _, _, future = heapq.heappop(slots.waiters)
+            if not future.done():
+                # hand the slot over to the next waiter
+                future.set_result(None)
+                return
+        slots.in_flight -= 1
+
+    async def _acquire(self, key: str, priority: str) -> Optional[Callable[[], None]]:
+        limit = self.get_limit(key)
+        if limit <= 0:
+            return None
+
+        slots = self._slots.get(key)
+        if slots is None:
+            slots = self._slots[key] = _Slots(limit)
+        slots.limit = limit
+
+        released = False
+
+        def release():
+            nonlocal released
+            if not released:
+                released = True
+                self._release(key)
+
+        if slots.in_flight < slots.limit and not slots.waiters:
+            slots.in_flight += 1
+            return release
+
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(slots.waiters, (PRIORITIES[priority], next(self._seq), future))
+        slots.waiting[priority] += 1
+        start = time.perf_counter()
+        try:
+            await asyncio.wait_for(future, self.timeouts.get(priority) or None)
+        except BaseException as e:
+            if future.done() and not future.cancelled():
+                # the slot was handed to us just as we gave up
+                release()
+            else:
+                slots.waiters = [w for w in slots.waiters if w[2] is not future]
+                heapq.heapify(slots.waiters)
+
+            if isinstance(e, asyncio.TimeoutError):
+                rejected_counter.add(1, {"key": key, "priority": priority})
+                raise HTTPException(
+                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                    detail=f"Too many requests for {key}, try again later",
+                )
+            raise
+        finally:
+            slots.waiting[priority] -= 1
+            wait_histogram.record(
+                (time.perf_counter() - start) * 1000, {"priority": priority}
+            )
+        return release
+
+    async def acquire(self, keys: list[str], priority: str) -> Callable[[], None]:
+        """Wait for a slot of every key in ``keys``, returns the function releasing them."""
+        releases = []
+        try:
+            for key in keys:
+                release = await self._acquire(key, priority)
+                if release is not None:
+                    releases.append(release)
+        except BaseException:
+            for release in releases:
+                release()
+            raise
+
+        def release_all():
+            for release in releases:
+                release()
+
+        return release_all
+
+    async def run(
+        self,
+        keys: list[str],
+        priority: str,
+        func: Callable[[], Awaitable[Any]],
+    ) -> Any:
+        """
+        Run ``func()`` within the limits of ``keys``. A streaming response
+        keeps its slots until the stream is exhausted or closed.
+        """
+        release = await self.acquire(keys, priority)
+        try:
+            response = await func()
+        except BaseException:
+            release()
+            raise
+
+        if isinstance(response, StreamingResponse):
+            body_iterator = response.body_iterator
+
+            async def release_on_close():
+                try:
+                    async for chunk in body_iterator:
+                        yield chunk
+                finally:
+                    release()
+
+            response.body_iterator = release_on_close()
+            # a stream that is dropped before it was iterated never runs the finally
+            weakref.finalize(response.body_iterator, release)
+        else:
+            release()
+        return response
+
+    def stats(self) -> dict[str, dict]:
+        return {
+            key: {
+                "limit": slots.limit,
+                "in_flight": slots.in_flight,
+                "waiting": dict(slots.waiting),
+            }
+            for key, slots in self._slots.items()
+        }
+
+
+UPSTREAM_SCHEDULER: Optional[UpstreamScheduler] = None
+
+
+def get_upstream_scheduler() -> UpstreamScheduler:
+    global UPSTREAM_SCHEDULER
+    if UPSTREAM_SCHEDULER is None:
+        UPSTREAM_SCHEDULER = UpstreamScheduler(
+            limits=UPSTREAM_CONCURRENCY_LIMITS,
+            default_limit=UPSTREAM_MAX_CONCURRENCY,
+            timeouts=UPSTREAM_QUEUE_TIMEOUTS,
+        )
+
+        def observe(attribute: str):
+            def callback(options: metrics.CallbackOptions):
+                observations = []
+                for key, entry in UPSTREAM_SCHEDULER.stats().items():
+                    if attribute == "in_flight":
+                        observations.append(
+                            metrics.Observation(entry["in_flight"], {"key": key})
+                        )
+                    else:
+                        observations.extend(
+                            metrics.Observation(count, {"key": key, "priority": p})
+                            for p, count in entry["waiting"].items()
+                        )
+                return observations
+
+            return callback
+
+        meter.create_observable_gauge(
+            name="webui.scheduler.queue_depth",
+            description="Upstream requests waiting for a slot, by key and priority",
+            unit="1",
+            callbacks=[observe("waiting")],
+        )
+        meter.create_observable_gauge(
+            name="webui.scheduler.in_flight",
+            description="Upstream requests holding a slot, by key",
+            unit="1",
+            callbacks=[observe("in_flight")],
+        )
+    return UPSTREAM_SCHEDULER
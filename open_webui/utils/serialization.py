@@ -0,0 +1,108 @@
+"""
+JSON encoding and decoding of the hot paths: streamed completion chunks, state
+kept in Redis (socket pools, config, Yjs updates) and JSON columns of the
+database such as chat rows.
+
+Uses orjson or msgspec when installed (see JSON_SERIALIZER) and the standard
+library otherwise. Values the fast encoder rejects, like integers over 64
+bits, are encoded by the standard library instead, and invalid documents raise
+json.JSONDecodeError whichever library is used. NaN and Infinity are written
+as null by orjson and msgspec, and as NaN/Infinity by the standard library.
+"""
+
+import base64
+import json
+import logging
+from typing import Any, Callable, Optional, Union
+
+from open_webui.env import JSON_SERIALIZER, SRC_LOG_LEVELS
+
+log = logging.getLogger(__name__)
+log.setLevel(SRC_LOG_LEVELS["MAIN"])
+
+JSON_BACKENDS = ("orjson", "msgspec", "json")
+
+
+def load_json_backend(
+    name: str,
+) -> Optional[tuple[Callable[..., str], Callable[[Union[str, bytes]], Any]]]:
+    """The (dumps, loads) functions of a JSON library, None if it is not installed."""
+    if name == "orjson":
+        try:
+            import orjson
+        except ImportError:
+            return None
+
+        def dumps(obj, default=None) -> str:
+            return orjson.dumps(
+                obj, default=default, option=orjson.OPT_NON_STR_KEYS
+            ).decode("utf-8")
+
+        return dumps, orjson.loads
+
+    if name == "msgspec":
+        try:
+            import msgspec
+        except ImportError:
+            return None
+
+        def dumps(obj, default=None) -> str:
+            return msgspec.json.encode(obj, enc_hook=default).decode("utf-8")
+
+        return dumps, msgspec.json.decode
+
+    if name == "json":
+
+        def dumps(obj, default=None) -> str:
+            return json.dumps(obj, default=default)
+
+        return dumps, json.loads
+
+    return None
+
+
+def get_json_backend(name: str = JSON_SERIALIZER):
+    """The name, dumps and loads of the configured JSON library, or the first installed."""
+    for backend in JSON_BACKENDS if name == "auto" else (name, *JSON_BACKENDS):
+        functions = load_json_backend(backend)
+        if functions is not None:
+            if name not in ("auto", backend):
+                log.warning(f"JSON_SERIALIZER {name} is not available, using {backend}")
+            return (backend, *functions)
+
+
+JSON_BACKEND, _dumps, _loads = get_json_backend()
+log.debug(f"Encoding JSON with {JSON_BACKEND}")
+
+
+def json_dumps(obj: Any, default: Optional[Callable[[Any], Any]] = None) -> str:
+    """
+    JSON of ``obj``. orjson and msgspec output is compact and does not
+    escape non-ASCII characters, decoders read it the same.
+    """
+    try:
+        return _dumps(obj, default)
+    except Exception:
+        return json.dumps(obj, default=default)
+
+
+def json_loads(value: Union[str, bytes, bytearray]) -> Any:
+    try:
+        return _loads(value)
+    except Exception:
+        # raises json.JSONDecodeError for invalid documents, reads NaN/Infinity
+        return json.loads(value)
+
+
+def encode_binary(value: bytes) -> str:
+    """Binary data as text, for Redis connections that decode responses."""
+    return base64.b64encode(value).decode("ascii")
+
+
+def decode_binary(value: Union[str, bytes]) -> bytes:
+    if isinstance(value, bytes):
+        value = value.decode("ascii")
+    if value.startswith("["):
+        # stored as a JSON list of byte values by earlier versions
+        return bytes(json_loads(value))
+    return base64.b64decode(value)
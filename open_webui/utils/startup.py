@@ -0,0 +1,248 @@
+import asyncio
+import logging
+import os
+import sys
+import tempfile
+import threading
+import time
+from typing import Callable, Optional
+
+from open_webui.env import SRC_LOG_LEVELS
+
+log = logging.getLogger(__name__)
+log.setLevel(SRC_LOG_LEVELS["MAIN"])
+
+STARTED_AT = time.time()
+READY_AT: Optional[float] = None
+
+
+def mark_ready():
+    """Record when the app finished starting up and begins serving requests."""
+    global READY_AT
+    READY_AT = time.time()
+
+
+####################################
+# Warm-ups
+####################################
+
+
+class WarmUp:
+    """
+    One-shot initialization of something expensive to load, such as the local
+    embedding models. It runs exactly once: in a background thread after
+    startup, or in the first caller that needs it, which then blocks in
+    ``wait()`` until loading is done instead of failing.
+    """
+
+    def __init__(self, name: str, load: Callable[[], None]):
+        self.name = name
+        self.load = load
+        self.state = "pending"
+        self.error: Optional[str] = None
+        self.duration: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def run(self):
+        if self.state in ("ready", "failed"):
+            return
+
+        with self._lock:
+            # another thread may have finished loading while we waited
+            if self.state in ("ready", "failed"):
+                return
+
+            self.state = "loading"
+            start = time.perf_counter()
+            try:
+                self.load()
+                self.state = "ready"
+            except Exception as e:
+                log.exception(f"Warm-up of {self.name} failed: {e}")
+                self.state = "failed"
+                self.error = str(e)
+            finally:
+                self.duration = time.perf_counter() - start
+                log.info(f"Warm-up of {self.name} {self.state} in {self.duration:.2f}s")
+
+    wait = run
+
+    async def wait_async(self):
+        """``wait()`` for async code, the load blocks a worker thread, not the loop."""
+        if self.state not in ("ready", "failed"):
+            await asyncio.to_thread(self.run)
+
+    def status(self) -> dict:
+        return {"state": self.state, "error": self.error, "duration": self.duration}
+
+
+WARM_UPS: dict[str, WarmUp] = {}
+
+
+def register_warm_up(name: str, load: Callable[[], None]) -> WarmUp:
+    WARM_UPS[name] = WarmUp(name, load)
+    return WARM_UPS[name]
+
+
+def wait_for_warm_up(name: str):
+    """Block until the warm-up ``name`` is done, running it here if it hasn't started."""
+    warm_up = WARM_UPS.get(name)
+    if warm_up is not None:
+        warm_up.wait()
+
+
+async def wait_for_warm_up_async(name: str):
+    """``wait_for_warm_up`` for async handlers, which must not block on the load."""
+    warm_up = WARM_UPS.get(name)
+    if warm_up is not None:
+        await warm_up.wait_async()
+
+
+class LazyFunction:
+    """
+    Placeholder for a function a warm-up builds, e.g. the embedding function.
+    Calls and attribute access wait for the warm-up and then go to the
+    function ``get`` returns, which the warm-up has put in place of this one.
+    Async code calls it through ``asyncio.to_thread`` or awaits
+    ``wait_for_warm_up_async`` first, the wait blocks the calling thread.
+    """
+
+    def __init__(self, warm_up: WarmUp, get: Callable[[], Optional[Callable]]):
+        self.warm_up = warm_up
+        self.get = get
+
+    def _resolve(self) -> Callable:
+        self.warm_up.wait()
+        func = self.get()
+        if func is None or func is self:
+            raise Exception(f"{self.warm_up.name} failed to load: {self.warm_up.error}")
+        return func
+
+    def __call__(self, *args, **kwargs):
+        return self._resolve()(*args, **kwargs)
+
+    def __getattr__(self, name):
+        return getattr(self._resolve(), name)
+
+
+async def run_warm_ups():
+    for warm_up in list(WARM_UPS.values()):
+        await asyncio.to_thread(warm_up.run)
+
+
+def get_startup_status() -> dict:
+    return {
+        "started_at": int(STARTED_AT),
+        "ready_in": READY_AT - STARTED_AT if READY_AT is not None else None,
+        "warm_ups": {name: w.status() for name, w in WARM_UPS.items()},
+    }
+
+
+####################################
+# Import time
+####################################
+
+
+def parse_import_time(output: str) -> list[dict]:
+    """Parse the ``python -X importtime`` report into per-module timings in ms."""
+    modules = []
+    for line in output.splitlines():
+        if not line.startswith("import time:"):
+            continue
+
+        try:
+            self_us, cumulative_us, name = line[len("import time:") :].split("|")
+            modules.append(
+                {
+                    "module": name.strip(),
+                    # nested imports are indented by two spaces per level
+                    "depth": (len(name) - len(name.lstrip()) - 1) // 2,
+                    "self": int(self_us) / 1000,
+                    "cumulative": int(cumulative_us) / 1000,
+                }
+            )
+        except ValueError:
+            # the header line ("self [us] | cumulative | imported package")
+            continue
+    return modules
+
+
+def summarize_import_time(modules: list[dict], limit: int = 25) -> dict:
+    return {
+        "total": sum(m["cumulative"] for m in modules if m["depth"] == 0),
+        "modules": len(modules),
+        "cumulative": sorted(modules, key=lambda m: m["cumulative"], reverse=True)[
+            :limit
+        ],
+        "self": sorted(modules, key=lambda m: m["self"], reverse=True)[:limit],
+    }
+
+
+async def profile_import_time(
+    module: str = "open_webui.main", timeout: float = 300
+) -> dict:
+    """
+    Import ``module`` in a fresh interpreter with ``-X importtime`` and parse
+    which imports the startup time goes to. The child imports it against a
+    scratch DATA_DIR and SQLite database, with lazy loading and offline mode
+    on, so the module-level side effects of the import (config, migrations,
+    model loading) neither touch the live data nor download anything.
+    """
+    with tempfile.TemporaryDirectory() as data_dir:
+        env = {
+            key: value
+            for key, value in os.environ.items()
+            if key not in ("DATABASE_URL", "DATABASE_TYPE")
+        }
+        env.update(DATA_DIR=data_dir, ENABLE_LAZY_LOADING="true", OFFLINE_MODE="true")
+        process = await asyncio.create_subprocess_exec(
+            sys.executable,
+            "-X",
+            "importtime",
+            "-c",
+            f"import {module}",
+            stdout=asyncio.subprocess.DEVNULL,
+            stderr=asyncio.subprocess.PIPE,
+            env=env,
+        )
+        try:
+            _, stderr = await asyncio.wait_for(process.communicate(), timeout)
+        except asyncio.TimeoutError:
+            process.kill()
+            await process.wait()
+            raise
+
+    return {
+        "module": module,
+        "returncode": process.returncode,
+        "modules": parse_import_time(stderr.decode(errors="replace")),
+    }
+
+
+IMPORT_TIME_PROFILE: Optional[dict] = None
+_import_time_lock = asyncio.Lock()
+
+
+async def get_import_time(limit: int = 25) -> dict:
+    """
+    Summary of the import time profile of ``open_webui.main``. It is taken once
+    per process, at startup with ENABLE_IMPORT_TIME_PROFILE, and later callers
+    wait for that run and get the stored result.
+    """
+    global IMPORT_TIME_PROFILE
+    async with _import_time_lock:
+        if IMPORT_TIME_PROFILE is None:
+            IMPORT_TIME_PROFILE = await profile_import_time("open_webui.main")
+
+    return {
+        "module": IMPORT_TIME_PROFILE["module"],
+        "returncode": IMPORT_TIME_PROFILE["returncode"],
+        **summarize_import_time(IMPORT_TIME_PROFILE["modules"], limit),
+    }
+
+
+async def run_import_time_profile():
+    try:
+        await get_import_time()
+    except Exception as e:
+        log.exception(f"Import time profile failed: {e}")
@@ -243,6 +243,63 @@ def tags_generation_template(
     return template
 
 
+# Output keys of the combined title/tags/follow-ups task, with their JSON example and schema
+COMBINED_TASK_OUTPUTS = {
+    "title": ('"title": "your concise title here"', {"type": "string"}),
+    "tags": (
+        '"tags": ["tag1", "tag2", "tag3"]',
+        {"type": "array", "items": {"type": "string"}},
+    ),
+    "follow_ups": (
+        '"follow_ups": ["Question 1?", "Question 2?", "Question 3?"]',
+        {"type": "array", "items": {"type": "string"}},
+    ),
+}
+
+
+def combined_task_generation_template(
+    template: str,
+    messages: list[dict],
+    outputs: list[str],
+    user: Optional[dict] = None,
+) -> str:
+    template = template.replace(
+        "{{OUTPUT}}",
+        "{ " + ", ".join(COMBINED_TASK_OUTPUTS[key][0] for key in outputs) + " }",
+    )
+
+    prompt = get_last_user_message(messages)
+    template = replace_prompt_variable(template, prompt)
+    template = replace_messages_variable(template, messages)
+
+    template = prompt_template(
+        template,
+        **(
+            {"user_name": user.get("name"), "user_location": user.get("location")}
+            if user
+            else {}
+        ),
+    )
+    return template
+
+
+def get_combined_task_response_format(outputs: list[str]) -> dict:
+    """Structured output format requiring exactly ``outputs`` in the response."""
+    return {
+        "type": "json_schema",
+        "json_schema": {
+            "name": "chat_metadata",
+            "strict": True,
+            "schema": {
+                "type": "object",
+                "properties": {key: COMBINED_TASK_OUTPUTS[key][1] for key in outputs},
+                "required": outputs,
+                "additionalProperties": False,
+            },
+        },
+    }
+
+
 def image_prompt_generation_template(
     template: str, messages: list[dict], user: Optional[dict] = None
 ) -> str:
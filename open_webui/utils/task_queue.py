@@ -0,0 +1,91 @@
+import asyncio
+import logging
+from typing import Awaitable, Callable, Optional
+
+from opentelemetry import metrics
+
+from open_webui.env import (
+    BACKGROUND_TASK_QUEUE_SIZE,
+    BACKGROUND_TASK_WORKERS,
+    SRC_LOG_LEVELS,
+)
+
+log = logging.getLogger(__name__)
+log.setLevel(SRC_LOG_LEVELS["MAIN"])
+
+meter = metrics.get_meter(__name__)
+dropped_counter = meter.create_counter(
+    name="webui.background_tasks.dropped",
+    description="Background tasks dropped because the queue was full",
+    unit="1",
+)
+
+
+class BackgroundTaskQueue:
+    """
+    Bounded queue for best-effort work that follows a chat response, such as
+    title, tag and follow-up generation. A fixed number of workers drain it, so
+    a burst of finished chats queues up behind them instead of sending as many
+    task model requests at once and starving interactive traffic. Work
+    submitted while the queue is full is dropped.
+    """
+
+    def __init__(
+        self,
+        workers: int = BACKGROUND_TASK_WORKERS,
+        maxsize: int = BACKGROUND_TASK_QUEUE_SIZE,
+    ):
+        self.workers = workers
+        # asyncio.Queue treats 0 as unbounded, the queue always holds at least one task
+        self.maxsize = max(1, maxsize)
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks: list[asyncio.Task] = []
+
+    async def _worker(self, queue: asyncio.Queue):
+        while True:
+            name, func = await queue.get()
+            try:
+                await func()
+            except Exception as e:
+                log.exception(f"Background task {name} failed: {e}")
+            finally:
+                queue.task_done()
+
+    def _start(self) -> asyncio.Queue:
+        loop = asyncio.get_running_loop()
+        # the workers belong to the event loop that started them
+        if self._queue is None or any(
+            task.get_loop() is not loop for task in self._tasks
+        ):
+            self._queue = asyncio.Queue(maxsize=self.maxsize)
+            self._tasks = [
+                asyncio.create_task(self._worker(self._queue))
+                for _ in range(self.workers)
+            ]
+        return self._queue
+
+    async def submit(self, func: Callable[[], Awaitable], name: str = "") -> bool:
+        """Queue ``func()`` to run in a worker, False if it was dropped."""
+        if self.workers <= 0:
+            await func()
+            return True
+
+        try:
+            self._start().put_nowait((name, func))
+        except asyncio.QueueFull:
+            log.warning(f"Background task queue is full, dropping {name}")
+            dropped_counter.add(1, {"name": name})
+            return False
+        return True
+
+    def qsize(self) -> int:
+        return self._queue.qsize() if self._queue is not None else 0
+
+    async def close(self):
+        tasks, self._tasks, self._queue = self._tasks, [], None
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+BACKGROUND_TASK_QUEUE = BackgroundTaskQueue()
@@ -8,6 +8,16 @@ Metrics collected:
 
 * http.server.requests (counter)
 * http.server.duration (histogram, milliseconds)
+* webui.rerank.batch_size (histogram, pairs per reranking model call)
+* webui.rerank.duration (histogram, milliseconds)
+* webui.rerank.cache (counter, attribute result=hit|miss)
+* webui.http_client.connections (counter, attributes origin, result=created|reused)
+* webui.http_client.pool (gauge, attributes origin, state=in_use|idle)
+* webui.scheduler.queue_depth (gauge, attributes key, priority)
+* webui.scheduler.in_flight (gauge, attribute key)
+* webui.scheduler.wait (histogram, milliseconds, attribute priority)
+* webui.scheduler.rejected (counter, attributes key, priority)
+* webui.task_cache.requests (counter, attributes task, result=hit|similar|miss)
 
 Attributes used: http.method, http.route, http.status_code
 
@@ -99,6 +109,22 @@ def _build_meter_provider(resource: Resource) -> MeterProvider:
         View(
             instrument_name="webui.users.active",
         ),
+        View(
+            instrument_name="webui.rerank.*",
+            attribute_keys=["model", "result"],
+        ),
+        View(
+            instrument_name="webui.http_client.*",
+            attribute_keys=["origin", "state", "result"],
+        ),
+        View(
+            instrument_name="webui.scheduler.*",
+            attribute_keys=["key", "priority"],
+        ),
+        View(
+            instrument_name="webui.task_cache.*",
+            attribute_keys=["task", "result"],
+        ),
     ]
 
     provider = MeterProvider(